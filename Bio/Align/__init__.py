@@ -13,6 +13,10 @@ class, used in the Bio.AlignIO module.
 
 """
 
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy
+
 from Bio.Align import _aligners
 from Bio.Align import substitution_matrices
 from Bio.Seq import Seq, MutableSeq
@@ -1332,17 +1336,44 @@ class PairwiseAlignment:
 class PairwiseAlignments:
     """Implements an iterator over pairwise alignments returned by the aligner.
 
-    This class also supports indexing, which is fast for increasing indices,
-    but may be slow for random access of a large number of alignments.
+    This class also supports indexing, including negative indices. Alignments
+    are generated lazily from the traceback matrix, one at a time, so iterating
+    over them takes a constant time per alignment. While iterating, the state
+    of the path generator is saved after every checkpoint_interval alignments;
+    an index smaller than the current one then restarts the path generator from
+    the nearest preceding checkpoint instead of from the first alignment.
 
     Note that pairwise aligners can return an astronomical number of alignments,
     even for relatively short sequences, if they align poorly to each other. We
     therefore recommend to first check the number of alignments, accessible as
-    len(alignments), which can be calculated quickly even if the number of
-    alignments is very large.
+    len(alignments), which is calculated by dynamic programming without
+    generating the alignments, and is therefore fast even if the number of
+    alignments is very large. Alternatively, use the max_alignments argument
+    of the align method of the aligner to stop after a given number of
+    alignments:
+
+    >>> from Bio import Align
+    >>> aligner = Align.PairwiseAligner()
+    >>> alignments = aligner.align("AAAAAAAAAA", "AAAAA")
+    >>> len(alignments)
+    252
+    >>> alignments = aligner.align("AAAAAAAAAA", "AAAAA", max_alignments=10)
+    >>> len(alignments)
+    10
+    >>> print(alignments[-1])
+    AAAAAAAAAA
+    |-|||-|---
+    A-AAA-A---
+    <BLANKLINE>
+    >>> alignments[10]
+    Traceback (most recent call last):
+     ...
+    IndexError: index out of range
     """
 
-    def __init__(self, seqA, seqB, score, paths):
+    checkpoint_interval = 1000
+
+    def __init__(self, seqA, seqB, score, paths, max_alignments=None):
         """Initialize a new PairwiseAlignments object.
 
         Arguments:
@@ -1351,31 +1382,51 @@ class PairwiseAlignments:
          - score - The alignment score.
          - paths - An iterator over the paths in the traceback matrix;
                    each path defines one alignment.
+         - max_alignments - The maximum number of alignments to return,
+                   or None (default) to return all optimal alignments.
 
         You would normally obtain an PairwiseAlignments object by calling
         aligner.align(seqA, seqB), where aligner is a PairwiseAligner object.
         """
+        if max_alignments is not None and max_alignments < 0:
+            raise ValueError("max_alignments must be a non-negative integer")
         self.seqA = seqA
         self.seqB = seqB
         self.score = score
         self.paths = paths
+        self.max_alignments = max_alignments
         self.index = -1
+        self._checkpoints = []
 
     def __len__(self):
-        return len(self.paths)
+        length = len(self.paths)
+        if self.max_alignments is not None and self.max_alignments < length:
+            return self.max_alignments
+        return length
 
     def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+            if index < 0:
+                raise IndexError("index out of range")
+        elif self.max_alignments is not None and index >= self.max_alignments:
+            raise IndexError("index out of range")
         if index == self.index:
             return self.alignment
-        if index < self.index:
-            self.paths.reset()
-            self.index = -1
-        while self.index < index:
+        n = index // self.checkpoint_interval
+        if index < self.index or (
+            n < len(self._checkpoints) and n * self.checkpoint_interval > self.index
+        ):
+            self._restore(index)
+        while self.index < index - 1:
             try:
-                alignment = next(self)
+                self._next_path()
             except StopIteration:
                 raise IndexError("index out of range") from None
-        return alignment
+        try:
+            return next(self)
+        except StopIteration:
+            raise IndexError("index out of range") from None
 
     def __iter__(self):
         self.paths.reset()
@@ -1383,12 +1434,30 @@ class PairwiseAlignments:
         return self
 
     def __next__(self):
-        path = next(self.paths)
-        self.index += 1
+        if self.max_alignments is not None and self.index + 1 >= self.max_alignments:
+            raise StopIteration
+        path = self._next_path()
         alignment = PairwiseAlignment(self.seqA, self.seqB, path, self.score)
         self.alignment = alignment
         return alignment
 
+    def _next_path(self):
+        """Return the next path, saving a checkpoint if needed (PRIVATE)."""
+        index = self.index + 1
+        if index % self.checkpoint_interval == 0:
+            n = index // self.checkpoint_interval
+            if n == len(self._checkpoints):
+                self._checkpoints.append(self.paths.checkpoint())
+        path = next(self.paths)
+        self.index = index
+        return path
+
+    def _restore(self, index):
+        """Restart the path generator from the last checkpoint before index (PRIVATE)."""
+        n = min(index // self.checkpoint_interval, len(self._checkpoints) - 1)
+        self.paths.restore(self._checkpoints[n])
+        self.index = n * self.checkpoint_interval - 1
+
 
 class PairwiseAligner(_aligners.PairwiseAligner):
     """Performs pairwise sequence alignment using dynamic programming.
@@ -1533,6 +1602,33 @@ class PairwiseAligner(_aligners.PairwiseAligner):
     -A-CG
     <BLANKLINE>
 
+    If the sequences are known to be similar, for example a sequencing read
+    and the region of the genome it was mapped to, the calculation can be
+    restricted to a band of diagonals by setting the band_width attribute.
+    Only the diagonals within band_width of the diagonals through the start
+    and the end of both sequences are then considered, so the running time is
+    proportional to the sequence length times the band width instead of the
+    product of the sequence lengths. Alignments needing more gaps than this
+    are not found:
+
+    >>> aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-2)
+    >>> aligner.band_width = 2
+    >>> alignments = aligner.align("GAACTTGACGATT", "GAACTGACGATT")
+    >>> print("Score = %.1f" % alignments.score)
+    Score = 10.0
+    >>> print(alignments[0])
+    GAACTTGACGATT
+    ||||-||||||||
+    GAAC-TGACGATT
+    <BLANKLINE>
+
+    In local mode, the xdrop attribute can be set instead of (or in addition
+    to) the band width, to stop extending an alignment in any direction once
+    its score falls more than xdrop below the highest score found so far, as
+    in BLAST. Both apply to the score and the align methods, and are switched
+    off by setting them to None (the default). They are not available for
+    gap score functions.
+
     """
 
     def __init__(self, **kwargs):
@@ -1553,16 +1649,58 @@ class PairwiseAligner(_aligners.PairwiseAligner):
             raise AttributeError("PairwiseAligner object has no attribute '%s'" % key)
         _aligners.PairwiseAligner.__setattr__(self, key, value)
 
-    def align(self, seqA, seqB):
-        """Return the alignments of two sequences using PairwiseAligner."""
+    def align(self, seqA, seqB, max_alignments=None):
+        """Return the alignments of two sequences using PairwiseAligner.
+
+        The optimal alignments are returned as a PairwiseAlignments object,
+        which generates them lazily. Use max_alignments to return at most
+        that many alignments.
+        """
         if isinstance(seqA, (Seq, MutableSeq)):
             seqA = bytes(seqA)
         if isinstance(seqB, (Seq, MutableSeq)):
             seqB = bytes(seqB)
         score, paths = _aligners.PairwiseAligner.align(self, seqA, seqB)
-        alignments = PairwiseAlignments(seqA, seqB, score, paths)
+        alignments = PairwiseAlignments(seqA, seqB, score, paths, max_alignments)
         return alignments
 
+    def align_linear(self, seqA, seqB):
+        """Return one optimal global alignment of two sequences, using linear memory.
+
+        The align method stores the full traceback matrix to find all optimal
+        alignments, which needs memory proportional to the product of the
+        sequence lengths. This method instead finds a single optimal alignment
+        using the divide-and-conquer algorithm of Hirschberg (for linear gap
+        scores) and of Myers and Miller (for affine gap scores), needing memory
+        proportional to the sequence lengths only, at about twice the run time.
+        This makes it possible to align long sequences, such as bacterial
+        genomes, to each other.
+
+        This method is available for global alignments using the
+        Needleman-Wunsch or Gotoh algorithm (i.e. not with gap score
+        functions). The alignment is returned as a PairwiseAlignment object.
+
+        >>> from Bio import Align
+        >>> aligner = Align.PairwiseAligner()
+        >>> aligner.mismatch_score = -1
+        >>> aligner.open_gap_score = -2
+        >>> aligner.extend_gap_score = -0.5
+        >>> alignment = aligner.align_linear("GAACTTTGAC", "GAACGAC")
+        >>> print("Score = %.1f" % alignment.score)
+        Score = 4.0
+        >>> print(alignment)
+        GAACTTTGAC
+        ||||---|||
+        GAAC---GAC
+        <BLANKLINE>
+        """
+        if isinstance(seqA, (Seq, MutableSeq)):
+            seqA = bytes(seqA)
+        if isinstance(seqB, (Seq, MutableSeq)):
+            seqB = bytes(seqB)
+        score, path = _aligners.PairwiseAligner.align_linear(self, seqA, seqB)
+        return PairwiseAlignment(seqA, seqB, path, score)
+
     def score(self, seqA, seqB):
         """Return the alignments score of two sequences using PairwiseAligner."""
         if isinstance(seqA, (Seq, MutableSeq)):
@@ -1571,6 +1709,147 @@ class PairwiseAligner(_aligners.PairwiseAligner):
             seqB = bytes(seqB)
         return _aligners.PairwiseAligner.score(self, seqA, seqB)
 
+    def score_many(self, seqsA, seqsB, threads=1):
+        """Return the alignment scores of many pairs of sequences as a NumPy array.
+
+        Arguments:
+         - seqsA - a list of sequences, or a single sequence
+         - seqsB - a list of sequences, or a single sequence
+         - threads - number of threads used to calculate the scores
+
+        The sequences are aligned pairwise (seqsA[0] with seqsB[0], seqsA[1]
+        with seqsB[1], and so on), so both lists must have the same length.
+        If either argument is a single sequence (a string, bytes, Seq or
+        MutableSeq object, or a one-dimensional NumPy array) it is aligned
+        to each of the sequences in the other list, as when scoring one query
+        against many targets. A two-dimensional NumPy array (for example of
+        dtype uint8 for letters, or int32 for indices into the substitution
+        matrix) is treated as a list of its rows.
+
+        The dynamic programming calculations release the GIL (except for the
+        Waterman-Smith-Beyer algorithm with gap score functions), so using
+        more than one thread makes use of multiple CPU cores. Don't modify
+        the aligner while this method is running.
+
+        For local alignments using a substitution matrix, with integer scores
+        and affine gap scores, the score is calculated by a vectorized
+        (striped) Smith-Waterman algorithm. The scores of the substitution
+        matrix arranged for the single sequence (the query profile) are then
+        calculated once and reused for each sequence in the other list.
+
+        >>> from Bio import Align
+        >>> aligner = Align.PairwiseAligner()
+        >>> aligner.score_many("ACGT", ["ACGT", "ACG", "TTTT"]).tolist()
+        [4.0, 3.0, 1.0]
+        >>> aligner.score_many(["ACGT", "GG"], ["AGT", "GAG"], threads=2).tolist()
+        [3.0, 2.0]
+        """
+        seqsA, seqsB = self._pair_sequences(seqsA, seqsB)
+        scores = numpy.empty(len(seqsA))
+
+        def score_range(start, end):
+            score = _aligners.PairwiseAligner.score
+            for i in range(start, end):
+                scores[i] = score(self, seqsA[i], seqsB[i])
+
+        self._run_in_threads(score_range, len(scores), threads)
+        return scores
+
+    def align_many(self, seqsA, seqsB, threads=1):
+        """Return a list of the alignments of many pairs of sequences.
+
+        This is the equivalent of calling the align method for each pair of
+        sequences, returning a list of PairwiseAlignments objects, with the
+        dynamic programming calculations spread over the given number of
+        threads. See the score_many method for how the sequences are paired.
+
+        >>> from Bio import Align
+        >>> aligner = Align.PairwiseAligner()
+        >>> for alignments in aligner.align_many("ACGT", ["ACGT", "AGT"]):
+        ...     print(alignments[0])
+        ...
+        ACGT
+        ||||
+        ACGT
+        <BLANKLINE>
+        ACGT
+        |-||
+        A-GT
+        <BLANKLINE>
+        """
+        seqsA, seqsB = self._pair_sequences(seqsA, seqsB)
+        results = [None] * len(seqsA)
+
+        def align_range(start, end):
+            align = _aligners.PairwiseAligner.align
+            for i in range(start, end):
+                seqA = seqsA[i]
+                seqB = seqsB[i]
+                score, paths = align(self, seqA, seqB)
+                results[i] = PairwiseAlignments(seqA, seqB, score, paths)
+
+        self._run_in_threads(align_range, len(results), threads)
+        return results
+
+    @staticmethod
+    def _pair_sequences(seqsA, seqsB):
+        """Return two lists of sequences of equal length to align pairwise (PRIVATE)."""
+
+        def as_list(seqs):
+            # Return None for a single sequence
+            if isinstance(seqs, (Seq, MutableSeq)):
+                return None
+            if isinstance(seqs, (str, bytes, bytearray)):
+                return None
+            if isinstance(seqs, numpy.ndarray):
+                if seqs.ndim == 1:
+                    return None
+                if seqs.ndim == 2:
+                    return list(numpy.ascontiguousarray(seqs))
+                raise ValueError("expected a one or two dimensional array")
+            return [
+                bytes(seq) if isinstance(seq, (Seq, MutableSeq)) else seq
+                for seq in seqs
+            ]
+
+        listA = as_list(seqsA)
+        listB = as_list(seqsB)
+        if listA is None and listB is None:
+            raise ValueError("expected a list of sequences for seqsA or seqsB")
+        if listA is None:
+            if isinstance(seqsA, (Seq, MutableSeq)):
+                seqsA = bytes(seqsA)
+            listA = [seqsA] * len(listB)
+        elif listB is None:
+            if isinstance(seqsB, (Seq, MutableSeq)):
+                seqsB = bytes(seqsB)
+            listB = [seqsB] * len(listA)
+        elif len(listA) != len(listB):
+            raise ValueError(
+                "seqsA and seqsB have different lengths (%d and %d)"
+                % (len(listA), len(listB))
+            )
+        return listA, listB
+
+    @staticmethod
+    def _run_in_threads(function, n, threads):
+        """Call function(start, end) on ranges covering 0 to n using threads (PRIVATE)."""
+        if threads < 1:
+            raise ValueError("threads must be a positive integer")
+        if threads == 1 or n < 2:
+            function(0, n)
+            return
+        # Use several ranges per thread to even out differences in run time
+        chunks = min(n, 4 * threads)
+        bounds = [n * i // chunks for i in range(chunks + 1)]
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            futures = [
+                executor.submit(function, start, end)
+                for start, end in zip(bounds[:-1], bounds[1:])
+            ]
+            for future in futures:
+                future.result()
+
 
 if __name__ == "__main__":
     from Bio._utils import run_doctest
@@ -1622,12 +1622,156 @@ PathGenerator_reset(PathGenerator* self)
     return Py_None;
 }
 
+static const char PathGenerator_checkpoint__doc__[] =
+    "return the current state of the iterator, for use with restore";
+
+static PyObject*
+PathGenerator_checkpoint(PathGenerator* self)
+{
+    int iA = self->iA;
+    int iB = self->iB;
+    int i;
+    int j;
+    int n = 0;
+    int path;
+    char* steps;
+    PyObject* bytes;
+    Trace** M = self->M;
+
+    path = M[0][0].path;
+    if (path == DONE || path == NONE) {
+        /* exhausted iterator */
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    if (self->mode == Global) {
+        iA = 0;
+        iB = 0;
+    }
+    /* The state of the iterator is stored in the path of the current
+     * alignment only, starting from its start point. */
+    i = iA;
+    j = iB;
+    while (1) {
+        path = M[i][j].path;
+        if (!path) break;
+        switch (path) {
+            case HORIZONTAL: j++; break;
+            case VERTICAL: i++; break;
+            case DIAGONAL: i++; j++; break;
+        }
+        n++;
+    }
+    bytes = PyBytes_FromStringAndSize(NULL, n);
+    if (!bytes) return NULL;
+    steps = PyBytes_AS_STRING(bytes);
+    i = iA;
+    j = iB;
+    for (n = 0; ; n++) {
+        path = M[i][j].path;
+        if (!path) break;
+        steps[n] = path;
+        switch (path) {
+            case HORIZONTAL: j++; break;
+            case VERTICAL: i++; break;
+            case DIAGONAL: i++; j++; break;
+        }
+    }
+    return Py_BuildValue("iiN", iA, iB, bytes);
+}
+
+static const char PathGenerator_restore__doc__[] =
+    "restore the state of the iterator saved by checkpoint";
+
+static PyObject*
+PathGenerator_restore(PathGenerator* self, PyObject* args)
+{
+    int iA;
+    int iB;
+    int i;
+    int j;
+    int path;
+    const char* steps;
+    Py_ssize_t n;
+    Py_ssize_t k;
+    const int nA = self->nA;
+    const int nB = self->nB;
+    Trace** M = self->M;
+    PyObject* state;
+
+    if (!PyArg_ParseTuple(args, "O:restore", &state)) return NULL;
+    if (M[0][0].path == NONE) {
+        /* no alignments */
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    if (state == Py_None) {
+        M[0][0].path = DONE;
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    if (!PyTuple_Check(state)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "state should be a tuple returned by checkpoint");
+        return NULL;
+    }
+    if (!PyArg_ParseTuple(state, "iiy#:restore", &iA, &iB, &steps, &n))
+        return NULL;
+    if (iA < 0 || iA > nA || iB < 0 || iB > nB
+     || (self->mode == Global && (iA != 0 || iB != 0))) {
+        PyErr_SetString(PyExc_ValueError, "inconsistent state");
+        return NULL;
+    }
+    /* check the path before modifying the traceback matrix */
+    i = iA;
+    j = iB;
+    for (k = 0; k < n; k++) {
+        switch (steps[k]) {
+            case HORIZONTAL: j++; break;
+            case VERTICAL: i++; break;
+            case DIAGONAL: i++; j++; break;
+            default: i = nA + 1; break;
+        }
+        if (i > nA || j > nB) {
+            PyErr_SetString(PyExc_ValueError, "inconsistent state");
+            return NULL;
+        }
+    }
+    M[0][0].path = 0;
+    self->iA = iA;
+    self->iB = iB;
+    i = iA;
+    j = iB;
+    for (k = 0; k < n; k++) {
+        path = steps[k];
+        M[i][j].path = path;
+        switch (path) {
+            case HORIZONTAL: j++; break;
+            case VERTICAL: i++; break;
+            case DIAGONAL: i++; j++; break;
+        }
+    }
+    M[i][j].path = 0;
+    Py_INCREF(Py_None);
+    return Py_None;
+}
+
 static PyMethodDef PathGenerator_methods[] = {
     {"reset",
      (PyCFunction)PathGenerator_reset,
      METH_NOARGS,
      PathGenerator_reset__doc__
     },
+    {"checkpoint",
+     (PyCFunction)PathGenerator_checkpoint,
+     METH_NOARGS,
+     PathGenerator_checkpoint__doc__
+    },
+    {"restore",
+     (PyCFunction)PathGenerator_restore,
+     METH_VARARGS,
+     PathGenerator_restore__doc__
+    },
     {NULL}  /* Sentinel */
 };
 
@@ -1698,6 +1842,9 @@ typedef struct {
     PyObject* alphabet;
     int* mapping;
     int wildcard;
+    Py_ssize_t band_width;
+    double xdrop;
+    PyObject* striped_profiles[2];
 } Aligner;
 
 
@@ -1814,6 +1961,10 @@ Aligner_init(Aligner *self, PyObject *args, PyObject *kwds)
     self->alphabet = NULL;
     self->mapping = NULL;
     self->wildcard = -1;
+    self->band_width = -1;
+    self->xdrop = -1;
+    self->striped_profiles[0] = NULL;
+    self->striped_profiles[1] = NULL;
     return 0;
 }
 
@@ -1824,6 +1975,8 @@ Aligner_dealloc(Aligner* self)
     if (self->substitution_matrix.obj) PyBuffer_Release(&self->substitution_matrix);
     Py_XDECREF(self->alphabet);
     Py_XDECREF(self->mapping);
+    Py_XDECREF(self->striped_profiles[0]);
+    Py_XDECREF(self->striped_profiles[1]);
     Py_TYPE(self)->tp_free((PyObject*)self);
 }
 
@@ -1900,6 +2053,10 @@ Aligner_str(Aligner* self)
         p += sprintf(p, "  query_right_extend_gap_score: %f\n",
                      self->query_right_extend_gap_score);
     }
+    if (self->band_width >= 0)
+        p += sprintf(p, "  band_width: %zd\n", self->band_width);
+    if (self->xdrop >= 0)
+        p += sprintf(p, "  xdrop: %f\n", self->xdrop);
     switch (self->mode) {
         case Global: sprintf(p, "  mode: global\n"); break;
         case Local: sprintf(p, "  mode: local\n"); break;
@@ -3697,6 +3854,73 @@ Aligner_set_wildcard(Aligner* self, PyObject* value, void* closure)
 
 static char Aligner_wildcard__doc__[] = "wildcard character";
 
+static char Aligner_band_width__doc__[] = "width of the band of diagonals used for banded alignment, or None";
+
+static PyObject*
+Aligner_get_band_width(Aligner* self, void* closure)
+{
+    if (self->band_width < 0) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    return PyLong_FromSsize_t(self->band_width);
+}
+
+static int
+Aligner_set_band_width(Aligner* self, PyObject* value, void* closure)
+{
+    Py_ssize_t band_width;
+    if (value == Py_None) {
+        self->band_width = -1;
+        return 0;
+    }
+    if (!PyLong_Check(value)) {
+        PyErr_SetString(PyExc_TypeError,
+                        "band_width should be a non-negative integer, or None");
+        return -1;
+    }
+    band_width = PyLong_AsSsize_t(value);
+    if (band_width == -1 && PyErr_Occurred()) return -1;
+    if (band_width < 0) {
+        PyErr_SetString(PyExc_ValueError,
+                        "band_width should be a non-negative integer, or None");
+        return -1;
+    }
+    self->band_width = band_width;
+    return 0;
+}
+
+static char Aligner_xdrop__doc__[] = "X-drop score for terminating local alignments, or None";
+
+static PyObject*
+Aligner_get_xdrop(Aligner* self, void* closure)
+{
+    if (self->xdrop < 0) {
+        Py_INCREF(Py_None);
+        return Py_None;
+    }
+    return PyFloat_FromDouble(self->xdrop);
+}
+
+static int
+Aligner_set_xdrop(Aligner* self, PyObject* value, void* closure)
+{
+    double xdrop;
+    if (value == Py_None) {
+        self->xdrop = -1;
+        return 0;
+    }
+    xdrop = PyFloat_AsDouble(value);
+    if (xdrop == -1.0 && PyErr_Occurred()) return -1;
+    if (!(xdrop >= 0)) {
+        PyErr_SetString(PyExc_ValueError,
+                        "xdrop should be a non-negative number, or None");
+        return -1;
+    }
+    self->xdrop = xdrop;
+    return 0;
+}
+
 static Algorithm _get_algorithm(Aligner* self)
 {
     Algorithm algorithm = self->algorithm;
@@ -3993,6 +4217,14 @@ static PyGetSetDef Aligner_getset[] = {
         (getter)Aligner_get_wildcard,
         (setter)Aligner_set_wildcard,
         Aligner_wildcard__doc__, NULL},
+    {"band_width",
+        (getter)Aligner_get_band_width,
+        (setter)Aligner_set_band_width,
+        Aligner_band_width__doc__, NULL},
+    {"xdrop",
+        (getter)Aligner_get_xdrop,
+        (setter)Aligner_set_xdrop,
+        Aligner_xdrop__doc__, NULL},
     {"algorithm",
         (getter)Aligner_get_algorithm,
         (setter)NULL,
@@ -4289,6 +4521,7 @@ static PyGetSetDef Aligner_getset[] = {
     /* Needleman-Wunsch algorithm */ \
     row = PyMem_Malloc((nB+1)*sizeof(double)); \
     if (!row) return PyErr_NoMemory(); \
+    Py_BEGIN_ALLOW_THREADS \
 \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4329,6 +4562,7 @@ static PyGetSetDef Aligner_getset[] = {
     SELECT_SCORE_GLOBAL(temp + (align_score), \
                         row[nB] + right_gap_extend_B, \
                         row[nB-1] + right_gap_extend_A); \
+    Py_END_ALLOW_THREADS \
     PyMem_Free(row); \
     return PyFloat_FromDouble(score);
 
@@ -4348,6 +4582,7 @@ static PyGetSetDef Aligner_getset[] = {
     /* Smith-Waterman algorithm */ \
     row = PyMem_Malloc((nB+1)*sizeof(double)); \
     if (!row) return PyErr_NoMemory(); \
+    Py_BEGIN_ALLOW_THREADS \
 \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4380,6 +4615,7 @@ static PyGetSetDef Aligner_getset[] = {
     } \
     kB = sB[nB-1]; \
     SELECT_SCORE_LOCAL1(temp + (align_score)); \
+    Py_END_ALLOW_THREADS \
     PyMem_Free(row); \
     return PyFloat_FromDouble(maximum);
 
@@ -4411,6 +4647,7 @@ static PyGetSetDef Aligner_getset[] = {
         Py_DECREF(paths); \
         return PyErr_NoMemory(); \
     } \
+    Py_BEGIN_ALLOW_THREADS \
     M = paths->M; \
     row[0] = 0; \
     for (j = 1; j <= nB; j++) row[j] = j * left_gap_extend_A; \
@@ -4434,6 +4671,7 @@ static PyGetSetDef Aligner_getset[] = {
     } \
     kB = sB[j-1]; \
     SELECT_TRACE_NEEDLEMAN_WUNSCH(right_gap_extend_A, right_gap_extend_B, align_score); \
+    Py_END_ALLOW_THREADS \
     PyMem_Free(row); \
     M[nA][nB].path = 0; \
     return Py_BuildValue("fN", score, paths);
@@ -4465,6 +4703,7 @@ static PyGetSetDef Aligner_getset[] = {
         Py_DECREF(paths); \
         return PyErr_NoMemory(); \
     } \
+    Py_BEGIN_ALLOW_THREADS \
     M = paths->M; \
     for (j = 0; j <= nB; j++) row[j] = 0; \
     for (i = 1; i < nA; i++) { \
@@ -4485,6 +4724,7 @@ static PyGetSetDef Aligner_getset[] = {
     } \
     kB = sB[nB-1]; \
     SELECT_TRACE_SMITH_WATERMAN_D(align_score); \
+    Py_END_ALLOW_THREADS \
     PyMem_Free(row); \
 \
     /* As we don't allow zero-score extensions to alignments, \
@@ -4556,6 +4796,7 @@ static PyGetSetDef Aligner_getset[] = {
     if (!Ix_row) goto exit; \
     Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
+    Py_BEGIN_ALLOW_THREADS \
 \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4655,6 +4896,7 @@ static PyGetSetDef Aligner_getset[] = {
     Iy_row[nB] = score; \
 \
     SELECT_SCORE_GLOBAL(M_row[nB], Ix_row[nB], Iy_row[nB]); \
+    Py_END_ALLOW_THREADS \
     PyMem_Free(M_row); \
     PyMem_Free(Ix_row); \
     PyMem_Free(Iy_row); \
@@ -4693,6 +4935,7 @@ exit: \
     if (!Ix_row) goto exit; \
     Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
+    Py_BEGIN_ALLOW_THREADS \
  \
     /* The top row of the score matrix is a special case, \
      * as there are no previously aligned characters. \
@@ -4767,6 +5010,7 @@ exit: \
                                    Ix_temp, \
                                    Iy_temp, \
                                    (align_score)); \
+    Py_END_ALLOW_THREADS \
     PyMem_Free(M_row); \
     PyMem_Free(Ix_row); \
     PyMem_Free(Iy_row); \
@@ -4818,6 +5062,7 @@ exit: \
     if (!Ix_row) goto exit; \
     Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
+    Py_BEGIN_ALLOW_THREADS \
     M = paths->M; \
     gaps = paths->gaps.gotoh; \
  \
@@ -4919,6 +5164,10 @@ exit: \
     if (M_row[nB] < score - epsilon) M[nA][nB].trace = 0; \
     if (Ix_row[nB] < score - epsilon) gaps[nA][nB].Ix = 0; \
     if (Iy_row[nB] < score - epsilon) gaps[nA][nB].Iy = 0; \
+    Py_END_ALLOW_THREADS \
+    PyMem_Free(M_row); \
+    PyMem_Free(Ix_row); \
+    PyMem_Free(Iy_row); \
     return Py_BuildValue("fN", score, paths); \
 exit: \
     Py_DECREF(paths); \
@@ -4965,6 +5214,7 @@ exit: \
     if (!Ix_row) goto exit; \
     Iy_row = PyMem_Malloc((nB+1)*sizeof(double)); \
     if (!Iy_row) goto exit; \
+    Py_BEGIN_ALLOW_THREADS \
     M_row[0] = 0; \
     Ix_row[0] = -DBL_MAX; \
     Iy_row[0] = -DBL_MAX; \
@@ -5037,6 +5287,7 @@ exit: \
     gaps[nA][nB].Ix = 0; \
     gaps[nA][nB].Iy = 0; \
 \
+    Py_END_ALLOW_THREADS \
     PyMem_Free(M_row); \
     PyMem_Free(Ix_row); \
     PyMem_Free(Iy_row); \
@@ -6549,6 +6800,763 @@ sequence_converter(PyObject* argument, void* pointer)
     return 0;
 }
  
+/* ----------------- banded and X-drop alignment ----------------- */
+
+/* Banded alignment restricts the dynamic programming to the cells (i, j)
+ * with j - i between min(0, nB - nA) - band_width and
+ * max(0, nB - nA) + band_width, i.e. to the diagonals within band_width of
+ * the diagonals through the top left and the bottom right corner of the
+ * matrix. With X-drop termination (local mode only), cells scoring more
+ * than xdrop below the highest score found so far are dropped, and each row
+ * is only filled from the first cell still alive in the previous row to one
+ * past the last, continuing to the right as long as a gap keeps the cells
+ * alive. Filling stops if no cells in a row are alive.
+ *
+ * Both use the three states of the Gotoh algorithm, which includes the
+ * Needleman-Wunsch and Smith-Waterman algorithms as special cases, and the
+ * Gotoh traceback matrices. Cells outside of the filled region have no
+ * traces, so no alignment passes through them.
+ */
+
+#define BANDED_PAIR_SCORE \
+    (scores ? MATRIX_SCORE : ((COMPARE_SCORE)))
+
+#define SELECT_TRACE_BANDED(score1, score2, score3) \
+    trace = M_MATRIX; \
+    score = score1; \
+    temp = score2; \
+    if (temp > score + epsilon) { \
+        score = temp; \
+        trace = Ix_MATRIX; \
+    } \
+    else if (temp > score - epsilon) trace |= Ix_MATRIX; \
+    temp = score3; \
+    if (temp > score + epsilon) { \
+        score = temp; \
+        trace = Iy_MATRIX; \
+    } \
+    else if (temp > score - epsilon) trace |= Iy_MATRIX;
+
+/* Fill the banded score matrices row by row, and return the score. The
+ * buffer should have space for 3*(nB+1) doubles. If paths is not NULL, the
+ * traceback matrices of the Gotoh path generator are filled as well; the
+ * traces of cells (i, j) with i > 0 and j > 0 should be zero on input, and
+ * starts and ends should have space for nA+1 values to store the range of
+ * columns calculated in each row. This function does not use the Python C
+ * API, and can be called without holding the GIL.
+ */
+static double
+_banded_fill(const Aligner* self,
+             const int* sA, Py_ssize_t nA, const int* sB, Py_ssize_t nB,
+             double* buffer, Py_ssize_t* starts, Py_ssize_t* ends,
+             PathGenerator* paths)
+{
+    const Mode mode = self->mode;
+    const Py_ssize_t band_width = self->band_width;
+    const double xdrop = self->xdrop;
+    const double epsilon = self->epsilon;
+    const double* scores = self->substitution_matrix.obj ? self->substitution_matrix.buf : NULL;
+    const Py_ssize_t n = scores ? self->substitution_matrix.shape[0] : 0;
+    const double match = self->match;
+    const double mismatch = self->mismatch;
+    const int wildcard = self->wildcard;
+    Trace** M = paths ? paths->M : NULL;
+    TraceGapsGotoh** gaps = paths ? paths->gaps.gotoh : NULL;
+    double* M_row = buffer;
+    double* Ix_row = M_row + (nB+1);
+    double* Iy_row = Ix_row + (nB+1);
+    Py_ssize_t dlo, dhi;
+    Py_ssize_t i, j, k;
+    Py_ssize_t start, end;
+    Py_ssize_t lo, hi;          /* columns calculated in the previous row */
+    Py_ssize_t first, last;     /* columns alive in the previous row */
+    Py_ssize_t row_first, row_last;
+    Py_ssize_t im = nA;
+    Py_ssize_t jm = nB;
+    int kA, kB;
+    int trace;
+    double open_A, extend_A, open_B, extend_B;
+    double M_temp, Ix_temp, Iy_temp;
+    double M_up, Ix_up, Iy_up;
+    double M_left, Ix_left, Iy_left;
+    double M_score, Ix_score;
+    double score, temp;
+    double maximum = 0;
+
+    if (band_width >= 0) {
+        dlo = (nB < nA ? nB - nA : 0) - band_width;
+        dhi = (nB > nA ? nB - nA : 0) + band_width;
+    }
+    else {
+        dlo = -nA;
+        dhi = nB;
+    }
+    for (j = 0; j <= nB; j++) {
+        M_row[j] = -DBL_MAX;
+        Ix_row[j] = -DBL_MAX;
+        Iy_row[j] = -DBL_MAX;
+    }
+
+    /* The top row of the score matrix is a special case,
+     * as there are no previously aligned characters.
+     */
+    end = (dhi < nB) ? dhi : nB;
+    for (j = 0; j <= end; j++) {
+        if (mode == Global) {
+            if (j == 0) M_row[j] = 0;
+            else Iy_row[j] = self->target_left_open_gap_score
+                           + self->target_left_extend_gap_score * (j-1);
+        }
+        else M_row[j] = 0;
+    }
+    lo = 0;
+    hi = end;
+    first = 0;
+    last = end;
+    if (starts) {
+        starts[0] = 0;
+        ends[0] = end;
+    }
+
+    for (i = 1; i <= nA; i++) {
+        kA = sA[i-1];
+        start = i + dlo;
+        if (start < first) start = first;
+        if (start < 0) start = 0;
+        end = i + dhi;
+        if (end > nB) end = nB;
+        if (mode == Global && i == nA) {
+            open_A = self->target_right_open_gap_score;
+            extend_A = self->target_right_extend_gap_score;
+        }
+        else {
+            open_A = self->target_internal_open_gap_score;
+            extend_A = self->target_internal_extend_gap_score;
+        }
+        row_first = -1;
+        row_last = -1;
+        if (start == 0) {
+            M_temp = M_row[0];
+            Ix_temp = Ix_row[0];
+            Iy_temp = Iy_row[0];
+            M_left = -DBL_MAX;
+            Ix_left = -DBL_MAX;
+            Iy_left = -DBL_MAX;
+            if (mode == Global)
+                Ix_left = self->query_left_open_gap_score
+                        + self->query_left_extend_gap_score * (i-1);
+            else if (i < nA && !(xdrop >= 0 && 0 < maximum - xdrop))
+                M_left = 0;
+            else if (M)
+                M[i][0].trace = 0;
+            M_row[0] = M_left;
+            Ix_row[0] = Ix_left;
+            Iy_row[0] = Iy_left;
+            if (M_left > -DBL_MAX || Ix_left > -DBL_MAX) {
+                row_first = 0;
+                row_last = 0;
+            }
+            j = 1;
+        }
+        else {
+            M_temp = M_row[start-1];
+            Ix_temp = Ix_row[start-1];
+            Iy_temp = Iy_row[start-1];
+            M_row[start-1] = -DBL_MAX;
+            Ix_row[start-1] = -DBL_MAX;
+            Iy_row[start-1] = -DBL_MAX;
+            M_left = -DBL_MAX;
+            Ix_left = -DBL_MAX;
+            Iy_left = -DBL_MAX;
+            j = start;
+        }
+        for ( ; j <= end; j++) {
+            if (j > last + 1
+             && M_left == -DBL_MAX && Ix_left == -DBL_MAX && Iy_left == -DBL_MAX)
+                break;
+            kB = sB[j-1];
+            if (mode == Global && j == nB) {
+                open_B = self->query_right_open_gap_score;
+                extend_B = self->query_right_extend_gap_score;
+            }
+            else {
+                open_B = self->query_internal_open_gap_score;
+                extend_B = self->query_internal_extend_gap_score;
+            }
+            M_up = M_row[j];
+            Ix_up = Ix_row[j];
+            Iy_up = Iy_row[j];
+
+            /* aligned letters */
+            SELECT_TRACE_BANDED(M_temp, Ix_temp, Iy_temp);
+            score += BANDED_PAIR_SCORE;
+            if (mode == Local) {
+                if (score < epsilon) {
+                    score = 0;
+                    trace = STARTPOINT;
+                }
+                if (xdrop >= 0 && score < maximum - xdrop) {
+                    score = -DBL_MAX;
+                    trace = 0;
+                }
+                else if (trace != STARTPOINT && score > maximum - epsilon) {
+                    if (score > maximum + epsilon) {
+                        maximum = score;
+                        if (M) {
+                            /* remove the previous end points */
+                            for ( ; im < i; im++, jm = 0) {
+                                if (jm < starts[im]) jm = starts[im];
+                                for ( ; jm <= ends[im]; jm++)
+                                    M[im][jm].trace &= ~ENDPOINT;
+                            }
+                            if (jm < start) jm = start;
+                            for ( ; jm < j; jm++) M[im][jm].trace &= ~ENDPOINT;
+                            im = i;
+                            jm = j;
+                        }
+                    }
+                    trace |= ENDPOINT;
+                }
+            }
+            if (M) M[i][j].trace = trace;
+            M_score = score;
+
+            /* gap in the query */
+            SELECT_TRACE_BANDED(M_up + open_B, Ix_up + extend_B, Iy_up + open_B);
+            if (mode == Local) {
+                if (i == nA || j == nB || score < epsilon
+                 || (xdrop >= 0 && score < maximum - xdrop)) {
+                    score = -DBL_MAX;
+                    trace = 0;
+                }
+            }
+            if (gaps) gaps[i][j].Ix = trace;
+            Ix_score = score;
+
+            /* gap in the target */
+            SELECT_TRACE_BANDED(M_left + open_A, Ix_left + open_A, Iy_left + extend_A);
+            if (mode == Local) {
+                if (i == nA || j == nB || score < epsilon
+                 || (xdrop >= 0 && score < maximum - xdrop)) {
+                    score = -DBL_MAX;
+                    trace = 0;
+                }
+            }
+            if (gaps) gaps[i][j].Iy = trace;
+
+            M_temp = M_up;
+            Ix_temp = Ix_up;
+            Iy_temp = Iy_up;
+            M_row[j] = M_left = M_score;
+            Ix_row[j] = Ix_left = Ix_score;
+            Iy_row[j] = Iy_left = score;
+            if (M_score > -DBL_MAX || Ix_score > -DBL_MAX || score > -DBL_MAX) {
+                if (row_first < 0) row_first = j;
+                row_last = j;
+            }
+        }
+        end = j - 1;
+        /* Cells outside of the columns calculated in this row should be
+         * -DBL_MAX when used in the next row. */
+        for (k = lo; k < start && k <= hi; k++) {
+            M_row[k] = -DBL_MAX;
+            Ix_row[k] = -DBL_MAX;
+            Iy_row[k] = -DBL_MAX;
+        }
+        for (k = (end < lo) ? lo : end + 1; k <= hi; k++) {
+            M_row[k] = -DBL_MAX;
+            Ix_row[k] = -DBL_MAX;
+            Iy_row[k] = -DBL_MAX;
+        }
+        lo = start;
+        hi = end;
+        if (starts) {
+            starts[i] = start;
+            ends[i] = end;
+        }
+        if (xdrop >= 0) {
+            if (row_first < 0) {
+                /* All cells were dropped */
+                if (starts) {
+                    for (i++; i <= nA; i++) {
+                        starts[i] = 1;
+                        ends[i] = 0;
+                    }
+                }
+                break;
+            }
+            first = row_first;
+            last = row_last;
+        }
+        else {
+            first = start;
+            last = end;
+        }
+    }
+
+    if (mode == Local) {
+        if (!M) return maximum;
+        M[nA][0].trace = 0;
+        gaps[nA][0].Ix = 0;
+        gaps[nA][0].Iy = 0;
+        /* As we don't allow zero-score extensions to alignments,
+         * we need to remove all traces towards an ENDPOINT.
+         * In addition, some points then won't have any path to a STARTPOINT.
+         * Here, use path as a temporary variable to indicate if the point
+         * is reachable from a STARTPOINT. If it is unreachable, remove all
+         * traces from it, and don't allow it to be an ENDPOINT. It may still
+         * be a valid STARTPOINT. Points outside of the band are unreachable.
+         */
+        for (j = 0; j <= nB; j++) M[0][j].path = M_MATRIX;
+        for (i = 1; i <= nA; i++) {
+            M[i][0].path = M_MATRIX;
+            for (j = (starts[i] > 1) ? starts[i] : 1; j <= ends[i]; j++) {
+                trace = M[i][j].trace;
+                if (!(M[i-1][j-1].path & M_MATRIX)) trace &= ~M_MATRIX;
+                if (!(M[i-1][j-1].path & Ix_MATRIX)) trace &= ~Ix_MATRIX;
+                if (!(M[i-1][j-1].path & Iy_MATRIX)) trace &= ~Iy_MATRIX;
+                if (trace & (STARTPOINT | M_MATRIX | Ix_MATRIX | Iy_MATRIX)) {
+                    if (trace & ENDPOINT) M[i][j].path = 0;
+                    else M[i][j].path |= M_MATRIX;
+                }
+                else {
+                    M[i][j].path &= ~M_MATRIX;
+                    trace = 0;
+                }
+                M[i][j].trace = trace;
+                trace = gaps[i][j].Ix;
+                if (!(M[i-1][j].path & M_MATRIX)) trace &= ~M_MATRIX;
+                if (!(M[i-1][j].path & Ix_MATRIX)) trace &= ~Ix_MATRIX;
+                if (!(M[i-1][j].path & Iy_MATRIX)) trace &= ~Iy_MATRIX;
+                if (trace & (M_MATRIX | Ix_MATRIX | Iy_MATRIX))
+                    M[i][j].path |= Ix_MATRIX;
+                else {
+                    M[i][j].path &= ~Ix_MATRIX;
+                    trace = 0;
+                }
+                gaps[i][j].Ix = trace;
+                trace = gaps[i][j].Iy;
+                if (!(M[i][j-1].path & M_MATRIX)) trace &= ~M_MATRIX;
+                if (!(M[i][j-1].path & Ix_MATRIX)) trace &= ~Ix_MATRIX;
+                if (!(M[i][j-1].path & Iy_MATRIX)) trace &= ~Iy_MATRIX;
+                if (trace & (M_MATRIX | Ix_MATRIX | Iy_MATRIX))
+                    M[i][j].path |= Iy_MATRIX;
+                else {
+                    M[i][j].path &= ~Iy_MATRIX;
+                    trace = 0;
+                }
+                gaps[i][j].Iy = trace;
+            }
+        }
+        if (maximum == 0) M[0][0].path = DONE;
+        else M[0][0].path = 0;
+        return maximum;
+    }
+
+    score = M_row[nB];
+    if (Ix_row[nB] > score) score = Ix_row[nB];
+    if (Iy_row[nB] > score) score = Iy_row[nB];
+    if (M) {
+        M[nA][nB].path = 0;
+        if (M_row[nB] < score - epsilon) M[nA][nB].trace = 0;
+        if (Ix_row[nB] < score - epsilon) gaps[nA][nB].Ix = 0;
+        if (Iy_row[nB] < score - epsilon) gaps[nA][nB].Iy = 0;
+    }
+    return score;
+}
+
+static int
+_check_banded(Aligner* self, Algorithm algorithm)
+{
+    if (algorithm == WatermanSmithBeyer) {
+        PyErr_SetString(PyExc_ValueError,
+                        "banded alignment is not available for gap score functions");
+        return 0;
+    }
+    if (self->xdrop >= 0 && self->mode != Local) {
+        PyErr_SetString(PyExc_ValueError,
+                        "X-drop termination requires local mode");
+        return 0;
+    }
+    return 1;
+}
+
+static PyObject*
+Aligner_banded_score(Aligner* self,
+                     const int* sA, Py_ssize_t nA,
+                     const int* sB, Py_ssize_t nB)
+{
+    double score;
+    double* buffer;
+
+    buffer = PyMem_Malloc(3*(nB+1)*sizeof(double));
+    if (!buffer) return PyErr_NoMemory();
+    Py_BEGIN_ALLOW_THREADS
+    score = _banded_fill(self, sA, nA, sB, nB, buffer, NULL, NULL, NULL);
+    Py_END_ALLOW_THREADS
+    PyMem_Free(buffer);
+    return PyFloat_FromDouble(score);
+}
+
+static PyObject*
+Aligner_banded_align(Aligner* self,
+                     const int* sA, Py_ssize_t nA,
+                     const int* sB, Py_ssize_t nB)
+{
+    Py_ssize_t i;
+    double score;
+    double* buffer = NULL;
+    Py_ssize_t* starts = NULL;
+    PathGenerator* paths;
+
+    paths = PathGenerator_create_Gotoh(nA, nB, self->mode);
+    if (!paths) return NULL;
+    buffer = PyMem_Malloc(3*(nB+1)*sizeof(double));
+    starts = PyMem_Malloc(2*(nA+1)*sizeof(Py_ssize_t));
+    if (!buffer || !starts) {
+        PyMem_Free(buffer);
+        PyMem_Free(starts);
+        Py_DECREF(paths);
+        return PyErr_NoMemory();
+    }
+    Py_BEGIN_ALLOW_THREADS
+    for (i = 1; i <= nA; i++) {
+        memset(paths->M[i] + 1, 0, nB*sizeof(Trace));
+        memset(paths->gaps.gotoh[i] + 1, 0, nB*sizeof(TraceGapsGotoh));
+    }
+    score = _banded_fill(self, sA, nA, sB, nB, buffer,
+                         starts, starts + (nA+1), paths);
+    Py_END_ALLOW_THREADS
+    PyMem_Free(buffer);
+    PyMem_Free(starts);
+    return Py_BuildValue("fN", score, paths);
+}
+
+/* ----------------- striped Smith-Waterman score ----------------- */
+
+/* For local alignments with a substitution matrix and (affine) gap scores,
+ * the score can be calculated using the striped algorithm of Farrar
+ * (Bioinformatics 23: 156-161 (2007)), which fills eight cells of the
+ * dynamic programming matrix at the same time using 16-bit integers in SSE2
+ * registers. The query profile holds the substitution scores of each letter
+ * of the alphabet against the profiled sequence, arranged in the striped
+ * order in which the cells are filled. As score_many typically aligns one
+ * sequence to many others, the aligner keeps the most recent profile for
+ * each of the two sequences, and reuses it if the sequence and the
+ * substitution matrix are unchanged.
+ *
+ * The striped algorithm is used only if all scores are integers, the gap
+ * scores are not positive, and opening a gap does not score higher than
+ * extending one (otherwise closing and reopening a gap would score higher
+ * than extending it, which the Gotoh algorithm does not allow). If the score
+ * may have overflowed the 16-bit integers, it is recalculated using the
+ * regular Gotoh algorithm.
+ */
+
+#if defined(__SSE2__) || defined(_M_X64) || (defined(_M_IX86_FP) && _M_IX86_FP >= 2)
+#define HAVE_STRIPED 1
+#include <emmintrin.h>
+
+#define STRIPED_LANES 8
+#define STRIPED_LIMIT 16383
+
+typedef struct {
+    Py_ssize_t length;     /* length of the profiled sequence */
+    Py_ssize_t segments;   /* number of vectors per letter */
+    Py_ssize_t size;       /* number of letters in the alphabet */
+    int transposed;        /* 1 if the profiled sequence is the target */
+    int maximum;           /* highest substitution score */
+    int* sequence;
+    double* scores;
+    void* memory;
+    __m128i* vectors;      /* NULL until the profile is first reused */
+} StripedProfile;
+
+static void
+_striped_profile_destroy(PyObject* capsule)
+{
+    StripedProfile* profile = PyCapsule_GetPointer(capsule, NULL);
+    PyMem_Free(profile->sequence);
+    PyMem_Free(profile->scores);
+    PyMem_Free(profile->memory);
+    PyMem_Free(profile);
+}
+
+static int
+_striped_scores_usable(Aligner* self)
+{
+    const Py_ssize_t n = self->substitution_matrix.shape[0];
+    const double* scores = self->substitution_matrix.buf;
+    const double gap_scores[4] = {self->target_internal_open_gap_score,
+                                  self->target_internal_extend_gap_score,
+                                  self->query_internal_open_gap_score,
+                                  self->query_internal_extend_gap_score};
+    double score;
+    Py_ssize_t i;
+
+    if (self->substitution_matrix.ndim != 2
+     || self->substitution_matrix.shape[1] != n) return 0;
+    for (i = 0; i < 4; i++) {
+        score = gap_scores[i];
+        if (score > 0 || score < -STRIPED_LIMIT || score != floor(score))
+            return 0;
+    }
+    if (gap_scores[0] > gap_scores[1] || gap_scores[2] > gap_scores[3])
+        return 0;
+    for (i = 0; i < n*n; i++) {
+        score = scores[i];
+        if (score < -STRIPED_LIMIT || score > STRIPED_LIMIT
+         || score != floor(score)) return 0;
+    }
+    return 1;
+}
+
+static StripedProfile*
+_striped_profile_find(Aligner* self, int transposed,
+                      const int* s, Py_ssize_t n)
+{
+    PyObject* capsule = self->striped_profiles[transposed];
+    const Py_ssize_t size = self->substitution_matrix.shape[0];
+    StripedProfile* profile;
+
+    if (!capsule) return NULL;
+    profile = PyCapsule_GetPointer(capsule, NULL);
+    if (profile->length != n || profile->size != size) return NULL;
+    if (memcmp(profile->sequence, s, n*sizeof(int)) != 0) return NULL;
+    if (memcmp(profile->scores, self->substitution_matrix.buf,
+               size*size*sizeof(double)) != 0) return NULL;
+    return profile;
+}
+
+static StripedProfile*
+_striped_profile_store(Aligner* self, int transposed,
+                       const int* s, Py_ssize_t n)
+{
+    PyObject* capsule;
+    const Py_ssize_t size = self->substitution_matrix.shape[0];
+    StripedProfile* profile = PyMem_Malloc(sizeof(StripedProfile));
+
+    if (!profile) return NULL;
+    profile->length = n;
+    profile->segments = (n + STRIPED_LANES - 1) / STRIPED_LANES;
+    profile->size = size;
+    profile->transposed = transposed;
+    profile->memory = NULL;
+    profile->vectors = NULL;
+    profile->sequence = PyMem_Malloc(n*sizeof(int));
+    profile->scores = PyMem_Malloc(size*size*sizeof(double));
+    if (!profile->sequence || !profile->scores) {
+        PyMem_Free(profile->sequence);
+        PyMem_Free(profile->scores);
+        PyMem_Free(profile);
+        return NULL;
+    }
+    memcpy(profile->sequence, s, n*sizeof(int));
+    memcpy(profile->scores, self->substitution_matrix.buf,
+           size*size*sizeof(double));
+    capsule = PyCapsule_New(profile, NULL, _striped_profile_destroy);
+    if (!capsule) {
+        PyMem_Free(profile->sequence);
+        PyMem_Free(profile->scores);
+        PyMem_Free(profile);
+        return NULL;
+    }
+    Py_XDECREF(self->striped_profiles[transposed]);
+    self->striped_profiles[transposed] = capsule;
+    return profile;
+}
+
+static int
+_striped_profile_fill(StripedProfile* profile)
+{
+    Py_ssize_t a;
+    Py_ssize_t i;
+    Py_ssize_t j;
+    Py_ssize_t k;
+    const Py_ssize_t n = profile->length;
+    const Py_ssize_t size = profile->size;
+    const Py_ssize_t segments = profile->segments;
+    const double* scores = profile->scores;
+    const int* s = profile->sequence;
+    int maximum = -STRIPED_LIMIT;
+    int score;
+    short* values;
+    char* memory;
+
+    memory = PyMem_Malloc(size*segments*sizeof(__m128i) + 15);
+    if (!memory) return 0;
+    profile->memory = memory;
+    profile->vectors = (__m128i*)(((size_t)memory + 15) & ~(size_t)15);
+    values = (short*)profile->vectors;
+    for (a = 0; a < size; a++) {
+        for (j = 0; j < segments; j++) {
+            for (k = 0; k < STRIPED_LANES; k++) {
+                i = j + k * segments;
+                if (i < n) {
+                    if (profile->transposed) score = (int)scores[s[i]*size+a];
+                    else score = (int)scores[a*size+s[i]];
+                    if (score > maximum) maximum = score;
+                }
+                else score = SHRT_MIN;
+                *values++ = (short)score;
+            }
+        }
+    }
+    profile->maximum = maximum;
+    return 1;
+}
+
+/* Returns the highest score, or -1 if the score may have overflowed. */
+static int
+_striped_fill(const StripedProfile* profile, const int* s, Py_ssize_t n,
+              int gap_open_E, int gap_extend_E,
+              int gap_open_F, int gap_extend_F, __m128i* buffer)
+{
+    Py_ssize_t i;
+    Py_ssize_t j;
+    const Py_ssize_t segments = profile->segments;
+    __m128i* H_load = buffer;
+    __m128i* H_store = buffer + segments;
+    __m128i* E = buffer + 2*segments;
+    __m128i* swap;
+    const __m128i* P;
+    const __m128i zero = _mm_setzero_si128();
+    const __m128i minimum = _mm_set1_epi16(SHRT_MIN);
+    const __m128i first = _mm_insert_epi16(zero, SHRT_MIN, 0);
+    const __m128i open_E = _mm_set1_epi16((short)gap_open_E);
+    const __m128i extend_E = _mm_set1_epi16((short)gap_extend_E);
+    const __m128i open_F = _mm_set1_epi16((short)gap_open_F);
+    const __m128i extend_F = _mm_set1_epi16((short)gap_extend_F);
+    __m128i vH;
+    __m128i vF;
+    __m128i vMax = zero;
+    int maximum;
+    int value;
+
+    for (j = 0; j < segments; j++) {
+        H_store[j] = zero;
+        E[j] = minimum;
+    }
+    for (i = 0; i < n; i++) {
+        P = profile->vectors + s[i] * segments;
+        vF = minimum;
+        vH = _mm_slli_si128(H_store[segments-1], 2);
+        swap = H_load;
+        H_load = H_store;
+        H_store = swap;
+        for (j = 0; j < segments; j++) {
+            vH = _mm_adds_epi16(vH, P[j]);
+            vH = _mm_max_epi16(vH, E[j]);
+            vH = _mm_max_epi16(vH, vF);
+            vH = _mm_max_epi16(vH, zero);
+            vMax = _mm_max_epi16(vMax, vH);
+            H_store[j] = vH;
+            E[j] = _mm_max_epi16(_mm_subs_epi16(E[j], extend_E),
+                                 _mm_subs_epi16(vH, open_E));
+            vF = _mm_max_epi16(_mm_subs_epi16(vF, extend_F),
+                               _mm_subs_epi16(vH, open_F));
+            vH = H_load[j];
+        }
+        /* Lazy F loop: propagate gaps across the stripes */
+        vF = _mm_or_si128(_mm_slli_si128(vF, 2), first);
+        j = 0;
+        while (1) {
+            vH = H_store[j];
+            if (!_mm_movemask_epi8(_mm_cmpgt_epi16(vF,
+                                   _mm_subs_epi16(vH, open_F)))) break;
+            vH = _mm_max_epi16(vH, vF);
+            vMax = _mm_max_epi16(vMax, vH);
+            H_store[j] = vH;
+            E[j] = _mm_max_epi16(E[j], _mm_subs_epi16(vH, open_E));
+            vF = _mm_subs_epi16(vF, extend_F);
+            if (++j == segments) {
+                j = 0;
+                vF = _mm_or_si128(_mm_slli_si128(vF, 2), first);
+            }
+        }
+    }
+    maximum = 0;
+    for (j = 0; j < STRIPED_LANES; j++) {
+        value = (short)_mm_extract_epi16(vMax, 0);
+        if (value > maximum) maximum = value;
+        vMax = _mm_srli_si128(vMax, 2);
+    }
+    if (maximum + profile->maximum >= SHRT_MAX) return -1;
+    return maximum;
+}
+
+static PyObject*
+Aligner_striped_score(Aligner* self,
+                      const int* sA, Py_ssize_t nA,
+                      const int* sB, Py_ssize_t nB)
+{
+    int transposed;
+    int maximum;
+    const int* s;
+    Py_ssize_t i;
+    Py_ssize_t n;
+    const Py_ssize_t size = self->substitution_matrix.shape[0];
+    PyObject* capsule;
+    StripedProfile* profile;
+    char* memory;
+    int gap_open_E;
+    int gap_extend_E;
+    int gap_open_F;
+    int gap_extend_F;
+
+    if (!_striped_scores_usable(self)) Py_RETURN_NONE;
+    for (i = 0; i < nA; i++) if (sA[i] >= size) Py_RETURN_NONE;
+    for (i = 0; i < nB; i++) if (sB[i] >= size) Py_RETURN_NONE;
+    profile = _striped_profile_find(self, 1, sA, nA);
+    if (profile) transposed = 1;
+    else {
+        transposed = 0;
+        profile = _striped_profile_find(self, 0, sB, nB);
+        if (!profile) {
+            /* Remember the target, and profile the query; the profile of
+             * the target is calculated if the target appears again. */
+            if (!_striped_profile_store(self, 1, sA, nA)) goto exit;
+            profile = _striped_profile_store(self, 0, sB, nB);
+            if (!profile) goto exit;
+        }
+    }
+    if (!profile->vectors && !_striped_profile_fill(profile)) goto exit;
+    if (transposed) {
+        s = sB;
+        n = nB;
+        /* E runs along the target, F along the query */
+        gap_open_E = (int)-self->target_internal_open_gap_score;
+        gap_extend_E = (int)-self->target_internal_extend_gap_score;
+        gap_open_F = (int)-self->query_internal_open_gap_score;
+        gap_extend_F = (int)-self->query_internal_extend_gap_score;
+    }
+    else {
+        s = sA;
+        n = nA;
+        gap_open_E = (int)-self->query_internal_open_gap_score;
+        gap_extend_E = (int)-self->query_internal_extend_gap_score;
+        gap_open_F = (int)-self->target_internal_open_gap_score;
+        gap_extend_F = (int)-self->target_internal_extend_gap_score;
+    }
+    memory = PyMem_Malloc(3*profile->segments*sizeof(__m128i) + 15);
+    if (!memory) goto exit;
+    /* Keep the profile alive even if another thread replaces it */
+    capsule = self->striped_profiles[transposed];
+    Py_INCREF(capsule);
+    Py_BEGIN_ALLOW_THREADS
+    maximum = _striped_fill(profile, s, n,
+                            gap_open_E, gap_extend_E, gap_open_F, gap_extend_F,
+                            (__m128i*)(((size_t)memory + 15) & ~(size_t)15));
+    Py_END_ALLOW_THREADS
+    Py_DECREF(capsule);
+    PyMem_Free(memory);
+    if (maximum < 0) Py_RETURN_NONE;
+    return PyFloat_FromDouble(maximum);
+exit:
+    return PyErr_NoMemory();
+}
+#endif
+
 static const char Aligner_score__doc__[] = "calculates the alignment score";
 
 static PyObject*
@@ -6579,7 +7587,15 @@ Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
     sB = bB.buf;
     nB = bB.len / bB.itemsize;
 
-    switch (algorithm) {
+    /* The dynamic programming loops run without holding the GIL, so make
+     * sure the substitution matrix stays alive even if another thread
+     * replaces it on this aligner in the meantime. */
+    Py_XINCREF(substitution_matrix);
+    if (self->band_width >= 0 || self->xdrop >= 0) {
+        if (_check_banded(self, algorithm))
+            result = Aligner_banded_score(self, sA, nA, sB, nB);
+    }
+    else switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
             switch (mode) {
                 case Global:
@@ -6589,8 +7605,14 @@ Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
                         result = Aligner_needlemanwunsch_score_compare(self, sA, nA, sB, nB);
                     break;
                 case Local:
-                    if (substitution_matrix)
+                    if (substitution_matrix) {
+#ifdef HAVE_STRIPED
+                        result = Aligner_striped_score(self, sA, nA, sB, nB);
+                        if (result != Py_None) break;
+                        Py_DECREF(result);
+#endif
                         result = Aligner_smithwaterman_score_matrix(self, sA, nA, sB, nB);
+                    }
                     else
                         result = Aligner_smithwaterman_score_compare(self, sA, nA, sB, nB);
                     break;
@@ -6605,8 +7627,14 @@ Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
                         result = Aligner_gotoh_global_score_compare(self, sA, nA, sB, nB);
                     break;
                 case Local:
-                    if (substitution_matrix)
+                    if (substitution_matrix) {
+#ifdef HAVE_STRIPED
+                        result = Aligner_striped_score(self, sA, nA, sB, nB);
+                        if (result != Py_None) break;
+                        Py_DECREF(result);
+#endif
                         result = Aligner_gotoh_local_score_matrix(self, sA, nA, sB, nB);
+                    }
                     else
                         result = Aligner_gotoh_local_score_compare(self, sA, nA, sB, nB);
                     break;
@@ -6633,6 +7661,7 @@ Aligner_score(Aligner* self, PyObject* args, PyObject* keywords)
             PyErr_SetString(PyExc_RuntimeError, "unknown algorithm");
             break;
     }
+    Py_XDECREF(substitution_matrix);
 
     sequence_converter(NULL, &bA);
     sequence_converter(NULL, &bB);
@@ -6670,7 +7699,15 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
     sB = bB.buf;
     nB = bB.len / bB.itemsize;
 
-    switch (algorithm) {
+    /* The dynamic programming loops run without holding the GIL, so make
+     * sure the substitution matrix stays alive even if another thread
+     * replaces it on this aligner in the meantime. */
+    Py_XINCREF(substitution_matrix);
+    if (self->band_width >= 0 || self->xdrop >= 0) {
+        if (_check_banded(self, algorithm))
+            result = Aligner_banded_align(self, sA, nA, sB, nB);
+    }
+    else switch (algorithm) {
         case NeedlemanWunschSmithWaterman:
             switch (mode) {
                 case Global:
@@ -6724,6 +7761,7 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
             PyErr_SetString(PyExc_RuntimeError, "unknown algorithm");
             break;
     }
+    Py_XDECREF(substitution_matrix);
 
     sequence_converter(NULL, &bA);
     sequence_converter(NULL, &bB);
@@ -6731,6 +7769,493 @@ Aligner_align(Aligner* self, PyObject* args, PyObject* keywords)
     return result;
 }
 
+/* ----------------- linear memory global alignment ----------------- */
+
+/* Global alignment in linear memory using the divide-and-conquer algorithm
+ * of Hirschberg, generalized to affine gap scores by Myers and Miller.
+ * Rows i = 0..nA correspond to the target, and columns j = 0..nB to the
+ * query, as in the traceback matrices used by the other algorithms. A
+ * horizontal step in row i is a gap in the target, scored with the target
+ * left gap scores if i == 0, the target right gap scores if i == nA, and
+ * the target internal gap scores otherwise. Likewise, a vertical step in
+ * column j is a gap in the query.
+ *
+ * The path is split at the middle row, into two subproblems whose paths
+ * are joined by the state in which the path crosses the middle row, so
+ * that gaps continuing across the split are scored correctly.
+ *
+ * This code does not use the Python C API, and runs without the GIL.
+ */
+
+#define LINEAR_DIAGONAL 0
+#define LINEAR_VERTICAL 1
+#define LINEAR_HORIZONTAL 2
+#define LINEAR_MOVE(move) (1 << (move))
+#define LINEAR_ANY_MOVE 0x7
+
+typedef struct {
+    const int* sA;
+    const int* sB;
+    Py_ssize_t nA;
+    Py_ssize_t nB;
+    const double* scores;   /* substitution matrix, or NULL */
+    Py_ssize_t n;           /* size of the substitution matrix */
+    double match;
+    double mismatch;
+    int wildcard;
+    double target_open[3];  /* internal, left, right */
+    double target_extend[3];
+    double query_open[3];
+    double query_extend[3];
+    double* forward[3];     /* M, Ix (vertical), Iy (horizontal) */
+    double* reverse[3];
+    char* moves;
+    Py_ssize_t nmoves;
+    int error;
+} LinearAligner;
+
+static double
+_linear_pair_score(const LinearAligner* h, int kA, int kB)
+{
+    if (h->scores) return h->scores[kA*h->n+kB];
+    if (kA == h->wildcard || kB == h->wildcard) return 0;
+    if (kA == kB) return h->match;
+    return h->mismatch;
+}
+
+static int
+_linear_target_gap_class(const LinearAligner* h, Py_ssize_t i)
+{
+    if (i == 0) return 1;
+    if (i == h->nA) return 2;
+    return 0;
+}
+
+static int
+_linear_query_gap_class(const LinearAligner* h, Py_ssize_t j)
+{
+    if (j == 0) return 1;
+    if (j == h->nB) return 2;
+    return 0;
+}
+
+static double
+_linear_max(double a, double b, double c)
+{
+    if (b > a) a = b;
+    if (c > a) a = c;
+    return a;
+}
+
+/* Fill the score rows of the M, Ix, and Iy matrices for the rectangle
+ * [i0, i1] x [j0, j1], starting from the top left corner (or from the
+ * bottom right corner if reverse is nonzero), and continuing for the given
+ * number of rows. On return, M, Ix, and Iy contain the last row calculated,
+ * indexed by the distance from the starting column. The path is in the
+ * given state at the starting point (so a gap continuing from outside the
+ * rectangle is scored as a gap extension only), and the first step from
+ * the starting point is restricted to the moves in the bitmask moves.
+ */
+static void
+_linear_fill(const LinearAligner* h,
+             Py_ssize_t i0, Py_ssize_t i1, Py_ssize_t j0, Py_ssize_t j1,
+             Py_ssize_t rows, int reverse, int state, int moves,
+             double* M, double* Ix, double* Iy)
+{
+    const Py_ssize_t nC = j1 - j0;
+    Py_ssize_t r, c, i, j;
+    int kA, kB, k;
+    double open_h, extend_h, open_v, extend_v;
+    double diagonal, score_M, score_Ix, score_Iy;
+
+    i = reverse ? i1 : i0;
+    k = _linear_target_gap_class(h, i);
+    open_h = h->target_open[k];
+    extend_h = h->target_extend[k];
+    M[0] = (state == LINEAR_DIAGONAL) ? 0 : -DBL_MAX;
+    Ix[0] = (state == LINEAR_VERTICAL) ? 0 : -DBL_MAX;
+    Iy[0] = (state == LINEAR_HORIZONTAL) ? 0 : -DBL_MAX;
+    if (moves & LINEAR_MOVE(LINEAR_HORIZONTAL))
+        score_Iy = _linear_max(M[0] + open_h, Iy[0] + extend_h, Ix[0] + open_h);
+    else
+        score_Iy = -DBL_MAX;
+    for (c = 1; c <= nC; c++) {
+        M[c] = -DBL_MAX;
+        Ix[c] = -DBL_MAX;
+        Iy[c] = score_Iy;
+        score_Iy += extend_h;
+    }
+    for (r = 1; r <= rows; r++) {
+        if (reverse) {
+            i = i1 - r;
+            kA = h->sA[i];
+        }
+        else {
+            i = i0 + r;
+            kA = h->sA[i-1];
+        }
+        k = _linear_target_gap_class(h, i);
+        open_h = h->target_open[k];
+        extend_h = h->target_extend[k];
+        k = _linear_query_gap_class(h, reverse ? j1 : j0);
+        if (r == 1 && !(moves & LINEAR_MOVE(LINEAR_DIAGONAL)))
+            diagonal = -DBL_MAX;
+        else
+            diagonal = _linear_max(M[0], Ix[0], Iy[0]);
+        if (r == 1 && !(moves & LINEAR_MOVE(LINEAR_VERTICAL)))
+            Ix[0] = -DBL_MAX;
+        else
+            Ix[0] = _linear_max(M[0] + h->query_open[k],
+                                Ix[0] + h->query_extend[k],
+                                Iy[0] + h->query_open[k]);
+        M[0] = -DBL_MAX;
+        Iy[0] = -DBL_MAX;
+        for (c = 1; c <= nC; c++) {
+            if (reverse) {
+                j = j1 - c;
+                kB = h->sB[j];
+            }
+            else {
+                j = j0 + c;
+                kB = h->sB[j-1];
+            }
+            k = _linear_query_gap_class(h, j);
+            open_v = h->query_open[k];
+            extend_v = h->query_extend[k];
+            score_M = diagonal + _linear_pair_score(h, kA, kB);
+            diagonal = _linear_max(M[c], Ix[c], Iy[c]);
+            score_Ix = _linear_max(M[c] + open_v, Ix[c] + extend_v, Iy[c] + open_v);
+            score_Iy = _linear_max(M[c-1] + open_h, Iy[c-1] + extend_h, Ix[c-1] + open_h);
+            M[c] = score_M;
+            Ix[c] = score_Ix;
+            Iy[c] = score_Iy;
+        }
+    }
+}
+
+/* Align the rectangle [i0, i1] x [j0, j1] using full score matrices with
+ * traceback, appending the moves to h->moves. The path starts in the
+ * given state, and ends with the move end_state (or any move if end_state
+ * is negative). Used for small rectangles.
+ */
+static double
+_linear_align_small(LinearAligner* h,
+                    Py_ssize_t i0, Py_ssize_t i1, Py_ssize_t j0, Py_ssize_t j1,
+                    int start_state, int end_state)
+{
+    const Py_ssize_t nR = i1 - i0;
+    const Py_ssize_t nC = j1 - j0;
+    const Py_ssize_t size = (nR+1)*(nC+1);
+    Py_ssize_t r, c, i;
+    Py_ssize_t nmoves = 0;
+    int kA, kB, k;
+    int state;
+    double open_h, extend_h, open_v, extend_v;
+    double score;
+    double scores[3];
+    double* M;
+    double* Ix;
+    double* Iy;
+    char* moves;
+
+    M = PyMem_RawMalloc(3*size*sizeof(double));
+    moves = PyMem_RawMalloc((nR+nC+1)*sizeof(char));
+    if (!M || !moves) {
+        PyMem_RawFree(M);
+        PyMem_RawFree(moves);
+        h->error = 1;
+        return 0;
+    }
+    Ix = M + size;
+    Iy = Ix + size;
+
+#define INDEX(r, c) ((r)*(nC+1)+(c))
+    k = _linear_target_gap_class(h, i0);
+    open_h = h->target_open[k];
+    extend_h = h->target_extend[k];
+    M[0] = (start_state == LINEAR_DIAGONAL) ? 0 : -DBL_MAX;
+    Ix[0] = (start_state == LINEAR_VERTICAL) ? 0 : -DBL_MAX;
+    Iy[0] = (start_state == LINEAR_HORIZONTAL) ? 0 : -DBL_MAX;
+    score = _linear_max(M[0] + open_h, Iy[0] + extend_h, Ix[0] + open_h);
+    for (c = 1; c <= nC; c++) {
+        M[c] = -DBL_MAX;
+        Ix[c] = -DBL_MAX;
+        Iy[c] = score;
+        score += extend_h;
+    }
+    for (r = 1; r <= nR; r++) {
+        kA = h->sA[i0+r-1];
+        k = _linear_target_gap_class(h, i0 + r);
+        open_h = h->target_open[k];
+        extend_h = h->target_extend[k];
+        k = _linear_query_gap_class(h, j0);
+        M[INDEX(r, 0)] = -DBL_MAX;
+        Iy[INDEX(r, 0)] = -DBL_MAX;
+        Ix[INDEX(r, 0)] = _linear_max(M[INDEX(r-1, 0)] + h->query_open[k],
+                                      Ix[INDEX(r-1, 0)] + h->query_extend[k],
+                                      Iy[INDEX(r-1, 0)] + h->query_open[k]);
+        for (c = 1; c <= nC; c++) {
+            kB = h->sB[j0+c-1];
+            k = _linear_query_gap_class(h, j0 + c);
+            open_v = h->query_open[k];
+            extend_v = h->query_extend[k];
+            M[INDEX(r, c)] = _linear_max(M[INDEX(r-1, c-1)],
+                                         Ix[INDEX(r-1, c-1)],
+                                         Iy[INDEX(r-1, c-1)])
+                           + _linear_pair_score(h, kA, kB);
+            Ix[INDEX(r, c)] = _linear_max(M[INDEX(r-1, c)] + open_v,
+                                          Ix[INDEX(r-1, c)] + extend_v,
+                                          Iy[INDEX(r-1, c)] + open_v);
+            Iy[INDEX(r, c)] = _linear_max(M[INDEX(r, c-1)] + open_h,
+                                          Iy[INDEX(r, c-1)] + extend_h,
+                                          Ix[INDEX(r, c-1)] + open_h);
+        }
+    }
+
+    r = nR;
+    c = nC;
+    scores[LINEAR_DIAGONAL] = M[INDEX(r, c)];
+    scores[LINEAR_VERTICAL] = Ix[INDEX(r, c)];
+    scores[LINEAR_HORIZONTAL] = Iy[INDEX(r, c)];
+    if (end_state < 0) {
+        state = LINEAR_DIAGONAL;
+        if (scores[LINEAR_VERTICAL] > scores[state]) state = LINEAR_VERTICAL;
+        if (scores[LINEAR_HORIZONTAL] > scores[state]) state = LINEAR_HORIZONTAL;
+    }
+    else state = end_state;
+    score = scores[state];
+
+    /* traceback */
+    while (r > 0 || c > 0) {
+        moves[nmoves++] = state;
+        switch (state) {
+            case LINEAR_DIAGONAL:
+                r--;
+                c--;
+                scores[LINEAR_DIAGONAL] = M[INDEX(r, c)];
+                scores[LINEAR_VERTICAL] = Ix[INDEX(r, c)];
+                scores[LINEAR_HORIZONTAL] = Iy[INDEX(r, c)];
+                break;
+            case LINEAR_VERTICAL:
+                k = _linear_query_gap_class(h, j0 + c);
+                r--;
+                scores[LINEAR_DIAGONAL] = M[INDEX(r, c)] + h->query_open[k];
+                scores[LINEAR_VERTICAL] = Ix[INDEX(r, c)] + h->query_extend[k];
+                scores[LINEAR_HORIZONTAL] = Iy[INDEX(r, c)] + h->query_open[k];
+                break;
+            case LINEAR_HORIZONTAL:
+            default:
+                k = _linear_target_gap_class(h, i0 + r);
+                c--;
+                scores[LINEAR_DIAGONAL] = M[INDEX(r, c)] + h->target_open[k];
+                scores[LINEAR_VERTICAL] = Ix[INDEX(r, c)] + h->target_open[k];
+                scores[LINEAR_HORIZONTAL] = Iy[INDEX(r, c)] + h->target_extend[k];
+                break;
+        }
+        state = LINEAR_DIAGONAL;
+        if (scores[LINEAR_VERTICAL] > scores[state]) state = LINEAR_VERTICAL;
+        if (scores[LINEAR_HORIZONTAL] > scores[state]) state = LINEAR_HORIZONTAL;
+    }
+#undef INDEX
+
+    for (i = nmoves - 1; i >= 0; i--) h->moves[h->nmoves++] = moves[i];
+    PyMem_RawFree(M);
+    PyMem_RawFree(moves);
+    return score;
+}
+
+/* Align the rectangle [i0, i1] x [j0, j1], appending the moves of one
+ * optimal alignment to h->moves, and return its score. The path starts
+ * in the given state, and ends with the move end_state (or with any move
+ * if end_state is negative).
+ */
+static double
+_linear_align(LinearAligner* h,
+              Py_ssize_t i0, Py_ssize_t i1, Py_ssize_t j0, Py_ssize_t j1,
+              int start_state, int end_state)
+{
+    const Py_ssize_t nR = i1 - i0;
+    const Py_ssize_t nC = j1 - j0;
+    const int moves = (end_state < 0) ? LINEAR_ANY_MOVE : LINEAR_MOVE(end_state);
+    Py_ssize_t imid;
+    Py_ssize_t j, jmid = j0;
+    double** f = h->forward;
+    double** b = h->reverse;
+    double best = -DBL_MAX;
+    double score;
+    double correction;
+    int k, s, t;
+    int state = LINEAR_DIAGONAL;
+
+    if (nR <= 1 || nC == 0 || (nR+1)*(nC+1) <= 4096)
+        return _linear_align_small(h, i0, i1, j0, j1, start_state, end_state);
+
+    /* Find the column where the optimal path crosses the middle row, and
+     * the move by which the path arrives there. */
+    imid = i0 + nR / 2;
+    _linear_fill(h, i0, i1, j0, j1, imid - i0, 0, start_state, LINEAR_ANY_MOVE,
+                 f[0], f[1], f[2]);
+    _linear_fill(h, i0, i1, j0, j1, i1 - imid, 1, LINEAR_DIAGONAL, moves,
+                 b[0], b[1], b[2]);
+    for (j = j0; j <= j1; j++) {
+        const Py_ssize_t c = j - j0;
+        const Py_ssize_t d = j1 - j;
+        for (s = 0; s < 3; s++) {
+            for (t = 0; t < 3; t++) {
+                score = f[s][c] + b[t][d];
+                if (s == t && s == LINEAR_VERTICAL) {
+                    /* a gap in the query continuing across the middle row */
+                    k = _linear_query_gap_class(h, j);
+                    correction = h->query_extend[k] - h->query_open[k];
+                    score += correction;
+                }
+                else if (s == t && s == LINEAR_HORIZONTAL) {
+                    /* a gap in the target continuing in the middle row */
+                    k = _linear_target_gap_class(h, imid);
+                    correction = h->target_extend[k] - h->target_open[k];
+                    score += correction;
+                }
+                if (score > best) {
+                    best = score;
+                    jmid = j;
+                    state = s;
+                }
+            }
+        }
+    }
+    _linear_align(h, i0, imid, j0, jmid, start_state, state);
+    if (h->error) return 0;
+    _linear_align(h, imid, i1, jmid, j1, state, end_state);
+    return best;
+}
+
+static const char Aligner_align_linear__doc__[] = "align two sequences globally in linear memory";
+
+static PyObject*
+Aligner_align_linear(Aligner* self, PyObject* args, PyObject* keywords)
+{
+    Py_ssize_t nA;
+    Py_ssize_t nB;
+    Py_ssize_t i;
+    Py_ssize_t iA = 0;
+    Py_ssize_t iB = 0;
+    Py_buffer bA = {0};
+    Py_buffer bB = {0};
+    const Algorithm algorithm = _get_algorithm(self);
+    PyObject* substitution_matrix = self->substitution_matrix.obj;
+    PyObject* result = NULL;
+    PyObject* path = NULL;
+    PyObject* point;
+    LinearAligner h;
+    double score;
+    char move;
+    char previous = -1;
+
+    static char *kwlist[] = {"sequenceA", "sequenceB", NULL};
+
+    if (self->mode != Global) {
+        PyErr_SetString(PyExc_ValueError,
+                        "linear memory alignment requires global mode");
+        return NULL;
+    }
+    if (algorithm != NeedlemanWunschSmithWaterman && algorithm != Gotoh) {
+        PyErr_SetString(PyExc_ValueError,
+                        "linear memory alignment is not available for gap score functions");
+        return NULL;
+    }
+
+    bA.obj = (PyObject*)self;
+    bB.obj = (PyObject*)self;
+    if(!PyArg_ParseTupleAndKeywords(args, keywords, "O&O&", kwlist,
+                                    sequence_converter, &bA,
+                                    sequence_converter, &bB))
+        return NULL;
+
+    nA = bA.len / bA.itemsize;
+    nB = bB.len / bB.itemsize;
+    h.sA = bA.buf;
+    h.sB = bB.buf;
+    h.nA = nA;
+    h.nB = nB;
+    if (substitution_matrix) {
+        h.scores = self->substitution_matrix.buf;
+        h.n = self->substitution_matrix.shape[0];
+    }
+    else {
+        h.scores = NULL;
+        h.n = 0;
+    }
+    h.match = self->match;
+    h.mismatch = self->mismatch;
+    h.wildcard = self->wildcard;
+    h.target_open[0] = self->target_internal_open_gap_score;
+    h.target_open[1] = self->target_left_open_gap_score;
+    h.target_open[2] = self->target_right_open_gap_score;
+    h.target_extend[0] = self->target_internal_extend_gap_score;
+    h.target_extend[1] = self->target_left_extend_gap_score;
+    h.target_extend[2] = self->target_right_extend_gap_score;
+    h.query_open[0] = self->query_internal_open_gap_score;
+    h.query_open[1] = self->query_left_open_gap_score;
+    h.query_open[2] = self->query_right_open_gap_score;
+    h.query_extend[0] = self->query_internal_extend_gap_score;
+    h.query_extend[1] = self->query_left_extend_gap_score;
+    h.query_extend[2] = self->query_right_extend_gap_score;
+    h.nmoves = 0;
+    h.error = 0;
+    h.forward[0] = PyMem_RawMalloc(6*(nB+1)*sizeof(double));
+    h.moves = PyMem_RawMalloc((nA+nB)*sizeof(char));
+    if (!h.forward[0] || !h.moves) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+    h.forward[1] = h.forward[0] + (nB+1);
+    h.forward[2] = h.forward[1] + (nB+1);
+    h.reverse[0] = h.forward[2] + (nB+1);
+    h.reverse[1] = h.reverse[0] + (nB+1);
+    h.reverse[2] = h.reverse[1] + (nB+1);
+
+    Py_XINCREF(substitution_matrix);
+    Py_BEGIN_ALLOW_THREADS
+    score = _linear_align(&h, 0, nA, 0, nB, LINEAR_DIAGONAL, -1);
+    Py_END_ALLOW_THREADS
+    Py_XDECREF(substitution_matrix);
+    if (h.error) {
+        PyErr_NoMemory();
+        goto exit;
+    }
+
+    /* Convert the moves to the vertices of the path, as used by the
+     * PairwiseAlignment class. */
+    path = PyList_New(0);
+    if (!path) goto exit;
+    for (i = 0; i <= h.nmoves; i++) {
+        move = (i < h.nmoves) ? h.moves[i] : -1;
+        if (move != previous) {
+            point = Py_BuildValue("nn", iA, iB);
+            if (!point || PyList_Append(path, point) < 0) {
+                Py_XDECREF(point);
+                goto exit;
+            }
+            Py_DECREF(point);
+            previous = move;
+        }
+        switch (move) {
+            case LINEAR_DIAGONAL: iA++; iB++; break;
+            case LINEAR_VERTICAL: iA++; break;
+            case LINEAR_HORIZONTAL: iB++; break;
+        }
+    }
+    result = Py_BuildValue("dN", score, PyList_AsTuple(path));
+
+exit:
+    Py_XDECREF(path);
+    PyMem_RawFree(h.forward[0]);
+    PyMem_RawFree(h.moves);
+    sequence_converter(NULL, &bA);
+    sequence_converter(NULL, &bB);
+    return result;
+}
+
 static char Aligner_doc[] =
 "Aligner.\n";
 
@@ -6745,6 +8270,11 @@ static PyMethodDef Aligner_methods[] = {
      METH_VARARGS | METH_KEYWORDS,
      Aligner_align__doc__
     },
+    {"align_linear",
+     (PyCFunction)Aligner_align_linear,
+     METH_VARARGS | METH_KEYWORDS,
+     Aligner_align_linear__doc__
+    },
     {NULL}  /* Sentinel */
 };
 
@@ -12,9 +12,14 @@ indexing files. These are not intended for direct use.
 """
 
 import os
+import array
 import contextlib
+import hashlib
 import itertools
 import collections.abc
+import mmap
+import struct
+import types
 
 from abc import ABC, abstractmethod
 
@@ -81,6 +86,10 @@ def _open_for_random_access(filename):
     This functionality is used by the Bio.SeqIO and Bio.SearchIO index
     and index_db functions.
 
+    BGZF files share the Bio.bgzf.shared_cache of decompressed blocks, so
+    that repeated lookups (even via different handles) avoid decompressing
+    the same blocks again.
+
     If the file is gzipped but not BGZF, a specific ValueError is raised.
     """
     handle = open(filename, "rb")
@@ -93,7 +102,7 @@ def _open_for_random_access(filename):
 
         try:
             # If it is BGZF, we support that
-            return bgzf.BgzfReader(mode="rb", fileobj=handle)
+            return bgzf.BgzfReader(mode="rb", fileobj=handle, cache=bgzf.shared_cache)
         except ValueError as e:
             assert "BGZF" in str(e)
             # Not a BGZF file after all,
@@ -167,6 +176,23 @@ class _IndexedSeqFileProxy(ABC):
         # Should be done by each sub-class (if possible)
         raise NotImplementedError("Not available for this file format.")
 
+    def _iter_chunk(self, start, end):
+        """Return (identifier, offset, length) tuples for part of the file (PRIVATE).
+
+        Should give the records starting at or after the start offset, and
+        before the end offset (or the end of the file if None), which allows
+        large files to be indexed in pieces in parallel.
+
+        This may not have been implemented for all file formats, see the
+        _can_split method.
+        """
+        # Should be done by each sub-class (if possible)
+        raise NotImplementedError("Not available for this file format.")
+
+    def _can_split(self):
+        """Check if the _iter_chunk method is available (PRIVATE)."""
+        return False
+
 
 class _IndexedSeqFileDict(collections.abc.Mapping):
     """Read only dictionary interface to a sequential record file.
@@ -273,6 +299,378 @@ class _IndexedSeqFileDict(collections.abc.Mapping):
         self._proxy._handle.close()
 
 
+# Binary index files used by Bio.SeqIO.index(..., index_filename=...)
+# The layout is a fixed header, the file format and key function names,
+# then arrays (in native byte order) of the record offsets, lengths, the
+# start of each key in the key data, and the record numbers sorted by key,
+# and finally the UTF-8 encoded keys themselves.
+_index_file_magic = b"BioIdx01"
+_index_file_header = struct.Struct("=8sIQQQqQQHH")
+_index_file_byte_order = 0x01020304
+
+
+def _update_code_digest(digest, code):
+    """Add the byte code, constants and names of a code object to a hash (PRIVATE)."""
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode("utf-8"))
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            # The repr of nested functions includes their memory address
+            _update_code_digest(digest, const)
+        else:
+            digest.update(repr(const).encode("utf-8"))
+
+
+def _key_function_name(key_function):
+    """Return a string identifying the key function, if any (PRIVATE).
+
+    For Python functions this includes a hash of their code, default
+    arguments and closure values, so that an index file made with a
+    different function of the same name (e.g. an edited lambda) is not
+    reused.
+    """
+    if key_function is None:
+        return ""
+    module = getattr(key_function, "__module__", None)
+    name = getattr(key_function, "__qualname__", None) or repr(key_function)
+    code = getattr(key_function, "__code__", None)
+    if code is None:
+        return "%s.%s" % (module, name)
+    digest = hashlib.sha1()
+    _update_code_digest(digest, code)
+    digest.update(repr(key_function.__defaults__).encode("utf-8"))
+    digest.update(repr(key_function.__kwdefaults__).encode("utf-8"))
+    for cell in key_function.__closure__ or ():
+        digest.update(repr(cell.cell_contents).encode("utf-8"))
+    return "%s.%s:%s" % (module, name, digest.hexdigest())
+
+
+def _write_index_file(index_filename, filename, fmt, key_name, offset_iter):
+    """Scan the records and save their keys and offsets to disk (PRIVATE).
+
+    The index is written to a temporary file which then replaces any old
+    index file, so a partially written index is never left behind.
+    """
+    info = os.stat(filename)
+    keys = []
+    offsets = array.array("q")
+    lengths = array.array("q")
+    key_starts = array.array("Q", [0])
+    seen = set()
+    for key, offset, length in offset_iter:
+        if not isinstance(key, str):
+            raise TypeError("Index files require string keys, not %r" % key)
+        if key in seen:
+            raise ValueError("Duplicate key '%s'" % key)
+        seen.add(key)
+        key = key.encode("utf-8")
+        keys.append(key)
+        offsets.append(offset)
+        lengths.append(length)
+        key_starts.append(key_starts[-1] + len(key))
+    del seen
+    order = array.array("Q", sorted(range(len(keys)), key=keys.__getitem__))
+    names = fmt.encode("utf-8") + key_name.encode("utf-8")
+    header = _index_file_header.pack(
+        _index_file_magic,
+        _index_file_byte_order,
+        info.st_dev,
+        info.st_ino,
+        info.st_size,
+        info.st_mtime_ns,
+        len(keys),
+        key_starts[-1],
+        len(fmt.encode("utf-8")),
+        len(key_name.encode("utf-8")),
+    )
+    # Pad so that the arrays are aligned on 8 byte boundaries
+    padding = b"\0" * (-(len(header) + len(names)) % 8)
+    temp_filename = index_filename + ".tmp"
+    try:
+        with open(temp_filename, "wb") as handle:
+            handle.write(header + names + padding)
+            offsets.tofile(handle)
+            lengths.tofile(handle)
+            key_starts.tofile(handle)
+            order.tofile(handle)
+            for key in keys:
+                handle.write(key)
+        os.replace(temp_filename, index_filename)
+    except BaseException:
+        if os.path.isfile(temp_filename):
+            os.remove(temp_filename)
+        raise
+
+
+class _IndexFileOffsets(collections.abc.Mapping):
+    """Read only mapping of keys to offsets held in an index file (PRIVATE).
+
+    The index file is memory mapped, so opening it is almost instant and
+    needs very little RAM regardless of the number of records. Keys are
+    found by a binary search of the record numbers sorted by key, while
+    iteration gives the keys in the order of the records in the file.
+    """
+
+    def __init__(self, index_filename):
+        """Initialize the class, raises ValueError for an invalid file."""
+        with open(index_filename, "rb") as handle:
+            try:
+                self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Can't map an empty file
+                raise ValueError("Empty index file") from None
+        data = self._mmap
+        size = _index_file_header.size
+        if len(data) < size:
+            self._mmap.close()
+            raise ValueError("Truncated index file")
+        (
+            magic,
+            byte_order,
+            self.file_dev,
+            self.file_ino,
+            self.file_size,
+            self.file_mtime_ns,
+            count,
+            key_bytes,
+            fmt_len,
+            key_name_len,
+        ) = _index_file_header.unpack_from(data)
+        if magic != _index_file_magic or byte_order != _index_file_byte_order:
+            self._mmap.close()
+            raise ValueError("Not an index file for this platform")
+        self.format = data[size : size + fmt_len].decode("utf-8")
+        size += fmt_len
+        self.key_name = data[size : size + key_name_len].decode("utf-8")
+        size += key_name_len
+        start = size + (-size % 8)
+        end = start + 8 * (4 * count + 1) + key_bytes
+        if len(data) != end:
+            self._mmap.close()
+            raise ValueError("Truncated index file")
+        view = memoryview(data)
+        arrays = []
+        for n, code in ((count, "q"), (count, "q"), (count + 1, "Q"), (count, "Q")):
+            arrays.append(view[start : start + 8 * n].cast(code))
+            start += 8 * n
+        self._views = [view] + arrays
+        self._offsets, self._lengths, self._key_starts, self._order = arrays
+        self._keys_start = start
+        self._count = count
+
+    def _key(self, index):
+        """Return the key of the record number given, as bytes (PRIVATE)."""
+        start = self._keys_start
+        return self._mmap[
+            start + self._key_starts[index] : start + self._key_starts[index + 1]
+        ]
+
+    def _find(self, key):
+        """Return the record number for the key, or raise KeyError (PRIVATE)."""
+        try:
+            target = key.encode("utf-8")
+        except AttributeError:
+            raise KeyError(key) from None
+        order = self._order
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(order[middle]) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._count and self._key(order[low]) == target:
+            return order[low]
+        raise KeyError(key)
+
+    def matches(self, filename, fmt, key_name):
+        """Check the index is for this (unmodified) file, format and key function."""
+        info = os.stat(filename)
+        return (
+            self.file_dev == info.st_dev
+            and self.file_ino == info.st_ino
+            and self.file_size == info.st_size
+            and self.file_mtime_ns == info.st_mtime_ns
+            and self.format == fmt
+            and self.key_name == key_name
+        )
+
+    def location(self, key):
+        """Return the offset and length in bytes of the record for this key."""
+        index = self._find(key)
+        return self._offsets[index], self._lengths[index]
+
+    def __getitem__(self, key):
+        """Return the offset of the record for this key."""
+        return self._offsets[self._find(key)]
+
+    def __contains__(self, key):
+        """Return True if the key is in the index."""
+        try:
+            self._find(key)
+        except KeyError:
+            return False
+        return True
+
+    def __len__(self):
+        """Return the number of records."""
+        return self._count
+
+    def __iter__(self):
+        """Iterate over the keys, in the order of the records in the file."""
+        for index in range(self._count):
+            yield self._key(index).decode("utf-8")
+
+    def close(self):
+        """Release the memory mapped index file."""
+        # Any memoryview exports must be released before closing the mmap
+        while self._views:
+            self._views.pop().release()
+        self._mmap.close()
+
+
+class _IndexFileSeqFileDict(_IndexedSeqFileDict):
+    """Read only dictionary interface to a sequential record file, with an index file.
+
+    This behaves like the _IndexedSeqFileDict, but rather than holding the
+    keys and offsets in memory, they are saved in a compact binary index
+    file which is memory mapped. If the index file exists and matches the
+    sequence file (same device, inode, size and modification time) as well
+    as the file format and key function name, it is reused without scanning
+    the file again.
+    Otherwise the file is scanned and the index file (re)written.
+
+    The record lengths are also saved, which speeds up the get_raw method.
+    """
+
+    def __init__(
+        self,
+        random_access_proxy,
+        key_function,
+        repr,
+        obj_repr,
+        filename,
+        fmt,
+        index_filename,
+    ):
+        """Initialize the class."""
+        self._proxy = random_access_proxy
+        self._key_function = key_function
+        self._repr = repr
+        self._obj_repr = obj_repr
+        key_name = _key_function_name(key_function)
+        offsets = None
+        if os.path.isfile(index_filename):
+            try:
+                offsets = _IndexFileOffsets(index_filename)
+            except ValueError:
+                # Not a valid index file, will overwrite it
+                pass
+            else:
+                if not offsets.matches(filename, fmt, key_name):
+                    # Out of date, will overwrite it
+                    offsets.close()
+                    offsets = None
+        if offsets is None:
+            if key_function:
+                offset_iter = (
+                    (key_function(k), o, l) for (k, o, l) in random_access_proxy
+                )
+            else:
+                offset_iter = random_access_proxy
+            try:
+                _write_index_file(index_filename, filename, fmt, key_name, offset_iter)
+            except (TypeError, ValueError):
+                self._proxy._handle.close()
+                raise
+            offsets = _IndexFileOffsets(index_filename)
+        self._offsets = offsets
+
+    def __contains__(self, key):
+        """Return True if the key is in the index."""
+        return key in self._offsets
+
+    def get_raw(self, key):
+        """Return the raw record from the file as a bytes string.
+
+        If the key is not found, a KeyError exception is raised.
+        """
+        offset, length = self._offsets.location(key)
+        if length:
+            # Shortcut if we have the length
+            handle = self._proxy._handle
+            handle.seek(offset)
+            return handle.read(length)
+        return self._proxy.get_raw(offset)
+
+    def close(self):
+        """Close the file handle being used to read the data, and the index file.
+
+        Once called, further use of the index won't work.
+        """
+        self._proxy._handle.close()
+        self._offsets.close()
+
+
+def _is_gzipped(filename):
+    """Check for the gzip magic number at the start of the file (PRIVATE)."""
+    with open(filename, "rb") as handle:
+        return handle.read(2) == b"\x1f\x8b"
+
+
+def _scan_chunk(proxy_factory, fmt, filename, start, end):
+    """Return lists of the keys, offsets and lengths for part of a file (PRIVATE).
+
+    This is used by the _SQLiteManySeqFilesDict in the worker processes, so
+    returns lists (which are efficient to pickle) rather than a generator.
+    """
+    proxy = proxy_factory(fmt, filename)
+    try:
+        if start == 0 and end is None:
+            offset_iter = proxy
+        else:
+            offset_iter = proxy._iter_chunk(start, end)
+        keys = []
+        offsets = []
+        lengths = []
+        for key, offset, length in offset_iter:
+            keys.append(key)
+            offsets.append(offset)
+            lengths.append(length)
+    finally:
+        proxy._handle.close()
+    return keys, offsets, lengths
+
+
+def _join_chunks(chunks, ends, size):
+    """Join the keys, offsets and lengths from the pieces of a file (PRIVATE).
+
+    Arguments are the scan results for each piece, the end offset of each
+    piece (None for the last), and the file size.
+
+    Returns None if the pieces do not join up, meaning the last record of
+    each piece must end where the first record of the next piece begins,
+    and any piece without records must be covered by the previous record.
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+    keys = []
+    offsets = []
+    lengths = []
+    for (chunk_keys, chunk_offsets, chunk_lengths), end in zip(chunks, ends):
+        if not chunk_keys:
+            # Should be a large record spanning the whole of this piece
+            if offsets and offsets[-1] + lengths[-1] < (size if end is None else end):
+                return None
+            continue
+        if offsets and offsets[-1] + lengths[-1] != chunk_offsets[0]:
+            return None
+        keys.extend(chunk_keys)
+        offsets.extend(chunk_offsets)
+        lengths.extend(chunk_lengths)
+    return keys, offsets, lengths
+
+
 class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
     """Read only dictionary interface to many sequential record files.
 
@@ -286,8 +684,16 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
     There are OS limits on the number of files that can be open at once,
     so a pool are kept. If a record is required from a closed file, then
     one of the open handles is closed first.
+
+    When building a new index, the files can be scanned in parallel using a
+    pool of worker processes (this requires the proxy_factory can be pickled).
+    Large uncompressed files are also split into pieces at record boundaries
+    and scanned in parallel, where the file format supports this.
     """
 
+    # Uncompressed files larger than this are scanned in pieces in parallel
+    _chunk_size = 64 * 1024 * 1024
+
     def __init__(
         self,
         index_filename,
@@ -297,6 +703,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         key_function,
         repr,
         max_open=10,
+        processes=1,
     ):
         """Initialize the class."""
         # TODO? - Don't keep filename list in memory (just in DB)?
@@ -322,6 +729,7 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         self._proxy_factory = proxy_factory
         self._repr = repr
         self._max_open = max_open
+        self._processes = processes
         self._proxies = {}
 
         # Note if using SQLite :memory: trick index filename, this will
@@ -443,8 +851,6 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         fmt = self._format
         key_function = self._key_function
         proxy_factory = self._proxy_factory
-        max_open = self._max_open
-        random_access_proxies = self._proxies
 
         if not fmt or not filenames:
             raise ValueError(
@@ -476,7 +882,11 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
             "file_number INTEGER, offset INTEGER, length INTEGER);"
         )
         count = 0
-        for i, filename in enumerate(filenames):
+        if self._processes > 1:
+            scans = self._scan_files_parallel()
+        else:
+            scans = self._scan_files()
+        for i, (filename, offset_iter) in enumerate(zip(filenames, scans)):
             # Default to storing as an absolute path,
             f = os.path.abspath(filename)
             if not os.path.isabs(filename) and not os.path.isabs(index_filename):
@@ -497,15 +907,12 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
             con.execute(
                 "INSERT INTO file_data (file_number, name) VALUES (?,?);", (i, f)
             )
-            random_access_proxy = proxy_factory(fmt, filename)
             if key_function:
-                offset_iter = (
-                    (key_function(k), i, o, l) for (k, o, l) in random_access_proxy
-                )
+                offset_iter = ((key_function(k), i, o, l) for (k, o, l) in offset_iter)
             else:
-                offset_iter = ((k, i, o, l) for (k, o, l) in random_access_proxy)
+                offset_iter = ((k, i, o, l) for (k, o, l) in offset_iter)
             while True:
-                batch = list(itertools.islice(offset_iter, 100))
+                batch = list(itertools.islice(offset_iter, 10000))
                 if not batch:
                     break
                 # print("Inserting batch of %i offsets, %s ... %s"
@@ -514,12 +921,9 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
                     "INSERT INTO offset_data (key,file_number,offset,length) VALUES (?,?,?,?);",
                     batch,
                 )
-                con.commit()
                 count += len(batch)
-            if len(random_access_proxies) < max_open:
-                random_access_proxies[i] = random_access_proxy
-            else:
-                random_access_proxy._handle.close()
+        # Bulk loaded in a single transaction, commit before adding the index
+        con.commit()
         self._length = count
         # print("About to index %i entries" % count)
         try:
@@ -527,7 +931,6 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
                 "CREATE UNIQUE INDEX IF NOT EXISTS key_index ON offset_data(key);"
             )
         except sqlite3.IntegrityError as err:
-            self._proxies = random_access_proxies
             self.close()
             con.close()
             raise ValueError("Duplicate key? %s" % err) from None
@@ -536,6 +939,89 @@ class _SQLiteManySeqFilesDict(_IndexedSeqFileDict):
         con.commit()
         # print("Index created")
 
+    def _scan_files(self):
+        """Scan the files one by one, yielding an offset iterator for each (PRIVATE)."""
+        for i, filename in enumerate(self._filenames):
+            yield self._scan_file(i, filename)
+
+    def _scan_file(self, file_number, filename):
+        """Iterate over the offsets in a file (PRIVATE).
+
+        Once finished, the file handle is kept open for later use (up to
+        max_open of them).
+        """
+        random_access_proxy = self._proxy_factory(self._format, filename)
+        yield from random_access_proxy
+        if len(self._proxies) < self._max_open:
+            self._proxies[file_number] = random_access_proxy
+        else:
+            random_access_proxy._handle.close()
+
+    def _scan_files_parallel(self):
+        """Scan the files using a process pool, yielding offsets for each (PRIVATE).
+
+        Large uncompressed files are split into pieces scanned in parallel,
+        if the file format allows this. If the pieces of a file don't join
+        up correctly at the record boundaries (or could not be scanned),
+        that file is scanned again in one go by the pool.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+
+        proxy_factory = self._proxy_factory
+        fmt = self._format
+        chunk_size = self._chunk_size
+        can_split = None
+        with ProcessPoolExecutor(self._processes) as executor:
+            tasks = []
+            for filename in self._filenames:
+                size = os.path.getsize(filename)
+                chunks = [(0, None)]
+                if size > chunk_size and not _is_gzipped(filename):
+                    if can_split is None:
+                        # This depends only on the file format
+                        proxy = proxy_factory(fmt, filename)
+                        can_split = proxy._can_split()
+                        proxy._handle.close()
+                    if can_split:
+                        starts = range(0, size, chunk_size)
+                        chunks = [(start, start + chunk_size) for start in starts]
+                        chunks[-1] = (chunks[-1][0], None)
+                futures = [
+                    executor.submit(
+                        _scan_chunk, proxy_factory, fmt, filename, start, end
+                    )
+                    for start, end in chunks
+                ]
+                tasks.append(([end for start, end in chunks], futures))
+            # Check the pieces join up before yielding anything, so that any
+            # files needing to be scanned again are also done by the pool
+            results = []
+            for filename, (ends, futures) in zip(self._filenames, tasks):
+                if len(futures) == 1:
+                    results.append(futures[0])
+                    continue
+                try:
+                    offsets = _join_chunks(
+                        [future.result() for future in futures],
+                        ends,
+                        os.path.getsize(filename),
+                    )
+                except ValueError:
+                    offsets = None
+                if offsets is None:
+                    # Fall back on scanning the file in one go
+                    results.append(
+                        executor.submit(
+                            _scan_chunk, proxy_factory, fmt, filename, 0, None
+                        )
+                    )
+                else:
+                    results.append(offsets)
+            for offsets in results:
+                if not isinstance(offsets, tuple):
+                    offsets = offsets.result()
+                yield zip(*offsets)
+
     def __repr__(self):
         return self._repr
 
@@ -144,7 +144,7 @@ class InsdcScanner:
         self.line = line
         return header_lines
 
-    def parse_features(self, skip=False):
+    def parse_features(self, skip=False, feature_types=None, lazy=False):
         """Return list of tuples for the features (if present).
 
         Each feature is returned as a tuple (key, location, qualifiers)
@@ -152,6 +152,12 @@ class InsdcScanner:
         "complement(join(490883..490885,1..879))") while qualifiers
         is a list of two string tuples (feature qualifier keys and values).
 
+        If feature_types is given, only features with one of these keys
+        are returned; the lines of any other features are skipped. If lazy
+        is True, each feature is instead returned as a tuple (key, lines)
+        with the lines of the feature, to be parsed later using the
+        parse_feature method.
+
         Assumes you have already read to the start of the features table.
         """
         if self.line.rstrip() not in self.FEATURE_START_MARKERS:
@@ -162,6 +168,8 @@ class InsdcScanner:
         while self.line.rstrip() in self.FEATURE_START_MARKERS:
             self.line = self.handle.readline()
 
+        if feature_types is not None:
+            feature_types = set(feature_types)
         features = []
         line = self.line
         while True:
@@ -218,6 +226,15 @@ class InsdcScanner:
                     feature_key = line[2 : self.FEATURE_QUALIFIER_INDENT].strip()
                     feature_lines = [line[self.FEATURE_QUALIFIER_INDENT :]]
                 line = self.handle.readline()
+                if feature_types is not None and feature_key not in feature_types:
+                    # Skip the lines of this feature
+                    while line[
+                        : self.FEATURE_QUALIFIER_INDENT
+                    ] == self.FEATURE_QUALIFIER_SPACER or (
+                        line != "" and line.rstrip() == ""
+                    ):
+                        line = self.handle.readline()
+                    continue
                 while line[
                     : self.FEATURE_QUALIFIER_INDENT
                 ] == self.FEATURE_QUALIFIER_SPACER or (
@@ -227,7 +244,10 @@ class InsdcScanner:
                     # white space (e.g. out of spec files with too much indentation)
                     feature_lines.append(line[self.FEATURE_QUALIFIER_INDENT :].strip())
                     line = self.handle.readline()
-                features.append(self.parse_feature(feature_key, feature_lines))
+                if lazy:
+                    features.append((feature_key, feature_lines))
+                else:
+                    features.append(self.parse_feature(feature_key, feature_lines))
         self.line = line
         return features
 
@@ -433,7 +453,14 @@ class InsdcScanner:
         """
         pass
 
-    def feed(self, handle, consumer, do_features=True):
+    def feed(
+        self,
+        handle,
+        consumer,
+        do_features=True,
+        feature_types=None,
+        lazy_features=False,
+    ):
         """Feed a set of data into the consumer.
 
         This method is intended for use with the "old" code in Bio.GenBank
@@ -443,6 +470,11 @@ class InsdcScanner:
          - consumer - The consumer that should be informed of events.
          - do_features - Boolean, should the features be parsed?
            Skipping the features can be much faster.
+         - feature_types - Optional list of feature keys (e.g. ["CDS"]),
+           only these features are parsed.
+         - lazy_features - Boolean, pass the lines of each feature to the
+           consumer's lazy_feature_table method, to be parsed when first
+           used, rather than parsing them now.
 
         Return values:
          - true  - Passed a record
@@ -466,10 +498,16 @@ class InsdcScanner:
         self._feed_header_lines(consumer, self.parse_header())
 
         # Features (common to both EMBL and GenBank):
-        if do_features:
-            self._feed_feature_table(consumer, self.parse_features(skip=False))
-        else:
+        if not do_features:
             self.parse_features(skip=True)  # ignore the data
+        elif lazy_features:
+            features = self.parse_features(feature_types=feature_types, lazy=True)
+            consumer.lazy_feature_table(features, self.__class__)
+        elif feature_types is not None:
+            features = self.parse_features(feature_types=feature_types)
+            self._feed_feature_table(consumer, features)
+        else:
+            self._feed_feature_table(consumer, self.parse_features(skip=False))
 
         # Footer and sequence
         misc_lines, sequence_string = self.parse_footer()
@@ -484,9 +522,13 @@ class InsdcScanner:
         # And we are done
         return True
 
-    def parse(self, handle, do_features=True):
+    def parse(self, handle, do_features=True, feature_types=None, lazy_features=False):
         """Return a SeqRecord (with SeqFeatures if do_features=True).
 
+        If feature_types is given, only features with one of these keys
+        (e.g. ["CDS"]) are included. If lazy_features is True, the location
+        and qualifiers of each feature are only parsed when first used.
+
         See also the method parse_records() for use on multi-record files.
         """
         from Bio.GenBank import _FeatureConsumer
@@ -496,24 +538,27 @@ class InsdcScanner:
             use_fuzziness=1, feature_cleaner=FeatureValueCleaner()
         )
 
-        if self.feed(handle, consumer, do_features):
+        if self.feed(handle, consumer, do_features, feature_types, lazy_features):
             return consumer.data
         else:
             return None
 
-    def parse_records(self, handle, do_features=True):
+    def parse_records(
+        self, handle, do_features=True, feature_types=None, lazy_features=False
+    ):
         """Parse records, return a SeqRecord object iterator.
 
         Each record (from the ID/LOCUS line to the // line) becomes a SeqRecord
 
-        The SeqRecord objects include SeqFeatures if do_features=True
+        The SeqRecord objects include SeqFeatures if do_features=True, see
+        the parse() method for the feature_types and lazy_features arguments.
 
         This method is intended for use in Bio.SeqIO
         """
         # This is a generator function
         with as_handle(handle) as handle:
             while True:
-                record = self.parse(handle, do_features)
+                record = self.parse(handle, do_features, feature_types, lazy_features)
                 if record is None:
                     break
                 if record.id is None:
@@ -1070,6 +1070,19 @@ class _FeatureConsumer(_BaseGenBankConsumer):
             self.data.annotations["references"].append(self._cur_reference)
             self._cur_reference = None
 
+    def lazy_feature_table(self, features, scanner_class):
+        """Add features to be parsed when they are first used.
+
+        The features are given as (key, lines) tuples by the parse_features
+        method of the scanner (an instance of scanner_class) with lazy=True.
+        """
+        self.start_feature_table()
+        parser = _LazyFeatureParser(scanner_class, self)
+        self.data.features.extend(
+            _LazySeqFeature(feature_key, lines, parser)
+            for feature_key, lines in features
+        )
+
     def feature_key(self, content):
         # start a new feature
         self._cur_feature = SeqFeature.SeqFeature()
@@ -1414,6 +1427,73 @@ class _FeatureConsumer(_BaseGenBankConsumer):
             self.data.seq = Seq(sequence)
 
 
+class _LazyFeatureParser:
+    """Parse the lines of a feature into a SeqFeature (PRIVATE).
+
+    This is shared by the _LazySeqFeature objects of a record, and parses
+    them in the same way as the scanner and _FeatureConsumer which read the
+    record would have done.
+    """
+
+    def __init__(self, scanner_class, consumer):
+        """Copy the settings of the consumer which read the record."""
+        self.scanner = scanner_class(debug=0)
+        self.consumer = _FeatureConsumer(
+            consumer._use_fuzziness, consumer._feature_cleaner
+        )
+        self.consumer._seq_type = consumer._seq_type
+        self.consumer._expected_size = consumer._expected_size
+
+    def parse(self, feature_key, lines):
+        """Return a SeqFeature for the feature lines."""
+        feature_tuple = self.scanner.parse_feature(feature_key, lines)
+        self.scanner._feed_feature_table(self.consumer, [feature_tuple])
+        return self.consumer.data.features.pop()
+
+
+class _LazySeqFeature(SeqFeature.SeqFeature):
+    """SeqFeature which parses its location and qualifiers when first used (PRIVATE).
+
+    The feature type is available immediately. The location and qualifiers
+    are parsed from the lines of the feature table when either of them is
+    first accessed, after which the object becomes a plain SeqFeature. Any
+    warnings or errors from parsing the feature are raised at that point.
+    """
+
+    def __init__(self, feature_key, lines, parser):
+        """Store the lines of the feature, to be parsed later."""
+        self.type = feature_key
+        self.id = "<unknown id>"
+        self._lines = lines
+        self._parser = parser
+
+    def __getattr__(self, name):
+        # Only called for attributes which have not been set (yet)
+        if name not in ("_location", "qualifiers") or "_lines" not in self.__dict__:
+            raise AttributeError(
+                "'%s' object has no attribute '%s'" % (self.__class__.__name__, name)
+            )
+        self._parse()
+        return getattr(self, name)
+
+    def _parse(self):
+        """Parse the location and qualifiers of the feature (PRIVATE)."""
+        feature = self._parser.parse(self.type, self._lines)
+        del self._lines
+        del self._parser
+        # Keep any location or qualifiers assigned before parsing
+        if "_location" not in self.__dict__:
+            self._location = feature.location
+        if "qualifiers" not in self.__dict__:
+            self.qualifiers = feature.qualifiers
+        self.__class__ = SeqFeature.SeqFeature
+
+    def __repr__(self):
+        """Represent the feature as a string for debugging."""
+        self._parse()
+        return repr(self)
+
+
 class _RecordConsumer(_BaseGenBankConsumer):
     """Create a GenBank Record object from scanner generated information (PRIVATE)."""
 
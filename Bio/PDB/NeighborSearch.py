@@ -12,7 +12,7 @@
 import numpy
 
 from Bio.PDB.PDBExceptions import PDBException
-from Bio.PDB.Selection import unfold_entities, entity_levels, uniqueify
+from Bio.PDB.Selection import unfold_entities, entity_levels
 
 
 class NeighborSearch:
@@ -48,26 +48,37 @@ class NeighborSearch:
         assert bucket_size > 1
         assert self.coords.shape[1] == 3
         self.kdt = KDTree(self.coords, bucket_size)
+        self._parent_indices = {}
 
     # Private
 
-    def _get_unique_parent_pairs(self, pair_list):
-        # translate a list of (entity, entity) tuples to
-        # a list of (parent entity, parent entity) tuples,
-        # thereby removing duplicate (parent entity, parent entity)
-        # pairs.
-        # o pair_list - a list of (entity, entity) tuples
-        parent_pair_list = []
-        for (e1, e2) in pair_list:
-            p1 = e1.get_parent()
-            p2 = e2.get_parent()
-            if p1 == p2:
-                continue
-            elif p1 < p2:
-                parent_pair_list.append((p1, p2))
-            else:
-                parent_pair_list.append((p2, p1))
-        return uniqueify(parent_pair_list)
+    def _get_parent_indices(self, level):
+        # return a list of the unique entities at the given level, sorted,
+        # and an array with the index in that list of the entity at that
+        # level containing each atom in the atom list.
+        try:
+            return self._parent_indices[level]
+        except KeyError:
+            pass
+        if level == "R":
+            # compute the parents of the atoms
+            entities = [atom.get_parent() for atom in self.atom_list]
+        else:
+            # compute the parents of the entities at the level below
+            below = entity_levels[entity_levels.index(level) - 1]
+            children, indices = self._get_parent_indices(below)
+            entities = [children[index].get_parent() for index in indices]
+        # Use a dictionary to find the unique entities (as a set would), and
+        # sort them so that comparing indices is the same as comparing entities.
+        unique = {}
+        for entity in entities:
+            unique.setdefault(entity, len(unique))
+        parents = sorted(unique)
+        ranks = numpy.empty(len(parents), numpy.intp)
+        ranks[[unique[parent] for parent in parents]] = numpy.arange(len(parents))
+        indices = ranks[[unique[entity] for entity in entities]]
+        self._parent_indices[level] = (parents, indices)
+        return parents, indices
 
     # Public
 
@@ -111,20 +122,22 @@ class NeighborSearch:
         """
         if level not in entity_levels:
             raise PDBException("%s: Unknown level" % level)
-        neighbors = self.kdt.neighbor_search(radius)
-        atom_list = self.atom_list
-        atom_pair_list = []
-        for neighbor in neighbors:
-            i1 = neighbor.index1
-            i2 = neighbor.index2
-            a1 = atom_list[i1]
-            a2 = atom_list[i2]
-            atom_pair_list.append((a1, a2))
+        pairs, distances = self.kdt.neighbor_search(radius, arrays=True)
         if level == "A":
             # return atoms
-            return atom_pair_list
-        next_level_pair_list = atom_pair_list
-        for l in ["R", "C", "M", "S"]:
-            next_level_pair_list = self._get_unique_parent_pairs(next_level_pair_list)
-            if level == l:
-                return next_level_pair_list
+            get_atom = self.atom_list.__getitem__
+            atoms1 = map(get_atom, pairs[:, 0].tolist())
+            atoms2 = map(get_atom, pairs[:, 1].tolist())
+            return list(zip(atoms1, atoms2))
+        # Map each atom directly to its parent entity at the requested level,
+        # and find the unique pairs of different entities using NumPy,
+        # without creating an intermediate tuple for each atom pair.
+        parents, indices = self._get_parent_indices(level)
+        pairs = indices[pairs]
+        pairs = pairs[pairs[:, 0] != pairs[:, 1]]
+        pairs.sort(axis=1)
+        keys = numpy.unique(pairs[:, 0] * len(parents) + pairs[:, 1])
+        i1s, i2s = numpy.divmod(keys, len(parents))
+        return [
+            (parents[i1], parents[i2]) for i1, i2 in zip(i1s.tolist(), i2s.tolist())
+        ]
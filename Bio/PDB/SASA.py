@@ -18,6 +18,7 @@ Reference:
 
 import collections
 import math
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -25,6 +26,9 @@ from Bio.PDB.kdtrees import KDTree
 
 __all__ = ["ShrakeRupley"]
 
+# Number of sphere points tested at once in ShrakeRupley.compute
+_BLOCK_SIZE = 100000
+
 _ENTITY_HIERARCHY = {
     "A": 0,
     "R": 1,
@@ -115,6 +119,9 @@ class ShrakeRupley:
         # Pre-compute reference sphere
         self._sphere = self._compute_sphere()
 
+        # Atoms, coordinates, and results of the previous calculation
+        self._previous = None
+
     def _compute_sphere(self):
         """Return the 3D coordinates of n points on a sphere.
 
@@ -141,7 +148,63 @@ class ShrakeRupley:
 
         return coords
 
-    def compute(self, entity, level="A"):
+    def _find_neighbors(self, coords, radii):
+        """Return the overlapping atoms of each atom (PRIVATE).
+
+        Returns two arrays in compressed sparse row format: the neighbors of
+        atom i are neighbors[indptr[i]:indptr[i+1]]. Two atoms overlap if the
+        distance between them is less than the sum of their radii.
+        """
+        n_atoms = len(coords)
+        kdt = KDTree(coords, 10)
+        pairs, distances = kdt.neighbor_search(np.max(radii) * 2, arrays=True)
+        pairs = pairs[distances < radii[pairs].sum(axis=1)]
+        # store each pair in both directions
+        atoms = np.concatenate((pairs[:, 0], pairs[:, 1]))
+        neighbors = np.concatenate((pairs[:, 1], pairs[:, 0]))
+        order = np.argsort(atoms, kind="stable")
+        indptr = np.searchsorted(atoms[order], np.arange(n_atoms + 1))
+        return indptr, neighbors[order]
+
+    def _count_points(self, coords, radii, indptr, neighbors, atoms):
+        """Return the number of accessible sphere points of each atom (PRIVATE).
+
+        A point on the sphere of an atom is accessible if it is not inside the
+        sphere of any of its neighbors. All points of a block of atoms are
+        tested against all their neighbors at once.
+        """
+        starts = indptr[atoms]
+        sizes = indptr[atoms + 1] - starts
+        counts = np.full(len(atoms), self.n_points)
+        overlapping = sizes > 0
+        if not overlapping.any():
+            return counts
+        starts = starts[overlapping]
+        sizes = sizes[overlapping]
+        offsets = np.cumsum(sizes) - sizes
+        # for each (atom, neighbor) pair, the atom and the neighbor index
+        pair_atoms = np.repeat(atoms[overlapping], sizes)
+        pair_neighbors = neighbors[
+            np.repeat(starts - offsets, sizes) + np.arange(sizes.sum())
+        ]
+        # A point s on the unit sphere of atom i is inside the sphere of atom j
+        # if |r_i * s - d|**2 <= r_j**2, with d the vector from i to j, or
+        # s . d >= (r_i**2 + |d|**2 - r_j**2) / (2 * r_i) as |s| is 1.
+        vectors = coords[pair_neighbors] - coords[pair_atoms]
+        pair_radii = radii[pair_atoms]
+        thresholds = (vectors * vectors).sum(axis=1)
+        thresholds += pair_radii * pair_radii - radii[pair_neighbors] ** 2
+        thresholds /= 2 * pair_radii
+        x, y, z = self._sphere.T.astype(np.float64)
+        products = vectors[:, 0, np.newaxis] * x
+        products += vectors[:, 1, np.newaxis] * y
+        products += vectors[:, 2, np.newaxis] * z
+        buried = products >= thresholds[:, np.newaxis]
+        buried = np.logical_or.reduceat(buried, offsets, axis=0)
+        counts[overlapping] -= buried.sum(axis=1)
+        return counts
+
+    def compute(self, entity, level="A", threads=1):
         """Calculate surface accessibility surface area for an entity.
 
         The resulting atomic surface accessibility values are attached to the
@@ -158,6 +221,15 @@ class ShrakeRupley:
             values of its children. Defaults to "A".
         :type entity: Bio.PDB.Entity
 
+        :param threads: number of threads used to test the sphere points of
+            blocks of atoms in parallel. Defaults to 1.
+        :type threads: int
+
+        If the same ShrakeRupley object was previously used on the same atoms
+        (for example, another model of a trajectory) with different
+        coordinates, only the atoms that moved or that overlap with a moved
+        atom are recalculated.
+
         Example:
         >>> from Bio.PDB import PDBParser
         >>> p = PDBParser(QUIET=1)
@@ -193,42 +265,70 @@ class ShrakeRupley:
         # We trust DisorderedAtom and friends to pick representatives.
         coords = np.array([a.coord for a in atoms], dtype=np.float64)
 
-        # Pre-compute atom neighbors using KDTree
-        kdt = KDTree(coords, 10)
-
         # Pre-compute radius * probe table
         radii_dict = self.radii_dict
         radii = np.array([radii_dict[a.element] for a in atoms], dtype=np.float64)
         radii += self.probe_radius
-        twice_maxradii = np.max(radii) * 2
-
-        # Calculate ASAs
-        asa_array = np.zeros((n_atoms, 1), dtype=np.int)
-        ptset = set(range(self.n_points))
-        for i in range(n_atoms):
-
-            r_i = radii[i]
-
-            # Move sphere to atom
-            s_on_i = (np.array(self._sphere, copy=True) * r_i) + coords[i]
-            available_set = ptset.copy()
 
-            # KDtree for sphere points
-            kdt_sphere = KDTree(s_on_i, 10)
-
-            # Iterate over neighbors of atom i
-            for jj in kdt.search(coords[i], twice_maxradii):
-                j = jj.index
-                if i == j:
-                    continue
-
-                if jj.radius < (r_i + radii[j]):
-                    # Remove overlapping points on sphere from available set
-                    available_set -= {
-                        pt.index for pt in kdt_sphere.search(coords[j], radii[j])
-                    }
-
-            asa_array[i] = len(available_set)  # update counts
+        # Pre-compute atom neighbors using KDTree
+        indptr, neighbors = self._find_neighbors(coords, radii)
+
+        # If only some atoms moved since the previous calculation on the same
+        # atoms (e.g. another model of a trajectory), only the moved atoms and
+        # the atoms that overlap them before or after the move are updated.
+        keys = [a.get_full_id()[2:] for a in atoms]
+        previous = self._previous
+        if (
+            previous is not None
+            and previous["keys"] == keys
+            and np.array_equal(previous["radii"], radii)
+            and previous["n_points"] == len(self._sphere)
+        ):
+            counts = previous["counts"].copy()
+            moved = np.any(previous["coords"] != coords, axis=1)
+            changed = moved.copy()
+            for indptr_, neighbors_ in (
+                (previous["indptr"], previous["neighbors"]),
+                (indptr, neighbors),
+            ):
+                pair_atoms = np.repeat(np.arange(n_atoms), np.diff(indptr_))
+                changed[pair_atoms[moved[neighbors_]]] = True
+            targets = np.flatnonzero(changed)
+        else:
+            counts = np.empty(n_atoms, int)
+            targets = np.arange(n_atoms)
+
+        # Calculate ASAs in blocks of about _BLOCK_SIZE sphere points
+        sizes = np.diff(indptr)[targets] + 1
+        step = _BLOCK_SIZE // self.n_points + 1
+        bounds = np.searchsorted(np.cumsum(sizes), np.arange(0, sizes.sum(), step))
+        blocks = np.split(targets, bounds[1:])
+        if threads > 1 and len(blocks) > 1:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                results = executor.map(
+                    lambda block: self._count_points(
+                        coords, radii, indptr, neighbors, block
+                    ),
+                    blocks,
+                )
+                for block, result in zip(blocks, results):
+                    counts[block] = result
+        else:
+            for block in blocks:
+                counts[block] = self._count_points(
+                    coords, radii, indptr, neighbors, block
+                )
+
+        self._previous = {
+            "keys": keys,
+            "radii": radii,
+            "coords": coords,
+            "indptr": indptr,
+            "neighbors": neighbors,
+            "counts": counts,
+            "n_points": len(self._sphere),
+        }
+        asa_array = counts[:, np.newaxis]
 
         # Convert accessible point count to surface area in A**2
         f = radii * radii * (4 * np.pi / self.n_points)
@@ -8,6 +8,7 @@
 
 #include <math.h>
 #include <stdlib.h>
+#include <string.h>
 #include <Python.h>
 
 #define INF 1000000
@@ -438,6 +439,11 @@ typedef struct {
     double _neighbor_radius;
     double _neighbor_radius_sq;
     double _center_coord[DIM];
+    /* Neighbor pairs found by neighbor_search if returning arrays. */
+    Py_ssize_t* _pair_indices;
+    double* _pair_radii;
+    Py_ssize_t _pair_count;
+    Py_ssize_t _pair_allocated;
 } KDTree;
 
 static double KDTree_dist(double *coord1, double *coord2)
@@ -474,6 +480,38 @@ KDTree_report_point(KDTree* self, DataPoint* data_point, PyObject* points)
     return 1;
 }
 
+static int
+KDTree_store_neighbors(KDTree* self, long int index1, long int index2, double r)
+{
+    /* store a neighbor pair in the arrays of the KD tree */
+    Py_ssize_t n = self->_pair_count;
+    if (n == self->_pair_allocated) {
+        Py_ssize_t* indices;
+        double* radii;
+        Py_ssize_t allocated = self->_pair_allocated;
+        allocated = (allocated == 0) ? 1024 : 2 * allocated;
+        indices = PyMem_Realloc(self->_pair_indices,
+                                2 * allocated * sizeof(Py_ssize_t));
+        if (!indices) return 0;
+        self->_pair_indices = indices;
+        radii = PyMem_Realloc(self->_pair_radii, allocated * sizeof(double));
+        if (!radii) return 0;
+        self->_pair_radii = radii;
+        self->_pair_allocated = allocated;
+    }
+    if (index1 < index2) {
+        self->_pair_indices[2*n] = index1;
+        self->_pair_indices[2*n+1] = index2;
+    }
+    else {
+        self->_pair_indices[2*n] = index2;
+        self->_pair_indices[2*n+1] = index1;
+    }
+    self->_pair_radii[n] = sqrt(r); /* note sqrt */
+    self->_pair_count++;
+    return 1;
+}
+
 static int
 KDTree_test_neighbors(KDTree* self, DataPoint* p1, DataPoint* p2, PyObject* neighbors)
 {
@@ -484,6 +522,8 @@ KDTree_test_neighbors(KDTree* self, DataPoint* p1, DataPoint* p2, PyObject* neig
         /* we found a neighbor pair! */
         Neighbor* neighbor;
         long int index1, index2;
+        if (!neighbors)
+            return KDTree_store_neighbors(self, p1->_index, p2->_index, r);
         neighbor = (Neighbor*) NeighborType.tp_alloc(&NeighborType, 0);
         if (!neighbor) return 0;
         index1 = p1->_index;
@@ -1013,9 +1053,21 @@ KDTree_search(KDTree* self, Region *region, Node *node, int depth, Region* query
 
 /* Python interface */
 
+static void
+KDTree_free_pairs(KDTree* self)
+{
+    if (self->_pair_indices) PyMem_Free(self->_pair_indices);
+    if (self->_pair_radii) PyMem_Free(self->_pair_radii);
+    self->_pair_indices = NULL;
+    self->_pair_radii = NULL;
+    self->_pair_count = 0;
+    self->_pair_allocated = 0;
+}
+
 static void
 KDTree_dealloc(KDTree* self)
 {
+    KDTree_free_pairs(self);
     Node_destroy(self->_root);
     if (self->_data_point_list) PyMem_Free(self->_data_point_list);
     Py_TYPE(self)->tp_free((PyObject*)self);
@@ -1187,6 +1239,58 @@ exit:
     return points;
 }
 
+static PyObject*
+KDTree_create_array(PyObject* numpy, const void* data, Py_ssize_t n, int m,
+                    const char* dtype, Py_ssize_t itemsize)
+{
+    /* create a NumPy array of shape (n, m), or (n,) if m is 0 */
+    Py_buffer view;
+    PyObject* array;
+    if (m)
+        array = PyObject_CallMethod(numpy, "empty", "(ni)s", n, m, dtype);
+    else
+        array = PyObject_CallMethod(numpy, "empty", "(n)s", n, dtype);
+    if (!array) return NULL;
+    if (PyObject_GetBuffer(array, &view, PyBUF_WRITABLE | PyBUF_C_CONTIGUOUS) == -1) {
+        Py_DECREF(array);
+        return NULL;
+    }
+    if (view.len != n * (m ? m : 1) * itemsize) {
+        PyBuffer_Release(&view);
+        Py_DECREF(array);
+        PyErr_SetString(PyExc_RuntimeError, "array has incorrect size");
+        return NULL;
+    }
+    if (n) memcpy(view.buf, data, view.len);
+    PyBuffer_Release(&view);
+    return array;
+}
+
+static PyObject*
+KDTree_pairs_as_arrays(KDTree* self)
+{
+    /* return the neighbor pairs as a tuple of two NumPy arrays */
+    PyObject* numpy;
+    PyObject* indices = NULL;
+    PyObject* radii = NULL;
+    PyObject* result = NULL;
+    const Py_ssize_t n = self->_pair_count;
+    numpy = PyImport_ImportModule("numpy");
+    if (!numpy) return NULL;
+    indices = KDTree_create_array(numpy, self->_pair_indices, n, 2, "intp",
+                                  sizeof(Py_ssize_t));
+    if (!indices) goto exit;
+    radii = KDTree_create_array(numpy, self->_pair_radii, n, 0, "d",
+                                sizeof(double));
+    if (!radii) goto exit;
+    result = PyTuple_Pack(2, indices, radii);
+exit:
+    Py_DECREF(numpy);
+    Py_XDECREF(indices);
+    Py_XDECREF(radii);
+    return result;
+}
+
 PyDoc_STRVAR(PyKDTree_neighbor_search__doc__,
 "All fixed neighbor search.\n\
 \n\
@@ -1194,20 +1298,29 @@ Find all point pairs that are within radius of each other.\n\
 \n\
 Arguments:\n\
  - radius: float (>0)\n\
+ - arrays: bool (default False)\n\
 \n\
 Returns a list of Neighbor objects; each neighbor has attributes\n\
 index1, index2 corresponding to the indices of the point pair,\n\
-and an attribute radius with the radius between them.");
+and an attribute radius with the radius between them.\n\
+\n\
+If arrays is True, the neighbors are instead returned as a tuple of two\n\
+NumPy arrays, without creating a Neighbor object for each of them: a Nx2\n\
+array of the indices of the point pairs (with index1 < index2), and an\n\
+array of length N of the radius between them.");
 
 
 static PyObject*
-PyKDTree_neighbor_search(KDTree* self, PyObject* args)
+PyKDTree_neighbor_search(KDTree* self, PyObject* args, PyObject* kwds)
 {
     int ok = 0;
     double radius;
+    int arrays = 0;
     PyObject* neighbors;
+    static char* kwlist[] = {"radius", "arrays", NULL};
 
-    if (!PyArg_ParseTuple(args, "d:neighbor_search", &radius))
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "d|p:neighbor_search", kwlist,
+                                     &radius, &arrays))
         return NULL;
 
     if (radius <= 0) {
@@ -1215,7 +1328,15 @@ PyKDTree_neighbor_search(KDTree* self, PyObject* args)
         return NULL;
     }
 
-    neighbors = PyList_New(0);
+    if (arrays) {
+        /* the neighbor pairs are stored in the KD tree during the search */
+        KDTree_free_pairs(self);
+        neighbors = NULL;
+    }
+    else {
+        neighbors = PyList_New(0);
+        if (!neighbors) return NULL;
+    }
 
     /* note the use of r^2 to avoid use of sqrt */
     self->_neighbor_radius = radius;
@@ -1236,9 +1357,14 @@ PyKDTree_neighbor_search(KDTree* self, PyObject* args)
         }
     }
     if (!ok) {
-        Py_DECREF(neighbors);
+        Py_XDECREF(neighbors);
+        KDTree_free_pairs(self);
         return PyErr_NoMemory();
     }
+    if (arrays) {
+        neighbors = KDTree_pairs_as_arrays(self);
+        KDTree_free_pairs(self);
+    }
     return neighbors;
 }
 
@@ -1312,7 +1438,7 @@ static PyMethodDef KDTree_methods[] = {
       PyKDTree_search__doc__},
     {"neighbor_search",
      (PyCFunction)PyKDTree_neighbor_search,
-      METH_VARARGS,
+      METH_VARARGS | METH_KEYWORDS,
       PyKDTree_neighbor_search__doc__},
     {"neighbor_simple_search",
      (PyCFunction)PyKDTree_neighbor_simple_search,
@@ -7,14 +7,126 @@
 
 """Classes and methods for tree construction."""
 
-import itertools
 import copy
 import numbers
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
 from Bio.Phylo import BaseTree
 from Bio.Align import MultipleSeqAlignment
 from Bio.Align import substitution_matrices
 
 
+def _read_only(name):
+    """Return a list method raising TypeError, as rows have a fixed size (PRIVATE)."""
+
+    def method(self, *args, **kwargs):
+        raise TypeError(
+            "%s.%s is not supported; use the insert method or del on the "
+            "matrix object to add or remove rows" % (self.__class__.__name__, name)
+        )
+
+    method.__name__ = name
+    return method
+
+
+class _MatrixRow(list):
+    """Row of the lower triangle of a _Matrix, assigning into it (PRIVATE).
+
+    This is a list of the row values as they were when the row was
+    requested; assigning a value to an element also stores it in the
+    matrix. Changing the length of the row is not allowed, and neither is
+    assigning to it once the matrix has been changed in any other way.
+    """
+
+    def __init__(self, owner, index, values):
+        list.__init__(self, values)
+        self._owner = owner
+        self._start = index * (index + 1) // 2
+        self._version = owner._version
+
+    def __setitem__(self, item, value):
+        owner = self._owner
+        if owner._version != self._version:
+            raise ValueError(
+                "The matrix was changed after this row was taken from it; "
+                "use the matrix attribute again, or assign using m[i, j]"
+            )
+        if isinstance(item, slice):
+            positions = range(*item.indices(len(self)))
+            value = list(value)
+            if len(value) != len(positions):
+                raise ValueError("Value not the same size.")
+        else:
+            positions = [range(len(self))[item]]
+            value = [value]
+        if not all(isinstance(n, numbers.Number) for n in value):
+            raise TypeError("Invalid value type.")
+        owner._promote(value)
+        for j, n in zip(positions, value):
+            owner._data[self._start + j] = n
+            list.__setitem__(self, j, n)
+
+    def __reduce__(self):
+        # Copies and pickles are plain lists, detached from the matrix
+        return (list, (list(self),))
+
+    __delitem__ = _read_only("__delitem__")
+    __iadd__ = _read_only("__iadd__")
+    __imul__ = _read_only("__imul__")
+    append = _read_only("append")
+    clear = _read_only("clear")
+    extend = _read_only("extend")
+    insert = _read_only("insert")
+    pop = _read_only("pop")
+    remove = _read_only("remove")
+    reverse = _read_only("reverse")
+    sort = _read_only("sort")
+
+
+class _MatrixRows(list):
+    """Lower triangle of a _Matrix as a list of _MatrixRow objects (PRIVATE).
+
+    Replacing a whole row stores its values in the matrix; adding or
+    removing rows is not allowed (use the matrix insert method or del).
+    """
+
+    def __init__(self, owner):
+        data = owner._data.tolist()
+        list.__init__(
+            self,
+            (
+                _MatrixRow(owner, i, data[i * (i + 1) // 2 : (i + 1) * (i + 2) // 2])
+                for i in range(len(owner))
+            ),
+        )
+
+    def __setitem__(self, item, value):
+        if isinstance(item, slice):
+            raise TypeError("Assign the rows one at a time.")
+        row = list.__getitem__(self, item)
+        if not isinstance(value, list) or len(value) != len(row):
+            raise ValueError("'matrix' should be in lower triangle format")
+        row[:] = value
+
+    def __reduce__(self):
+        # Copies and pickles are plain lists, detached from the matrix
+        return (list, ([list(row) for row in self],))
+
+    __delitem__ = _read_only("__delitem__")
+    __iadd__ = _read_only("__iadd__")
+    __imul__ = _read_only("__imul__")
+    append = _read_only("append")
+    clear = _read_only("clear")
+    extend = _read_only("extend")
+    insert = _read_only("insert")
+    pop = _read_only("pop")
+    remove = _read_only("remove")
+    reverse = _read_only("reverse")
+    sort = _read_only("sort")
+
+
 class _Matrix:
     """Base class for distance matrix or scoring matrix.
 
@@ -30,11 +142,17 @@ class _Matrix:
         [2,3,0,6]
         [4,5,6,0]
 
+    The values are stored in a one-dimensional NumPy array holding the
+    lower triangle (including the diagonal) row by row, which uses much
+    less memory than nested lists of Python numbers for large matrices.
+
     :Parameters:
         names : list
             names of elements, used for indexing
-        matrix : list
-            nested list of numerical lists in lower triangular format
+        matrix : list or numpy array
+            nested list of numerical lists in lower triangular format,
+            or a square two-dimensional NumPy array (of which the lower
+            triangle is used)
 
     Examples
     --------
@@ -78,13 +196,33 @@ class _Matrix:
     >>> m
     _Matrix(names=['Alpha', 'Beta', 'Gamma', 'Delta'], matrix=[[0], [7, 0], [8, 4, 0], [9, 5, 6, 0]])
 
+    The lower triangle is also available as a nested list, but indexing
+    the matrix itself as above is faster for single values:
+
+    >>> m.matrix[2]
+    [8, 4, 0]
+
+    The full symmetric matrix is available as a NumPy array:
+
+    >>> m.to_numpy()
+    array([[0, 7, 8, 9],
+           [7, 0, 4, 5],
+           [8, 4, 0, 6],
+           [9, 5, 6, 0]])
+
     """
 
+    # Incremented on every change, so the cached rows of the matrix
+    # attribute can be rebuilt when needed
+    _version = 0
+    _rows = None
+
     def __init__(self, names, matrix=None):
         """Initialize matrix.
 
         Arguments are a list of names, and optionally a list of lower
-        triangular matrix data (zero matrix used by default).
+        triangular matrix data or a square NumPy array (zero matrix used
+        by default).
         """
         # check names
         if isinstance(names, list) and all(isinstance(s, str) for s in names):
@@ -98,29 +236,113 @@ class _Matrix:
         # check matrix
         if matrix is None:
             # create a new one with 0 if matrix is not assigned
-            matrix = [[0] * i for i in range(1, len(self) + 1)]
-            self.matrix = matrix
+            n = len(self)
+            self._data = np.zeros(n * (n + 1) // 2, int)
+        elif isinstance(matrix, np.ndarray):
+            if matrix.ndim != 2 or matrix.shape[0] != matrix.shape[1]:
+                raise ValueError("'matrix' should be a square array")
+            if len(matrix) != len(names):
+                raise ValueError("'names' and 'matrix' should be the same size")
+            if not np.issubdtype(matrix.dtype, np.number):
+                raise TypeError("'matrix' should be a numerical array")
+            self._data = matrix[np.tril_indices(len(matrix))]
         else:
-            # check if all elements are numbers
-            if (
-                isinstance(matrix, list)
-                and all(isinstance(l, list) for l in matrix)
-                and all(
-                    isinstance(n, numbers.Number)
-                    for n in [item for sublist in matrix for item in sublist]
-                )
-            ):
-                # check if the same length with names
-                if len(matrix) == len(names):
-                    # check if is lower triangle format
-                    if [len(m) for m in matrix] == list(range(1, len(self) + 1)):
-                        self.matrix = matrix
-                    else:
-                        raise ValueError("'matrix' should be in lower triangle format")
+            self.matrix = matrix
+
+    @property
+    def matrix(self):
+        """Lower triangular matrix as a nested list of numbers.
+
+        The lists hold the values at the time the matrix was last changed,
+        and are built again on first access after each change; use
+        ``m[i, j]``, ``m[i]`` or the to_numpy method to read the values of a
+        matrix while it is being changed. Assigning to an element
+        (``m.matrix[i][j] = x``) or replacing a row also updates the matrix,
+        but rows can not be added or removed this way; use the insert
+        method or del instead.
+        """
+        if self._rows is None:
+            self._rows = _MatrixRows(self)
+        return self._rows
+
+    @matrix.setter
+    def matrix(self, matrix):
+        # check if all elements are numbers
+        if (
+            isinstance(matrix, list)
+            and all(isinstance(l, list) for l in matrix)
+            and all(
+                isinstance(n, numbers.Number)
+                for n in [item for sublist in matrix for item in sublist]
+            )
+        ):
+            # check if the same length with names
+            if len(matrix) == len(self.names):
+                # check if is lower triangle format
+                if [len(m) for m in matrix] == list(range(1, len(self) + 1)):
+                    values = [item for sublist in matrix for item in sublist]
+                    self._data = np.array(values) if values else np.zeros(0, int)
+                    self._changed()
                 else:
-                    raise ValueError("'names' and 'matrix' should be the same size")
+                    raise ValueError("'matrix' should be in lower triangle format")
+            else:
+                raise ValueError("'names' and 'matrix' should be the same size")
+        else:
+            raise TypeError("'matrix' should be a list of numerical lists")
+
+    def _changed(self):
+        """Record that the matrix was changed, dropping the cached rows (PRIVATE)."""
+        self._version += 1
+        self._rows = None
+
+    def _get_index(self, item):
+        """Map a name or index to an index, and check its range (PRIVATE)."""
+        if isinstance(item, int):
+            index = item
+        elif isinstance(item, str):
+            if item in self.names:
+                index = self.names.index(item)
             else:
-                raise TypeError("'matrix' should be a list of numerical lists")
+                raise ValueError("Item not found.")
+        else:
+            raise TypeError("Invalid index type.")
+        # check index
+        if index > len(self) - 1:
+            raise IndexError("Index out of range.")
+        return index
+
+    def _get_indices(self, item):
+        """Map a pair of names or indices to a position in the array (PRIVATE)."""
+        if all(isinstance(i, int) for i in item):
+            row_index, col_index = item
+        elif all(isinstance(i, str) for i in item):
+            row_name, col_name = item
+            if row_name in self.names and col_name in self.names:
+                row_index = self.names.index(row_name)
+                col_index = self.names.index(col_name)
+            else:
+                raise ValueError("Item not found.")
+        else:
+            raise TypeError("Invalid index type.")
+        # check index
+        if row_index > len(self) - 1 or col_index > len(self) - 1:
+            raise IndexError("Index out of range.")
+        if row_index < col_index:
+            row_index, col_index = col_index, row_index
+        return row_index * (row_index + 1) // 2 + col_index
+
+    def _get_row_indices(self, index):
+        """Return the positions in the array of the values of a row (PRIVATE)."""
+        j = np.arange(len(self))
+        return np.where(
+            j < index, index * (index + 1) // 2 + j, j * (j + 1) // 2 + index
+        )
+
+    def _promote(self, value):
+        """Change the data type of the array if needed to store value (PRIVATE)."""
+        dtype = np.result_type(self._data, np.asarray(value))
+        if dtype != self._data.dtype:
+            self._data = self._data.astype(dtype)
 
     def __getitem__(self, item):
         """Access value(s) by the index(s) or name(s).
@@ -135,44 +357,11 @@ class _Matrix:
         """
         # Handle single indexing
         if isinstance(item, (int, str)):
-            index = None
-            if isinstance(item, int):
-                index = item
-            elif isinstance(item, str):
-                if item in self.names:
-                    index = self.names.index(item)
-                else:
-                    raise ValueError("Item not found.")
-            else:
-                raise TypeError("Invalid index type.")
-            # check index
-            if index > len(self) - 1:
-                raise IndexError("Index out of range.")
-            return [self.matrix[index][i] for i in range(0, index)] + [
-                self.matrix[i][index] for i in range(index, len(self))
-            ]
+            index = self._get_index(item)
+            return self._data[self._get_row_indices(index)].tolist()
         # Handle double indexing
         elif len(item) == 2:
-            row_index = None
-            col_index = None
-            if all(isinstance(i, int) for i in item):
-                row_index, col_index = item
-            elif all(isinstance(i, str) for i in item):
-                row_name, col_name = item
-                if row_name in self.names and col_name in self.names:
-                    row_index = self.names.index(row_name)
-                    col_index = self.names.index(col_name)
-                else:
-                    raise ValueError("Item not found.")
-            else:
-                raise TypeError("Invalid index type.")
-            # check index
-            if row_index > len(self) - 1 or col_index > len(self) - 1:
-                raise IndexError("Index out of range.")
-            if row_index > col_index:
-                return self.matrix[row_index][col_index]
-            else:
-                return self.matrix[col_index][row_index]
+            return self._data[self._get_indices(item)].item()
         else:
             raise TypeError("Invalid index type.")
 
@@ -187,56 +376,27 @@ class _Matrix:
         """
         # Handle single indexing
         if isinstance(item, (int, str)):
-            index = None
-            if isinstance(item, int):
-                index = item
-            elif isinstance(item, str):
-                if item in self.names:
-                    index = self.names.index(item)
-                else:
-                    raise ValueError("Item not found.")
-            else:
-                raise TypeError("Invalid index type.")
-            # check index
-            if index > len(self) - 1:
-                raise IndexError("Index out of range.")
+            index = self._get_index(item)
             # check and assign value
             if isinstance(value, list) and all(
                 isinstance(n, numbers.Number) for n in value
             ):
                 if len(value) == len(self):
-                    for i in range(0, index):
-                        self.matrix[index][i] = value[i]
-                    for i in range(index, len(self)):
-                        self.matrix[i][index] = value[i]
+                    self._promote(value)
+                    self._data[self._get_row_indices(index)] = value
+                    self._changed()
                 else:
                     raise ValueError("Value not the same size.")
             else:
                 raise TypeError("Invalid value type.")
         # Handle double indexing
         elif len(item) == 2:
-            row_index = None
-            col_index = None
-            if all(isinstance(i, int) for i in item):
-                row_index, col_index = item
-            elif all(isinstance(i, str) for i in item):
-                row_name, col_name = item
-                if row_name in self.names and col_name in self.names:
-                    row_index = self.names.index(row_name)
-                    col_index = self.names.index(col_name)
-                else:
-                    raise ValueError("Item not found.")
-            else:
-                raise TypeError("Invalid index type.")
-            # check index
-            if row_index > len(self) - 1 or col_index > len(self) - 1:
-                raise IndexError("Index out of range.")
+            position = self._get_indices(item)
             # check and assign value
             if isinstance(value, numbers.Number):
-                if row_index > col_index:
-                    self.matrix[row_index][col_index] = value
-                else:
-                    self.matrix[col_index][row_index] = value
+                self._promote(value)
+                self._data[position] = value
+                self._changed()
             else:
                 raise TypeError("Invalid value type.")
         else:
@@ -252,11 +412,12 @@ class _Matrix:
         else:
             raise TypeError("Invalid index type.")
         # remove distances related to index
-        for i in range(index + 1, len(self)):
-            del self.matrix[i][index]
-        del self.matrix[index]
+        keep = np.ones(len(self._data), bool)
+        keep[self._get_row_indices(index)] = False
+        self._data = self._data[keep]
         # remove name
         del self.names[index]
+        self._changed()
 
     def insert(self, name, value, index=None):
         """Insert distances given the name and value.
@@ -277,14 +438,32 @@ class _Matrix:
             # insert name
             self.names.insert(index, name)
             # insert elements of 0, to be assigned
-            self.matrix.insert(index, [0] * index)
-            for i in range(index, len(self)):
-                self.matrix[i].insert(index, 0)
+            data = np.zeros(len(self) * (len(self) + 1) // 2, self._data.dtype)
+            keep = np.ones(len(data), bool)
+            keep[self._get_row_indices(index)] = False
+            data[keep] = self._data
+            self._data = data
+            self._changed()
             # assign value
             self[index] = value
         else:
             raise TypeError("Invalid name type.")
 
+    def __getstate__(self):
+        """Return the state for copying and pickling, without the cached rows."""
+        state = self.__dict__.copy()
+        state.pop("_rows", None)
+        return state
+
+    def to_numpy(self):
+        """Return the full symmetric matrix as a two-dimensional NumPy array."""
+        n = len(self)
+        array = np.zeros((n, n), self._data.dtype)
+        rows, cols = np.tril_indices(n)
+        array[rows, cols] = self._data
+        array[cols, rows] = self._data
+        return array
+
     def __len__(self):
         """Matrix length."""
         return len(self.names)
@@ -297,9 +476,10 @@ class _Matrix:
 
     def __str__(self):
         """Get a lower triangular matrix string."""
+        matrix = self.matrix
         matrix_string = "\n".join(
             [
-                self.names[i] + "\t" + "\t".join([str(n) for n in self.matrix[i]])
+                self.names[i] + "\t" + "\t".join([str(n) for n in matrix[i]])
                 for i in range(0, len(self))
             ]
         )
@@ -325,8 +505,8 @@ class DistanceMatrix(_Matrix):
 
     def _set_zero_diagonal(self):
         """Set all diagonal elements to zero (PRIVATE)."""
-        for i in range(0, len(self)):
-            self.matrix[i][i] = 0
+        i = np.arange(len(self))
+        self._data[i * (i + 3) // 2] = 0
 
     def format_phylip(self, handle):
         """Write data in Phylip format to a given file-like object or handle.
@@ -344,13 +524,11 @@ class DistanceMatrix(_Matrix):
         handle.write(f"    {len(self.names)}\n")
         # Phylip needs space-separated, vertically aligned columns
         name_width = max(12, max(map(len, self.names)) + 1)
-        value_fmts = ("{" + str(x) + ":.4f}" for x in range(1, len(self.matrix) + 1))
+        value_fmts = ("{" + str(x) + ":.4f}" for x in range(1, len(self) + 1))
         row_fmt = "{0:" + str(name_width) + "s}" + "  ".join(value_fmts) + "\n"
-        for i, (name, values) in enumerate(zip(self.names, self.matrix)):
-            # Mirror the matrix values across the diagonal
-            mirror_values = (self.matrix[j][i] for j in range(i + 1, len(self.matrix)))
-            fields = itertools.chain([name], values, mirror_values)
-            handle.write(row_fmt.format(*fields))
+        for i, name in enumerate(self.names):
+            # Each row holds the values mirrored across the diagonal
+            handle.write(row_fmt.format(name, *self[i]))
 
 
 # Shim for compatibility with Biopython<1.70 (#1304)
@@ -398,11 +576,11 @@ class DistanceCalculator:
 
     Output::
 
-        Alpha	0
-        Beta	0.23076923076923073	0
-        Gamma	0.3846153846153846	0.23076923076923073	0
-        Delta	0.5384615384615384	0.5384615384615384	0.5384615384615384	0
-        Epsilon	0.6153846153846154	0.3846153846153846	0.46153846153846156	0.15384615384615385	0
+        Alpha	0.0
+        Beta	0.23076923076923073	0.0
+        Gamma	0.3846153846153846	0.23076923076923073	0.0
+        Delta	0.5384615384615384	0.5384615384615384	0.5384615384615384	0.0
+        Epsilon	0.6153846153846154	0.3846153846153846	0.46153846153846156	0.15384615384615385	0.0
             Alpha	Beta	Gamma	Delta	Epsilon
 
     Protein calculator with 'blosum62' model::
@@ -413,11 +591,11 @@ class DistanceCalculator:
 
     Output::
 
-        Alpha	0
-        Beta	0.36904761904761907	0
-        Gamma	0.49397590361445787	0.25	0
-        Delta	0.5853658536585367	0.5476190476190477	0.5662650602409638	0
-        Epsilon	0.7	0.3555555555555555	0.48888888888888893	0.2222222222222222	0
+        Alpha	0.0
+        Beta	0.36904761904761907	0.0
+        Gamma	0.49397590361445787	0.25	0.0
+        Delta	0.5853658536585367	0.5476190476190477	0.5662650602409638	0.0
+        Epsilon	0.7	0.3555555555555555	0.48888888888888893	0.2222222222222222	0.0
             Alpha	Beta	Gamma	Delta	Epsilon
 
     """
@@ -516,22 +694,148 @@ class DistanceCalculator:
             return 1  # max possible scaled distance
         return 1 - (score * 1.0 / max_score)
 
-    def get_distance(self, msa):
+    def get_distance(self, msa, threads=1):
         """Return a DistanceMatrix for MSA object.
 
+        The alignment is encoded once as an integer array, and the pairwise
+        scores are then calculated for blocks of sequences at a time using
+        matrix multiplication, instead of comparing each pair of sequences
+        letter by letter.
+
         :Parameters:
             msa : MultipleSeqAlignment
                 DNA or Protein multiple sequence alignment.
+            threads : int
+                Number of threads used to calculate the blocks of the
+                distance matrix (default 1). NumPy releases the GIL during
+                the matrix multiplications, so using more threads speeds
+                up the calculation for large alignments.
 
         """
         if not isinstance(msa, MultipleSeqAlignment):
             raise TypeError("Must provide a MultipleSeqAlignment object.")
 
         names = [s.id for s in msa]
-        dm = DistanceMatrix(names)
-        for seq1, seq2 in itertools.combinations(msa, 2):
-            dm[seq1.id, seq2.id] = self._pairwise(seq1, seq2)
-        return dm
+        n = len(names)
+        if n < 2:
+            return DistanceMatrix(names)
+        codes, table_x, table_y, diagonal = self._encode(msa)
+        length = codes.shape[1]
+        # Size the blocks such that the expanded (one-hot) arrays used in
+        # the matrix multiplication remain reasonably small.
+        block = min(n, 256)
+        letters = max(1, table_x.shape[1])
+        width = max(1, self._block_cells // (block * letters))
+        distances = np.zeros((n, n))
+        starts = range(0, n, block)
+        tasks = [(i, j) for i in starts for j in starts if i <= j]
+
+        def calculate(task):
+            i, j = task
+            rows = codes[i : i + block]
+            cols = codes[j : j + block]
+            score = np.zeros((len(rows), len(cols)))
+            if diagonal is None:
+                max_score = length
+            else:
+                max_score1 = np.zeros((len(rows), len(cols)))
+                max_score2 = np.zeros((len(rows), len(cols)))
+            for start in range(0, length, width):
+                end = start + width
+                x = table_x[rows[:, start:end]].reshape(len(rows), -1)
+                y = table_y[cols[:, start:end]].reshape(len(cols), -1)
+                score += np.dot(x, y.T)
+                if diagonal is not None:
+                    valid1 = (rows[:, start:end] < len(diagonal) - 1).astype(float)
+                    valid2 = (cols[:, start:end] < len(diagonal) - 1).astype(float)
+                    max_score1 += np.dot(diagonal[rows[:, start:end]], valid2.T)
+                    max_score2 += np.dot(valid1, diagonal[cols[:, start:end]].T)
+            if diagonal is not None:
+                # Take the higher score if the matrix is asymmetrical
+                max_score = np.maximum(max_score1, max_score2)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                values = np.where(max_score == 0, 1.0, 1 - score / max_score)
+            distances[i : i + block, j : j + block] = values
+
+        if threads > 1 and len(tasks) > 1:
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                list(executor.map(calculate, tasks))
+        else:
+            for task in tasks:
+                calculate(task)
+        # The score of each pair was taken with the first sequence in the
+        # alignment as seq1, which is the upper triangle of the array.
+        return DistanceMatrix(names, distances.T)
+
+    # Maximum number of array cells of the expanded sequence blocks
+    _block_cells = 1 << 22
+
+    def _encode(self, msa):
+        """Encode the alignment as an array of letter indices (PRIVATE).
+
+        Returns a tuple of four arrays. The first is a two-dimensional
+        array of letter indices of each sequence in the alignment. Letters
+        to be skipped are assigned the index one more than the last letter.
+        The second and third are lookup tables to expand the letter indices
+        into one-hot rows, and into rows of the scoring matrix, respectively,
+        with zeros for skipped letters. The fourth is the diagonal of the
+        scoring matrix (zero for skipped letters), or None for the identity
+        model.
+        """
+        data = np.array([np.frombuffer(bytes(s.seq), np.uint8) for s in msa])
+        letters = np.unique(data)
+        skip_letters = {ord(letter) for letter in self.skip_letters}
+        if self.scoring_matrix is not None:
+            alphabet = self.scoring_matrix.alphabet
+            bad = [
+                letter
+                for letter in letters
+                if letter not in skip_letters and chr(letter) not in alphabet
+            ]
+            if bad:
+                self._check_bad_letters(msa, data, bad, skip_letters)
+                # These letters are only found opposite skipped letters, so
+                # are never scored and can be skipped as well
+                skip_letters.update(bad)
+        valid = [letter for letter in letters if letter not in skip_letters]
+        size = len(valid)
+        mapping = np.full(256, size, np.intp)
+        mapping[valid] = np.arange(size)
+        codes = mapping[data]
+        table_x = np.zeros((size + 1, size))
+        table_x[:size] = np.identity(size)
+        if self.scoring_matrix is None:
+            return codes, table_x, table_x, None
+        indices = [alphabet.index(chr(letter)) for letter in valid]
+        matrix = np.array(self.scoring_matrix)[np.ix_(indices, indices)]
+        table_y = np.zeros((size + 1, size))
+        table_y[:size] = matrix.T
+        diagonal = np.zeros(size + 1)
+        diagonal[:size] = matrix.diagonal()
+        return codes, table_x, table_y, diagonal
+
+    def _check_bad_letters(self, msa, data, bad, skip_letters):
+        """Raise an error if letters missing from the model would be scored (PRIVATE).
+
+        A letter missing from the scoring matrix is only an error where it is
+        compared to a letter which is not skipped (e.g. not to a gap). As in
+        _pairwise, the error is for the first such letter found comparing the
+        pairs of sequences in turn.
+        """
+        is_bad = np.isin(data, bad)
+        scored = ~np.isin(data, list(skip_letters))
+        if not (is_bad.any(axis=0) & (scored.sum(axis=0) > 1)).any():
+            return
+        for i in range(len(data) - 1):
+            conflict = scored[i] & scored[i + 1 :] & (is_bad[i] | is_bad[i + 1 :])
+            rows = np.flatnonzero(conflict.any(axis=1))
+            if len(rows):
+                column = np.flatnonzero(conflict[rows[0]])[0]
+                row = i if is_bad[i, column] else i + 1 + rows[0]
+                raise ValueError(
+                    "Bad letter '%s' in sequence '%s' at position '%s'"
+                    % (chr(data[row, column]), msa[int(row)].id, column)
+                )
 
 
 class TreeConstructor:
@@ -545,6 +849,47 @@ class TreeConstructor:
         raise NotImplementedError("Method not implemented!")
 
 
+def _condensed_distances(distance_matrix):
+    """Return the distances below the diagonal as a flat float array (PRIVATE).
+
+    The distances are stored row by row, so the distance between i and j
+    (with j < i) is at position i * (i - 1) // 2 + j. This takes about half
+    the memory of the full square matrix.
+    """
+    n = len(distance_matrix)
+    keep = np.ones(len(distance_matrix._data), bool)
+    i = np.arange(n)
+    keep[i * (i + 3) // 2] = False
+    return distance_matrix._data[keep].astype(float, copy=False)
+
+
+def _row_offsets(n):
+    """Return the position of the first distance of each row, and the end (PRIVATE)."""
+    i = np.arange(n + 1)
+    return i * (i - 1) // 2
+
+
+def _pair_positions(offsets, i, indices):
+    """Return the positions of the distances between i and indices (PRIVATE)."""
+    return np.where(indices < i, offsets[i] + indices, offsets[indices] + i)
+
+
+def _lower_blocks(dm, offsets, block, fill):
+    """Iterate over blocks of rows of the lower triangle (PRIVATE).
+
+    Yields the first and last row of each block, and the distances of the
+    rows as a rectangular array, with the diagonal and the elements above
+    it set to the fill value.
+    """
+    n = len(offsets) - 1
+    for start in range(0, n, block):
+        stop = min(start + block, n)
+        values = np.full((stop - start, stop), fill)
+        lower = np.arange(stop) < np.arange(start, stop)[:, None]
+        values[lower] = dm[offsets[start] : offsets[stop]]
+        yield start, stop, values
+
+
 class DistanceTreeConstructor(TreeConstructor):
     """Distance based tree constructor.
 
@@ -641,6 +986,11 @@ class DistanceTreeConstructor(TreeConstructor):
         Constructs and returns an Unweighted Pair Group Method
         with Arithmetic mean (UPGMA) tree.
 
+        The distances below the diagonal are copied into a flat NumPy array,
+        and the minimum of each row is kept and only recalculated for the
+        rows affected by a merge, so that each step does not need to scan
+        the whole matrix.
+
         :Parameters:
             distance_matrix : DistanceMatrix
                 The distance matrix for tree construction.
@@ -649,61 +999,102 @@ class DistanceTreeConstructor(TreeConstructor):
         if not isinstance(distance_matrix, DistanceMatrix):
             raise TypeError("Must provide a DistanceMatrix object.")
 
-        # make a copy of the distance matrix to be used
-        dm = copy.deepcopy(distance_matrix)
+        n = len(distance_matrix)
         # init terminal clades
-        clades = [BaseTree.Clade(None, name) for name in dm.names]
-        # init minimum index
-        min_i = 0
-        min_j = 0
-        inner_count = 0
-        while len(dm) > 1:
-            min_dist = dm[1, 0]
-            # find minimum index
-            for i in range(1, len(dm)):
-                for j in range(0, i):
-                    if min_dist >= dm[i, j]:
-                        min_dist = dm[i, j]
-                        min_i = i
-                        min_j = j
+        clades = [BaseTree.Clade(None, name) for name in distance_matrix.names]
+        if n == 1:
+            clades[0].branch_length = 0
+            return BaseTree.Tree(clades[0])
+        # make a copy of the distances to be used; the distances of clades
+        # that were merged are set to infinity
+        dm = _condensed_distances(distance_matrix)
+        offsets = _row_offsets(n)
+        # the largest branch length of the terminals in each clade
+        heights = np.zeros(n)
+        # the minimum of each row left of the diagonal, and its column;
+        # ties are resolved in favour of the last column
+        minima = np.full(n, np.inf)
+        positions = np.zeros(n, int)
+
+        def update_minimum(i):
+            row = dm[offsets[i] : offsets[i] + i]
+            j = i - 1 - np.argmin(row[::-1])
+            minima[i] = row[j]
+            positions[i] = j
+
+        for i in range(1, n):
+            update_minimum(i)
+        active = np.ones(n, bool)
+        for inner_count in range(1, n):
+            # find minimum index, taking the last row in case of ties
+            min_i = n - 1 - np.argmin(minima[::-1])
+            min_j = positions[min_i]
+            min_dist = float(minima[min_i])
 
             # create clade
             clade1 = clades[min_i]
             clade2 = clades[min_j]
-            inner_count += 1
             inner_clade = BaseTree.Clade(None, "Inner" + str(inner_count))
             inner_clade.clades.append(clade1)
             inner_clade.clades.append(clade2)
             # assign branch length
             if clade1.is_terminal():
                 clade1.branch_length = min_dist * 1.0 / 2
+                height1 = clade1.branch_length
             else:
-                clade1.branch_length = min_dist * 1.0 / 2 - self._height_of(clade1)
+                clade1.branch_length = min_dist * 1.0 / 2 - heights[min_i]
+                height1 = heights[min_i]
 
             if clade2.is_terminal():
                 clade2.branch_length = min_dist * 1.0 / 2
+                height2 = clade2.branch_length
             else:
-                clade2.branch_length = min_dist * 1.0 / 2 - self._height_of(clade2)
+                clade2.branch_length = min_dist * 1.0 / 2 - heights[min_j]
+                height2 = heights[min_j]
 
             # update node list
             clades[min_j] = inner_clade
-            del clades[min_i]
+            clades[min_i] = None
+            heights[min_j] = max(height1, height2)
 
             # rebuild distance matrix,
             # set the distances of new node at the index of min_j
-            for k in range(0, len(dm)):
-                if k != min_i and k != min_j:
-                    dm[min_j, k] = (dm[min_i, k] + dm[min_j, k]) * 1.0 / 2
-
-            dm.names[min_j] = "Inner" + str(inner_count)
+            active[min_i] = False
+            others = active.copy()
+            others[min_j] = False
+            indices = np.flatnonzero(others)
+            positions_i = _pair_positions(offsets, min_i, indices)
+            positions_j = _pair_positions(offsets, min_j, indices)
+            dm[positions_j] = (dm[positions_i] + dm[positions_j]) * 1.0 / 2
+            dm[positions_i] = np.inf
+            dm[offsets[min_i] + min_j] = np.inf
+            minima[min_i] = np.inf
+
+            # update the row minima affected by the merge
+            if min_j > 0:
+                update_minimum(min_j)
+            rows = indices[indices > min_j]
+            stale = (positions[rows] == min_i) | (positions[rows] == min_j)
+            for i in rows[stale]:
+                update_minimum(i)
+            rows = rows[~stale]
+            values = dm[offsets[rows] + min_j]
+            better = (values < minima[rows]) | (
+                (values == minima[rows]) & (positions[rows] < min_j)
+            )
+            minima[rows[better]] = values[better]
+            positions[rows[better]] = min_j
 
-            del dm[min_i]
         inner_clade.branch_length = 0
         return BaseTree.Tree(inner_clade)
 
     def nj(self, distance_matrix):
         """Construct and return a Neighbor Joining tree.
 
+        The distances below the diagonal are copied into a flat NumPy array,
+        and the node distances and the pair to be joined are calculated for
+        blocks of rows at a time instead of element by element.
+
         :Parameters:
             distance_matrix : DistanceMatrix
                 The distance matrix for tree construction.
@@ -712,29 +1103,27 @@ class DistanceTreeConstructor(TreeConstructor):
         if not isinstance(distance_matrix, DistanceMatrix):
             raise TypeError("Must provide a DistanceMatrix object.")
 
-        # make a copy of the distance matrix to be used
-        dm = copy.deepcopy(distance_matrix)
+        n = len(distance_matrix)
         # init terminal clades
-        clades = [BaseTree.Clade(None, name) for name in dm.names]
-        # init node distance
-        node_dist = [0] * len(dm)
+        clades = [BaseTree.Clade(None, name) for name in distance_matrix.names]
         # init minimum index
         min_i = 0
         min_j = 0
         inner_count = 0
         # special cases for Minimum Alignment Matrices
-        if len(dm) == 1:
+        if n == 1:
             root = clades[0]
 
             return BaseTree.Tree(root, rooted=False)
-        elif len(dm) == 2:
+        elif n == 2:
             # minimum distance will always be [1,0]
             min_i = 1
             min_j = 0
             clade1 = clades[min_i]
             clade2 = clades[min_j]
-            clade1.branch_length = dm[min_i, min_j] / 2.0
-            clade2.branch_length = dm[min_i, min_j] - clade1.branch_length
+            distance = float(distance_matrix[min_i, min_j])
+            clade1.branch_length = distance / 2.0
+            clade2.branch_length = distance - clade1.branch_length
             inner_clade = BaseTree.Clade(None, "Inner")
             inner_clade.clades.append(clade1)
             inner_clade.clades.append(clade2)
@@ -742,25 +1131,47 @@ class DistanceTreeConstructor(TreeConstructor):
             root = clades[0]
 
             return BaseTree.Tree(root, rooted=False)
-        while len(dm) > 2:
-            # calculate nodeDist
-            for i in range(0, len(dm)):
-                node_dist[i] = 0
-                for j in range(0, len(dm)):
-                    node_dist[i] += dm[i, j]
-                node_dist[i] = node_dist[i] / (len(dm) - 2)
-
-            # find minimum distance pair
-            min_dist = dm[1, 0] - node_dist[1] - node_dist[0]
-            min_i = 0
-            min_j = 1
-            for i in range(1, len(dm)):
-                for j in range(0, i):
-                    temp = dm[i, j] - node_dist[i] - node_dist[j]
-                    if min_dist > temp:
-                        min_dist = temp
-                        min_i = i
-                        min_j = j
+        # make a copy of the distances to be used; the distances of clades
+        # that were merged are set to zero
+        dm = _condensed_distances(distance_matrix)
+        offsets = _row_offsets(n)
+        active = np.ones(n, bool)
+        size = n
+        while size > 2:
+            if n > 2 * size:
+                # drop the distances of merged clades
+                indices = np.flatnonzero(active)
+                rows = [
+                    dm[offsets[index] + indices[:i]] for i, index in enumerate(indices)
+                ]
+                dm = np.concatenate(rows)
+                clades = [clades[index] for index in indices]
+                n = size
+                offsets = _row_offsets(n)
+                active = np.ones(n, bool)
+            block = min(n, max(1, self._block_cells // n))
+            # calculate nodeDist, adding the distances of each row left of
+            # the diagonal and those below it in the same column
+            node_dist = np.zeros(n)
+            for start, stop, values in _lower_blocks(dm, offsets, block, 0.0):
+                node_dist[start:stop] += values.sum(axis=1)
+                node_dist[:stop] += values.sum(axis=0)
+            node_dist /= size - 2
+            node_dist[~active] = -np.inf
+
+            # find minimum distance pair, taking the first one in case of ties
+            min_dist = np.inf
+            for start, stop, temp in _lower_blocks(dm, offsets, block, np.inf):
+                temp -= node_dist[start:stop, None]
+                temp -= node_dist[:stop]
+                index = np.argmin(temp)
+                if temp.flat[index] < min_dist:
+                    min_dist = temp.flat[index]
+                    min_i, min_j = divmod(index, stop)
+                    min_i += start
+            first, second = np.flatnonzero(active)[:2]
+            if min_i == second and min_j == first:
+                min_i, min_j = first, second
             # create clade
             clade1 = clades[min_i]
             clade2 = clades[min_j]
@@ -769,41 +1180,51 @@ class DistanceTreeConstructor(TreeConstructor):
             inner_clade.clades.append(clade1)
             inner_clade.clades.append(clade2)
             # assign branch length
+            position = offsets[max(min_i, min_j)] + min(min_i, min_j)
+            distance = float(dm[position])
             clade1.branch_length = (
-                dm[min_i, min_j] + node_dist[min_i] - node_dist[min_j]
+                distance + float(node_dist[min_i]) - float(node_dist[min_j])
             ) / 2.0
-            clade2.branch_length = dm[min_i, min_j] - clade1.branch_length
+            clade2.branch_length = distance - clade1.branch_length
 
             # update node list
             clades[min_j] = inner_clade
-            del clades[min_i]
+            clades[min_i] = None
 
             # rebuild distance matrix,
             # set the distances of new node at the index of min_j
-            for k in range(0, len(dm)):
-                if k != min_i and k != min_j:
-                    dm[min_j, k] = (
-                        dm[min_i, k] + dm[min_j, k] - dm[min_i, min_j]
-                    ) / 2.0
-
-            dm.names[min_j] = "Inner" + str(inner_count)
-            del dm[min_i]
+            active[min_i] = False
+            others = active.copy()
+            others[min_j] = False
+            indices = np.flatnonzero(others)
+            positions_i = _pair_positions(offsets, min_i, indices)
+            positions_j = _pair_positions(offsets, min_j, indices)
+            dm[positions_j] = (dm[positions_i] + dm[positions_j] - distance) / 2.0
+            dm[positions_i] = 0
+            dm[position] = 0
+            size -= 1
 
         # set the last clade as one of the child of the inner_clade
+        first, second = np.flatnonzero(active)
+        clades = [clades[first], clades[second]]
+        distance = float(dm[offsets[second] + first])
         root = None
-        if clades[0] == inner_clade:
+        if clades[0] is inner_clade:
             clades[0].branch_length = 0
-            clades[1].branch_length = dm[1, 0]
+            clades[1].branch_length = distance
             clades[0].clades.append(clades[1])
             root = clades[0]
         else:
-            clades[0].branch_length = dm[1, 0]
+            clades[0].branch_length = distance
             clades[1].branch_length = 0
             clades[1].clades.append(clades[0])
             root = clades[1]
 
         return BaseTree.Tree(root, rooted=False)
 
+    # Maximum number of array cells processed at once in nj
+    _block_cells = 1 << 18
+
     def _height_of(self, clade):
         """Calculate clade height -- the longest path to any terminal (PRIVATE)."""
         height = 0
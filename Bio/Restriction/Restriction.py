@@ -83,10 +83,12 @@ Notes about the diverses class of the restriction enzyme implementation::
 """
 
 
+import sys
 import warnings
 
 import re
 import itertools
+import math
 
 from Bio.Seq import Seq, MutableSeq
 from Bio.Restriction.Restriction_Dictionary import rest_dict as enzymedict
@@ -609,7 +611,7 @@ class AbstractCut(RestrictionType):
         Equischizomer: same site, same position of restriction.
         """
         if not batch:
-            batch = AllEnzymes
+            batch = _all_enzymes()
         r = [x for x in batch if not cls != x]
         i = r.index(cls)
         del r[i]
@@ -626,7 +628,7 @@ class AbstractCut(RestrictionType):
         Neoschizomer: same site, different position of restriction.
         """
         if not batch:
-            batch = AllEnzymes
+            batch = _all_enzymes()
         r = sorted(x for x in batch if cls >> x)
         return r
 
@@ -638,7 +640,7 @@ class AbstractCut(RestrictionType):
         If batch is supplied it is used instead of the default AllEnzymes.
         """
         if not batch:
-            batch = AllEnzymes
+            batch = _all_enzymes()
         r = [x for x in batch if (cls >> x) or (not cls != x)]
         i = r.index(cls)
         del r[i]
@@ -946,14 +948,17 @@ class Palindromic(AbstractCut):
     """
 
     @classmethod
-    def _search(cls):
+    def _search(cls, siteloc=None):
         """Return a list of cutting sites of the enzyme in the sequence (PRIVATE).
 
         For internal use only.
 
-        Implement the search method for palindromic enzymes.
+        Implement the search method for palindromic enzymes. If siteloc is
+        given, it is used instead of cls.dna.finditer as the (location, group)
+        tuples of the recognition sites in the sequence.
         """
-        siteloc = cls.dna.finditer(cls.compsite, cls.size)
+        if siteloc is None:
+            siteloc = cls.dna.finditer(cls.compsite, cls.size)
         cls.results = [r for s, g in siteloc for r in cls._modify(s)]
         if cls.results:
             cls._drop()
@@ -975,21 +980,24 @@ class NonPalindromic(AbstractCut):
     """
 
     @classmethod
-    def _search(cls):
+    def _search(cls, siteloc=None):
         """Return a list of cutting sites of the enzyme in the sequence (PRIVATE).
 
         For internal use only.
 
-        Implement the search method for non palindromic enzymes.
+        Implement the search method for non palindromic enzymes. If siteloc
+        is given, it is used instead of cls.dna.finditer as the (location, group)
+        tuples of the recognition sites in the sequence.
         """
-        iterator = cls.dna.finditer(cls.compsite, cls.size)
+        if siteloc is None:
+            siteloc = cls.dna.finditer(cls.compsite, cls.size)
         cls.results = []
         modif = cls._modify
         revmodif = cls._rev_modify
         s = str(cls)
         cls.on_minus = []
 
-        for start, group in iterator:
+        for start, group in siteloc:
             if group(s):
                 cls.results += list(modif(start))
             else:
@@ -1216,8 +1224,8 @@ class Blunt(AbstractCut):
     def compatible_end(cls, batch=None):
         """List all enzymes that produce compatible ends for the enzyme."""
         if not batch:
-            batch = AllEnzymes
-        r = sorted(x for x in iter(AllEnzymes) if x.is_blunt())
+            batch = _all_enzymes()
+        r = sorted(x for x in iter(_all_enzymes()) if x.is_blunt())
         return r
 
     @staticmethod
@@ -1346,8 +1354,8 @@ class Ov5(AbstractCut):
     def compatible_end(cls, batch=None):
         """List all enzymes that produce compatible ends for the enzyme."""
         if not batch:
-            batch = AllEnzymes
-        r = sorted(x for x in iter(AllEnzymes) if x.is_5overhang() and x % cls)
+            batch = _all_enzymes()
+        r = sorted(x for x in iter(_all_enzymes()) if x.is_5overhang() and x % cls)
         return r
 
     @classmethod
@@ -1479,8 +1487,8 @@ class Ov3(AbstractCut):
     def compatible_end(cls, batch=None):
         """List all enzymes that produce compatible ends for the enzyme."""
         if not batch:
-            batch = AllEnzymes
-        r = sorted(x for x in iter(AllEnzymes) if x.is_3overhang() and x % cls)
+            batch = _all_enzymes()
+        r = sorted(x for x in iter(_all_enzymes()) if x.is_3overhang() and x % cls)
         return r
 
     @classmethod
@@ -2039,13 +2047,240 @@ class Not_available(AbstractCut):
 ###############################################################################
 
 
+class _SiteFinder:
+    """Find the recognition sites of many enzymes in a single pass (PRIVATE).
+
+    For internal use only, by RestrictionBatch.search.
+
+    The compsite regular expression of each enzyme is split into the
+    positions of its recognition site (on both strands for non palindromic
+    enzymes). The most specific part of each site is expanded into all the
+    DNA words it matches, and these anchors of all enzymes are compiled into
+    a single Aho-Corasick automaton. Scanning the sequence once with the
+    automaton gives the candidate locations of each enzyme; these are then
+    confirmed with the enzyme's own regular expression, so the results are
+    identical to those of FormattedSeq.finditer.
+
+    Enzymes without a suitable anchor (e.g. with a site of mostly N's) are
+    searched with FormattedSeq.finditer. So are enzymes whose anchor includes
+    an N if the sequence contains ambiguous nucleotides, as the regular
+    expression of the enzyme matches those with an N only.
+    """
+
+    # Minimum number of enzymes for which the automaton is faster than
+    # searching with the regular expression of each enzyme separately.
+    min_enzymes = 8
+    # Minimum information content of an anchor, in bits (i.e. as specific
+    # as three unambiguous nucleotides), and maximum number of DNA words
+    # matched by an anchor.
+    min_information = 6
+    max_expansions = 64
+
+    _alternative = re.compile(r"\(\?=\(\?P<(\w+)>([^()]*)\)\)")
+    _position = re.compile(r"\[[ACGT]+\]|[ACGT.]")
+    _information = {1: 2.0, 2: 1.0, 3: 2 - math.log2(3), 4: 0.0}
+    # A, C, G, T are mapped to 0, 1, 2, 3; all other characters to 4.
+    _codes = bytes(b"ACGT".find(bytes([c])) % 5 for c in range(256))
+
+    def __init__(self, enzymes):
+        """Build the automaton for the enzymes (an iterable)."""
+        self.enzymes = frozenset(enzymes)
+        self.found = []
+        self.wildcards = []
+        self.others = []
+        anchors = {}
+        for enzyme in self.enzymes:
+            selected = self._anchors(enzyme)
+            if selected is None:
+                self.others.append(enzyme)
+                continue
+            index = len(self.found)
+            self.found.append(enzyme)
+            self.wildcards.append(False)
+            for offset, letters in selected:
+                if "ACGT" in letters:
+                    self.wildcards[index] = True
+                shift = offset + len(letters) - 1
+                for word in itertools.product(*letters):
+                    anchors.setdefault(word, []).append((index, shift))
+        self._build(anchors)
+
+    def _anchors(self, enzyme):
+        """Return the anchors of the sites of the enzyme (PRIVATE).
+
+        Returns a list of (offset, letters) tuples, one for each alternative
+        in the compsite of the enzyme, or None if the enzyme has no usable
+        anchors.
+        """
+        pattern = enzyme.compsite.pattern
+        alternatives = self._alternative.findall(pattern)
+        name = str(enzyme)
+        if [alternative[0] for alternative in alternatives] not in (
+            [name],
+            [name, name + "_as"],
+        ):
+            return None
+        if pattern != "|".join(
+            "(?=(?P<%s>%s))" % alternative for alternative in alternatives
+        ):
+            return None
+        anchors = []
+        for name, site in alternatives:
+            positions = self._position.findall(site)
+            if "".join(positions) != site:
+                return None
+            positions = ["ACGT" if p == "." else p.strip("[]") for p in positions]
+            anchor = self._anchor(positions)
+            if anchor is None:
+                return None
+            anchors.append(anchor)
+        return anchors
+
+    def _anchor(self, positions):
+        """Return the offset and letters of the most specific anchor (PRIVATE)."""
+        information = self._information
+        best = None
+        best_information = self.min_information
+        for start in range(len(positions)):
+            if positions[start] == "ACGT":
+                continue
+            count = 1
+            total = 0.0
+            for end in range(start, len(positions)):
+                letters = positions[end]
+                count *= len(letters)
+                if count > self.max_expansions:
+                    break
+                total += information[len(letters)]
+                if total >= best_information and letters != "ACGT":
+                    if best is None or total > best_information:
+                        best = (start, positions[start : end + 1])
+                        best_information = total
+        return best
+
+    def _build(self, anchors):
+        """Compile the anchors into the transition table (PRIVATE)."""
+        # trie
+        children = [{}]
+        outputs = [[]]
+        for word, hits in anchors.items():
+            state = 0
+            for letter in word:
+                code = "ACGT".index(letter)
+                child = children[state].get(code)
+                if child is None:
+                    child = len(children)
+                    children[state][code] = child
+                    children.append({})
+                    outputs.append([])
+                state = child
+            outputs[state].extend(hits)
+        # failure links, breadth first, giving a deterministic automaton.
+        # States are stored as 5 * state, the offset in the transition table.
+        n = len(children)
+        delta = [0] * (5 * n)
+        failure = [0] * n
+        queue = []
+        for code, child in children[0].items():
+            delta[code] = 5 * child
+            queue.append(child)
+        for state in queue:
+            fail = failure[state]
+            outputs[state].extend(outputs[fail])
+            for code in range(4):
+                child = children[state].get(code)
+                if child is None:
+                    delta[5 * state + code] = delta[5 * fail + code]
+                else:
+                    delta[5 * state + code] = 5 * child
+                    failure[child] = delta[5 * fail + code] // 5
+                    queue.append(child)
+        self.delta = delta
+        self.outputs = [None] * (5 * n)
+        for state, hits in enumerate(outputs):
+            if hits:
+                self.outputs[5 * state] = hits
+
+    def finditer(self, dna):
+        """Return a dictionary of the recognition sites of each enzyme.
+
+        The values are iterables of (location, group) tuples, as returned by
+        dna.finditer for the enzyme.
+        """
+        data = dna.data
+        length = len(data)
+        if not dna.is_linear():
+            size = max((enzyme.size for enzyme in self.found), default=1)
+            data += data[1:size]
+        codes = data.encode("ascii").translate(self._codes)
+        # store the end positions of the anchors found for each state
+        ends = [None if hits is None else [] for hits in self.outputs]
+        delta = self.delta
+        state = 0
+        for end, code in enumerate(codes):
+            state = delta[state + code]
+            positions = ends[state]
+            if positions is not None:
+                positions.append(end)
+        candidates = [set() for enzyme in self.found]
+        for hits, positions in zip(self.outputs, ends):
+            if positions:
+                for index, shift in hits:
+                    candidates[index].update(end - shift for end in positions)
+        # only A, C, G, T after the leading space
+        exact = codes.find(4, 1) == -1
+        result = {}
+        for enzyme, wildcard, locations in zip(self.found, self.wildcards, candidates):
+            if wildcard:
+                if not exact:
+                    result[enzyme] = self._finditer(dna, enzyme)
+                    continue
+                # an N at the start of the site also matches the leading space
+                locations.add(0)
+            if dna.is_linear():
+                endpos = length
+            else:
+                endpos = length + len(dna.data[1 : enzyme.size])
+            locations = sorted(locations)
+            result[enzyme] = self._confirm(enzyme.compsite, data, locations, endpos)
+        for enzyme in self.others:
+            result[enzyme] = self._finditer(dna, enzyme)
+        return result
+
+    @staticmethod
+    def _finditer(dna, enzyme):
+        """Iterate over the recognition sites of the enzyme (PRIVATE).
+
+        Yields the same (location, group) tuples as dna.finditer.
+        """
+        data = dna.data
+        if not dna.is_linear():
+            data += data[1 : enzyme.size]
+        for m in enzyme.compsite.finditer(data):
+            yield m.start(), m.group
+
+    @staticmethod
+    def _confirm(compsite, data, locations, endpos):
+        """Iterate over the candidate locations that are recognition sites (PRIVATE).
+
+        Yields (location, group) tuples, as FormattedSeq.finditer. These are
+        generated lazily to avoid keeping a match object for each site alive.
+        """
+        match = compsite.match
+        for location in locations:
+            if location >= 0:
+                m = match(data, location, endpos)
+                if m is not None:
+                    yield location, m.group
+
+
 class RestrictionBatch(set):
     """Class for operations on more than one enzyme."""
 
     def __init__(self, first=(), suppliers=()):
         """Initialize empty RB or pre-fill with enzymes (from supplier)."""
         first = [self.format(x) for x in first]
-        first += [eval(x) for n in suppliers for x in suppliers_dict[n][1]]
+        first += [_enzyme(x) for n in suppliers for x in suppliers_dict[n][1]]
         set.__init__(self, first)
         self.mapping = dict.fromkeys(self)
         self.already_mapped = None
@@ -2133,7 +2368,7 @@ class RestrictionBatch(set):
         supplier = suppliers_dict[letter]
         self.suppliers.append(letter)
         for x in supplier[1]:
-            self.add_nocheck(eval(x))
+            self.add_nocheck(_enzyme(x))
 
     def current_suppliers(self):
         """List the current suppliers for the restriction batch.
@@ -2194,6 +2429,8 @@ class RestrictionBatch(set):
         try:
             if isinstance(y, RestrictionType):
                 return y
+            elif str(y) in _enzyme_types:
+                return _enzyme(str(y))
             elif isinstance(eval(str(y)), RestrictionType):
                 return eval(y)
         except (NameError, SyntaxError):
@@ -2205,8 +2442,10 @@ class RestrictionBatch(set):
 
         True if y or eval(y) is a RestrictionType.
         """
-        return isinstance(y, RestrictionType) or isinstance(
-            eval(str(y)), RestrictionType
+        return (
+            isinstance(y, RestrictionType)
+            or str(y) in _enzyme_types
+            or isinstance(eval(str(y)), RestrictionType)
         )
 
     def split(self, *classes, **bool):
@@ -2264,6 +2503,25 @@ class RestrictionBatch(set):
         supply = [" = ".join(i) for i in cls.suppl_codes().items()]
         print("\n".join(supply))
 
+    def _search(self, fseq):
+        """Return a dic of cutting sites in the FormattedSeq (PRIVATE).
+
+        For larger batches, the recognition sites of all enzymes are found in
+        a single pass over the sequence, after which each enzyme calculates
+        its cutting sites from them.
+        """
+        if len(self) < _SiteFinder.min_enzymes:
+            return {x: x.search(fseq) for x in self}
+        finder = getattr(self, "_finder", None)
+        if finder is None or finder.enzymes != self:
+            finder = _SiteFinder(self)
+            self._finder = finder
+        mapping = {}
+        for enzyme, siteloc in finder.finditer(fseq).items():
+            enzyme.dna = fseq
+            mapping[enzyme] = enzyme._search(siteloc)
+        return mapping
+
     def search(self, dna, linear=True):
         """Return a dic of cutting sites in the seq for the batch enzymes."""
         #
@@ -2284,14 +2542,14 @@ class RestrictionBatch(set):
             else:
                 self.already_mapped = str(dna), linear
                 fseq = FormattedSeq(dna, linear)
-                self.mapping = {x: x.search(fseq) for x in self}
+                self.mapping = self._search(fseq)
                 return self.mapping
         elif isinstance(dna, FormattedSeq):
             if (str(dna), dna.linear) == self.already_mapped:
                 return self.mapping
             else:
                 self.already_mapped = str(dna), dna.linear
-                self.mapping = {x: x.search(dna) for x in self}
+                self.mapping = self._search(dna)
                 return self.mapping
         raise TypeError(
             "Expected Seq or MutableSeq instance, got %s instead" % type(dna)
@@ -2490,7 +2748,7 @@ class Analysis(RestrictionBatch, PrintFormat):
     def with_name(self, names, dct=None):
         """Return only results from enzymes which names are listed."""
         for i, enzyme in enumerate(names):
-            if enzyme not in AllEnzymes:
+            if enzyme not in _all_enzymes():
                 warnings.warn("no data for the enzyme: %s" % enzyme, BiopythonWarning)
                 del names[i]
         if not dct:
@@ -2610,8 +2868,8 @@ class Analysis(RestrictionBatch, PrintFormat):
 
 
 #
-#   The restriction enzyme classes are created dynamically when the module is
-#   imported. Here is the magic which allow the creation of the
+#   The restriction enzyme classes are created dynamically, when they are
+#   first used. Here is the magic which allow the creation of the
 #   restriction-enzyme classes.
 #
 #   The reason for the two dictionaries in Restriction_Dictionary
@@ -2620,69 +2878,93 @@ class Analysis(RestrictionBatch, PrintFormat):
 #   and one for the enzymes is efficiency as the bases are evaluated
 #   once per pseudo-type.
 #
-#   However Restriction is still a very inefficient module at import. But
-#   remember that around 660 classes (which is more or less the size of Rebase)
-#   have to be created dynamically. However, this processing take place only
-#   once.
-#   This inefficiency is however largely compensated by the use of metaclass
-#   which provide a very efficient layout for the class themselves mostly
-#   alleviating the need of if/else loops in the class methods.
+#   Creating the around 800 classes of Rebase (and compiling the regular
+#   expressions of their sites) used to make Restriction a very inefficient
+#   module at import. The classes are therefore only created when they are
+#   requested as an attribute of the module (see __getattr__ below), or when
+#   AllEnzymes, CommOnly or NonComm are used, which require all of them.
+#   Once created, an enzyme is placed in the globals of the module, so that
+#   __getattr__ is not called again.
 #
-#   It is essential to run Restriction with doc string optimisation (-OO
-#   switch) as the doc string of 660 classes take a lot of processing.
+#   _enzyme_types is the index of the pseudo-type of each enzyme.
 #
-CommOnly = RestrictionBatch()  # commercial enzymes
-NonComm = RestrictionBatch()  # not available commercially
-for TYPE, (bases, enzymes) in typedict.items():
-    #
-    #   The keys are the pseudo-types TYPE (stored as type1, type2...)
-    #   The names are not important and are only present to differentiate
-    #   the keys in the dict. All the pseudo-types are in fact RestrictionType.
-    #   These names will not be used after and the pseudo-types are not
-    #   kept in the locals() dictionary. It is therefore impossible to
-    #   import them.
-    #   Now, if you have look at the dictionary, you will see that not all the
-    #   types are present as those without corresponding enzymes have been
-    #   removed by Dictionary_Builder().
-    #
-    #   The values are tuples which contain
-    #   as first element a tuple of bases (as string) and
-    #   as second element the names of the enzymes.
-    #
-    #   First eval the bases.
-    #
-    bases = tuple(eval(x) for x in bases)
-    #
-    #   now create the particular value of RestrictionType for the classes
-    #   in enzymes.
-    #
-    T = type.__new__(RestrictionType, "RestrictionType", bases, {})
-    for k in enzymes:
-        #
-        #   Now, we go through all the enzymes and assign them their type.
-        #   enzymedict[k] contains the values of the attributes for this
-        #   particular class (self.site, self.ovhg,....).
+_enzyme_types = {
+    name: TYPE for TYPE, (bases, enzymes) in typedict.items() for name in enzymes
+}
+_pseudo_types = {}
+
+
+def _enzyme(name):
+    """Return the restriction enzyme class with this name (PRIVATE).
+
+    The enzyme is created if needed. Raises a KeyError if there is no enzyme
+    with this name in Rebase.
+    """
+    try:
+        return globals()[name]
+    except KeyError:
+        pass
+    TYPE = _enzyme_types[name]
+    try:
+        T, bases = _pseudo_types[TYPE]
+    except KeyError:
         #
-        newenz = T(k, bases, enzymedict[k])
+        #   First eval the bases, then create the particular value of
+        #   RestrictionType for the enzymes of this pseudo-type.
         #
-        #   we add the enzymes to the corresponding batch.
+        bases = tuple(eval(x) for x in typedict[TYPE][0])
+        T = type.__new__(RestrictionType, "RestrictionType", bases, {})
+        _pseudo_types[TYPE] = T, bases
+    #
+    #   enzymedict[name] contains the values of the attributes for this
+    #   particular class (self.site, self.ovhg,....).
+    #
+    enzyme = T(name, bases, enzymedict[name])
+    globals()[name] = enzyme
+    return enzyme
+
+
+def _all_enzymes():
+    """Return AllEnzymes, creating all enzymes if needed (PRIVATE)."""
+    try:
+        return globals()["AllEnzymes"]
+    except KeyError:
+        pass
+    CommOnly = RestrictionBatch()  # commercial enzymes
+    NonComm = RestrictionBatch()  # not available commercially
+    for name in _enzyme_types:
+        enzyme = _enzyme(name)
         #
         #   No need to verify the enzyme is a RestrictionType -> add_nocheck
         #
-        if newenz.is_comm():
-            CommOnly.add_nocheck(newenz)
+        if enzyme.is_comm():
+            CommOnly.add_nocheck(enzyme)
         else:
-            NonComm.add_nocheck(newenz)
-#
-#   AllEnzymes is a RestrictionBatch with all the enzymes from Rebase.
-#
-AllEnzymes = RestrictionBatch(CommOnly)
-AllEnzymes.update(NonComm)
-#
-#   Now, place the enzymes in locals so they can be imported.
-#
-names = [str(x) for x in AllEnzymes]
-locals().update(dict(zip(names, AllEnzymes)))
+            NonComm.add_nocheck(enzyme)
+    #
+    #   AllEnzymes is a RestrictionBatch with all the enzymes from Rebase.
+    #
+    AllEnzymes = RestrictionBatch(CommOnly)
+    AllEnzymes.update(NonComm)
+    globals().update(CommOnly=CommOnly, NonComm=NonComm, AllEnzymes=AllEnzymes)
+    return AllEnzymes
+
+
+def __getattr__(name):
+    """Create the restriction enzymes and batches when first used (PRIVATE)."""
+    if name in _enzyme_types:
+        return _enzyme(name)
+    if name in ("AllEnzymes", "CommOnly", "NonComm"):
+        _all_enzymes()
+        return globals()[name]
+    raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+
+def __dir__():
+    """Return the names in the module, including all enzymes (PRIVATE)."""
+    return sorted(set(globals()).union(__all__))
+
+
 __all__ = (
     "FormattedSeq",
     "Analysis",
@@ -2690,5 +2972,8 @@ __all__ = (
     "AllEnzymes",
     "CommOnly",
     "NonComm",
-) + tuple(names)
-del k, enzymes, TYPE, bases, names
+) + tuple(_enzyme_types)
+
+if sys.version_info < (3, 7):
+    # Module __getattr__ is not available (PEP 562), create all enzymes now.
+    _all_enzymes()
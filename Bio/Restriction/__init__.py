@@ -50,7 +50,30 @@ Examples
 
 """  # noqa: W291, W293
 
-from Bio.Restriction.Restriction import *  # noqa (legacy module arrangement)
+import sys
+
+from Bio.Restriction import Restriction as _Restriction
+
+if sys.version_info < (3, 7):
+    from Bio.Restriction.Restriction import *  # noqa (legacy module arrangement)
+else:
+    from Bio.Restriction.Restriction import FormattedSeq  # noqa: F401
+    from Bio.Restriction.Restriction import Analysis  # noqa: F401
+    from Bio.Restriction.Restriction import RestrictionBatch  # noqa: F401
+    from Bio.Restriction.Restriction import __all__
+
+    # The enzymes, and AllEnzymes, CommOnly and NonComm, are only created by
+    # Bio.Restriction.Restriction when first used.
+
+    def __getattr__(name):
+        """Return the restriction enzyme or batch with this name (PRIVATE)."""
+        if name in __all__:
+            return getattr(_Restriction, name)
+        raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+    def __dir__():
+        """Return the names in the module, including all enzymes (PRIVATE)."""
+        return sorted(set(globals()).union(__all__))
 
 
 #
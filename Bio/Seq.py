@@ -22,6 +22,7 @@ See also the Seq_ wiki and the chapter in our tutorial:
 
 import array
 import warnings
+import weakref
 from abc import ABC, abstractmethod
 
 from Bio import BiopythonWarning, BiopythonDeprecationWarning
@@ -3305,6 +3306,294 @@ def back_transcribe(rna):
         return rna.replace("U", "T").replace("u", "t")
 
 
+class _CodonTranslator:
+    """Translate codons using a lookup table indexed by their letters (PRIVATE).
+
+    Each nucleotide letter is mapped to a number, and each codon to the index
+    of an entry in the lookup table, so that a whole sequence is translated
+    with a few NumPy operations instead of one dictionary lookup per codon.
+    The table entries are amino acid letters, or one of the markers below for
+    codons that need special treatment. Entries for ambiguous codons are only
+    looked up in the codon table when they are first seen.
+
+    Short sequences (or any sequence, if NumPy is not installed) are instead
+    translated using a dictionary of the table entries of each codon.
+    """
+
+    STOP = 0
+    POSSIBLE_STOP = 1
+    INVALID = 2
+    GAP = 3
+    UNKNOWN = 255
+
+    def __init__(self, codon_table):
+        """Initialize the lookup table for a codon table."""
+        self.forward_table = codon_table.forward_table
+        self.stop_codons = set(codon_table.stop_codons)
+        if codon_table.nucleotide_alphabet is not None:
+            valid_letters = set(codon_table.nucleotide_alphabet.upper())
+        else:
+            # Assume the worst case, ambiguous DNA or RNA:
+            valid_letters = set(
+                IUPACData.ambiguous_dna_letters.upper()
+                + IUPACData.ambiguous_rna_letters.upper()
+            )
+        self.valid_letters = valid_letters
+        self.dual_coding = [
+            c for c in codon_table.stop_codons if c in self.forward_table
+        ]
+        # Letters that may be found in the forward table, e.g. X in the
+        # ambiguous tables, are translated even if they are not valid letters:
+        letters = set(valid_letters)
+        if isinstance(self.forward_table, dict):
+            letters.update(*self.forward_table)
+        else:
+            letters.update(getattr(self.forward_table, "ambiguous_nucleotide", ""))
+        self.letters = "".join(sorted({letter.upper() for letter in letters}))
+        self.letter_set = set(self.letters + self.letters.lower())
+        # Table entries of codons in short sequences, as bytes:
+        self.entries = {}
+        # Amino acids that are not a single character are stored as a code
+        # below 32, and replaced after the translation.
+        self.replacements = {}
+        # NumPy lookup table, made when first needed:
+        self.table = None
+
+    def _make_table(self):
+        """Make the NumPy lookup table, returning False without NumPy (PRIVATE)."""
+        try:
+            import numpy
+        except ImportError:
+            return False
+        # Any other character is mapped to len(self.letters):
+        m = len(self.letters) + 1
+        if m ** 3 <= 1 << 16:
+            dtype = numpy.uint16
+        else:
+            dtype = numpy.uint32
+        self.codes = numpy.full(256, m - 1, dtype)
+        self.weights = numpy.array([m * m, m, 1], dtype)
+        for code, letter in enumerate(self.letters):
+            self.codes[ord(letter)] = code
+            self.codes[ord(letter.lower())] = code
+        indices = numpy.arange(m ** 3)
+        invalid = indices // (m * m) == m - 1
+        invalid |= indices // m % m == m - 1
+        invalid |= indices % m == m - 1
+        self.table = numpy.full(m ** 3, self.UNKNOWN, numpy.uint8)
+        self.table[invalid] = self.INVALID
+        # Look up the unambiguous codons already:
+        codes = [self.codes[ord(c)] for c in "ACGTU" if c in self.valid_letters]
+        self._fill([(i * m + j) * m + k for i in codes for j in codes for k in codes])
+        return True
+
+    def _fill(self, indices):
+        """Look up the codons with these indices in the codon table (PRIVATE)."""
+        letters = self.letters
+        m = len(letters) + 1
+        for index in indices:
+            codon = letters[index // (m * m)] + letters[index // m % m]
+            codon += letters[index % m]
+            self.table[index] = self._entry(codon)
+
+    def _entry(self, codon):
+        """Return the table entry for a codon given as a string (PRIVATE)."""
+        if not self.letter_set.issuperset(codon):
+            return self.INVALID
+        codon = codon.upper()
+        try:
+            amino_acid = self.forward_table[codon]
+        except (KeyError, CodonTable.TranslationError):
+            if codon in self.stop_codons:
+                return self.STOP
+            elif self.valid_letters.issuperset(codon):
+                # Possible stop codon (e.g. NNN or TAN)
+                return self.POSSIBLE_STOP
+            else:
+                return self.INVALID
+        if len(amino_acid) == 1 and 32 <= ord(amino_acid) < self.UNKNOWN:
+            return ord(amino_acid)
+        for code, replacement in self.replacements.items():
+            if replacement == amino_acid:
+                return code
+        code = self.GAP + 1 + len(self.replacements)
+        if code == 32:
+            raise ValueError(f"Unable to translate codon '{codon}'")
+        self.replacements[code] = amino_acid
+        return code
+
+    @staticmethod
+    def encode(sequence):
+        """Encode a sequence string as bytes for the lookup.
+
+        Characters which can't be encoded as latin-1 become NUL bytes, which
+        are never valid letters.
+        """
+        try:
+            return sequence.encode("latin-1")
+        except UnicodeEncodeError:
+            return "".join(c if c <= "\xff" else "\0" for c in sequence).encode(
+                "latin-1"
+            )
+
+    def check_dual_coding(self, to_stop):
+        """Warn about, or refuse to_stop with, dual coding stop codons."""
+        # Check for tables with 'ambiguous' (dual-coding) stop codons:
+        dual_coding = self.dual_coding
+        if dual_coding:
+            c = dual_coding[0]
+            forward_table = self.forward_table
+            if to_stop:
+                raise ValueError(
+                    "You cannot use 'to_stop=True' with this table as it contains"
+                    f" {len(dual_coding)} codon(s) which can be both STOP and an"
+                    f" amino acid (e.g. '{c}' -> '{forward_table[c]}' or STOP)."
+                )
+            warnings.warn(
+                f"This table contains {len(dual_coding)} codon(s) which code(s) for"
+                f" both STOP and an amino acid (e.g. '{c}' -> '{forward_table[c]}'"
+                " or STOP). Such codons will be translated as amino acid.",
+                BiopythonWarning,
+            )
+
+    def lookup(self, data):
+        """Return the table entries for the codons in a bytes object as bytes.
+
+        Any partial codon at the end is ignored.
+        """
+        n = len(data) // 3
+        if n < 100 or (self.table is None and not self._make_table()):
+            # For short sequences, a dictionary is faster than NumPy
+            entries = self.entries
+            codons = [data[i : i + 3] for i in range(0, 3 * n, 3)]
+            try:
+                return bytes(map(entries.__getitem__, codons))
+            except KeyError:
+                pass
+            result = bytearray(n)
+            for i, codon in enumerate(codons):
+                try:
+                    result[i] = entries[codon]
+                except KeyError:
+                    entry = self._entry(codon.decode("latin-1"))
+                    if entry != self.INVALID:
+                        entries[codon] = entry
+                    result[i] = entry
+            return bytes(result)
+        import numpy
+
+        codes = self.codes[numpy.frombuffer(data, numpy.uint8, 3 * n)]
+        indices = codes.reshape(n, 3) @ self.weights
+        entries = self.table[indices]
+        if n > 0 and entries.max() == self.UNKNOWN:
+            unknown = entries == self.UNKNOWN
+            self._fill(numpy.unique(indices[unknown]).tolist())
+            entries = self.table[indices]
+        return entries.tobytes()
+
+    def translate(
+        self,
+        sequence,
+        stop_symbol="*",
+        to_stop=False,
+        cds=False,
+        pos_stop="X",
+        gap=None,
+    ):
+        """Translate the codons in a string into a protein string.
+
+        Any partial codon at the end is ignored. Stop codons, invalid codons
+        and gaps are treated as in _translate_str.
+        """
+        entries = self.lookup(self.encode(sequence))
+        return self.finish(sequence, entries, stop_symbol, to_stop, cds, pos_stop, gap)
+
+    def finish(self, sequence, entries, stop_symbol, to_stop, cds, pos_stop, gap):
+        """Convert the table entries of the codons in sequence to a protein string."""
+        if to_stop or cds:
+            end = entries.find(self.STOP)
+            if end >= 0:
+                entries = entries[:end]
+                if cds:
+                    self.check(sequence, entries, gap)
+                    raise CodonTable.TranslationError(
+                        "Extra in frame stop codon found."
+                    )
+        entries = self.check(sequence, entries, gap)
+        return self.decode(entries, stop_symbol, pos_stop, gap)
+
+    def check(self, sequence, entries, gap):
+        """Mark the gap codons, and raise an error for any other invalid codon.
+
+        Returns the table entries, with the gap marker for gap codons.
+        """
+        i = entries.find(self.INVALID)
+        if i >= 0:
+            entries = bytearray(entries)
+        while i >= 0:
+            codon = sequence[3 * i : 3 * i + 3]
+            if gap is not None and codon == gap * 3:
+                # Gapped translation
+                entries[i] = self.GAP
+            else:
+                raise CodonTable.TranslationError(f"Codon '{codon}' is invalid")
+            i = entries.find(self.INVALID, i + 1)
+        return entries
+
+    def decode(self, entries, stop_symbol="*", pos_stop="X", gap=None):
+        """Convert the table entries of a translation to a string."""
+        protein = entries.decode("latin-1")
+        if (
+            self.STOP in entries
+            or self.POSSIBLE_STOP in entries
+            or self.GAP in entries
+            or self.replacements
+        ):
+            replacements = {
+                self.STOP: stop_symbol,
+                self.POSSIBLE_STOP: pos_stop,
+                self.GAP: gap,
+            }
+            replacements.update(self.replacements)
+            protein = protein.translate(replacements)
+        return protein
+
+
+_codon_translators = weakref.WeakKeyDictionary()
+
+
+def _get_codon_table(table):
+    """Return the codon table for a name, NCBI identifier, or object (PRIVATE)."""
+    try:
+        table_id = int(table)
+    except ValueError:
+        # Assume it's a table name
+        # The same table can be used for RNA or DNA
+        codon_table = CodonTable.ambiguous_generic_by_name[table]
+
+    except (AttributeError, TypeError):
+        # Assume it's a CodonTable object
+        if isinstance(table, CodonTable.CodonTable):
+            codon_table = table
+        else:
+            raise ValueError("Bad table argument") from None
+    else:
+        # Assume it's a table ID
+        # The same table can be used for RNA or DNA
+        codon_table = CodonTable.ambiguous_generic_by_id[table_id]
+    return codon_table
+
+
+def _get_codon_translator(codon_table):
+    """Return the _CodonTranslator object for a codon table (PRIVATE)."""
+    try:
+        translator = _codon_translators[codon_table]
+    except KeyError:
+        translator = _CodonTranslator(codon_table)
+        _codon_translators[codon_table] = translator
+    return translator
+
+
 def _translate_str(
     sequence, table, stop_symbol="*", to_stop=False, cds=False, pos_stop="X", gap=None
 ):
@@ -3370,53 +3659,14 @@ def _translate_str(
        ...
     Bio.Data.CodonTable.TranslationError: Extra in frame stop codon found.
     """
-    try:
-        table_id = int(table)
-    except ValueError:
-        # Assume it's a table name
-        # The same table can be used for RNA or DNA
-        codon_table = CodonTable.ambiguous_generic_by_name[table]
-
-    except (AttributeError, TypeError):
-        # Assume it's a CodonTable object
-        if isinstance(table, CodonTable.CodonTable):
-            codon_table = table
-        else:
-            raise ValueError("Bad table argument") from None
-    else:
-        # Assume it's a table ID
-        # The same table can be used for RNA or DNA
-        codon_table = CodonTable.ambiguous_generic_by_id[table_id]
+    codon_table = _get_codon_table(table)
+    translator = _get_codon_translator(codon_table)
     sequence = sequence.upper()
-    amino_acids = []
-    forward_table = codon_table.forward_table
+    amino_acids = ""
     stop_codons = codon_table.stop_codons
-    if codon_table.nucleotide_alphabet is not None:
-        valid_letters = set(codon_table.nucleotide_alphabet.upper())
-    else:
-        # Assume the worst case, ambiguous DNA or RNA:
-        valid_letters = set(
-            IUPACData.ambiguous_dna_letters.upper()
-            + IUPACData.ambiguous_rna_letters.upper()
-        )
     n = len(sequence)
 
-    # Check for tables with 'ambiguous' (dual-coding) stop codons:
-    dual_coding = [c for c in stop_codons if c in forward_table]
-    if dual_coding:
-        c = dual_coding[0]
-        if to_stop:
-            raise ValueError(
-                "You cannot use 'to_stop=True' with this table as it contains"
-                f" {len(dual_coding)} codon(s) which can be both STOP and an"
-                f" amino acid (e.g. '{c}' -> '{forward_table[c]}' or STOP)."
-            )
-        warnings.warn(
-            f"This table contains {len(dual_coding)} codon(s) which code(s) for"
-            f" both STOP and an amino acid (e.g. '{c}' -> '{forward_table[c]}'"
-            " or STOP). Such codons will be translated as amino acid.",
-            BiopythonWarning,
-        )
+    translator.check_dual_coding(to_stop)
 
     if cds:
         if str(sequence[:3]).upper() not in codon_table.start_codons:
@@ -3434,7 +3684,7 @@ def _translate_str(
         # Don't translate the stop symbol, and manually translate the M
         sequence = sequence[3:-3]
         n -= 6
-        amino_acids = ["M"]
+        amino_acids = "M"
     elif n % 3 != 0:
         warnings.warn(
             "Partial codon, len(sequence) not a multiple of three. "
@@ -3448,30 +3698,9 @@ def _translate_str(
         elif len(gap) > 1:
             raise ValueError("Gap character should be a single character string.")
 
-    for i in range(0, n - n % 3, 3):
-        codon = sequence[i : i + 3]
-        try:
-            amino_acids.append(forward_table[codon])
-        except (KeyError, CodonTable.TranslationError):
-            if codon in codon_table.stop_codons:
-                if cds:
-                    raise CodonTable.TranslationError(
-                        "Extra in frame stop codon found."
-                    ) from None
-                if to_stop:
-                    break
-                amino_acids.append(stop_symbol)
-            elif valid_letters.issuperset(set(codon)):
-                # Possible stop codon (e.g. NNN or TAN)
-                amino_acids.append(pos_stop)
-            elif gap is not None and codon == gap * 3:
-                # Gapped translation
-                amino_acids.append(gap)
-            else:
-                raise CodonTable.TranslationError(
-                    f"Codon '{codon}' is invalid"
-                ) from None
-    return "".join(amino_acids)
+    return amino_acids + translator.translate(
+        sequence, stop_symbol, to_stop, cds, pos_stop, gap
+    )
 
 
 def translate(
@@ -3578,6 +3807,93 @@ def translate(
         return _translate_str(sequence, table, stop_symbol, to_stop, cds, gap=gap)
 
 
+def translate_many(
+    sequences, table="Standard", stop_symbol="*", to_stop=False, gap=None
+):
+    """Translate many nucleotide sequences into amino acids at once.
+
+    This gives the same result as calling translate on each sequence, but the
+    codons of all sequences are looked up in the codon table in a single pass,
+    which is much faster for many short sequences, such as all open reading
+    frames of an assembly, or the six reading frames of a sequence.
+
+    Arguments:
+     - sequences - An iterable of strings, Seq or MutableSeq objects.
+     - table, stop_symbol, to_stop, gap - As for the translate function.
+
+    Returns a list with a string for each string, and a Seq object for each
+    Seq or MutableSeq object.
+
+    >>> coding_dna = "GTGGCCATTGTAATGGGCCGCTGAAAGGGTGCCCGATAG"
+    >>> translate_many([coding_dna, coding_dna[3:15], "ATG---AAA"], gap="-")
+    ['VAIVMGR*KGAR*', 'AIVM', 'M-K']
+    >>> translate_many([coding_dna, coding_dna[3:15]], table=2, to_stop=True)
+    ['VAIVMGRWKGAR', 'AIVM']
+
+    For example, to translate all six reading frames of a sequence:
+
+    >>> from Bio.Seq import Seq
+    >>> dna = Seq("AUGGCCAUUGUAAUGGGCCGCUGA")
+    >>> rna = dna.reverse_complement()
+    >>> frames = [dna, dna[1:], dna[2:], rna, rna[1:], rna[2:]]
+    >>> frames = [frame[: len(frame) // 3 * 3] for frame in frames]
+    >>> for protein in translate_many(frames):
+    ...     print(protein)
+    MAIVMGR*
+    WPL*WAA
+    GHCNGPL
+    SAAHYNGH
+    QRPITMA
+    SGPLQWP
+
+    """
+    codon_table = _get_codon_table(table)
+    translator = _get_codon_translator(codon_table)
+    translator.check_dual_coding(to_stop)
+    if gap is not None:
+        if not isinstance(gap, str):
+            raise TypeError("Gap character should be a single character string.")
+        elif len(gap) > 1:
+            raise ValueError("Gap character should be a single character string.")
+    sequences = list(sequences)
+    blocks = []
+    for sequence in sequences:
+        n = len(sequence)
+        try:
+            data = str(sequence).upper()
+        except UndefinedSequenceError:
+            # translating an undefined sequence yields an undefined
+            # sequence with the length divided by 3
+            data = None
+        if n % 3 != 0:
+            warnings.warn(
+                "Partial codon, len(sequence) not a multiple of three. "
+                "Explicitly trim the sequence or add trailing N before "
+                "translation. This may become an error in future.",
+                BiopythonWarning,
+            )
+        blocks.append(data)
+    data = b"".join(
+        translator.encode(block[: len(block) // 3 * 3]) for block in blocks if block
+    )
+    entries = translator.lookup(data)
+    proteins = []
+    start = 0
+    for sequence, block in zip(sequences, blocks):
+        if block is None:
+            proteins.append(Seq(None, len(sequence) // 3))
+            continue
+        end = start + len(block) // 3
+        protein = translator.finish(
+            block, entries[start:end], stop_symbol, to_stop, False, "X", gap
+        )
+        start = end
+        if isinstance(sequence, (Seq, MutableSeq)):
+            protein = Seq(protein)
+        proteins.append(protein)
+    return proteins
+
+
 def reverse_complement(sequence):
     """Return the reverse complement sequence of a nucleotide string.
 
@@ -152,7 +152,7 @@ class SeqFeature:
             raise TypeError(
                 "FeatureLocation, CompoundLocation (or None) required for the location"
             )
-        self.location = location
+        self._location = location
         self.type = type
         if location_operator:
             # TODO - Deprecation warning
@@ -173,6 +173,43 @@ class SeqFeature:
             # TODO - Deprecation warning
             self.ref_db = ref_db
 
+    def __getstate__(self):
+        """Return the state for pickling and copying.
+
+        Any SeqRecord feature indexes watching the location are left out.
+        """
+        state = self.__dict__.copy()
+        state.pop("_location_watchers", None)
+        return state
+
+    def __setstate__(self, state):
+        """Restore the state when unpickling or copying.
+
+        Objects pickled before location became a property stored it under
+        the name location rather than _location.
+        """
+        if "location" in state:
+            state = state.copy()
+            state["_location"] = state.pop("location")
+        self.__dict__.update(state)
+
+    def _get_location(self):
+        """Get function for the location property (PRIVATE)."""
+        return self._location
+
+    def _set_location(self, value):
+        """Set function for the location property (PRIVATE)."""
+        self._location = value
+        # Tell any SeqRecord feature index including this feature it is stale
+        for watcher in self.__dict__.pop("_location_watchers", ()):
+            watcher.stale = True
+
+    location = property(
+        fget=_get_location,
+        fset=_set_location,
+        doc="""Feature's location (FeatureLocation, CompoundLocation or None)""",
+    )
+
     def _get_strand(self):
         """Get function for the strand property (PRIVATE)."""
         return self.location.strand
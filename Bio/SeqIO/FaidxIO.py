@@ -0,0 +1,384 @@
+# Copyright 2021 by the Biopython developers.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+
+"""Random access to subsequences of FASTA files using samtools faidx indexes.
+
+The samtools ``faidx`` command indexes a FASTA file, writing a tab separated
+``.fai`` file with a line for each record giving its name, the sequence
+length, the offset of the first base in the file, the number of bases on
+each line, and the number of bytes in each line (including the new line).
+This requires all the sequence lines of a record are the same length, except
+for the last one.
+
+With this information, the position in the file of any base can be
+calculated, so a subsequence can be read without parsing the whole record.
+The FaidxIndex class uses (or creates) such an index, giving SeqRecord
+objects whose sequence is only read from the file when (and as far as) it is
+requested, like the sequences from the Bio.SeqIO.TwoBitIO parser.
+
+FASTA files compressed with bgzip (BGZF) are also supported, using the
+``.gzi`` index of the compressed block offsets (which is also created if
+missing) and Bio.bgzf for reading.
+
+For example,
+
+>>> from Bio.SeqIO.FaidxIO import FaidxIndex
+>>> genome = FaidxIndex("Fasta/faidx.fasta")
+>>> list(genome)
+['chr1', 'chr2', 'empty', 'chr3']
+>>> record = genome["chr2"]
+>>> len(record)
+100
+>>> print(record.seq[58:66])
+ACGTtttt
+>>> print(genome.fetch("chr3", 0, 5))
+NNNNA
+>>> genome.close()
+"""
+
+import os
+import struct
+
+from Bio import bgzf
+from Bio.Seq import Seq, SequenceDataAbstractBaseClass
+from Bio.SeqRecord import SeqRecord
+
+
+class _FaidxSequenceData(SequenceDataAbstractBaseClass):
+    """Sequence data of a FASTA record read on demand via an faidx index (PRIVATE).
+
+    Only two methods are provided: __len__ and __getitem__. The former will
+    return the length of the sequence, while the latter reads the requested
+    region of the sequence from the file and returns it as a bytes object
+    (or as an integer for a single letter, as indexing bytes does).
+    """
+
+    def __init__(self, index, length, offset, linebases, linewidth):
+        """Initialize with the FaidxIndex and the record's index entry."""
+        self.index = index
+        self.length = length
+        self.offset = offset
+        self.linebases = linebases
+        self.linewidth = linewidth
+        super().__init__()
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            start, end, step = key.indices(self.length)
+            if len(range(start, end, step)) == 0:
+                return b""
+            if step < 0:
+                # Read the region forwards, then take the requested letters
+                first = start + step * (len(range(start, end, step)) - 1)
+                data = self._read(first, start + 1)
+                return data[::-1][::-step]
+            return self._read(start, end)[::step]
+        if key < 0:
+            key += self.length
+        if not 0 <= key < self.length:
+            raise IndexError("sequence index out of range")
+        return self._read(key, key + 1)[0]
+
+    def __len__(self):
+        return self.length
+
+    def _position(self, i):
+        """Return the (uncompressed) file offset of the letter i (PRIVATE)."""
+        lines, column = divmod(i, self.linebases)
+        return self.offset + lines * self.linewidth + column
+
+    def _read(self, start, end):
+        """Return the sequence letters from start to end as bytes (PRIVATE)."""
+        first = self._position(start)
+        last = self._position(end - 1)
+        data = self.index._read(first, last + 1 - first)
+        if self.linewidth != self.linebases:
+            data = data.translate(None, b"\r\n")
+        if len(data) != end - start:
+            raise ValueError(
+                "Read %i letters, not %i; is the index out of date?"
+                % (len(data), end - start)
+            )
+        return data
+
+
+def _scan_fasta(handle):
+    """Scan a FASTA file (as a binary handle), returning the faidx entries (PRIVATE).
+
+    Returns a list of (name, length, offset, linebases, linewidth) tuples,
+    where offsets are positions in the uncompressed data.
+    """
+    entries = []
+    names = set()
+    name = None
+    length = offset = linebases = linewidth = position = 0
+    last_line = False
+    for line in handle:
+        if line.startswith(b">"):
+            if name is not None:
+                entries.append((name, length, offset, linebases, linewidth))
+            try:
+                name = line[1:].split(None, 1)[0].decode()
+            except IndexError:
+                raise ValueError("Missing name in FASTA title line %r" % line) from None
+            if name in names:
+                raise ValueError("Duplicate name '%s'" % name)
+            names.add(name)
+            length = 0
+            offset = position + len(line)
+            linebases = linewidth = 0
+            last_line = False
+        elif name is None:
+            if line.strip():
+                raise ValueError("Expected FASTA record starting with '>'")
+        else:
+            bases = len(line.rstrip(b"\r\n"))
+            if bases:
+                if last_line:
+                    raise ValueError(
+                        "Different line length in sequence '%s' at offset %i"
+                        % (name, position)
+                    )
+                if not linebases:
+                    linebases = bases
+                    linewidth = len(line)
+                elif bases != linebases or len(line) != linewidth:
+                    if bases > linebases:
+                        raise ValueError(
+                            "Different line length in sequence '%s' at offset %i"
+                            % (name, position)
+                        )
+                    # Should be the last line of the sequence
+                    last_line = True
+                length += bases
+            else:
+                # Blank lines are only allowed at the end of the sequence
+                last_line = True
+        position += len(line)
+    if name is not None:
+        entries.append((name, length, offset, linebases, linewidth))
+    return entries
+
+
+def _bgzf_block_offsets(filename):
+    """Return the (compressed, uncompressed) block offsets of a BGZF file (PRIVATE).
+
+    This gives the same information as a .gzi index file, including the
+    first block at (0, 0).
+    """
+    offsets = []
+    with open(filename, "rb") as handle:
+        for start, raw_length, data_start, data_length in bgzf.BgzfBlocks(handle):
+            if data_length:
+                offsets.append((start, data_start))
+    if not offsets:
+        offsets.append((0, 0))
+    return offsets
+
+
+def read_fai(fai_filename):
+    """Read a samtools faidx .fai file.
+
+    Returns a list of (name, length, offset, linebases, linewidth) tuples.
+    """
+    entries = []
+    with open(fai_filename) as handle:
+        for line in handle:
+            fields = line.rstrip("\r\n").split("\t")
+            if len(fields) < 5:
+                raise ValueError("Expected five columns in .fai line %r" % line)
+            name = fields[0]
+            length, offset, linebases, linewidth = (int(x) for x in fields[1:5])
+            entries.append((name, length, offset, linebases, linewidth))
+    return entries
+
+
+def write_fai(entries, fai_filename):
+    """Write a list of (name, length, offset, linebases, linewidth) to a .fai file."""
+    with open(fai_filename, "w") as handle:
+        for entry in entries:
+            handle.write("%s\t%i\t%i\t%i\t%i\n" % entry)
+
+
+def read_gzi(gzi_filename):
+    """Read a bgzip .gzi file of (compressed, uncompressed) block offsets.
+
+    Returns a list of (compressed, uncompressed) offset tuples, starting
+    with the implicit first block at (0, 0).
+    """
+    with open(gzi_filename, "rb") as handle:
+        data = handle.read()
+    if len(data) < 8:
+        raise ValueError("Truncated .gzi file")
+    (count,) = struct.unpack_from("<Q", data)
+    if len(data) != 8 + 16 * count:
+        raise ValueError("Expected %i entries in .gzi file" % count)
+    values = struct.unpack_from("<%iQ" % (2 * count), data, 8)
+    return [(0, 0)] + list(zip(values[::2], values[1::2]))
+
+
+def write_gzi(offsets, gzi_filename):
+    """Write (compressed, uncompressed) block offsets to a bgzip .gzi file.
+
+    The first block at (0, 0) is implicit, and is not written.
+    """
+    offsets = [offset for offset in offsets if offset != (0, 0)]
+    with open(gzi_filename, "wb") as handle:
+        handle.write(struct.pack("<Q", len(offsets)))
+        for compressed, uncompressed in offsets:
+            handle.write(struct.pack("<QQ", compressed, uncompressed))
+
+
+def _is_current(index_filename, filename):
+    """Check the index file exists, and is not older than the file (PRIVATE)."""
+    try:
+        return os.path.getmtime(index_filename) >= os.path.getmtime(filename)
+    except OSError:
+        return False
+
+
+def _try_writing(write_function, data, index_filename):
+    """Write an index file if possible, otherwise remove any partial file (PRIVATE)."""
+    try:
+        write_function(data, index_filename)
+    except OSError:
+        try:
+            os.remove(index_filename)
+        except OSError:
+            pass
+
+
+class FaidxIndex:
+    """Dictionary like random access to the records of an indexed FASTA file.
+
+    Arguments:
+     - filename - the FASTA file, which may be plain text or compressed
+       with bgzip (BGZF)
+     - fai_filename - the faidx index, default filename plus ".fai"
+     - gzi_filename - the BGZF block index (only used for bgzipped files),
+       default filename plus ".gzi"
+
+    If the index files do not exist, or are older than the FASTA file, the
+    FASTA file is scanned and they are written (as with ``samtools faidx``).
+    If they can not be written (e.g. in a read only directory), the index is
+    just kept in memory. The keys are the record names
+    (the first word of the title lines), in the order in the file. The
+    values are SeqRecord objects with lazily loaded sequences, so slicing
+    reads only the requested part of the file.
+
+    The file is kept open until the close method is called (or at the end
+    of a with statement).
+    """
+
+    def __init__(self, filename, fai_filename=None, gzi_filename=None):
+        """Load or create the index, and open the FASTA file."""
+        if fai_filename is None:
+            fai_filename = filename + ".fai"
+        if gzi_filename is None:
+            gzi_filename = filename + ".gzi"
+        self.filename = filename
+        with open(filename, "rb") as handle:
+            compressed = handle.read(2) == b"\x1f\x8b"
+        if compressed:
+            if _is_current(gzi_filename, filename):
+                self._blocks = read_gzi(gzi_filename)
+            else:
+                self._blocks = _bgzf_block_offsets(filename)
+                _try_writing(write_gzi, self._blocks, gzi_filename)
+            self._block_starts = [uncompressed for (_, uncompressed) in self._blocks]
+            self._handle = bgzf.BgzfReader(filename, "rb")
+        else:
+            self._blocks = None
+            self._handle = open(filename, "rb")
+        if _is_current(fai_filename, filename):
+            entries = read_fai(fai_filename)
+        else:
+            try:
+                self._seek(0)
+                entries = _scan_fasta(self._handle)
+            except ValueError:
+                self._handle.close()
+                raise
+            _try_writing(write_fai, entries, fai_filename)
+        self._entries = {entry[0]: entry[1:] for entry in entries}
+
+    def _seek(self, offset):
+        """Move to the given uncompressed offset in the FASTA file (PRIVATE)."""
+        if self._blocks is None:
+            self._handle.seek(offset)
+            return
+        # Find the last block starting at or before this offset
+        low, high = 0, len(self._block_starts)
+        while low < high:
+            middle = (low + high) // 2
+            if self._block_starts[middle] <= offset:
+                low = middle + 1
+            else:
+                high = middle
+        compressed, uncompressed = self._blocks[low - 1]
+        self._handle.seek(bgzf.make_virtual_offset(compressed, offset - uncompressed))
+
+    def _read(self, offset, size):
+        """Read size bytes from the given uncompressed offset (PRIVATE)."""
+        if self._handle is None:
+            raise ValueError("cannot retrieve sequence: file is closed")
+        self._seek(offset)
+        return self._handle.read(size)
+
+    def __getitem__(self, name):
+        """Return the SeqRecord for the given name, with a lazily loaded sequence."""
+        length, offset, linebases, linewidth = self._entries[name]
+        data = _FaidxSequenceData(self, length, offset, linebases, linewidth)
+        return SeqRecord(Seq(data), id=name, name=name, description="")
+
+    def fetch(self, name, start=None, end=None):
+        """Return the sequence of the named record from start to end as a string.
+
+        As in Python, start and end are zero based and end is exclusive. This
+        is a shortcut for ``str(index[name].seq[start:end])``.
+        """
+        length, offset, linebases, linewidth = self._entries[name]
+        data = _FaidxSequenceData(self, length, offset, linebases, linewidth)
+        return data[start:end].decode("ASCII")
+
+    def __contains__(self, name):
+        """Return True if there is a record with this name."""
+        return name in self._entries
+
+    def __iter__(self):
+        """Iterate over the record names."""
+        return iter(self._entries)
+
+    def keys(self):
+        """Return the record names."""
+        return self._entries.keys()
+
+    def lengths(self):
+        """Return a dictionary of the record names and sequence lengths."""
+        return {name: entry[0] for name, entry in self._entries.items()}
+
+    def __len__(self):
+        """Return the number of records."""
+        return len(self._entries)
+
+    def close(self):
+        """Close the FASTA file."""
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+
+    run_doctest()
@@ -53,13 +53,20 @@ from .Interfaces import SequenceIterator, SequenceWriter, _get_seq_string
 class GenBankIterator(SequenceIterator):
     """Parser for GenBank files."""
 
-    def __init__(self, source):
+    def __init__(self, source, feature_types=None, lazy_features=False):
         """Break up a Genbank file into SeqRecord objects.
 
         Argument source is a file-like object opened in text mode or a path to a file.
         Every section from the LOCUS line to the terminating // becomes
         a single SeqRecord with associated annotation and features.
 
+        Optional arguments:
+         - feature_types - List of feature types (e.g. ["CDS", "gene"]) to
+           include; other features are skipped without parsing them.
+         - lazy_features - If True, the location and qualifiers of each
+           feature are only parsed when first used, which saves time when
+           most features are not used.
+
         Note that for genomes or chromosomes, there is typically only
         one record.
 
@@ -89,25 +96,43 @@ class GenBankIterator(SequenceIterator):
         L31939.1
         AF297471.1
 
+        To read only the CDS features of a genome, parsing each of them only
+        if needed:
+
+        >>> with open("GenBank/NC_005816.gb") as handle:
+        ...     for record in GenBankIterator(handle, ["CDS"], lazy_features=True):
+        ...         cds = [f for f in record.features if f.location.start < 2000]
+        ...         tags = cds[0].qualifiers["locus_tag"]
+        ...         print(record.id, len(record.features), tags)
+        ...
+        NC_005816.1 10 ['YP_pPCP01']
+
         """
+        self.feature_types = feature_types
+        self.lazy_features = lazy_features
         super().__init__(source, mode="t", fmt="GenBank")
 
     def parse(self, handle):
         """Start parsing the file, and return a SeqRecord generator."""
-        records = GenBankScanner(debug=0).parse_records(handle)
+        records = GenBankScanner(debug=0).parse_records(
+            handle, feature_types=self.feature_types, lazy_features=self.lazy_features
+        )
         return records
 
 
 class EmblIterator(SequenceIterator):
     """Parser for EMBL files."""
 
-    def __init__(self, source):
+    def __init__(self, source, feature_types=None, lazy_features=False):
         """Break up an EMBL file into SeqRecord objects.
 
         Argument source is a file-like object opened in text mode or a path to a file.
         Every section from the LOCUS line to the terminating // becomes
         a single SeqRecord with associated annotation and features.
 
+        The optional feature_types and lazy_features arguments are as for
+        the GenBankIterator.
+
         Note that for genomes or chromosomes, there is typically only
         one record.
 
@@ -144,11 +169,15 @@ class EmblIterator(SequenceIterator):
         CQ797900.1
 
         """
+        self.feature_types = feature_types
+        self.lazy_features = lazy_features
         super().__init__(source, mode="t", fmt="EMBL")
 
     def parse(self, handle):
         """Start parsing the file, and return a SeqRecord generator."""
-        records = EmblScanner(debug=0).parse_records(handle)
+        records = EmblScanner(debug=0).parse_records(
+            handle, feature_types=self.feature_types, lazy_features=self.lazy_features
+        )
         return records
 
 
@@ -368,6 +368,11 @@ from math import log
 import warnings
 from Bio import BiopythonWarning, BiopythonParserWarning
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 # define score offsets. See discussion for differences between Sanger and
 # Solexa offsets.
@@ -1314,6 +1319,259 @@ def FastqIlluminaIterator(source, alphabet=None, title2ids=None):
         yield record
 
 
+class FastqBatch:
+    """A batch of FASTQ reads held in contiguous NumPy arrays.
+
+    This is what FastqBatchIterator yields. Rather than one SeqRecord per
+    read, all the reads in the batch share a few flat buffers:
+
+     - titles - list of the title lines (without the leading @)
+     - sequences - uint8 array of the ASCII sequence letters of all the
+       reads, concatenated
+     - qualities - uint8 array of the matching PHRED quality scores
+     - offsets - int64 array of length len(batch) + 1; read i occupies
+       offsets[i]:offsets[i + 1] in both sequences and qualities
+
+    Indexing the batch with an integer gives a (title, sequence, qualities)
+    tuple, where the sequence is a string and the qualities are a view into
+    the qualities array.
+    """
+
+    def __init__(self, titles, sequences, qualities, offsets):
+        """Initialize the class."""
+        if len(offsets) != len(titles) + 1:
+            raise ValueError("Expected one more offset than titles")
+        if len(sequences) != len(qualities) or len(sequences) != offsets[-1]:
+            raise ValueError("Lengths of sequences and qualities do not match")
+        self.titles = titles
+        self.sequences = sequences
+        self.qualities = qualities
+        self.offsets = offsets
+
+    def __len__(self):
+        """Return the number of reads in the batch."""
+        return len(self.titles)
+
+    def __getitem__(self, index):
+        """Return (title, sequence, qualities) for the read at index."""
+        title = self.titles[index]
+        if index < 0:
+            index += len(self.titles)
+        start, end = self.offsets[index], self.offsets[index + 1]
+        sequence = self.sequences[start:end].tobytes().decode("ASCII")
+        return title, sequence, self.qualities[start:end]
+
+    def __iter__(self):
+        """Iterate over the reads as (title, sequence, qualities) tuples."""
+        for index in range(len(self.titles)):
+            yield self[index]
+
+    def __repr__(self):
+        """Return a concise summary of the batch."""
+        return "<%s with %i reads, %i bases>" % (
+            self.__class__.__name__,
+            len(self),
+            len(self.sequences),
+        )
+
+    @property
+    def ids(self):
+        """List of the read identifiers (first word of each title)."""
+        return [title.split(None, 1)[0] for title in self.titles]
+
+    @property
+    def lengths(self):
+        """Array of the read lengths."""
+        return numpy.diff(self.offsets)
+
+    def mean_qualities(self):
+        """Return an array of the mean PHRED quality of each read.
+
+        Reads of length zero are given a mean quality of zero.
+
+        >>> from Bio.SeqIO.QualityIO import FastqBatchIterator
+        >>> batch = next(FastqBatchIterator("Quality/example.fastq"))
+        >>> ["%0.1f" % q for q in batch.mean_qualities()]
+        ['25.3', '24.5', '23.4']
+        """
+        lengths = self.lengths
+        cumulative = numpy.zeros(len(self.qualities) + 1, numpy.int64)
+        numpy.cumsum(self.qualities, out=cumulative[1:])
+        sums = cumulative[self.offsets[1:]] - cumulative[self.offsets[:-1]]
+        return sums / numpy.maximum(lengths, 1)
+
+    def select(self, mask):
+        """Return a new batch with just the reads where mask is True.
+
+        The mask can be a boolean array with one entry per read, or an
+        array of read indices.
+
+        >>> from Bio.SeqIO.QualityIO import FastqBatchIterator
+        >>> batch = next(FastqBatchIterator("Quality/example.fastq"))
+        >>> batch.select(batch.lengths > 20)
+        <FastqBatch with 3 reads, 75 bases>
+        >>> batch.select([2, 0]).ids
+        ['EAS54_6_R1_2_1_443_348', 'EAS54_6_R1_2_1_413_324']
+        """
+        mask = numpy.asarray(mask)
+        lengths = self.lengths
+        if mask.dtype == bool:
+            if len(mask) != len(lengths):
+                raise ValueError("Mask length does not match the number of reads")
+            indices = numpy.flatnonzero(mask)
+        else:
+            indices = mask.astype(numpy.intp)
+        lengths = lengths[indices]
+        offsets = numpy.zeros(len(indices) + 1, numpy.int64)
+        numpy.cumsum(lengths, out=offsets[1:])
+        # Position of each selected base in the original buffers:
+        bases = numpy.arange(offsets[-1]) + numpy.repeat(
+            self.offsets[indices] - offsets[:-1], lengths
+        )
+        titles = [self.titles[i] for i in indices]
+        return FastqBatch(titles, self.sequences[bases], self.qualities[bases], offsets)
+
+    def trim(self, min_quality):
+        """Return a new batch with low quality 3' ends trimmed off each read.
+
+        Each read is cut after the last base with a PHRED quality of at least
+        min_quality. Reads where no base reaches that quality become empty,
+        but are kept (use select to remove them).
+
+        >>> from Bio.SeqIO.QualityIO import FastqBatchIterator
+        >>> batch = next(FastqBatchIterator("Quality/example.fastq"))
+        >>> batch.lengths.tolist()
+        [25, 25, 25]
+        >>> batch.trim(26).lengths.tolist()
+        [23, 23, 19]
+        """
+        lengths = self.lengths
+        total = len(self.qualities)
+        starts = numpy.repeat(self.offsets[:-1], lengths)
+        # One based position within the read of each base passing the cut off
+        within = numpy.arange(1, total + 1) - starts
+        within[self.qualities < min_quality] = 0
+        new_lengths = numpy.zeros(len(lengths), numpy.int64)
+        # Only reduce over non-empty reads, as reduceat returns the element
+        # at the start position for an empty segment:
+        nonempty = lengths > 0
+        if nonempty.any():
+            new_lengths[nonempty] = numpy.maximum.reduceat(
+                within, self.offsets[:-1][nonempty]
+            )
+        keep = numpy.arange(1, total + 1) - starts <= numpy.repeat(new_lengths, lengths)
+        offsets = numpy.zeros(len(lengths) + 1, numpy.int64)
+        numpy.cumsum(new_lengths, out=offsets[1:])
+        return FastqBatch(
+            list(self.titles), self.sequences[keep], self.qualities[keep], offsets
+        )
+
+
+def FastqBatchIterator(
+    source,
+    batch_size=100000,
+    fmt="fastq",
+    trim_quality=None,
+    min_mean_quality=None,
+    min_length=None,
+):
+    """Iterate over a FASTQ file in batches of reads held in NumPy arrays.
+
+    Arguments:
+     - source - input stream opened in text mode, or a path to a file
+     - batch_size - maximum number of reads in each batch (before any
+       filtering is applied)
+     - fmt - "fastq" (or "fastq-sanger") for PHRED scores with an ASCII
+       offset of 33, or "fastq-illumina" for an offset of 64
+     - trim_quality - optional PHRED score; if given the 3' end of each read
+       is trimmed back to the last base with at least this quality
+     - min_mean_quality - optional; reads (after trimming) with a lower
+       mean PHRED quality are discarded
+     - min_length - optional; reads (after trimming) shorter than this are
+       discarded
+
+    This yields FastqBatch objects. It is built on the FastqGeneralIterator,
+    but avoids creating a SeqRecord (with its Seq object and list of quality
+    scores) for every read, which makes it much faster and far more memory
+    efficient for quality control of large sequencing runs:
+
+    >>> from Bio.SeqIO.QualityIO import FastqBatchIterator
+    >>> for batch in FastqBatchIterator("Quality/example.fastq", batch_size=2):
+    ...     print("%i reads: %s" % (len(batch), ", ".join(batch.ids)))
+    ...
+    2 reads: EAS54_6_R1_2_1_413_324, EAS54_6_R1_2_1_540_792
+    1 reads: EAS54_6_R1_2_1_443_348
+
+    Each read in a batch is available as a tuple of its title, sequence and
+    PHRED qualities:
+
+    >>> title, seq, qual = batch[0]
+    >>> print(seq)
+    GTTGCTTCTGGCGTGGGTGGGGGGG
+    >>> qual[:5].tolist()
+    [26, 26, 26, 26, 26]
+
+    Solexa style FASTQ files are not supported, as their scores can be
+    negative and are not PHRED scores.
+    """
+    if numpy is None:
+        from Bio import MissingPythonDependencyError
+
+        raise MissingPythonDependencyError(
+            "Please install NumPy if you want to use FastqBatchIterator."
+        )
+    if fmt in ("fastq", "fastq-sanger"):
+        offset, max_quality = SANGER_SCORE_OFFSET, 93
+    elif fmt == "fastq-illumina":
+        offset, max_quality = SOLEXA_SCORE_OFFSET, 62
+    else:
+        raise ValueError("Unsupported FASTQ variant %r" % fmt)
+    if batch_size < 1:
+        raise ValueError("The batch size must be at least one")
+    # Lookup table from ASCII code to PHRED score; 255 marks invalid letters
+    q_mapping = numpy.full(256, 255, numpy.uint8)
+    q_mapping[offset : offset + max_quality + 1] = numpy.arange(max_quality + 1)
+
+    records = FastqGeneralIterator(source)
+    while True:
+        titles = []
+        seqs = []
+        quals = []
+        for title, seq, qual in records:
+            titles.append(title)
+            seqs.append(seq)
+            quals.append(qual)
+            if len(titles) == batch_size:
+                break
+        if not titles:
+            return
+        offsets = numpy.zeros(len(titles) + 1, numpy.int64)
+        numpy.cumsum([len(seq) for seq in seqs], out=offsets[1:])
+        try:
+            sequences = numpy.frombuffer("".join(seqs).encode("ASCII"), numpy.uint8)
+            qualities = q_mapping[
+                numpy.frombuffer("".join(quals).encode("ASCII"), numpy.uint8)
+            ]
+        except UnicodeEncodeError:
+            raise ValueError("Non-ASCII character in FASTQ record") from None
+        if (qualities == 255).any():
+            raise ValueError("Invalid character in quality string")
+        batch = FastqBatch(titles, sequences, qualities, offsets)
+        if trim_quality is not None:
+            batch = batch.trim(trim_quality)
+        if min_mean_quality is not None or min_length is not None:
+            keep = numpy.ones(len(batch), bool)
+            if min_mean_quality is not None:
+                keep &= batch.mean_qualities() >= min_mean_quality
+            if min_length is not None:
+                keep &= batch.lengths >= min_length
+            if not keep.all():
+                batch = batch.select(keep)
+        yield batch
+        if len(titles) < batch_size:
+            return
+
+
 class QualPhredIterator(SequenceIterator):
     """Parser for QUAL files with PHRED quality scores but no sequence."""
 
@@ -746,7 +746,7 @@ def to_dict(sequences, key_function=None):
     return d
 
 
-def index(filename, format, alphabet=None, key_function=None):
+def index(filename, format, alphabet=None, key_function=None, index_filename=None):
     """Indexes a sequence file and returns a dictionary like object.
 
     Arguments:
@@ -756,6 +756,8 @@ def index(filename, format, alphabet=None, key_function=None):
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique key for the
        dictionary.
+     - index_filename - Optional filename where the keys and offsets are
+       saved as a compact binary index, to be reused next time (see below).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values.
@@ -850,6 +852,16 @@ def index(filename, format, alphabet=None, key_function=None):
     to be completely parsed while building the index. Right now this is
     usually avoided.
 
+    For very large files, scanning the file every time and holding all the
+    keys and offsets in memory can be slow. If you give an index_filename,
+    the keys, offsets and record lengths are instead saved there as a
+    compact binary file which is memory mapped. Next time the same index
+    file is used, provided the sequence file is unmodified (same inode,
+    size and modification time) and the format and name of the key_function
+    are unchanged, it is loaded almost instantly without scanning the
+    sequence file, and needs very little RAM. Otherwise, it is rebuilt.
+    This requires string keys.
+
     See Also: Bio.SeqIO.index_db() and Bio.SeqIO.to_dict()
 
     """
@@ -867,7 +879,7 @@ def index(filename, format, alphabet=None, key_function=None):
 
     # Map the file format to a sequence iterator:
     from ._index import _FormatToRandomAccess  # Lazy import
-    from Bio.File import _IndexedSeqFileDict
+    from Bio.File import _IndexedSeqFileDict, _IndexFileSeqFileDict
 
     try:
         proxy_class = _FormatToRandomAccess[format]
@@ -879,13 +891,29 @@ def index(filename, format, alphabet=None, key_function=None):
         alphabet,
         key_function,
     )
+    if index_filename is not None:
+        repr = repr[:-1] + ", index_filename=%r)" % index_filename
+        return _IndexFileSeqFileDict(
+            proxy_class(filename, format),
+            key_function,
+            repr,
+            "SeqRecord",
+            filename,
+            format,
+            index_filename,
+        )
     return _IndexedSeqFileDict(
         proxy_class(filename, format), key_function, repr, "SeqRecord"
     )
 
 
 def index_db(
-    index_filename, filenames=None, format=None, alphabet=None, key_function=None
+    index_filename,
+    filenames=None,
+    format=None,
+    alphabet=None,
+    key_function=None,
+    processes=1,
 ):
     """Index several sequence files and return a dictionary like object.
 
@@ -903,6 +931,8 @@ def index_db(
      - key_function - Optional callback function which when given a
        SeqRecord identifier string should return a unique
        key for the dictionary.
+     - processes - Optional number of worker processes to use when building
+       a new index (default 1).
 
     This indexing function will return a dictionary like object, giving the
     SeqRecord objects as values:
@@ -929,6 +959,14 @@ def index_db(
     BGZF compressed files are supported, and detected automatically. Ordinary
     GZIP compressed files are not supported.
 
+    Building the index for many (or large) files can be slow. With processes
+    above one, the files are scanned in parallel using a pool of worker
+    processes, and large uncompressed FASTA and FASTQ files (and similar
+    simple formats) are also split into pieces at record boundaries which
+    are scanned in parallel. The results are then bulk loaded into the
+    SQLite database in file order, giving the same index as with a single
+    process. Any key_function is applied in the main process.
+
     See Also: Bio.SeqIO.index() and Bio.SeqIO.to_dict(), and the Python module
     glob which is useful for building lists of files.
 
@@ -950,7 +988,7 @@ def index_db(
         raise ValueError("The alphabet argument is no longer supported")
 
     # Map the file format to a sequence iterator:
-    from ._index import _FormatToRandomAccess  # Lazy import
+    from ._index import _proxy_factory  # Lazy import
     from Bio.File import _SQLiteManySeqFilesDict
 
     repr = "SeqIO.index_db(%r, filenames=%r, format=%r, key_function=%r)" % (
@@ -960,15 +998,14 @@ def index_db(
         key_function,
     )
 
-    def proxy_factory(format, filename=None):
-        """Given a filename returns proxy object, else boolean if format OK."""
-        if filename:
-            return _FormatToRandomAccess[format](filename, format)
-        else:
-            return format in _FormatToRandomAccess
-
     return _SQLiteManySeqFilesDict(
-        index_filename, filenames, proxy_factory, format, key_function, repr
+        index_filename,
+        filenames,
+        _proxy_factory,
+        format,
+        key_function,
+        repr,
+        processes=processes,
     )
 
 
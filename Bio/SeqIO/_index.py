@@ -196,11 +196,32 @@ class SequentialSeqFileRandomAccess(SeqFileRandomAccess):
 
     def __iter__(self):
         """Return (id, offset, length) tuples."""
+        return self._iter_chunk(0, None)
+
+    def _can_split(self):
+        """Check if the _iter_chunk method is available (PRIVATE)."""
+        # Not for subclasses with their own logic for finding the identifiers
+        return type(self).__iter__ is SequentialSeqFileRandomAccess.__iter__
+
+    def _iter_chunk(self, start, end):
+        """Return (id, offset, length) tuples for records starting in a range (PRIVATE).
+
+        Gives the records starting at or after the start offset, and before
+        the end offset (or the end of the file if None). This allows a large
+        uncompressed file to be indexed in pieces.
+        """
+        if not self._can_split():
+            raise NotImplementedError("Not available for this file format.")
         marker_offset = len(self._marker)
         marker_re = self._marker_re
         handle = self._handle
-        handle.seek(0)
-        # Skip any header before first record
+        if start:
+            # Move to the start of the next line
+            handle.seek(start - 1)
+            handle.readline()
+        else:
+            handle.seek(0)
+        # Skip any header (or part of a record) before first record
         while True:
             start_offset = handle.tell()
             line = handle.readline()
@@ -208,6 +229,9 @@ class SequentialSeqFileRandomAccess(SeqFileRandomAccess):
                 break
         # Should now be at the start of a record, or end of the file
         while marker_re.match(line):
+            if end is not None and start_offset >= end:
+                # Start of the next chunk
+                return
             # Here we can assume the record.id is the first word after the
             # marker. This is generally fine... but not for GenBank, EMBL, Swiss
             id = line[marker_offset:].strip().split(None, 1)[0]
@@ -590,8 +614,47 @@ class FastqRandomAccess(SeqFileRandomAccess):
 
     def __iter__(self):
         """Iterate over the sequence records in the file."""
+        return self._iter_chunk(0, None)
+
+    def _can_split(self):
+        """Check if the _iter_chunk method is available (PRIVATE)."""
+        return True
+
+    def _iter_chunk(self, start, end):
+        """Return (id, offset, length) tuples for records starting in a range (PRIVATE).
+
+        Gives the records starting at or after the start offset, and before
+        the end offset (or the end of the file if None). This allows a large
+        uncompressed file to be indexed in pieces.
+
+        As quality lines can also start with "@", the first record after the
+        start offset is found assuming the usual four line FASTQ layout. It
+        is up to the caller to check the pieces join up, as this is not the
+        case for line wrapped FASTQ files.
+        """
         handle = self._handle
-        handle.seek(0)
+        if start:
+            # Move to the start of the next line
+            handle.seek(start - 1)
+            handle.readline()
+            while True:
+                start_offset = handle.tell()
+                lines = [handle.readline() for i in range(4)]
+                if not lines[0]:
+                    # No records start in this piece of the file
+                    return
+                if (
+                    lines[0][0:1] == b"@"
+                    and lines[2][0:1] == b"+"
+                    and len(lines[1].strip()) == len(lines[3].strip())
+                ):
+                    break
+                # Try the next line
+                handle.seek(start_offset)
+                handle.readline()
+            handle.seek(start_offset)
+        else:
+            handle.seek(0)
         id = None
         start_offset = handle.tell()
         line = handle.readline()
@@ -601,6 +664,9 @@ class FastqRandomAccess(SeqFileRandomAccess):
         if line[0:1] != b"@":
             raise ValueError("Problem with FASTQ @ line:\n%r" % line)
         while line:
+            if end is not None and start_offset >= end:
+                # Start of the next chunk
+                return
             # assert line[0]=="@"
             # This record seems OK (so far)
             id = line[1:].rstrip().split(None, 1)[0]
@@ -690,6 +756,19 @@ class FastqRandomAccess(SeqFileRandomAccess):
 
 ###############################################################################
 
+
+def _proxy_factory(format, filename=None):
+    """Given a filename returns proxy object, else boolean if format OK (PRIVATE).
+
+    This is used by Bio.SeqIO.index_db, and is defined here at the top level
+    of the module so that it can be passed to worker processes.
+    """
+    if filename:
+        return _FormatToRandomAccess[format](filename, format)
+    else:
+        return format in _FormatToRandomAccess
+
+
 _FormatToRandomAccess = {
     "ace": SequentialSeqFileRandomAccess,
     "embl": EmblRandomAccess,
@@ -14,6 +14,8 @@
 # need to be in sync (this is the BioSQL "Database SeqRecord").
 
 
+from bisect import bisect_left
+from bisect import bisect_right
 from io import StringIO
 from Bio import StreamModeError
 from Bio.Seq import UndefinedSequenceError
@@ -98,6 +100,138 @@ class _RestrictedDict(dict):
             self[key] = value
 
 
+class _FeatureList(list):
+    """List of the features of a SeqRecord, counting its modifications (PRIVATE).
+
+    Every method changing the list increases the version attribute, which
+    tells the feature index of the SeqRecord it needs rebuilding without
+    comparing the whole list.
+    """
+
+    version = 0
+
+    def _changed(name):
+        """Wrap a list method to increase the version when called (PRIVATE)."""
+        method = getattr(list, name)
+
+        def changed(self, *args, **kwargs):
+            self.version += 1
+            return method(self, *args, **kwargs)
+
+        changed.__name__ = name
+        changed.__doc__ = method.__doc__
+        return changed
+
+    __setitem__ = _changed("__setitem__")
+    __delitem__ = _changed("__delitem__")
+    __iadd__ = _changed("__iadd__")
+    __imul__ = _changed("__imul__")
+    append = _changed("append")
+    extend = _changed("extend")
+    insert = _changed("insert")
+    pop = _changed("pop")
+    remove = _changed("remove")
+    clear = _changed("clear")
+    reverse = _changed("reverse")
+    sort = _changed("sort")
+
+    del _changed
+
+
+class _LocationWatcher:
+    """Marker set as stale when the location of a watched feature changes (PRIVATE)."""
+
+    __slots__ = ("stale",)
+
+    def __init__(self):
+        """Initialize the watcher as not stale."""
+        self.stale = False
+
+
+class _FeatureIndex:
+    """Interval index of the feature locations of a SeqRecord (PRIVATE).
+
+    The features are grouped by the bit length of their length, so that
+    within each group the lengths differ by less than a factor of two.
+    Each group stores the start positions in sorted order, which allows the
+    features overlapping or contained in a region to be found by bisection
+    in O(log n + k) time.
+
+    Features without a location are not indexed. Features referencing other
+    sequences (e.g. from segmented GenBank records) are not indexed either,
+    but are counted in the references attribute.
+
+    Each feature is given a watcher, which its location setter marks as
+    stale. For a _FeatureList the version is used to notice changes to the
+    list; any other list is compared with a copy taken here.
+    """
+
+    def __init__(self, features):
+        """Index the locations of a list of features."""
+        if isinstance(features, _FeatureList):
+            self.features = features
+            self.version = features.version
+        else:
+            self.features = features[:]
+            self.version = None
+        self.watcher = _LocationWatcher()
+        self.references = 0
+        groups = {}
+        for i, feature in enumerate(features):
+            location = feature.location
+            # Set after reading the location, which could parse it (e.g.
+            # features parsed lazily from a GenBank file):
+            watchers = feature.__dict__.setdefault("_location_watchers", [])
+            watchers[:] = [watcher for watcher in watchers if not watcher.stale]
+            watchers.append(self.watcher)
+            if location is None:
+                continue
+            if location.ref or location.ref_db:
+                self.references += 1
+                continue
+            start = location.nofuzzy_start
+            end = location.nofuzzy_end
+            groups.setdefault((end - start).bit_length(), []).append((start, end, i))
+        self.groups = []
+        for intervals in groups.values():
+            intervals.sort()
+            starts, ends, indices = zip(*intervals)
+            lengths = [end - start for start, end, i in intervals]
+            self.groups.append(
+                (list(starts), list(ends), list(indices), min(lengths), max(lengths))
+            )
+
+    def is_current(self, features):
+        """Check if the index is still valid for this list of features."""
+        if self.watcher.stale:
+            return False
+        if self.version is None:
+            return self.features == features
+        return features is self.features and features.version == self.version
+
+    def overlapping(self, start, end):
+        """Return the indices of the features overlapping start:end, in order."""
+        indices = []
+        for starts, ends, group, shortest, longest in self.groups:
+            # An overlapping feature ends after start, so it cannot start
+            # at or before start - longest.
+            i = bisect_right(starts, start - longest)
+            j = bisect_left(starts, end)
+            indices.extend(group[k] for k in range(i, j) if ends[k] > start)
+        indices.sort()
+        return indices
+
+    def contained(self, start, end):
+        """Return the indices of the features within start:end, in order."""
+        indices = []
+        for starts, ends, group, shortest, longest in self.groups:
+            i = bisect_left(starts, start)
+            j = bisect_right(starts, end - shortest)
+            indices.extend(group[k] for k in range(i, j) if ends[k] <= end)
+        indices.sort()
+        return indices
+
+
 class SeqRecord:
     """A SeqRecord object holds a sequence and information about it.
 
@@ -239,7 +373,7 @@ class SeqRecord:
 
         # annotations about parts of the sequence
         if features is None:
-            features = []
+            features = _FeatureList()
         elif not isinstance(features, list):
             raise TypeError(
                 "features argument should be a list (of SeqFeature objects)"
@@ -496,22 +630,19 @@ class SeqRecord:
             if step == 1:
                 # Select relevant features, add them with shifted locations
                 # assert str(self.seq)[index] == str(self.seq)[start:stop]
-                for f in self.features:
-                    if f.ref or f.ref_db:
-                        # TODO - Implement this (with lots of tests)?
-                        import warnings
-
-                        warnings.warn(
-                            "When slicing SeqRecord objects, any "
-                            "SeqFeature referencing other sequences (e.g. "
-                            "from segmented GenBank records) are ignored."
-                        )
-                        continue
-                    if (
-                        start <= f.location.nofuzzy_start
-                        and f.location.nofuzzy_end <= stop
-                    ):
-                        answer.features.append(f._shift(-start))
+                feature_index = self._get_feature_index()
+                if feature_index.references:
+                    # TODO - Implement this (with lots of tests)?
+                    import warnings
+
+                    warnings.warn(
+                        "When slicing SeqRecord objects, any "
+                        "SeqFeature referencing other sequences (e.g. "
+                        "from segmented GenBank records) are ignored."
+                    )
+                features = self.features
+                for i in feature_index.contained(start, stop):
+                    answer.features.append(features[i]._shift(-start))
 
             # Slice all the values to match the sliced sequence
             # (this should also work with strides, even negative strides):
@@ -521,6 +652,72 @@ class SeqRecord:
             return answer
         raise ValueError("Invalid index")
 
+    def __getstate__(self):
+        """Return the state for pickling and copying, without the feature index."""
+        state = self.__dict__.copy()
+        state.pop("_feature_index", None)
+        return state
+
+    def _get_feature_index(self):
+        """Return the interval index of the features, building it if needed (PRIVATE).
+
+        The index is rebuilt if the features list was modified, or if the
+        location of any feature was replaced, since it was last built.
+        """
+        try:
+            feature_index = self._feature_index
+        except AttributeError:
+            feature_index = None
+        if feature_index is None or not feature_index.is_current(self.features):
+            if feature_index is not None:
+                feature_index.watcher.stale = True
+            feature_index = _FeatureIndex(self.features)
+            self._feature_index = feature_index
+        return feature_index
+
+    def find_features(self, start, end=None, contained=False):
+        """Return the features overlapping a position or region of the sequence.
+
+        Arguments:
+         - start - Start of the region (Python counting, zero based).
+         - end - End of the region (Python slice style, exclusive). If None,
+           the features overlapping the single position start are returned.
+         - contained - If True, only return the features lying completely
+           within the region, as used when slicing the SeqRecord.
+
+        The features are returned in the same order as in the features list.
+        The features are found using an interval index, which is built when
+        first needed and rebuilt after the features list was modified or a
+        feature location was replaced. Features referencing other sequences
+        (e.g. from segmented GenBank records) are ignored, as are features
+        without a location.
+
+        >>> from Bio import SeqIO
+        >>> record = SeqIO.read("GenBank/NC_005816.gb", "genbank")
+        >>> for feature in record.find_features(4500):
+        ...     print(feature.type, feature.location)
+        source [0:9609](+)
+        gene [4342:4780](+)
+        CDS [4342:4780](+)
+        >>> for feature in record.find_features(4300, 5000, contained=True):
+        ...     print(feature.type, feature.location)
+        gene [4342:4780](+)
+        CDS [4342:4780](+)
+
+        Note that changes within a location object itself (e.g. editing the
+        parts list of a CompoundLocation) are not detected; assign a new
+        location to the feature instead.
+        """
+        if end is None:
+            end = start + 1
+        feature_index = self._get_feature_index()
+        if contained:
+            indices = feature_index.contained(start, end)
+        else:
+            indices = feature_index.overlapping(start, end)
+        features = self.features
+        return [features[i] for i in indices]
+
     def __iter__(self):
         """Iterate over the letters in the sequence.
 
@@ -901,13 +1098,15 @@ class SeqRecord:
                 id=self.id,
                 name=self.name,
                 description=self.description,
-                features=self.features[:],
+                features=_FeatureList(self.features),
                 annotations=self.annotations.copy(),
                 dbxrefs=self.dbxrefs[:],
             )
         # Adding two SeqRecord objects... must merge annotation.
         answer = SeqRecord(
-            self.seq + other.seq, features=self.features[:], dbxrefs=self.dbxrefs[:]
+            self.seq + other.seq,
+            features=_FeatureList(self.features),
+            dbxrefs=self.dbxrefs[:],
         )
         # Will take all the features and all the db cross refs,
         length = len(self)
@@ -966,7 +1165,7 @@ class SeqRecord:
             id=self.id,
             name=self.name,
             description=self.description,
-            features=[f._shift(offset) for f in self.features],
+            features=_FeatureList(f._shift(offset) for f in self.features),
             annotations=self.annotations.copy(),
             dbxrefs=self.dbxrefs[:],
         )
@@ -1003,7 +1202,7 @@ class SeqRecord:
             name=self.name,
             description=self.description,
             dbxrefs=self.dbxrefs[:],
-            features=self.features[:],
+            features=_FeatureList(self.features),
             annotations=self.annotations.copy(),
             letter_annotations=self.letter_annotations.copy(),
         )
@@ -1046,7 +1245,7 @@ class SeqRecord:
             name=self.name,
             description=self.description,
             dbxrefs=self.dbxrefs[:],
-            features=self.features[:],
+            features=_FeatureList(self.features),
             annotations=self.annotations.copy(),
             letter_annotations=self.letter_annotations.copy(),
         )
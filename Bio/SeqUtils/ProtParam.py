@@ -256,6 +256,25 @@ class ProteinAnalysis:
         # (* 2 + 1) since the weight list is one sided:
         sum_of_weights = sum(weights) * 2 + 1
 
+        n = self.length - window + 1
+        if n > 0 and set(str(self.sequence)) <= set(param_dict):
+            # Without any non-standard amino acids to warn about, all windows
+            # can be calculated at once, adding the values in the same order
+            # as the loop below so that the scores are exactly the same.
+            import numpy
+
+            from Bio.SeqUtils.windows import _get_bytes, _scale_table
+
+            data = _get_bytes(self.sequence, 0, self.length)
+            values = _scale_table(param_dict)[numpy.frombuffer(data, numpy.uint8)]
+            score = numpy.zeros(n)
+            for j in range(window // 2):
+                front = values[j : j + n]
+                back = values[window - j - 1 : window - j - 1 + n]
+                score += weights[j] * front + weights[j] * back
+            score += values[window // 2 : window // 2 + n]
+            return (score / sum_of_weights).tolist()
+
         for i in range(self.length - window + 1):
             subsequence = self.sequence[i : i + window]
             score = 0.0
@@ -10,7 +10,6 @@
 """Miscellaneous functions for dealing with sequences."""
 
 
-import re
 from math import pi, sin, cos
 
 from Bio.Seq import Seq
@@ -95,9 +94,13 @@ def GC_skew(seq, window=100):
 
     Does NOT look at any ambiguous nucleotides.
     """
+    from Bio.SeqUtils.windows import window_statistics
+
+    values = window_statistics(seq, window, window, ["gc_skew"])["gc_skew"]
+    values = values.tolist()
+    # Include any partial window at the end:
     # 8/19/03: Iddo: added lowercase
-    values = []
-    for i in range(0, len(seq), window):
+    for i in range(len(values) * window, len(seq), window):
         s = seq[i : i + window]
         g = s.count("G") + s.count("g")
         c = s.count("C") + s.count("c")
@@ -175,7 +178,16 @@ def nt_search(seq, subseq):
 
     Use ambiguous values (like N = A or T or C or G, R = A or G etc.),
     searches only on forward strand.
+
+    >>> from Bio.SeqUtils import nt_search
+    >>> nt_search("ACGTRTAGAGTTAT", "RT")
+    ['[AG]T', 2, 9, 12]
+
+    To search both strands, or for many patterns at once, see the
+    NucleotideSearch class in Bio.SeqUtils.patterns.
     """
+    from Bio.SeqUtils.patterns import NucleotideSearch
+
     pattern = ""
     for nt in subseq:
         value = IUPACData.ambiguous_dna_values[nt]
@@ -184,17 +196,9 @@ def nt_search(seq, subseq):
         else:
             pattern += "[%s]" % value
 
-    pos = -1
-    result = [pattern]
-    while True:
-        pos += 1
-        s = seq[pos:]
-        m = re.search(pattern, s)
-        if not m:
-            break
-        pos += int(m.start(0))
-        result.append(pos)
-    return result
+    searcher = NucleotideSearch([subseq], both=False, ignore_case=False)
+    positions, strands = searcher.search(seq)[subseq]
+    return [pattern] + positions.tolist()
 
 
 ######################################
@@ -416,16 +420,22 @@ def six_frame_translations(seq, genetic_code=1):
     <BLANKLINE>
 
     """  # noqa for pep8 W291 trailing whitespace
-    from Bio.Seq import reverse_complement, translate
+    from Bio.Seq import reverse_complement, translate_many
 
     anti = reverse_complement(seq)
     comp = anti[::-1]
     length = len(seq)
-    frames = {}
+    fragments = []
     for i in range(0, 3):
         fragment_length = 3 * ((length - i) // 3)
-        frames[i + 1] = translate(seq[i : i + fragment_length], genetic_code)
-        frames[-(i + 1)] = translate(anti[i : i + fragment_length], genetic_code)[::-1]
+        fragments.append(seq[i : i + fragment_length])
+        fragments.append(anti[i : i + fragment_length])
+    # Translate all six frames in one go
+    translations = translate_many(fragments, genetic_code)
+    frames = {}
+    for i in range(0, 3):
+        frames[i + 1] = translations[2 * i]
+        frames[-(i + 1)] = translations[2 * i + 1][::-1]
 
     # create header
     if length > 20:
@@ -26,6 +26,12 @@ def lcc_mult(seq, wsize):
     l2 = math.log(2)
     tamseq = len(seq)
     upper = str(seq).upper()
+    if tamseq >= wsize and set(str(seq)) <= set("ACGT"):
+        # Unambiguous upper case DNA, the values can be calculated using
+        # cumulative counts of each letter.
+        from Bio.SeqUtils.windows import window_statistics
+
+        return [0] + window_statistics(seq, wsize, 1, ["lcc"])["lcc"].tolist()
     compone = [0]
     lccsal = [0]
     for i in range(wsize):
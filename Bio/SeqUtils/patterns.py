@@ -0,0 +1,208 @@
+# Copyright 2021 by the Biopython developers.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Search nucleotide sequences for IUPAC patterns.
+
+A NucleotideSearch object compiles a set of patterns, such as primers or
+adaptors, written using the IUPAC ambiguity codes (e.g. R = A or G). Its
+search method then finds all matches of all patterns, including overlapping
+matches, on both strands, in a single pass over the sequence:
+
+>>> from Bio.Seq import Seq
+>>> from Bio.SeqUtils.patterns import NucleotideSearch
+>>> searcher = NucleotideSearch(["GATC", "TTY"])
+>>> matches = searcher.search(Seq("AAAGATCCAGGAAATTCCTGG"))
+>>> positions, strands = matches["TTY"]
+>>> positions.tolist()
+[0, 10, 11, 14]
+>>> strands.tolist()
+[-1, -1, -1, 1]
+>>> positions, strands = matches["GATC"]
+>>> positions.tolist()
+[3, 3]
+>>> strands.tolist()
+[1, -1]
+
+Positions are the start of the match on the forward strand (Python
+counting), also for matches of the reverse complement of a pattern. A
+palindromic pattern such as GATC therefore matches each site on both
+strands. Use both=False to search the forward strand only.
+
+The sequence is read in chunks, so it need not be held in memory as a
+whole. To search the reads in a file, reuse the NucleotideSearch object
+for each record:
+
+>>> from Bio import SeqIO
+>>> searcher = NucleotideSearch(["CGTCTCN", "GAATTC"])
+>>> for record in SeqIO.parse("GenBank/NC_005816.fna", "fasta"):
+...     matches = searcher.search(record)
+...     print(record.id, len(matches["CGTCTCN"][0]), len(matches["GAATTC"][0]))
+gi|45478711|ref|NC_005816.1| 4 6
+
+"""
+
+import numpy
+
+from Bio.Data.IUPACData import ambiguous_dna_complement
+from Bio.Data.IUPACData import ambiguous_dna_values
+from Bio.SeqRecord import SeqRecord
+from Bio.SeqUtils.windows import _get_bytes
+
+
+# Number of patterns checked at the same time, one for each bit:
+_BITS = 64
+
+
+class NucleotideSearch:
+    """Search nucleotide sequences for a set of IUPAC patterns.
+
+    The patterns are compiled into lookup tables, with one bit for each
+    pattern (and for its reverse complement), which are used to check all
+    patterns for all positions in the sequence using NumPy operations.
+    """
+
+    def __init__(self, patterns, both=True, ignore_case=True):
+        """Compile the patterns.
+
+        Arguments:
+         - patterns - The patterns to search for, as a list of strings or
+           Seq objects (or a single string), using the IUPAC ambiguity codes
+           in Bio.Data.IUPACData.ambiguous_dna_values.
+         - both - Also search for the reverse complement of each pattern
+           (default True).
+         - ignore_case - Match upper and lower case letters in the sequence
+           (default True). The patterns themselves are case insensitive.
+
+        A letter in the sequence matches a letter in a pattern if it is one
+        of the nucleotides represented by it; ambiguous letters such as N
+        in the sequence are never matched.
+        """
+        if isinstance(patterns, str):
+            patterns = [patterns]
+        self.patterns = []
+        for pattern in patterns:
+            pattern = str(pattern)
+            if not pattern:
+                raise ValueError("Empty patterns cannot be searched for")
+            for letter in pattern.upper():
+                if letter not in ambiguous_dna_values:
+                    raise ValueError(
+                        f"Unknown letter '{letter}' in pattern '{pattern}'"
+                    )
+            if pattern not in self.patterns:
+                self.patterns.append(pattern)
+        self.both = both
+        self.ignore_case = ignore_case
+        # Each pattern to search for, with its index and strand:
+        targets = []
+        for index, pattern in enumerate(self.patterns):
+            pattern = pattern.upper()
+            targets.append((index, 1, pattern))
+            if both:
+                complement = "".join(ambiguous_dna_complement[c] for c in pattern)
+                targets.append((index, -1, complement[::-1]))
+        self._groups = []
+        for i in range(0, len(targets), _BITS):
+            self._groups.append(self._compile(targets[i : i + _BITS]))
+        self._length = max(len(pattern) for pattern in self.patterns)
+
+    def _compile(self, targets):
+        """Return the lookup tables for up to 64 patterns (PRIVATE).
+
+        Bit b of tables[j][c] is set if byte c matches position j of pattern
+        b, or if pattern b is shorter than j + 1.
+        """
+        length = max(len(pattern) for index, strand, pattern in targets)
+        tables = numpy.zeros((length, 256), numpy.uint64)
+        for bit, (index, strand, pattern) in enumerate(targets):
+            value = numpy.uint64(1 << bit)
+            for j in range(length):
+                if j < len(pattern):
+                    letters = ambiguous_dna_values[pattern[j]]
+                    if self.ignore_case:
+                        letters += letters.lower()
+                    codes = [ord(letter) for letter in letters]
+                else:
+                    codes = slice(None)
+                tables[j, codes] |= value
+        return tables, targets
+
+    def _search_chunk(self, data, n, tables):
+        """Return the positions of all matches starting before n (PRIVATE).
+
+        Returns an array of candidate positions, and an array with the bits
+        of the matching patterns at each position.
+        """
+        length = len(tables)
+        positions = None
+        matches = tables[0][data[:n]]
+        for j in range(1, length):
+            if positions is None:
+                matches &= tables[j][data[j : j + n]]
+                if j < length - 1 and numpy.count_nonzero(matches) * 16 < n:
+                    # Only check the remaining positions of the candidates:
+                    positions = numpy.flatnonzero(matches)
+                    matches = matches[positions]
+            else:
+                matches &= tables[j][data[positions + j]]
+        if positions is None:
+            positions = numpy.flatnonzero(matches)
+            matches = matches[positions]
+        return positions, matches
+
+    def search(self, seq, chunk_size=1048576):
+        """Find the matches of the patterns in a sequence.
+
+        Arguments:
+         - seq - The sequence (a string, Seq, MutableSeq, or SeqRecord
+           object).
+         - chunk_size - Approximate number of letters to process at a time.
+
+        Returns a dictionary mapping each pattern to a tuple of two NumPy
+        arrays, with the start position of each match on the forward strand,
+        and its strand (1 for the pattern, -1 for its reverse complement).
+        The matches are sorted by position, with forward strand matches
+        first.
+        """
+        if isinstance(seq, SeqRecord):
+            seq = seq.seq
+        n = len(seq)
+        found = [[] for group in self._groups]
+        for start in range(0, n, chunk_size):
+            end = min(start + chunk_size, n)
+            data = _get_bytes(seq, start, min(end + self._length - 1, n))
+            # Pad with zeros, which match no pattern, beyond the sequence end:
+            data = numpy.frombuffer(data + bytes(self._length), numpy.uint8)
+            for i, (tables, targets) in enumerate(self._groups):
+                positions, matches = self._search_chunk(data, end - start, tables)
+                if len(positions) > 0:
+                    found[i].append((positions + start, matches))
+        results = {}
+        for pattern in self.patterns:
+            results[pattern] = ([], [])
+        for (tables, targets), chunks in zip(self._groups, found):
+            for positions, matches in chunks:
+                for bit, (index, strand, pattern) in enumerate(targets):
+                    selected = positions[(matches >> numpy.uint64(bit)) & 1 == 1]
+                    if len(selected) > 0:
+                        pattern = self.patterns[index]
+                        results[pattern][0].append(selected)
+                        results[pattern][1].append(numpy.full(len(selected), strand))
+        for pattern, (positions, strands) in results.items():
+            if positions:
+                positions = numpy.concatenate(positions)
+                strands = numpy.concatenate(strands)
+                order = numpy.lexsort((-strands, positions))
+                results[pattern] = (positions[order], strands[order])
+            else:
+                results[pattern] = (numpy.zeros(0, int), numpy.zeros(0, int))
+        return results
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+
+    run_doctest()
@@ -0,0 +1,254 @@
+# Copyright 2021 by the Biopython developers.  All rights reserved.
+#
+# This file is part of the Biopython distribution and governed by your
+# choice of the "Biopython License Agreement" or the "BSD 3-Clause License".
+# Please see the LICENSE file that should have been included as part of this
+# package.
+"""Statistics over fixed or sliding windows along a sequence.
+
+The function window_statistics calculates the G+C content, the GC and AT
+skew, the Local Composition Complexity (LCC), and any number of per-letter
+property scales, for all windows along a sequence in a single pass:
+
+>>> from Bio.Seq import Seq
+>>> from Bio.SeqUtils.windows import window_statistics
+>>> seq = Seq("ACGGGCTACCGTATAGGCAAGAGATGATGCCC")
+>>> values = window_statistics(seq, 8, 8, ["gc", "gc_skew"])
+>>> values["gc"].tolist()
+[62.5, 50.0, 50.0, 62.5]
+>>> values["gc_skew"].tolist()
+[0.2, 0.0, 0.5, -0.2]
+
+Window i starts at position i * step; windows extending beyond the end of
+the sequence are not included. The sequence is read in chunks, so it need
+not be held in memory as a whole (e.g. a lazily loaded sequence from a
+2bit file). To calculate genome-wide tracks for a file with several
+records, use Bio.SeqIO to iterate over the records:
+
+>>> from Bio import SeqIO
+>>> for record in SeqIO.parse("Fasta/f002", "fasta"):
+...     values = window_statistics(record, 100, 50, ["gc", "lcc"])
+...     print(record.id, len(values["gc"]), values["gc"].max())
+gi|1348912|gb|G26680|G26680 11 50.0
+gi|1348917|gb|G26685|G26685 7 42.0
+gi|1592936|gb|G29385|G29385 8 52.0
+
+"""
+
+import math
+
+import numpy
+
+from Bio.SeqRecord import SeqRecord
+
+
+# The letters to count in each window for each statistic:
+_STATISTICS = {"gc": "GCS", "gc_skew": "GC", "at_skew": "AT", "lcc": "ACGT"}
+
+
+def _get_bytes(seq, start, end):
+    """Return the letters start:end of the sequence as bytes (PRIVATE)."""
+    data = seq[start:end]
+    if isinstance(data, str):
+        return data.encode("ascii", "replace")
+    return bytes(data)
+
+
+def _window_sums(values, starts, window, step):
+    """Return the sum of the values in each window (PRIVATE)."""
+    if step < window:
+        cumsum = numpy.zeros(len(values) + 1, numpy.int32)
+        numpy.cumsum(values, dtype=numpy.int32, out=cumsum[1:])
+        return cumsum[starts + window] - cumsum[starts]
+    # The windows don't overlap, so we can sum over each of them directly.
+    # The odd sums are over the gaps between the windows (if any); the last
+    # window ends at the end of the values.
+    indices = numpy.empty(2 * len(starts) - 1, numpy.intp)
+    indices[0::2] = starts
+    indices[1::2] = starts[:-1] + window
+    return numpy.add.reduceat(values, indices, dtype=numpy.int32)[0::2]
+
+
+def _scale_table(scale):
+    """Return the lookup table mapping bytes to the values of a scale (PRIVATE).
+
+    Lower case letters get the value of the upper case letter, unless the
+    scale defines them explicitly. Letters not in the scale get a value of 0.
+    """
+    table = numpy.zeros(256)
+    for letter in scale:
+        if len(letter) == 1 and letter.upper() in scale:
+            table[ord(letter.lower())] = scale[letter.upper()]
+    for letter, value in scale.items():
+        if len(letter) == 1:
+            table[ord(letter)] = value
+    return table
+
+
+def _lcc_terms(window):
+    """Return the LCC term for each possible count of a letter (PRIVATE).
+
+    This uses the same calculation as Bio.SeqUtils.lcc.lcc_mult.
+    """
+    l2 = math.log(2)
+    terms = [0.0]
+    for i in range(window):
+        terms.append(
+            ((i + 1) / float(window)) * ((math.log((i + 1) / float(window))) / l2)
+        )
+    return numpy.array(terms)
+
+
+def _skew(x, y):
+    """Return (x - y) / (x + y), or 0 where x + y is zero (PRIVATE)."""
+    total = x + y
+    skew = numpy.zeros(len(x))
+    numpy.divide(x - y, total, out=skew, where=total != 0)
+    return skew
+
+
+def window_statistics(
+    seq, window, step=1, statistics=("gc",), scales=None, edge=1.0, chunk_size=1048576
+):
+    """Calculate statistics for fixed or sliding windows along a sequence.
+
+    Arguments:
+     - seq - The sequence (a string, Seq, MutableSeq, or SeqRecord object).
+     - window - The window size (integer).
+     - step - The distance between the starts of consecutive windows
+       (integer). Use step=window for adjacent windows that don't overlap.
+     - statistics - The names of the statistics to calculate, any of:
+
+       - "gc" - G+C content as a percentage, counting G, C, and S, as in
+         Bio.SeqUtils.GC.
+       - "gc_skew" - GC skew (G-C)/(G+C), or 0 if there is no G or C, as
+         in Bio.SeqUtils.GC_skew.
+       - "at_skew" - AT skew (A-T)/(A+T), or 0 if there is no A or T.
+       - "lcc" - Local Composition Complexity, as in Bio.SeqUtils.lcc.
+
+     - scales - Optional dictionary of per-letter property scales (each a
+       dictionary mapping letters to values, e.g. from
+       Bio.SeqUtils.ProtParamData) to average over each window. Letters
+       missing from a scale are counted as zero.
+     - edge - Relative weight of the letters at the edges of the window
+       for the scales, as in ProteinAnalysis.protein_scale.
+     - chunk_size - Approximate number of letters to process at a time.
+
+    Letters are counted regardless of case. Returns a dictionary mapping the
+    name of each statistic and scale to a NumPy array with one value for
+    each window. Window i starts at position i * step; windows extending
+    beyond the end of the sequence are not included.
+
+    Each value is calculated from cumulative sums, so the time taken does
+    not depend on the window size. For the scales, the weights are
+    calculated as in ProteinAnalysis.protein_scale:
+
+    >>> from Bio.SeqUtils.ProtParamData import kd
+    >>> from Bio.SeqUtils.windows import window_statistics
+    >>> protein = "MAEGEITTFTALTEKFNLPPGNYKKPKLLYCSNGGHFLRILPDGTVDGTRDRSDQHIQ"
+    >>> values = window_statistics(protein, 9, 10, [], {"kd": kd}, 0.4)
+    >>> values["kd"].round(2).tolist()
+    [-0.08, -0.53, -1.78, -0.52, -0.37]
+    """
+    if isinstance(seq, SeqRecord):
+        seq = seq.seq
+    if scales is None:
+        scales = {}
+    window = int(window)
+    step = int(step)
+    if window < 1:
+        raise ValueError("The window size must be at least 1")
+    if step < 1:
+        raise ValueError("The step size must be at least 1")
+    for name in statistics:
+        if name not in _STATISTICS:
+            raise ValueError(f"Unknown statistic '{name}'")
+        if name in scales:
+            raise ValueError(f"Scale name '{name}' is already used for a statistic")
+
+    letters = set()
+    for name in statistics:
+        letters.update(_STATISTICS[name])
+    if "lcc" in statistics:
+        lcc_terms = _lcc_terms(window)
+    scale_tables = {name: _scale_table(scale) for name, scale in scales.items()}
+    half = window // 2
+    unit = 2 * (1.0 - edge) / (window - 1) if window > 1 else 0.0
+    weights = [edge + unit * i for i in range(half)]
+    sum_of_weights = sum(weights) * 2 + 1
+
+    windows_per_chunk = max(1, chunk_size // step)
+    if scales and unit != 0:
+        # Limit the size of the position-weighted cumulative sums, to keep
+        # the rounding errors small:
+        windows_per_chunk = max(
+            1, min(windows_per_chunk, max(4096, 16 * window) // step)
+        )
+
+    length = len(seq)
+    if length < window:
+        n = 0
+    else:
+        n = (length - window) // step + 1
+    results = {name: [] for name in statistics}
+    results.update((name, []) for name in scales)
+    for first in range(0, n, windows_per_chunk):
+        last = min(first + windows_per_chunk, n)
+        start = first * step
+        end = (last - 1) * step + window
+        data = numpy.frombuffer(_get_bytes(seq, start, end), numpy.uint8)
+        starts = numpy.arange(0, (last - first) * step, step)
+        ends = starts + window
+        counts = {}
+        if letters:
+            # Setting bit 5 converts upper case letters to lower case:
+            lower = data | 32
+            for letter in letters:
+                mask = lower == ord(letter.lower())
+                counts[letter] = _window_sums(mask, starts, window, step)
+        for name in statistics:
+            if name == "gc":
+                values = (counts["G"] + counts["C"] + counts["S"]) * 100.0 / window
+            elif name == "gc_skew":
+                values = _skew(counts["G"], counts["C"])
+            elif name == "at_skew":
+                values = _skew(counts["A"], counts["T"])
+            elif name == "lcc":
+                values = -(
+                    lcc_terms[counts["A"]]
+                    + lcc_terms[counts["C"]]
+                    + lcc_terms[counts["T"]]
+                    + lcc_terms[counts["G"]]
+                )
+            results[name].append(values)
+        for name, table in scale_tables.items():
+            values = table[data]
+            cumsum = numpy.zeros(len(data) + 1)
+            numpy.cumsum(values, out=cumsum[1:])
+            # Each half of the window excluding the middle letter, and the
+            # middle letter with a weight of 1:
+            front = cumsum[starts + half] - cumsum[starts]
+            back = cumsum[ends] - cumsum[ends - half]
+            score = edge * (front + back) + values[starts + half]
+            if unit != 0:
+                positions = numpy.arange(len(data), dtype=float)
+                cumsum = numpy.zeros(len(data) + 1)
+                numpy.cumsum(positions * values, out=cumsum[1:])
+                # Weight edge + unit * j for the j-th letter from either end:
+                weighted_front = cumsum[starts + half] - cumsum[starts]
+                weighted_back = cumsum[ends] - cumsum[ends - half]
+                score += unit * (weighted_front - starts * front)
+                score += unit * ((ends - 1) * back - weighted_back)
+            results[name].append(score / sum_of_weights)
+    for name, values in results.items():
+        if values:
+            results[name] = numpy.concatenate(values)
+        else:
+            results[name] = numpy.zeros(0)
+    return results
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+
+    run_doctest()
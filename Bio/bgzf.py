@@ -247,11 +247,18 @@ If your data is in UTF-8 or any other incompatible encoding, you must use
 binary mode, and decode the appropriate fragments yourself.
 """
 
+import io
+import itertools
+import os
 import struct
 import sys
+import threading
 import zlib
 
 from builtins import open as _open
+from collections import deque
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 _bgzf_magic = b"\x1f\x8b\x08\x04"
 _bgzf_header = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00\x42\x43\x02\x00"
@@ -259,7 +266,7 @@ _bgzf_eof = b"\x1f\x8b\x08\x04\x00\x00\x00\x00\x00\xff\x06\x00BC\x02\x00\x1b\x00
 _bytes_BC = b"BC"
 
 
-def open(filename, mode="rb"):
+def open(filename, mode="rb", threads=1):
     r"""Open a BGZF file for reading, writing or appending.
 
     If text mode is requested, in order to avoid multi-byte characters, this is
@@ -268,11 +275,14 @@ def open(filename, mode="rb"):
 
     If your data is in UTF-8 or any other incompatible encoding, you must use
     binary mode, and decode the appropriate fragments yourself.
+
+    The optional threads argument is passed to the BgzfReader or BgzfWriter,
+    and enables (de)compression of blocks in parallel.
     """
     if "r" in mode.lower():
-        return BgzfReader(filename, mode)
+        return BgzfReader(filename, mode, threads=threads)
     elif "w" in mode.lower() or "a" in mode.lower():
-        return BgzfWriter(filename, mode)
+        return BgzfWriter(filename, mode, threads=threads)
     else:
         raise ValueError("Bad mode %r" % mode)
 
@@ -435,6 +445,21 @@ def _load_bgzf_block(handle, text_mode=False):
     Returns a tuple (block size and data), or at end of file
     will raise StopIteration.
     """
+    block_size, deflated, expected_crc, expected_size = _read_bgzf_block(handle)
+    data = _inflate_bgzf_block(deflated, expected_crc, expected_size, text_mode)
+    return block_size, data
+
+
+def _read_bgzf_block(handle):
+    """Read the next BGZF block without decompressing it (PRIVATE).
+
+    Returns a tuple of the block size, the raw deflated data, the expected
+    CRC (as bytes), and the expected decompressed length. At end of file
+    will raise StopIteration.
+
+    This only does the (sequential) file I/O, leaving the expensive
+    decompression to _inflate_bgzf_block which can be run on another thread.
+    """
     magic = handle.read(4)
     if not magic:
         # End of file - should we signal this differently now?
@@ -465,10 +490,20 @@ def _load_bgzf_block(handle, text_mode=False):
     assert block_size is not None, "Missing BC, this isn't a BGZF file!"
     # Now comes the compressed data, CRC, and length of uncompressed data.
     deflate_size = block_size - 1 - extra_len - 19
-    d = zlib.decompressobj(-15)  # Negative window size means no headers
-    data = d.decompress(handle.read(deflate_size)) + d.flush()
+    deflated = handle.read(deflate_size)
     expected_crc = handle.read(4)
     expected_size = struct.unpack("<I", handle.read(4))[0]
+    return block_size, deflated, expected_crc, expected_size
+
+
+def _inflate_bgzf_block(deflated, expected_crc, expected_size, text_mode=False):
+    """Decompress and check the raw data of a BGZF block (PRIVATE).
+
+    Returns the decompressed data, as a string in text mode otherwise as
+    bytes. As zlib releases the GIL, this can usefully be run in parallel.
+    """
+    d = zlib.decompressobj(-15)  # Negative window size means no headers
+    data = d.decompress(deflated) + d.flush()
     if expected_size != len(data):
         raise RuntimeError("Decompressed to %i, not %i" % (len(data), expected_size))
     # Should cope with a mix of Python platforms...
@@ -482,9 +517,139 @@ def _load_bgzf_block(handle, text_mode=False):
     if text_mode:
         # Note ISO-8859-1 aka Latin-1 preserves first 256 chars
         # (i.e. ASCII), but critically is a single byte encoding
-        return block_size, data.decode("latin-1")
+        return data.decode("latin-1")
     else:
-        return block_size, data
+        return data
+
+
+def _deflate_bgzf_block(block, compresslevel):
+    """Compress data as a complete BGZF block, returned as bytes (PRIVATE).
+
+    As zlib releases the GIL, this can usefully be run in parallel.
+    """
+    assert len(block) <= 65536
+    # Giving a negative window bits means no gzip/zlib headers,
+    # -15 used in samtools
+    c = zlib.compressobj(compresslevel, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, 0)
+    compressed = c.compress(block) + c.flush()
+    del c
+    if len(compressed) > 65536:
+        raise RuntimeError("TODO - Didn't compress enough, try less data in this block")
+    bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
+    crc = struct.pack("<I", zlib.crc32(block) & 0xFFFFFFFF)
+    uncompressed_length = struct.pack("<I", len(block))
+    # Fixed 16 bytes,
+    # gzip magic bytes (4) mod time (4),
+    # gzip flag (1), os (1), extra length which is six (2),
+    # sub field which is BC (2), sub field length of two (2),
+    # Variable data,
+    # 2 bytes: block length as BC sub field (2)
+    # X bytes: the data
+    # 8 bytes: crc (4), uncompressed data length (4)
+    return _bgzf_header + bsize + compressed + crc + uncompressed_length
+
+
+class BgzfBlockCache:
+    """Least recently used cache of decompressed BGZF blocks.
+
+    The cache is bounded by the total size of the decompressed data it
+    holds (max_bytes), evicting the least recently used blocks as needed.
+    The hits and misses attributes count the lookups made by the readers
+    using the cache, which is useful for tuning its size.
+
+    A single cache can be shared by several BgzfReader objects. Blocks are
+    keyed on the identity of the underlying file (device, inode, size and
+    modification time where available) so readers opened separately on the
+    same file will reuse each other's blocks:
+
+    >>> cache = BgzfBlockCache(max_bytes=1024 * 1024)
+    >>> with BgzfReader("SamBam/ex1.bam", "rb", cache=cache) as handle:
+    ...     data = handle.read(70000)
+    >>> with BgzfReader("SamBam/ex1.bam", "rb", cache=cache) as handle:
+    ...     data = handle.read(70000)
+    >>> print("%i blocks, %i hits, %i misses" % (len(cache), cache.hits, cache.misses))
+    2 blocks, 2 hits, 2 misses
+
+    The cache is thread safe.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        """Initialize the class."""
+        if max_bytes < 0:
+            raise ValueError("Use max_bytes with a minimum of 0")
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self._blocks = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        """Return the number of blocks in the cache."""
+        return len(self._blocks)
+
+    def __repr__(self):
+        """Return a concise summary of the cache."""
+        return "%s(max_bytes=%i) with %i blocks, %i bytes" % (
+            self.__class__.__name__,
+            self.max_bytes,
+            len(self._blocks),
+            self.size,
+        )
+
+    def get(self, key):
+        """Return the cached (data, raw block length) for key, or None."""
+        with self._lock:
+            try:
+                value = self._blocks[key]
+            except KeyError:
+                self.misses += 1
+                return None
+            self._blocks.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value):
+        """Add the (data, raw block length) for key to the cache."""
+        size = len(value[0])
+        with self._lock:
+            if key in self._blocks:
+                self.size -= len(self._blocks.pop(key)[0])
+            if size > self.max_bytes:
+                return
+            while self.size + size > self.max_bytes:
+                self.size -= len(self._blocks.popitem(last=False)[1][0])
+            self._blocks[key] = value
+            self.size += size
+
+    def clear(self):
+        """Remove all the blocks from the cache, and reset the counters."""
+        with self._lock:
+            self._blocks.clear()
+            self.size = 0
+            self.hits = 0
+            self.misses = 0
+
+
+# Used by the Bio.SeqIO and Bio.SearchIO index functions via Bio.File,
+# so that BGZF blocks are shared between all the handles on the same file.
+shared_cache = BgzfBlockCache(64 * 1024 * 1024)
+
+# Unique keys for files we can't identify via os.fstat (e.g. BytesIO)
+_unidentified_files = itertools.count()
+
+
+def _file_key(handle):
+    """Return a hashable key identifying the file behind a handle (PRIVATE).
+
+    This is used by the BgzfBlockCache, and ensures blocks are only shared
+    between handles on the same unmodified file on disk.
+    """
+    try:
+        info = os.fstat(handle.fileno())
+    except (AttributeError, OSError, io.UnsupportedOperation):
+        return ("unidentified", next(_unidentified_files))
+    return (info.st_dev, info.st_ino, info.st_size, info.st_mtime_ns)
 
 
 class BgzfReader:
@@ -550,14 +715,37 @@ class BgzfReader:
     block can be up to 64kb, the default cache could take up to 6MB of
     RAM. The cache is not important for reading through the file in one
     pass, but is important for improving performance of random access.
+    Alternatively, use the cache argument to give a BgzfBlockCache, for
+    example to share one cache between several readers (the max_cache
+    argument is then ignored).
+
+    Use the threads argument to read ahead, decompressing the upcoming BGZF
+    blocks in parallel on a pool of worker threads. This speeds up reading
+    through the file from start to end, while random access jumping around
+    the file will still decompress blocks one by one as needed:
+
+    >>> with BgzfReader("SamBam/ex1.bam", "rb", threads=4) as handle:
+    ...     data = handle.read(200000)
+    ...     print(len(data))
+    200000
     """
 
-    def __init__(self, filename=None, mode="r", fileobj=None, max_cache=100):
+    def __init__(
+        self,
+        filename=None,
+        mode="r",
+        fileobj=None,
+        max_cache=100,
+        threads=1,
+        cache=None,
+    ):
         """Initialize the class."""
         # TODO - Assuming we can seek, check for 28 bytes EOF empty block
         # and if missing warn about possible truncation (as in samtools)?
         if max_cache < 1:
             raise ValueError("Use max_cache with a minimum of 1")
+        if threads < 1:
+            raise ValueError("Use threads with a minimum of 1")
         # Must open the BGZF file in binary mode, but we may want to
         # treat the contents as either text or binary (unicode or
         # bytes under Python 3)
@@ -578,9 +766,23 @@ class BgzfReader:
             self._newline = b"\n"
         self._handle = handle
         self.max_cache = max_cache
-        self._buffers = {}
+        if cache is None:
+            # Blocks are at most 64kb
+            cache = BgzfBlockCache(max_cache * 65536)
+        self._cache = cache
+        self._file_key = _file_key(handle)
         self._block_start_offset = None
         self._block_raw_length = None
+        if threads > 1:
+            self._executor = ThreadPoolExecutor(threads)
+            self._read_ahead = 2 * threads
+        else:
+            self._executor = None
+            self._read_ahead = 0
+        # Blocks being decompressed in the background, keyed by start offset
+        self._pending = {}
+        # Where the next block to read ahead starts (None at end of file)
+        self._ahead_offset = None
         self._load_block(handle.tell())
 
     def _load_block(self, start_offset=None):
@@ -592,34 +794,76 @@ class BgzfReader:
         if start_offset == self._block_start_offset:
             self._within_block_offset = 0
             return
-        elif start_offset in self._buffers:
+        cached = self._cache.get((self._file_key, start_offset, self._text))
+        if cached is not None:
             # Already in cache
-            self._buffer, self._block_raw_length = self._buffers[start_offset]
+            self._buffer, self._block_raw_length = cached
             self._within_block_offset = 0
             self._block_start_offset = start_offset
             return
-        # Must hit the disk... first check cache limits,
-        while len(self._buffers) >= self.max_cache:
-            # TODO - Implemente LRU cache removal?
-            self._buffers.popitem()
-        # Now load the block
+        # Must hit the disk...
         handle = self._handle
         if start_offset is not None:
             handle.seek(start_offset)
         self._block_start_offset = handle.tell()
-        try:
-            block_size, self._buffer = _load_bgzf_block(handle, self._text)
-        except StopIteration:
-            # EOF
-            block_size = 0
-            if self._text:
-                self._buffer = ""
-            else:
-                self._buffer = b""
+        if self._block_start_offset in self._pending:
+            # Already read ahead, may still be decompressing
+            future = self._pending.pop(self._block_start_offset)
+            block_size, self._buffer = future.result()
+        else:
+            # Random access, any blocks read ahead are now unlikely to be used
+            self._cancel_pending()
+            try:
+                block_size, self._buffer = _load_bgzf_block(handle, self._text)
+            except StopIteration:
+                # EOF
+                block_size = 0
+                if self._text:
+                    self._buffer = ""
+                else:
+                    self._buffer = b""
+            self._ahead_offset = self._block_start_offset + block_size
         self._within_block_offset = 0
         self._block_raw_length = block_size
         # Finally save the block in our cache,
-        self._buffers[self._block_start_offset] = self._buffer, block_size
+        self._cache.put(
+            (self._file_key, self._block_start_offset, self._text),
+            (self._buffer, block_size),
+        )
+        if self._read_ahead and block_size:
+            self._schedule_read_ahead()
+
+    def _schedule_read_ahead(self):
+        """Start decompressing the upcoming blocks on the thread pool (PRIVATE).
+
+        The raw blocks are read from the file here on the calling thread,
+        only the decompression is handed over to the worker threads.
+        """
+        handle = self._handle
+        while self._ahead_offset is not None and len(self._pending) < self._read_ahead:
+            start_offset = self._ahead_offset
+            handle.seek(start_offset)
+            try:
+                block_size, deflated, crc, size = _read_bgzf_block(handle)
+            except StopIteration:
+                # EOF, nothing more to read ahead
+                self._ahead_offset = None
+                break
+            self._pending[start_offset] = self._executor.submit(
+                self._inflate, block_size, deflated, crc, size
+            )
+            self._ahead_offset = start_offset + block_size
+
+    def _cancel_pending(self):
+        """Cancel decompressing any blocks read ahead which did not start yet (PRIVATE)."""
+        for future in self._pending.values():
+            future.cancel()
+        self._pending.clear()
+
+    def _inflate(self, block_size, deflated, expected_crc, expected_size):
+        """Decompress a block which was read ahead (PRIVATE)."""
+        data = _inflate_bgzf_block(deflated, expected_crc, expected_size, self._text)
+        return block_size, data
 
     def tell(self):
         """Return a 64-bit unsigned BGZF virtual offset."""
@@ -732,10 +976,15 @@ class BgzfReader:
 
     def close(self):
         """Close BGZF file."""
+        if self._executor is not None:
+            self._cancel_pending()
+            self._executor.shutdown()
+            self._executor = None
+        self._pending = {}
         self._handle.close()
         self._buffer = None
         self._block_start_offset = None
-        self._buffers = None
+        self._cache = None
 
     def seekable(self):
         """Return True indicating the BGZF supports random access."""
@@ -759,10 +1008,21 @@ class BgzfReader:
 
 
 class BgzfWriter:
-    """Define a BGZFWriter object."""
+    """Define a BGZFWriter object.
+
+    Use the threads argument to compress the BGZF blocks in parallel on a
+    pool of worker threads. The blocks are still written to the file in
+    order, so the output is identical to that from a single thread. Note
+    that calling tell must wait for the blocks already submitted to be
+    compressed and written, in order to give the correct virtual offset.
+    """
 
-    def __init__(self, filename=None, mode="w", fileobj=None, compresslevel=6):
+    def __init__(
+        self, filename=None, mode="w", fileobj=None, compresslevel=6, threads=1
+    ):
         """Initilize the class."""
+        if threads < 1:
+            raise ValueError("Use threads with a minimum of 1")
         if fileobj:
             assert filename is None
             handle = fileobj
@@ -778,42 +1038,31 @@ class BgzfWriter:
         self._handle = handle
         self._buffer = b""
         self.compresslevel = compresslevel
+        if threads > 1:
+            self._executor = ThreadPoolExecutor(threads)
+            self._max_pending = 4 * threads
+        else:
+            self._executor = None
+        # Blocks being compressed in the background, in file order
+        self._pending = deque()
 
     def _write_block(self, block):
         """Write provided data to file as a single BGZF compressed block (PRIVATE)."""
         # print("Saving %i bytes" % len(block))
-        start_offset = self._handle.tell()
-        assert len(block) <= 65536
-        # Giving a negative window bits means no gzip/zlib headers,
-        # -15 used in samtools
-        c = zlib.compressobj(
-            self.compresslevel, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, 0
+        if self._executor is None:
+            self._handle.write(_deflate_bgzf_block(block, self.compresslevel))
+            return
+        self._pending.append(
+            self._executor.submit(_deflate_bgzf_block, block, self.compresslevel)
         )
-        compressed = c.compress(block) + c.flush()
-        del c
-        if len(compressed) > 65536:
-            raise RuntimeError(
-                "TODO - Didn't compress enough, try less data in this block"
-            )
-        crc = zlib.crc32(block)
-        # Should cope with a mix of Python platforms...
-        if crc < 0:
-            crc = struct.pack("<i", crc)
-        else:
-            crc = struct.pack("<I", crc)
-        bsize = struct.pack("<H", len(compressed) + 25)  # includes -1
-        crc = struct.pack("<I", zlib.crc32(block) & 0xFFFFFFFF)
-        uncompressed_length = struct.pack("<I", len(block))
-        # Fixed 16 bytes,
-        # gzip magic bytes (4) mod time (4),
-        # gzip flag (1), os (1), extra length which is six (2),
-        # sub field which is BC (2), sub field length of two (2),
-        # Variable data,
-        # 2 bytes: block length as BC sub field (2)
-        # X bytes: the data
-        # 8 bytes: crc (4), uncompressed data length (4)
-        data = _bgzf_header + bsize + compressed + crc + uncompressed_length
-        self._handle.write(data)
+        # Limit how much data is held in memory waiting to be written
+        while len(self._pending) > self._max_pending:
+            self._handle.write(self._pending.popleft().result())
+
+    def _write_pending(self):
+        """Wait for any blocks being compressed, and write them out (PRIVATE)."""
+        while self._pending:
+            self._handle.write(self._pending.popleft().result())
 
     def write(self, data):
         """Write method for the class."""
@@ -844,6 +1093,7 @@ class BgzfWriter:
             self._buffer = self._buffer[65535:]
         self._write_block(self._buffer)
         self._buffer = b""
+        self._write_pending()
         self._handle.flush()
 
     def close(self):
@@ -856,12 +1106,17 @@ class BgzfWriter:
         """
         if self._buffer:
             self.flush()
+        self._write_pending()
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
         self._handle.write(_bgzf_eof)
         self._handle.flush()
         self._handle.close()
 
     def tell(self):
         """Return a BGZF 64-bit virtual offset."""
+        self._write_pending()
         return make_virtual_offset(self._handle.tell(), len(self._buffer))
 
     def seekable(self):
@@ -12,14 +12,17 @@
 
 
 static void
-calculate(const char sequence[], int s, Py_ssize_t m, double* matrix,
-          Py_ssize_t n, float* scores)
+calculate(const char sequence[], Py_ssize_t m, const double* matrix,
+          Py_ssize_t n, float* scores, float* rcscores)
 {
+    /* Calculate the scores along the sequence for the position-weight
+     * matrix, and, if rcscores is not NULL, for its reverse complement
+     * in the same pass over the sequence. This function does not use
+     * any Python objects, and is called without holding the GIL. */
     Py_ssize_t i, j;
-    char c;
+    int k;
     double score;
-    int ok;
-    float* p = scores;
+    double rcscore;
 #ifndef NAN
     float NAN = 0.0;
     NAN /= NAN;
@@ -28,35 +31,37 @@ calculate(const char sequence[], int s, Py_ssize_t m, double* matrix,
     for (i = 0; i < n; i++)
     {
         score = 0.0;
-        ok = 1;
+        rcscore = 0.0;
         for (j = 0; j < m; j++)
         {
-            c = sequence[i+j];
-            switch (c)
+            switch (sequence[i+j])
             {
               /* Handling mixed case input here rather than converting it to
                  uppercase in Python code first, since doing so could use too
                  much memory if sequence is too long (e.g. chromosome or
                  plasmid). */
                 case 'A':
-                case 'a':
-                    score += matrix[j*4+0]; break;
+                case 'a': k = 0; break;
                 case 'C':
-                case 'c':
-                    score += matrix[j*4+1]; break;
+                case 'c': k = 1; break;
                 case 'G':
-                case 'g':
-                    score += matrix[j*4+2]; break;
+                case 'g': k = 2; break;
                 case 'T':
-                case 't':
-                    score += matrix[j*4+3]; break;
-                default:
-                    ok = 0;
+                case 't': k = 3; break;
+                default: k = -1; break;
             }
+            if (k < 0) break;
+            score += matrix[j*4+k];
+            rcscore += matrix[(m-1-j)*4+3-k];
+        }
+        if (j == m) {
+            scores[i] = (float)score;
+            if (rcscores) rcscores[i] = (float)rcscore;
+        }
+        else {
+            scores[i] = NAN;
+            if (rcscores) rcscores[i] = NAN;
         }
-        if (ok) *p = (float)score;
-        else *p = NAN;
-        p++;
     }
 }
 
@@ -145,46 +150,64 @@ exit:
 }
 
 static char calculate__doc__[] =
-"    calculate(sequence, pwm, scores)\n"
+"    calculate(sequence, pwm, scores, rcscores=None)\n"
 "\n"
 "This function calculates the position-weight matrix scores for all\n"
 "positions along the sequence for position-weight matrix pwm, and stores\n"
-"them in the provided numpy array scores.\n";
+"them in the provided numpy array scores. If scores is shorter than the\n"
+"number of positions, only the first len(scores) positions are scored.\n"
+"If rcscores is given, the scores\n"
+"of the reverse complement of the position-weight matrix are calculated\n"
+"in the same pass and stored in rcscores. The GIL is released during the\n"
+"calculation.\n";
 
 static PyObject*
 py_calculate(PyObject* self, PyObject* args, PyObject* keywords)
 {
     const char* sequence;
-    static char* kwlist[] = {"sequence", "matrix", "scores", NULL};
+    static char* kwlist[] = {"sequence", "matrix", "scores", "rcscores", NULL};
     Py_ssize_t m;
     Py_ssize_t n;
     Py_ssize_t s;
     PyObject* result = NULL;
     Py_buffer scores;
+    Py_buffer rcscores;
     Py_buffer matrix;
 
     matrix.obj = NULL;
     scores.obj = NULL;
-    if (!PyArg_ParseTupleAndKeywords(args, keywords, "y#O&O&", kwlist,
+    rcscores.obj = NULL;
+    rcscores.buf = NULL;
+    if (!PyArg_ParseTupleAndKeywords(args, keywords, "y#O&O&|O&", kwlist,
                                      &sequence, &s,
                                      matrix_converter, &matrix,
-                                     scores_converter, &scores)) return NULL;
+                                     scores_converter, &scores,
+                                     scores_converter, &rcscores)) return NULL;
     m = matrix.shape[0];
     n = scores.shape[0];
-    if (n == s - m + 1) {
-        calculate(sequence, s, m, matrix.buf, n, scores.buf);
-        Py_INCREF(Py_None);
-        result = Py_None;
-    }
-    else {
+    if (n > s - m + 1) {
         PyErr_Format(PyExc_RuntimeError,
                     "size of scores array is inconsistent "
                     "(sequence length is %zd, "
                     "motif length is %zd, scores length is %zd", s, m, n);
     }
+    else if (rcscores.obj && rcscores.shape[0] != n) {
+        PyErr_Format(PyExc_RuntimeError,
+                    "size of rcscores array is inconsistent "
+                    "(scores length is %zd, rcscores length is %zd)",
+                    n, rcscores.shape[0]);
+    }
+    else {
+        Py_BEGIN_ALLOW_THREADS
+        calculate(sequence, m, matrix.buf, n, scores.buf, rcscores.buf);
+        Py_END_ALLOW_THREADS
+        Py_INCREF(Py_None);
+        result = Py_None;
+    }
 
     matrix_converter(NULL, &matrix);
     scores_converter(NULL, &scores);
+    scores_converter(NULL, &rcscores);
     return result;
 }
 
@@ -12,6 +12,8 @@ and position-specific scoring matrices.
 """
 
 import math
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
 
 try:
     import numpy as np
@@ -323,9 +325,75 @@ class PositionWeightMatrix(GenericPositionMatrix):
         return pssm
 
 
+def _as_bytes(sequence):
+    """Return the sequence as a bytes object (PRIVATE)."""
+    try:
+        sequence = bytes(sequence)
+    except TypeError:  # str
+        try:
+            sequence = bytes(sequence, "ASCII")
+        except TypeError:
+            raise ValueError(
+                "sequence should be a Seq, MutableSeq, string, or bytes-like object"
+            ) from None
+        except UnicodeEncodeError:
+            raise ValueError("sequence should contain ASCII characters only") from None
+    except Exception:
+        raise ValueError(
+            "sequence should be a Seq, MutableSeq, string, or bytes-like object"
+        ) from None
+    return sequence
+
+
+def _scan(sequence, logodds, n, threshold, both):
+    """Find hits with a score above the threshold among the first n positions (PRIVATE).
+
+    Returns the positions, strands (+1 or -1), and scores of the hits as
+    NumPy arrays, ordered by position. The reverse strand is scored in the
+    same pass over the sequence as the forward strand.
+    """
+    n = min(n, len(sequence) - len(logodds) + 1)
+    if n <= 0:
+        return np.empty(0, int), np.empty(0, np.int8), np.empty(0, np.float32)
+    scores = np.empty(n, np.float32)
+    if both:
+        rcscores = np.empty(n, np.float32)
+        _pwm.calculate(sequence, logodds, scores, rcscores)
+        scores = np.concatenate([scores, rcscores])
+    else:
+        _pwm.calculate(sequence, logodds, scores)
+    indices = np.flatnonzero(scores >= threshold)
+    positions = indices % n
+    # stable sort, so forward strand hits come first at the same position
+    order = np.argsort(positions, kind="stable")
+    indices = indices[order]
+    strands = np.where(indices < n, 1, -1).astype(np.int8)
+    return positions[order], strands, scores[indices]
+
+
+def _pvalues(distributions, strands, scores):
+    """Return the p-values of hits on the forward and reverse strand (PRIVATE)."""
+    pvalues = distributions[0].pvalue(scores)
+    if len(distributions) > 1:
+        reverse = strands < 0
+        pvalues[reverse] = distributions[1].pvalue(scores[reverse])
+    return pvalues
+
+
 class PositionSpecificScoringMatrix(GenericPositionMatrix):
     """Class for the support of Position Specific Scoring Matrix calculations."""
 
+    def _logodds(self):
+        """Return the scores as a two-dimensional array with columns ACGT (PRIVATE)."""
+        if sorted(self.alphabet) != ["A", "C", "G", "T"]:
+            raise ValueError(
+                "PSSM has wrong alphabet: %s - Use only with DNA motifs" % self.alphabet
+            )
+        m = self.length
+        return np.array(
+            [[self[letter][i] for letter in "ACGT"] for i in range(m)], float
+        )
+
     def calculate(self, sequence):
         """Return the PWM score for a given sequence for all positions.
 
@@ -338,40 +406,18 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
 
         """
         # TODO - Code itself tolerates ambiguous bases (as NaN).
-        if sorted(self.alphabet) != ["A", "C", "G", "T"]:
-            raise ValueError(
-                "PSSM has wrong alphabet: %s - Use only with DNA motifs" % self.alphabet
-            )
+        logodds = self._logodds()
 
         # NOTE: The C code handles mixed case input as this could be large
         # (e.g. contig or chromosome), so requiring it be all upper or lower
         # case would impose an overhead to allocate the extra memory.
-        try:
-            sequence = bytes(sequence)
-        except TypeError:  # str
-            try:
-                sequence = bytes(sequence, "ASCII")
-            except TypeError:
-                raise ValueError(
-                    "sequence should be a Seq, MutableSeq, string, or bytes-like object"
-                ) from None
-            except UnicodeEncodeError:
-                raise ValueError(
-                    "sequence should contain ASCII characters only"
-                ) from None
-        except Exception:
-            raise ValueError(
-                "sequence should be a Seq, MutableSeq, string, or bytes-like object"
-            ) from None
+        sequence = _as_bytes(sequence)
 
         n = len(sequence)
         m = self.length
         # Create the numpy arrays here; the C module then does not rely on numpy
         # Use a float32 for the scores array to save space
         scores = np.empty(n - m + 1, np.float32)
-        logodds = np.array(
-            [[self[letter][i] for letter in "ACGT"] for i in range(m)], float
-        )
         _pwm.calculate(sequence, logodds, scores)
 
         if len(scores) == 1:
@@ -379,38 +425,63 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
         else:
             return scores
 
-    def search(self, sequence, threshold=0.0, both=True, chunksize=10 ** 6):
+    def search(
+        self,
+        sequence,
+        threshold=0.0,
+        both=True,
+        chunksize=10 ** 6,
+        pvalue=None,
+        background=None,
+        precision=10 ** 3,
+    ):
         """Find hits with PWM score above given threshold.
 
         A generator function, returning found hits in the given sequence
-        with the pwm score higher than the threshold.
+        with the pwm score higher than the threshold. Hits on the reverse
+        strand are returned with a negative position, following the Python
+        convention on negative indices. Both strands are scored in a single
+        pass over the sequence.
+
+        If pvalue is given, hits are selected by their p-value instead of
+        by the threshold, and (position, score, p-value) tuples are returned.
+        The p-values are calculated from the score distribution (see the
+        ``distribution`` method) for the given background and precision.
+
+        To search for many motifs at once, use the ``batch_search`` function.
         """
-        sequence = sequence.upper()
+        logodds = self._logodds()
+        if pvalue is not None:
+            distributions = self._distributions(background, precision, both)
+            threshold = min(
+                distribution.threshold_pvalue(pvalue) - distribution.step
+                for distribution in distributions
+            )
+        sequence = _as_bytes(sequence)
         seq_len = len(sequence)
-        motif_l = self.length
-        chunk_starts = np.arange(0, seq_len, chunksize)
+        for chunk_start in range(0, seq_len, chunksize):
+            subseq = sequence[chunk_start : chunk_start + chunksize + self.length - 1]
+            positions, strands, scores = _scan(
+                subseq, logodds, chunksize, threshold, both
+            )
+            positions += chunk_start
+            if pvalue is None:
+                positions[strands < 0] -= seq_len
+                yield from zip(positions, scores)
+            else:
+                pvalues = _pvalues(distributions, strands, scores)
+                selected = pvalues <= pvalue
+                positions = positions[selected]
+                positions[strands[selected] < 0] -= seq_len
+                yield from zip(positions, scores[selected], pvalues[selected])
+
+    def _distributions(self, background, precision, both):
+        """Return the score distributions of the forward and reverse strand (PRIVATE)."""
+        distributions = [self.distribution(background, precision)]
         if both:
             rc = self.reverse_complement()
-        for chunk_start in chunk_starts:
-            subseq = sequence[chunk_start : chunk_start + chunksize + motif_l - 1]
-            pos_scores = self.calculate(subseq)
-            pos_ind = pos_scores >= threshold
-            pos_positions = np.where(pos_ind)[0] + chunk_start
-            pos_scores = pos_scores[pos_ind]
-            if both:
-                neg_scores = rc.calculate(subseq)
-                neg_ind = neg_scores >= threshold
-                neg_positions = np.where(neg_ind)[0] + chunk_start
-                neg_scores = neg_scores[neg_ind]
-            else:
-                neg_positions = np.empty((0), dtype=int)
-                neg_scores = np.empty((0), dtype=int)
-            chunk_positions = np.append(pos_positions, neg_positions - seq_len)
-            chunk_scores = np.append(pos_scores, neg_scores)
-            order = np.argsort(np.append(pos_positions, neg_positions))
-            chunk_positions = chunk_positions[order]
-            chunk_scores = chunk_scores[order]
-            yield from zip(chunk_positions, chunk_scores)
+            distributions.append(rc.distribution(background, precision))
+        return distributions
 
     @property
     def max(self):
@@ -537,8 +608,13 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
         return numerator / denominator
 
     def distribution(self, background=None, precision=10 ** 3):
-        """Calculate the distribution of the scores at the given precision."""
-        from .thresholds import ScoreDistribution
+        """Calculate the distribution of the scores at the given precision.
+
+        Distributions are cached (see ``Bio.motifs.thresholds``), so asking
+        again for the distribution of the same scoring matrix, background,
+        and precision does not recalculate it.
+        """
+        from .thresholds import _get_distribution
 
         if background is None:
             background = dict.fromkeys(self.alphabet, 1.0)
@@ -547,4 +623,212 @@ class PositionSpecificScoringMatrix(GenericPositionMatrix):
         total = sum(background.values())
         for letter in self.alphabet:
             background[letter] /= total
-        return ScoreDistribution(precision=precision, pssm=self, background=background)
+        return _get_distribution(self, background, precision)
+
+
+_hit_dtype = np.dtype(
+    [
+        ("motif", np.int32),
+        ("position", np.int64),
+        ("strand", np.int8),
+        ("score", np.float32),
+    ]
+)
+
+
+class _BatchSearch:
+    """Scan sequences with many position-specific scoring matrices (PRIVATE).
+
+    This holds the log-odds matrices, thresholds and (if searching by
+    p-value) score distributions, so they are calculated only once when
+    searching many sequences.
+    """
+
+    def __init__(
+        self, pssms, threshold, both, chunksize, pvalue, background, precision
+    ):
+        """Prepare the matrices and thresholds for the search."""
+        self.matrices = [pssm._logodds() for pssm in pssms]
+        self.both = both
+        self.chunksize = chunksize
+        self.pvalue = pvalue
+        if pvalue is None:
+            self.dtype = _hit_dtype
+            self.thresholds = np.broadcast_to(
+                np.asarray(threshold, float), (len(self.matrices),)
+            )
+        else:
+            self.dtype = np.dtype(_hit_dtype.descr + [("pvalue", float)])
+            self.distributions = [
+                pssm._distributions(background, precision, both) for pssm in pssms
+            ]
+            self.thresholds = [
+                min(d.threshold_pvalue(pvalue) - d.step for d in pair)
+                for pair in self.distributions
+            ]
+        self.length = max((len(matrix) for matrix in self.matrices), default=1)
+
+    def search(self, sequence, executor=None, threads=1):
+        """Return the hits in the sequence, using the executor if given."""
+        matrices = self.matrices
+        chunksize = self.chunksize
+        pvalue = self.pvalue
+        dtype = self.dtype
+        sequence = _as_bytes(sequence)
+        # Split the motifs over the threads, so that threads have work to do
+        # even if the sequence consists of a single chunk.
+        groups = max(1, min(threads, len(matrices)))
+        tasks = [
+            (start, range(group, len(matrices), groups))
+            for start in range(0, len(sequence), chunksize)
+            for group in range(groups)
+        ]
+
+        def scan(task):
+            start, indices = task
+            hits = []
+            # slice the chunk only once for all motifs in this task
+            chunk = sequence[start : start + chunksize + self.length - 1]
+            for index in indices:
+                positions, strands, scores = _scan(
+                    chunk, matrices[index], chunksize, self.thresholds[index], self.both
+                )
+                if pvalue is not None:
+                    pvalues = _pvalues(self.distributions[index], strands, scores)
+                    selected = pvalues <= pvalue
+                    positions = positions[selected]
+                    strands = strands[selected]
+                    scores = scores[selected]
+                array = np.empty(len(positions), dtype)
+                array["motif"] = index
+                array["position"] = positions + start
+                array["strand"] = strands
+                array["score"] = scores
+                if pvalue is not None:
+                    array["pvalue"] = pvalues[selected]
+                hits.append(array)
+            return hits
+
+        if executor is not None and len(tasks) > 1:
+            results = list(executor.map(scan, tasks))
+        else:
+            results = [scan(task) for task in tasks]
+        hits = np.concatenate([np.empty(0, dtype)] + list(chain(*results)))
+        order = np.lexsort((-hits["strand"], hits["position"], hits["motif"]))
+        return hits[order]
+
+
+def batch_search(
+    pssms,
+    sequence,
+    threshold=0.0,
+    both=True,
+    chunksize=10 ** 6,
+    threads=1,
+    pvalue=None,
+    background=None,
+    precision=10 ** 3,
+):
+    """Search a sequence with many position-specific scoring matrices at once.
+
+    Arguments:
+     - pssms      - list of PositionSpecificScoringMatrix objects, e.g. for
+                    all motifs in a JASPAR collection.
+     - sequence   - the DNA sequence to search (Seq, MutableSeq, string,
+                    or bytes-like object).
+     - threshold  - minimum score of a hit, either a single number or a
+                    list with one threshold for each PSSM.
+     - both       - if True (default), the reverse strand is searched too.
+     - chunksize  - the sequence is scanned in chunks of this size.
+     - threads    - number of threads used to scan the chunks (default 1).
+                    The scanning is done in C code without holding the GIL,
+                    so threads can run in parallel.
+     - pvalue     - if given, select hits by their p-value instead of by
+                    the threshold.
+     - background - background used to calculate the p-values.
+     - precision  - precision of the score distributions used to calculate
+                    the p-values.
+
+    The hits are returned as a NumPy structured array with fields ``motif``
+    (the index of the PSSM in pssms), ``position`` (start position of the
+    hit in the sequence, on either strand), ``strand`` (+1 or -1), and
+    ``score``, sorted by motif and position. If pvalue is given, the array
+    has an additional field ``pvalue``.
+
+    >>> from Bio import motifs
+    >>> from Bio.motifs.matrix import batch_search
+    >>> m1 = motifs.create(["TACAA", "TACGC", "TACAC"])
+    >>> m2 = motifs.create(["GTTA", "GTTC"])
+    >>> pssms = [m.pssm for m in (m1, m2)]
+    >>> sequence = "TTACACGTTAATGTAACGTTAAC"
+    >>> hits = batch_search(pssms, sequence, threshold=[4.0, 2.0])
+    >>> for hit in hits:
+    ...     print("%d %d %+d %.3f" % tuple(hit))
+    0 1 +1 8.830
+    1 6 +1 7.000
+    1 13 -1 7.000
+    1 17 +1 7.000
+    1 19 -1 7.000
+
+    To search a file with many sequences, use batch_search_records.
+
+    """
+    searcher = _BatchSearch(
+        pssms, threshold, both, chunksize, pvalue, background, precision
+    )
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            return searcher.search(sequence, executor, threads)
+    return searcher.search(sequence)
+
+
+def batch_search_records(
+    pssms,
+    records,
+    threshold=0.0,
+    both=True,
+    chunksize=10 ** 6,
+    threads=1,
+    pvalue=None,
+    background=None,
+    precision=10 ** 3,
+):
+    """Search many sequences with many position-specific scoring matrices.
+
+    This takes an iterable of SeqRecord objects (e.g. from Bio.SeqIO.parse)
+    or sequences, and yields a (record, hits) tuple for each of them, where
+    hits is the NumPy structured array returned by batch_search for that
+    sequence. The other arguments are as for batch_search; the log-odds
+    matrices, thresholds and any score distributions are calculated only
+    once, and the same thread pool is used for all the records.
+
+    >>> from Bio import motifs, SeqIO
+    >>> from Bio.motifs.matrix import batch_search_records
+    >>> m1 = motifs.create(["TACAA", "TACGC", "TACAC"])
+    >>> m2 = motifs.create(["GTTA", "GTTC"])
+    >>> pssms = [m.pssm for m in (m1, m2)]
+    >>> records = SeqIO.parse("Fasta/f002", "fasta")
+    >>> for record, hits in batch_search_records(pssms, records, threshold=6.0):
+    ...     print(record.id, len(hits))
+    gi|1348912|gb|G26680|G26680 2
+    gi|1348917|gb|G26685|G26685 5
+    gi|1592936|gb|G29385|G29385 7
+
+    """
+    searcher = _BatchSearch(
+        pssms, threshold, both, chunksize, pvalue, background, precision
+    )
+    if threads > 1:
+        with ThreadPoolExecutor(max_workers=threads) as executor:
+            for record in records:
+                sequence = getattr(record, "seq", record)
+                yield record, searcher.search(sequence, executor, threads)
+    else:
+        for record in records:
+            yield record, searcher.search(getattr(record, "seq", record))
+
+
+if __name__ == "__main__":
+    from Bio._utils import run_doctest
+
+    run_doctest(verbose=0)
@@ -3,7 +3,40 @@
 # This code is part of the Biopython distribution and governed by its
 # license.  Please see the LICENSE file that should have been included
 # as part of this package.
-"""Approximate calculation of appropriate thresholds for motif finding."""
+"""Approximate calculation of appropriate thresholds for motif finding.
+
+Score distributions calculated for a position-specific scoring matrix are
+kept in a least-recently-used cache in memory, keyed by the scoring matrix,
+the background, and the precision, so repeated calls to the ``distribution``
+method of a PSSM (e.g. when searching by p-value) do not recalculate them.
+If ``cache_dir`` is set to a directory name, the distributions are also
+stored there and reused by later Python sessions.
+"""
+
+import copy
+import hashlib
+import os
+import tempfile
+import zipfile
+from collections import OrderedDict
+
+try:
+    import numpy as np
+except ImportError:
+    from Bio import MissingPythonDependencyError
+
+    raise MissingPythonDependencyError(
+        "Install NumPy if you want to use Bio.motifs.thresholds."
+    )
+
+
+# Directory to store calculated score distributions in, if not None
+cache_dir = None
+
+# Maximum number of score distributions kept in memory
+cache_size = 1024
+
+_cache = OrderedDict()
 
 
 class ScoreDistribution:
@@ -11,7 +44,7 @@ class ScoreDistribution:
 
     Utilizes a dynamic programming approach to calculate the distribution of
     scores with a predefined precision. Provides a number of methods for calculating
-    thresholds for motif occurrences.
+    thresholds for motif occurrences, and for calculating the p-value of a score.
     """
 
     def __init__(self, motif=None, precision=10 ** 3, pssm=None, background=None):
@@ -27,27 +60,20 @@ class ScoreDistribution:
             self.n_points = precision * pssm.length
             self.ic = pssm.mean(background)
         self.step = self.interval / (self.n_points - 1)
-        self.mo_density = [0.0] * self.n_points
+        self.mo_density = np.zeros(self.n_points)
         self.mo_density[-self._index_diff(self.min_score)] = 1.0
-        self.bg_density = [0.0] * self.n_points
+        self.bg_density = np.zeros(self.n_points)
         self.bg_density[-self._index_diff(self.min_score)] = 1.0
         if pssm is None:
             for lo, mo in zip(motif.log_odds(), motif.pwm()):
                 self.modify(lo, mo, motif.background)
         else:
             for position in range(pssm.length):
-                mo_new = [0.0] * self.n_points
-                bg_new = [0.0] * self.n_points
                 lo = pssm[:, position]
-                for letter, score in lo.items():
-                    bg = background[letter]
-                    mo = pow(2, pssm[letter, position]) * bg
-                    d = self._index_diff(score)
-                    for i in range(self.n_points):
-                        mo_new[self._add(i, d)] += self.mo_density[i] * mo
-                        bg_new[self._add(i, d)] += self.bg_density[i] * bg
-                self.mo_density = mo_new
-                self.bg_density = bg_new
+                mo = {}
+                for letter in lo:
+                    mo[letter] = pow(2, pssm[letter, position]) * background[letter]
+                self.modify(lo, mo, background)
 
     def _index_diff(self, x, y=0.0):
         return int((x - y + 0.5 * self.step) // self.step)
@@ -55,18 +81,67 @@ class ScoreDistribution:
     def _add(self, i, j):
         return max(0, min(self.n_points - 1, i + j))
 
+    def _shift(self, density, d, probability, new):
+        """Add the density shifted by d bins and weighted by probability to new (PRIVATE).
+
+        Mass shifted beyond either end of the array is collected in the first
+        or last bin, as in ``_add``.
+        """
+        n = self.n_points
+        if d >= n:
+            new[-1] += density.sum() * probability
+        elif d <= -n:
+            new[0] += density.sum() * probability
+        elif d >= 0:
+            new[d:] += density[: n - d] * probability
+            if d > 0:
+                new[-1] += density[n - d :].sum() * probability
+        else:
+            new[: n + d] += density[-d:] * probability
+            new[0] += density[:-d].sum() * probability
+
     def modify(self, scores, mo_probs, bg_probs):
         """Modify motifs and background density."""
-        mo_new = [0.0] * self.n_points
-        bg_new = [0.0] * self.n_points
+        mo_new = np.zeros(self.n_points)
+        bg_new = np.zeros(self.n_points)
         for k, v in scores.items():
             d = self._index_diff(v)
-            for i in range(self.n_points):
-                mo_new[self._add(i, d)] += self.mo_density[i] * mo_probs[k]
-                bg_new[self._add(i, d)] += self.bg_density[i] * bg_probs[k]
+            self._shift(self.mo_density, d, mo_probs[k], mo_new)
+            self._shift(self.bg_density, d, bg_probs[k], bg_new)
         self.mo_density = mo_new
         self.bg_density = bg_new
 
+    def pvalue(self, score):
+        """Return the probability of a score at least this high in the background.
+
+        The argument can be a single score, or a NumPy array of scores, in
+        which case an array of p-values is returned. The p-values are
+        approximated at the precision of the score distribution.
+        """
+        tail = np.cumsum(self.bg_density[::-1])[::-1]
+        # scores above the maximum have a p-value of zero, and NaN scores
+        # (e.g. due to ambiguous letters in the sequence) a p-value of NaN
+        tail = np.append(tail, [0.0, np.nan])
+        index = (np.asarray(score) - self.min_score + 0.5 * self.step) // self.step
+        index = np.clip(index, 0, self.n_points)
+        index = np.where(np.isnan(index), self.n_points + 1, index)
+        pvalues = tail[index.astype(int)]
+        if np.ndim(pvalues) == 0:
+            return float(pvalues)
+        return pvalues
+
+    def threshold_pvalue(self, pvalue):
+        """Return the lowest score with a p-value not above the given p-value.
+
+        The returned score is at the lower edge of the first bin of the
+        score distribution for which the p-value is not larger than the
+        given p-value, so selecting hits with a score at least this high
+        selects the same hits as comparing their p-values to pvalue.
+        """
+        tail = np.cumsum(self.bg_density[::-1])[::-1]
+        i = np.searchsorted(-tail, -pvalue)
+        return self.min_score + (i - 0.5) * self.step
+
     def threshold_fpr(self, fpr):
         """Approximate the log-odds threshold which makes the type I error (false positive rate)."""
         i = self.n_points
@@ -107,3 +182,80 @@ class ScoreDistribution:
         are not directly comparable.
         """
         return self.threshold_fpr(fpr=2 ** -self.ic)
+
+
+def _save_distribution(distribution, directory, filename):
+    """Store a score distribution in the cache directory, if possible (PRIVATE).
+
+    The file is written under a temporary name and then renamed, so other
+    processes never see a partially written file. Failure to write it (e.g.
+    a read only directory, or a full disk) is ignored.
+    """
+    try:
+        handle, temp_filename = tempfile.mkstemp(suffix=".tmp", dir=directory)
+    except OSError:
+        return
+    try:
+        with os.fdopen(handle, "wb") as handle:
+            np.savez(
+                handle,
+                min_score=distribution.min_score,
+                interval=distribution.interval,
+                n_points=distribution.n_points,
+                ic=distribution.ic,
+                step=distribution.step,
+                mo_density=distribution.mo_density,
+                bg_density=distribution.bg_density,
+            )
+        os.replace(temp_filename, os.path.join(directory, filename))
+    except OSError:
+        try:
+            os.remove(temp_filename)
+        except OSError:
+            pass
+
+
+def _get_distribution(pssm, background, precision):
+    """Return the score distribution of a PSSM, using the cache if possible (PRIVATE).
+
+    The background should be normalized. A copy of the cached distribution
+    is returned, so modifying it does not affect the cache.
+    """
+    letters = sorted(pssm.alphabet)
+    key = repr(
+        (
+            [(letter, list(pssm[letter])) for letter in letters],
+            [(letter, background[letter]) for letter in letters],
+            precision,
+        )
+    )
+    key = hashlib.sha1(key.encode()).hexdigest()
+    try:
+        distribution = _cache.pop(key)
+    except KeyError:
+        distribution = None
+        if cache_dir is not None:
+            path = os.path.join(cache_dir, key + ".npz")
+            try:
+                with np.load(path) as data:
+                    distribution = ScoreDistribution.__new__(ScoreDistribution)
+                    distribution.min_score = float(data["min_score"])
+                    distribution.interval = float(data["interval"])
+                    distribution.n_points = int(data["n_points"])
+                    distribution.ic = float(data["ic"])
+                    distribution.step = float(data["step"])
+                    distribution.mo_density = data["mo_density"]
+                    distribution.bg_density = data["bg_density"]
+            except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile):
+                # Missing, truncated or corrupt file, recalculate it
+                distribution = None
+        if distribution is None:
+            distribution = ScoreDistribution(
+                precision=precision, pssm=pssm, background=background
+            )
+            if cache_dir is not None:
+                _save_distribution(distribution, cache_dir, key + ".npz")
+    _cache[key] = distribution
+    while len(_cache) > cache_size:
+        _cache.popitem(last=False)
+    return copy.deepcopy(distribution)
@@ -114,6 +114,13 @@ All alignment functions have the following arguments:
   Always use the generic, non-cached, dynamic programming function (slow!).
   For debugging.
 
+  Unless ``force_generic`` is used, the alignments are calculated by the C
+  code of ``Bio.Align.PairwiseAligner`` whenever the parameters allow it
+  (``x``, ``m`` or ``d`` match parameters with ``x``, ``s`` or ``d`` gap
+  penalties, and strings or sequence objects as input), returning the same
+  alignments in the same order. Local alignments are only calculated this
+  way if ``score_only`` is used.
+
 - ``score_only``: boolean (default: False).
   Only get the best score, don't recover any alignments. The return value of
   the function is the score. Faster and uses less memory.
@@ -550,6 +557,23 @@ def _align(
             BiopythonWarning,
         )
 
+    if not force_generic:
+        result = _align_with_aligner(
+            sequenceA,
+            sequenceB,
+            match_fn,
+            gap_A_fn,
+            gap_B_fn,
+            penalize_extend_when_opening,
+            penalize_end_gaps,
+            align_globally,
+            gap_char,
+            score_only,
+            one_alignment_only,
+        )
+        if result is not None:
+            return result
+
     if (
         (not force_generic)
         and isinstance(gap_A_fn, affine_penalty)
@@ -628,6 +652,207 @@ def _align(
     return alignments
 
 
+def _align_with_aligner(
+    sequenceA,
+    sequenceB,
+    match_fn,
+    gap_A_fn,
+    gap_B_fn,
+    penalize_extend_when_opening,
+    penalize_end_gaps,
+    align_globally,
+    gap_char,
+    score_only,
+    one_alignment_only,
+):
+    """Align the sequences using Bio.Align.PairwiseAligner (PRIVATE).
+
+    The score, and for global alignments the alignments in the same order as
+    _recover_alignments would find them, are calculated by the C code of
+    PairwiseAligner. Returns None if the parameters cannot be expressed as a
+    PairwiseAligner, or if the result could be different (for example, if
+    there are too many alignments to recover all of them); the caller then
+    falls back to the dynamic programming functions of this module.
+    """
+    if _PairwiseAligner is None:
+        return None
+    if isinstance(sequenceA, list) or isinstance(sequenceB, list):
+        return None
+    if not isinstance(gap_A_fn, affine_penalty):
+        return None
+    if not isinstance(gap_B_fn, affine_penalty):
+        return None
+    if not align_globally and (
+        not score_only or penalize_end_gaps[0] or penalize_end_gaps[1]
+    ):
+        return None
+    lenA, lenB = len(sequenceA), len(sequenceB)
+    pe = penalize_extend_when_opening
+    open_A, extend_A = gap_A_fn.open, gap_A_fn.extend
+    open_B, extend_B = gap_B_fn.open, gap_B_fn.extend
+    first_A = calc_affine_penalty(1, open_A, extend_A, pe)
+    first_B = calc_affine_penalty(1, open_B, extend_B, pe)
+    if align_globally:
+        # The scores of gaps in sequence B in the first row (and of gaps in
+        # sequence A in the first column) are initialized from an imaginary
+        # gap of twice the opening penalty; make sure they are never used.
+        for n in (1, lenB):
+            if penalize_end_gaps[0]:
+                score = calc_affine_penalty(n, open_A, extend_A, pe)
+            else:
+                score = 0
+            extended = calc_affine_penalty(n, 2 * open_B, extend_B, pe)
+            if score + first_B < extended + extend_B:
+                return None
+        for n in (1, lenA):
+            if penalize_end_gaps[1]:
+                score = calc_affine_penalty(n, open_B, extend_B, pe)
+            else:
+                score = 0
+            extended = calc_affine_penalty(n, 2 * open_A, extend_A, pe)
+            if score + first_A < extended + extend_A:
+                return None
+    aligner = _PairwiseAligner()
+    if type(match_fn) is identity_match:
+        aligner.match_score = match_fn.match
+        aligner.mismatch_score = match_fn.mismatch
+    elif type(match_fn) is dictionary_match:
+        lettersA = set(sequenceA)
+        lettersB = set(sequenceB)
+        alphabet = "".join(sorted(lettersA | lettersB))
+        if len(alphabet) != len(lettersA | lettersB):
+            return None  # letters are not single characters
+        matrix = _substitution_matrices.Array(alphabet, dims=2)
+        try:
+            for charA in lettersA:
+                for charB in lettersB:
+                    matrix[charA, charB] = match_fn(charA, charB)
+        except (KeyError, TypeError, ValueError):
+            return None  # let the dynamic programming functions complain
+        aligner.substitution_matrix = matrix
+    else:
+        return None
+    aligner.mode = "global" if align_globally else "local"
+    aligner.target_open_gap_score = first_A
+    aligner.target_extend_gap_score = extend_A
+    aligner.query_open_gap_score = first_B
+    aligner.query_extend_gap_score = extend_B
+    if not penalize_end_gaps[0]:
+        aligner.target_end_gap_score = 0
+    if not penalize_end_gaps[1]:
+        aligner.query_end_gap_score = 0
+    if score_only:
+        return aligner.score(sequenceA, sequenceB)
+    alignments = aligner.align(sequenceA, sequenceB)
+    try:
+        # Sorting very many alignments to find the first ones that
+        # _recover_alignments would find takes longer than recovering them.
+        if len(alignments) > MAX_ALIGNMENTS:
+            return None
+    except OverflowError:
+        return None
+    score = alignments.score
+    # Gaps in sequence A (or B) can be recovered in several ways if they are
+    # as long as needed.
+    linear_A = first_A == extend_A
+    linear_B = first_B == extend_B
+    paths = [alignment.path for alignment in alignments]
+    keys = [
+        _traceback_key(path, lenA, lenB, linear_A, linear_B, penalize_end_gaps)
+        for path in paths
+    ]
+    if not any(keys):
+        # _recover_alignments reverses the matrices and tries again
+        penalize_end_gaps = penalize_end_gaps[::-1]
+        keys = [
+            _traceback_key(
+                [(j, i) for i, j in path],
+                lenB,
+                lenA,
+                linear_B,
+                linear_A,
+                penalize_end_gaps,
+            )
+            for path in paths
+        ]
+    found = sorted((key, path) for key, path in zip(keys, paths) if key)
+    if one_alignment_only:
+        del found[1:]
+    elif all(key[1] == 1 for key, path in found):
+        del found[MAX_ALIGNMENTS:]
+    elif sum(key[1] for key, path in found) > MAX_ALIGNMENTS:
+        # _recover_alignments stops after MAX_ALIGNMENTS tracebacks, some of
+        # which are duplicates, so we cannot tell which alignments it finds.
+        return None
+    tracebacks = []
+    for key, path in found:
+        ali_seqA = sequenceA[0:0]
+        ali_seqB = sequenceB[0:0]
+        for (i1, j1), (i2, j2) in zip(path[:-1], path[1:]):
+            if i1 == i2:
+                ali_seqA += gap_char * (j2 - j1)
+            else:
+                ali_seqA += sequenceA[i1:i2]
+            if j1 == j2:
+                ali_seqB += gap_char * (i2 - i1)
+            else:
+                ali_seqB += sequenceB[j1:j2]
+        tracebacks.append((ali_seqA, ali_seqB, score, 0, None))
+    return _clean_alignments(tracebacks)
+
+
+def _traceback_key(path, lenA, lenB, linear_A, linear_B, penalize_end_gaps):
+    """Return the sort key of an alignment path for _align_with_aligner (PRIVATE).
+
+    The key is a tuple of the steps taken by _recover_alignments from the
+    end to the start of the path, encoded such that the alignments sort in
+    the order in which _recover_alignments finds them, and the number of
+    tracebacks giving the same alignment. Returns None if
+    _recover_alignments would not find the alignment, as it does not allow a
+    gap in sequence A directly followed by a gap in sequence B.
+    """
+    steps = []
+    count = 1
+    previous = None
+    for (i1, j1), (i2, j2) in zip(path[-2::-1], path[:0:-1]):
+        if i1 == i2:
+            if previous == "B":
+                return None
+            previous = "A"
+        elif j1 == j2:
+            previous = "B"
+        else:
+            previous = None
+        if i2 == 0 or j2 == 0:
+            # the rest of the alignment is added by _finish_backtrace
+            continue
+        if previous == "A":
+            n = j2 - j1
+            if linear_A or (i2 == lenA and not penalize_end_gaps[0]):
+                steps.extend([(0,)] * n)
+                count *= 2 ** (n - 1)
+            elif n == 1:
+                steps.append((0,))
+            elif j1 == 0:
+                steps.append((3,))
+            else:
+                steps.append((6, -n))
+        elif previous == "B":
+            n = i2 - i1
+            if linear_B or (j2 == lenB and not penalize_end_gaps[1]):
+                steps.extend([(2,)] * n)
+                count *= 2 ** (n - 1)
+            elif n == 1:
+                steps.append((2,))
+            elif i1 == 0:
+                steps.append((4,))
+            else:
+                steps.append((5, -n))
+        else:
+            steps.extend([(1,)] * (i2 - i1))
+    return (steps, count)
+
+
 def _make_score_matrix_generic(
     sequenceA,
     sequenceB,
@@ -1416,6 +1641,12 @@ def format_alignment(align1, align2, score, begin, end, full_sequences=False):
 _python_make_score_matrix_fast = _make_score_matrix_fast
 _python_rint = rint
 
+try:
+    from Bio.Align import PairwiseAligner as _PairwiseAligner
+    from Bio.Align import substitution_matrices as _substitution_matrices
+except ImportError:
+    _PairwiseAligner = None
+
 try:
     from .cpairwise2 import rint, _make_score_matrix_fast  # noqa
 except ImportError:
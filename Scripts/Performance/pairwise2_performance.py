@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# This code is part of the Biopython distribution and governed by its
+# license.  Please see the LICENSE file that should have been included
+# as part of this package.
+
+"""Compare the speed of pairwise2 with and without PairwiseAligner.
+
+The alignment functions of Bio.pairwise2 use the C code of
+Bio.Align.PairwiseAligner if the parameters allow it. This script runs some
+typical calls both ways, checks that they give the same result, and prints
+the time taken.
+"""
+
+import random
+import time
+
+from Bio import pairwise2
+from Bio.Align import substitution_matrices
+
+
+def timed(function, *args, **keywds):
+    """Return the result of the function, and the time it took."""
+    start_time = time.time()
+    result = function(*args, **keywds)
+    return result, time.time() - start_time
+
+
+def same(result1, result2):
+    """Return True if both results agree, allowing for rounding of the scores."""
+    if not isinstance(result1, list):
+        return abs(result1 - result2) < 1.0e-6
+    if len(result1) != len(result2):
+        return False
+    if result1 and isinstance(result1[0], list):
+        return all(same(item1, item2) for item1, item2 in zip(result1, result2))
+    for alignment1, alignment2 in zip(result1, result2):
+        if alignment1[:2] != alignment2[:2] or alignment1[3:] != alignment2[3:]:
+            return False
+        if abs(alignment1.score - alignment2.score) > 1.0e-6:
+            return False
+    return True
+
+
+def compare(name, function, *args, **keywds):
+    """Run the function with and without PairwiseAligner and print timings."""
+    aligner = pairwise2._PairwiseAligner
+    pairwise2._PairwiseAligner = None
+    expected, old_time = timed(function, *args, **keywds)
+    pairwise2._PairwiseAligner = aligner
+    result, new_time = timed(function, *args, **keywds)
+    print(
+        "%-40s %10.4f s %10.4f s %8.1fx  %s"
+        % (
+            name,
+            old_time,
+            new_time,
+            old_time / new_time,
+            "same" if same(result, expected) else "DIFFERENT",
+        )
+    )
+
+
+def mutate(sequence, alphabet, rate=0.1):
+    """Return a copy of the sequence with random substitutions and indels."""
+    letters = []
+    for letter in sequence:
+        r = random.random()
+        if r < rate / 2:
+            letters.append(random.choice(alphabet))
+        elif r < rate * 3 / 4:
+            continue
+        elif r < rate:
+            letters.append(letter)
+            letters.append(random.choice(alphabet))
+        else:
+            letters.append(letter)
+    return "".join(letters)
+
+
+random.seed(0)
+dna = "".join(random.choice("ACGT") for i in range(500))
+dna2 = mutate(dna, "ACGT")
+long_dna = "".join(random.choice("ACGT") for i in range(3000))
+long_dna2 = mutate(long_dna, "ACGT", 0.02)
+protein = "".join(random.choice("ACDEFGHIKLMNPQRSTVWY") for i in range(300))
+protein2 = mutate(protein, "ACDEFGHIKLMNPQRSTVWY")
+blosum62 = substitution_matrices.load("BLOSUM62")
+
+print("%-40s %12s %12s %9s" % ("", "traceback", "aligner", "speedup"))
+compare("globalms, DNA 500 bp", pairwise2.align.globalms, dna, dna2, 2, -1, -3, -1)
+compare(
+    "globalms, one alignment only",
+    pairwise2.align.globalms,
+    dna,
+    dna2,
+    2,
+    -1,
+    -3,
+    -1,
+    one_alignment_only=True,
+)
+compare(
+    "globalms, DNA 3000 bp, score only",
+    pairwise2.align.globalms,
+    long_dna,
+    long_dna2,
+    5,
+    -4,
+    -10,
+    -0.5,
+    score_only=True,
+)
+compare(
+    "globalds, protein 300 aa",
+    pairwise2.align.globalds,
+    protein,
+    protein2,
+    blosum62,
+    -10,
+    -0.5,
+)
+compare(
+    "globalds, score only",
+    pairwise2.align.globalds,
+    protein,
+    protein2,
+    blosum62,
+    -10,
+    -0.5,
+    score_only=True,
+)
+compare(
+    "localds, score only",
+    pairwise2.align.localds,
+    protein,
+    protein2[50:250],
+    blosum62,
+    -10,
+    -0.5,
+    score_only=True,
+)
+compare(
+    "globalxx, short sequences (x1000)",
+    lambda: [
+        pairwise2.align.globalxx(dna[i : i + 12], dna2[i : i + 10]) for i in range(1000)
+    ],
+)
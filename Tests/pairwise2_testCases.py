@@ -895,6 +895,94 @@ class TestOtherFunctions(unittest.TestCase):
         self.assertEqual(len(pairwise2.align.localxx("AC", "GA")), 1)
 
 
+class TestPairwiseAlignerDispatch(unittest.TestCase):
+    """Compare the results of PairwiseAligner with the traceback functions."""
+
+    def align(self, function, *args, **keywds):
+        """Return the alignments with and without using PairwiseAligner."""
+        result = function(*args, **keywds)
+        aligner = pairwise2._PairwiseAligner
+        pairwise2._PairwiseAligner = None
+        try:
+            expected = function(*args, **keywds)
+        finally:
+            pairwise2._PairwiseAligner = aligner
+        return result, expected
+
+    def check(self, function, *args, **keywds):
+        """Check that the alignments are the same, in the same order."""
+        result, expected = self.align(function, *args, **keywds)
+        if keywds.get("score_only"):
+            self.assertAlmostEqual(result, expected)
+            return
+        self.assertEqual(len(result), len(expected))
+        for alignment, expected_alignment in zip(result, expected):
+            self.assertEqual(alignment.seqA, expected_alignment.seqA)
+            self.assertEqual(alignment.seqB, expected_alignment.seqB)
+            self.assertAlmostEqual(alignment.score, expected_alignment.score)
+            self.assertEqual(alignment.start, expected_alignment.start)
+            self.assertEqual(alignment.end, expected_alignment.end)
+
+    def test_random(self):
+        """Test random sequences with various scores."""
+        import random
+
+        random.seed(0)
+        blosum62 = substitution_matrices.load("BLOSUM62")
+        for trial in range(50):
+            seqA = "".join(random.choice("ACGT") for i in range(random.randint(1, 15)))
+            seqB = "".join(random.choice("ACGT") for i in range(random.randint(1, 15)))
+            self.check(pairwise2.align.globalxx, seqA, seqB)
+            self.check(pairwise2.align.globalms, seqA, seqB, 2, -1, -0.5, -0.1)
+            self.check(pairwise2.align.globalms, seqA, seqB, 1, -1, -1, -1)
+            self.check(
+                pairwise2.align.globalms,
+                seqA,
+                seqB,
+                5,
+                -4,
+                -2,
+                -0.5,
+                one_alignment_only=True,
+            )
+            self.check(
+                pairwise2.align.globalmd,
+                seqA,
+                seqB,
+                1,
+                -1,
+                -3,
+                -1,
+                -1,
+                -0.5,
+                penalize_end_gaps=(True, False),
+            )
+            self.check(pairwise2.align.globalds, seqA, seqB, blosum62, -10, -1)
+            self.check(
+                pairwise2.align.globalxs,
+                seqA,
+                seqB,
+                -1,
+                -0.5,
+                penalize_extend_when_opening=True,
+            )
+            self.check(
+                pairwise2.align.localms, seqA, seqB, 2, -1, -3, -1, score_only=True
+            )
+            self.check(
+                pairwise2.align.localds, seqA, seqB, blosum62, -3, -1, score_only=True
+            )
+
+    def test_fallback(self):
+        """Test that unsupported parameters give the same result."""
+        self.check(pairwise2.align.localxx, "ACCGT", "ACG")
+        self.check(
+            pairwise2.align.globalxx, ["A", "C", "G"], ["A", "G"], gap_char=["-"]
+        )
+        # Too many optimal alignments to recover them all:
+        self.check(pairwise2.align.globalxx, "A" * 20, "A" * 10)
+
+
 if __name__ == "__main__":
     if pairwise2.rint != pairwise2._python_rint:
         # This uses the default C extensions, if import didn't fail.
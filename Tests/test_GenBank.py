@@ -10,6 +10,7 @@
 """Tests for the GenBank module."""
 
 
+import copy
 import os
 import sys
 import unittest
@@ -23,6 +24,7 @@ from Bio import BiopythonParserWarning
 
 from Bio import SeqIO
 from Bio.SeqRecord import SeqRecord
+from Bio.SeqFeature import FeatureLocation, SeqFeature
 from Bio.Seq import Seq, UndefinedSequenceError
 
 # GenBank stuff to test:
@@ -8449,6 +8451,85 @@ class GenBankScannerTests(unittest.TestCase):
         )
         self.assertEqual(len(l_embl_r[0].features), 29)
 
+    def test_genbank_lazy_features(self):
+        """Test parsing the features of gbk files only when used."""
+        for filename in ("GenBank/NC_005816.gb", "GenBank/NC_000932.gb"):
+            with open(filename) as handle:
+                eager = self.gb_s.parse(handle)
+            with open(filename) as handle:
+                lazy = self.gb_s.parse(handle, lazy_features=True)
+            self.assertEqual(len(eager.features), len(lazy.features))
+            for old, new in zip(eager.features, lazy.features):
+                self.assertIsNot(type(new), SeqFeature)
+                self.assertEqual(old.type, new.type)
+                self.assertEqual(old.location, new.location)
+                self.assertIs(type(new), SeqFeature)
+                self.assertEqual(old.qualifiers, new.qualifiers)
+                self.assertEqual(repr(old), repr(new))
+            self.assertEqual(eager.format("gb"), lazy.format("gb"))
+
+    def test_genbank_lazy_features_slicing(self):
+        """Test slicing and copying records with features not yet parsed."""
+        with open("GenBank/NC_000932.gb") as handle:
+            eager = self.gb_s.parse(handle)
+        with open("GenBank/NC_000932.gb") as handle:
+            lazy = self.gb_s.parse(handle, lazy_features=True)
+        feature = copy.deepcopy(lazy.features[1])
+        self.assertEqual(repr(feature), repr(eager.features[1]))
+        self.assertEqual(
+            [repr(f) for f in lazy[10000:40000].features],
+            [repr(f) for f in eager[10000:40000].features],
+        )
+
+    def test_genbank_lazy_features_assignment(self):
+        """Test assigning to features which have not been parsed yet."""
+        with open("GenBank/NC_005816.gb") as handle:
+            eager = self.gb_s.parse(handle)
+        with open("GenBank/NC_005816.gb") as handle:
+            lazy = self.gb_s.parse(handle, lazy_features=True)
+        location = FeatureLocation(0, 10, 1)
+        feature = lazy.features[1]
+        feature.location = location
+        self.assertEqual(feature.qualifiers, eager.features[1].qualifiers)
+        self.assertEqual(feature.location, location)
+        qualifiers = {"note": ["assigned"]}
+        feature = lazy.features[2]
+        feature.qualifiers = qualifiers
+        self.assertEqual(feature.location, eager.features[2].location)
+        self.assertEqual(feature.qualifiers, qualifiers)
+
+    def test_genbank_feature_types(self):
+        """Test parsing only some feature types of gbk files."""
+        with open("GenBank/NC_000932.gb") as handle:
+            eager = self.gb_s.parse(handle)
+        for lazy_features in (False, True):
+            with open("GenBank/NC_000932.gb") as handle:
+                records = SeqIO.InsdcIO.GenBankIterator(
+                    handle, ["gene", "tRNA"], lazy_features=lazy_features
+                )
+                record = next(records)
+            self.assertEqual(
+                [repr(f) for f in record.features],
+                [repr(f) for f in eager.features if f.type in ("gene", "tRNA")],
+            )
+        self.assertEqual(record.features[0].type, "gene")
+        self.assertEqual(record.features[0].qualifiers["gene"], ["rps12"])
+
+    def test_embl_lazy_features(self):
+        """Test parsing the features of embl files only when used."""
+        with open("EMBL/AE017046.embl") as handle:
+            eager = list(SeqIO.InsdcIO.EmblIterator(handle))
+        with open("EMBL/AE017046.embl") as handle:
+            lazy = list(SeqIO.InsdcIO.EmblIterator(handle, lazy_features=True))
+        self.assertEqual(len(lazy[0].features), 29)
+        self.assertEqual(
+            [repr(f) for f in eager[0].features], [repr(f) for f in lazy[0].features]
+        )
+        with open("EMBL/AE017046.embl") as handle:
+            record = next(SeqIO.InsdcIO.EmblIterator(handle, feature_types=["CDS"]))
+        self.assertEqual(len(record.features), 10)
+        self.assertEqual(record.features[0].qualifiers["protein_id"], ["AAS58758.1"])
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
@@ -33,6 +33,7 @@ except ImportError:
     ) from None
 
 from Bio.PDB.NeighborSearch import NeighborSearch
+from Bio.PDB import PDBParser
 
 
 class NeighborTest(unittest.TestCase):
@@ -62,6 +63,41 @@ class NeighborTest(unittest.TestCase):
         self.assertEqual([], ns.search(x, 5.0, "M"))
         self.assertEqual([], ns.search(x, 5.0, "S"))
 
+    def test_neighbor_search_levels(self):
+        """NeighborSearch: Find residues and chains within radius."""
+        parser = PDBParser(QUIET=True)
+        structure = parser.get_structure("2BEG", "PDB/2BEG.pdb")
+        atoms = list(structure.get_atoms())
+        ns = NeighborSearch(atoms)
+        atom_pairs = ns.search_all(4.0)
+        self.assertEqual(len(atom_pairs), len(set(atom_pairs)))
+        for atom1, atom2 in atom_pairs:
+            self.assertLessEqual(atom1 - atom2, 4.0)
+        # compare to translating the atom pairs level by level
+        pairs = atom_pairs
+        for level in "RCMS":
+            parent_pairs = set()
+            for entity1, entity2 in pairs:
+                parent1 = entity1.get_parent()
+                parent2 = entity2.get_parent()
+                if parent1 == parent2:
+                    continue
+                elif parent1 < parent2:
+                    parent_pairs.add((parent1, parent2))
+                else:
+                    parent_pairs.add((parent2, parent1))
+            pairs = list(parent_pairs)
+            hits = ns.search_all(4.0, level)
+            self.assertIsInstance(hits, list)
+            self.assertEqual(len(hits), len(pairs))
+            self.assertEqual(set(hits), parent_pairs)
+            for entity1, entity2 in hits:
+                self.assertLess(entity1, entity2)
+        self.assertEqual(len(ns.search_all(4.0, "R")), 546)
+        self.assertEqual(len(ns.search_all(4.0, "C")), 7)
+        self.assertEqual(ns.search_all(4.0, "M"), [])
+        self.assertEqual(ns.search_all(0.1, "R"), [])
+
 
 class KDTreeTest(unittest.TestCase):
 
@@ -142,6 +178,35 @@ class KDTreeTest(unittest.TestCase):
                 self.assertEqual(neighbor1.index2, neighbor2.index2)
                 self.assertAlmostEqual(neighbor1.radius, neighbor2.radius)
 
+    def test_KDTree_neighbor_search_arrays(self):
+        """Test all fixed radius neighbor search returning arrays.
+
+        Compare the index and radius arrays returned by the KD tree search
+        to the Neighbor objects returned by the same search.
+        """
+        bucket_size = self.bucket_size
+        nr_points = self.nr_points
+        for radius in (self.radius, 2 * self.radius):
+            coords = random((nr_points, 3))
+            kdt = kdtrees.KDTree(coords, bucket_size)
+            neighbors = kdt.neighbor_search(radius)
+            pairs, distances = kdt.neighbor_search(radius, arrays=True)
+            self.assertEqual(pairs.shape, (len(neighbors), 2))
+            self.assertEqual(distances.shape, (len(neighbors),))
+            for neighbor, pair, distance in zip(neighbors, pairs, distances):
+                self.assertEqual(neighbor.index1, pair[0])
+                self.assertEqual(neighbor.index2, pair[1])
+                self.assertAlmostEqual(neighbor.radius, distance)
+            self.assertTrue((pairs[:, 0] < pairs[:, 1]).all())
+        # a tree consisting of a single bucket
+        kdt = kdtrees.KDTree(coords[:3], bucket_size)
+        pairs, distances = kdt.neighbor_search(10.0, arrays=True)
+        self.assertEqual(pairs.tolist(), [[0, 1], [0, 2], [1, 2]])
+        self.assertEqual(len(distances), 3)
+        pairs, distances = kdt.neighbor_search(1.0e-9, arrays=True)
+        self.assertEqual(pairs.shape, (0, 2))
+        self.assertEqual(distances.shape, (0,))
+
     def test_KDTree_neighbor_search_manual(self):
         """Test all fixed radius neighbor search.
 
@@ -104,6 +104,48 @@ class TestShrakeRupley(unittest.TestCase):
             atom_sum = sum(a.sasa for a in c.get_atoms())
             self.assertAlmostEqual(atom_sum, c.sasa, places=2)
 
+    def test_threads(self):
+        """Run Shrake-Rupley with multiple threads."""
+        m = copy.deepcopy(self.model)  # modifies atom.sasa
+
+        sasa = ShrakeRupley()
+        sasa.compute(m)
+        expected = [a.sasa for a in m.get_atoms()]
+
+        sasa = ShrakeRupley()
+        sasa.compute(m, threads=4)
+        result = [a.sasa for a in m.get_atoms()]
+        self.assertEqual(result, expected)
+
+    def test_moved_atoms(self):
+        """Run Shrake-Rupley again after moving some atoms."""
+        m = copy.deepcopy(self.model)  # modifies atom.sasa
+        atoms = list(m.get_atoms())
+
+        sasa = ShrakeRupley()
+        sasa.compute(m)
+        before = [a.sasa for a in atoms]
+
+        # move one residue away from the others
+        for a in m["A"][11]:
+            a.coord = a.coord + 3.0
+        sasa.compute(m, level="R")
+        result = [a.sasa for a in atoms]
+        self.assertNotEqual(result, before)
+
+        expected = copy.deepcopy(m)
+        ShrakeRupley().compute(expected, level="R")
+        self.assertEqual(result, [a.sasa for a in expected.get_atoms()])
+        for r1, r2 in zip(m.get_residues(), expected.get_residues()):
+            self.assertAlmostEqual(r1.sasa, r2.sasa, places=6)
+
+        # and back
+        for a in m["A"][11]:
+            a.coord = a.coord - 3.0
+        sasa.compute(m)
+        for a, b in zip([a.sasa for a in atoms], before):
+            self.assertAlmostEqual(a, b, places=6)
+
     # Exceptions
     def test_fail_probe_radius(self):
         """Raise exception on bad probe_radius parameter."""
@@ -183,6 +183,24 @@ class ProtParamTest(unittest.TestCase):
             # Expected values have 4 decimal places, so restrict to that exactness
             self.assertAlmostEqual(i, e, places=4)
 
+    def test_protein_scale_unchanged(self):
+        """Check the scale profile matches a window by window calculation."""
+        sequence = self.analysis.sequence
+        window = 9
+        weights = self.analysis._weight_list(window, 0.4)
+        expected = []
+        for i in range(len(sequence) - window + 1):
+            score = 0.0
+            for j in range(window // 2):
+                front = ProtParamData.kd[sequence[i + j]]
+                back = ProtParamData.kd[sequence[i + window - j - 1]]
+                score += weights[j] * front + weights[j] * back
+            score += ProtParamData.kd[sequence[i + window // 2]]
+            expected.append(score / (sum(weights) * 2 + 1))
+        self.assertEqual(
+            self.analysis.protein_scale(ProtParamData.kd, window, 0.4), expected
+        )
+
     def test_gravy(self):
         """Calculate gravy."""
         self.assertAlmostEqual(self.analysis.gravy(), -0.5974, places=4)
@@ -4,6 +4,7 @@
 #
 
 """Testing code for Restriction enzyme classes of Biopython."""
+import random
 import unittest
 
 from Bio.Restriction import Analysis, Restriction, RestrictionBatch
@@ -498,6 +499,31 @@ class RestrictionBatches(unittest.TestCase):
         search = seq / NonComm
         self.assertEqual(search[McrI], [28])
 
+    def test_search_single_pass(self):
+        """Test batch search in a single pass gives the same sites as each enzyme."""
+        random.seed(0)
+        for letters in ("ACGT", "ACGTACGTACGTNRY"):
+            seq = Seq("".join(random.choice(letters) for i in range(2000)))
+            batch = RestrictionBatch(AllEnzymes)
+            for linear in (True, False):
+                search = batch.search(seq, linear)
+                fseq = FormattedSeq(seq, linear)
+                for enzyme in AllEnzymes:
+                    self.assertEqual(search[enzyme], enzyme.search(fseq), enzyme)
+        # sites spanning the origin of circular sequences
+        seq = Seq("ATTCAAAACCCGGGAAAGAATTCAAAAAAAAAAAGA")
+        batch = RestrictionBatch(CommOnly)
+        for enzyme, sites in batch.search(seq, linear=False).items():
+            self.assertEqual(sites, enzyme.search(seq, linear=False), enzyme)
+        self.assertEqual(batch.search(seq, linear=False)[EcoRI], [19, 36])
+        # the automaton is rebuilt if the batch changes
+        batch = RestrictionBatch(CommOnly)
+        batch.remove(EcoRI)
+        self.assertNotIn(EcoRI, batch.search(seq))
+        self.assertEqual(batch.search(seq)[SmaI], [12])
+        batch.add(EcoRI)
+        self.assertEqual(batch.search(seq, linear=False)[EcoRI], [19, 36])
+
     def test_analysis_restrictions(self):
         """Test Fancier restriction analysis."""
         new_seq = Seq("TTCAAAAAAAAAAAAAAAAAAAAAAAAAAAAGAA")
@@ -553,6 +579,37 @@ class RestrictionBatches(unittest.TestCase):
         self.assertEqual(ana.do_not_cut(7, 12), {EcoRI: [2, 14]})
 
 
+class LazyEnzymes(unittest.TestCase):
+    """Tests for the enzymes created when first used."""
+
+    def test_module_attributes(self):
+        """Enzymes are found as attributes of the modules."""
+        import Bio.Restriction
+
+        self.assertIs(Bio.Restriction.EcoRI, EcoRI)
+        self.assertIs(Restriction.EcoRI, EcoRI)
+        self.assertIs(Bio.Restriction.AllEnzymes, AllEnzymes)
+        self.assertEqual(len(Restriction.__all__), len(AllEnzymes) + 6)
+        self.assertIn("EcoRI", dir(Bio.Restriction))
+        self.assertIn("AllEnzymes", dir(Restriction))
+        with self.assertRaises(AttributeError):
+            Bio.Restriction.NotAnEnzyme
+        with self.assertRaises(AttributeError):
+            Restriction.NotAnEnzyme
+
+    def test_batches(self):
+        """Enzymes given by name are the enzyme classes."""
+        batch = RestrictionBatch(["EcoRI", "Hpy188III"])
+        self.assertIn(EcoRI, batch)
+        self.assertIn(Restriction.Hpy188III, batch)
+        self.assertTrue(batch.is_restriction("BsaXI"))
+        self.assertIs(batch.format("BsaXI"), Restriction.BsaXI)
+        self.assertRaises(ValueError, batch.format, "NotAnEnzyme")
+        batch = RestrictionBatch((), ("S",))
+        self.assertTrue(all(isinstance(x, Restriction.RestrictionType) for x in batch))
+        self.assertEqual(len(AllEnzymes), len(CommOnly) + len(NonComm))
+
+
 class TestPrintOutputs(unittest.TestCase):
     """Class to test various print outputs."""
 
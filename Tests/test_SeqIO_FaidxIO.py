@@ -0,0 +1,143 @@
+"""Tests for SeqIO FaidxIO module."""
+
+
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from Bio import bgzf
+from Bio import SeqIO
+from Bio.SeqIO.FaidxIO import FaidxIndex, read_fai, read_gzi
+
+
+class Parsing(unittest.TestCase):
+    """Test random access to FASTA files via faidx indexes."""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp(prefix="biopython-test-faidx")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def temp_copy(self, path):
+        filename = os.path.join(self.temp_dir, os.path.basename(path))
+        shutil.copyfile(path, filename)
+        return filename
+
+    def check_slices(self, records, index, step=7):
+        self.assertEqual([record.id for record in records], list(index))
+        for record1 in records:
+            record2 = index[record1.id]
+            self.assertEqual(record1.id, record2.id)
+            seq1 = record1.seq
+            seq2 = record2.seq
+            self.assertEqual(len(seq1), len(seq2))
+            self.assertEqual(seq1, seq2)
+            n = len(seq1)
+            for i in range(0, n, step):
+                self.assertEqual(seq1[i], seq2[i])
+                self.assertEqual(seq1[-i - 1], seq2[-i - 1])
+                for j in range(i, n, step):
+                    self.assertEqual(seq1[i:j], seq2[i:j])
+                    self.assertEqual(seq1[j:i:-3], seq2[j:i:-3])
+
+    def test_plain(self):
+        path = "Fasta/faidx.fasta"
+        records = list(SeqIO.parse(path, "fasta"))
+        with FaidxIndex(path) as index:
+            self.assertEqual(len(index), 4)
+            self.assertIn("empty", index)
+            self.assertNotIn("chr4", index)
+            self.assertEqual(index.lengths()["chr1"], 150)
+            self.check_slices(records, index, step=3)
+            self.assertEqual(index.fetch("chr2", 58, 66), "ACGTtttt")
+            record = index["chr1"]
+        self.assertRaises(ValueError, lambda: record.seq[:10])
+
+    def test_create_fai(self):
+        path = self.temp_copy("Fasta/faidx.fasta")
+        with FaidxIndex(path):
+            pass
+        self.assertEqual(read_fai(path + ".fai"), read_fai("Fasta/faidx.fasta.fai"))
+
+    def test_unwritable_index(self):
+        path = "Fasta/faidx.fasta"
+        records = list(SeqIO.parse(path, "fasta"))
+        # Directory does not exist, so the index can't be written
+        fai_filename = os.path.join(self.temp_dir, "missing", "faidx.fasta.fai")
+        with FaidxIndex(path, fai_filename=fai_filename) as index:
+            self.check_slices(records, index)
+        self.assertFalse(os.path.exists(fai_filename))
+
+    def test_stale_index(self):
+        path = self.temp_copy("Fasta/faidx.fasta")
+        with FaidxIndex(path) as index:
+            self.assertEqual(index.fetch("chr3", 0, 5), "NNNNA")
+        with open(path, "w") as handle:
+            handle.write(">chr3\nACGT\nAC\n>chr4\nTTTT\n")
+        stat = os.stat(path + ".fai")
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        with FaidxIndex(path) as index:
+            self.assertEqual(list(index), ["chr3", "chr4"])
+            self.assertEqual(index.fetch("chr3"), "ACGTAC")
+        self.assertEqual(read_fai(path + ".fai")[1], ("chr4", 4, 20, 4, 5))
+
+    def test_bgzf(self):
+        # Make a file long enough to span several BGZF blocks
+        random.seed(0)
+        path = os.path.join(self.temp_dir, "example.fasta.gz")
+        records = []
+        with bgzf.BgzfWriter(path, "wb") as handle:
+            for i, (length, width) in enumerate([(50000, 60), (120000, 70), (3, 80)]):
+                seq = "".join(random.choice("ACGTN") for j in range(length))
+                records.append((f"seq{i}", seq))
+                handle.write(f">seq{i} description\n".encode())
+                for j in range(0, length, width):
+                    handle.write(seq[j : j + width].encode() + b"\n")
+        with bgzf.open(path, "rt") as handle:
+            self.assertEqual(
+                [
+                    (record.id, str(record.seq))
+                    for record in SeqIO.parse(handle, "fasta")
+                ],
+                records,
+            )
+        with FaidxIndex(path) as index:
+            self.assertEqual(len(read_gzi(path + ".gzi")), 3)
+            for name, seq in records:
+                self.assertEqual(index.fetch(name), seq)
+                for start in range(0, len(seq), 9973):
+                    end = start + 20000
+                    self.assertEqual(index[name].seq[start:end], seq[start:end])
+                    self.assertEqual(index.fetch(name, start, end), seq[start:end])
+        # Now reuse the .gzi and .fai files
+        with FaidxIndex(path) as index:
+            self.assertEqual(
+                index.fetch("seq1", 65530, 65545), records[1][1][65530:65545]
+            )
+
+    def test_bad_line_length(self):
+        path = os.path.join(self.temp_dir, "bad.fasta")
+        with open(path, "w") as handle:
+            handle.write(">alpha\nACGT\nAC\nACGT\n>beta\nACGT\n")
+        with self.assertRaises(ValueError) as cm:
+            FaidxIndex(path)
+        self.assertEqual(
+            str(cm.exception), "Different line length in sequence 'alpha' at offset 15"
+        )
+        self.assertFalse(os.path.exists(path + ".fai"))
+
+    def test_duplicate_name(self):
+        path = os.path.join(self.temp_dir, "dups.fasta")
+        with open(path, "w") as handle:
+            handle.write(">alpha\nACGT\n>beta\nACGT\n>alpha\nAC\n")
+        with self.assertRaises(ValueError) as cm:
+            FaidxIndex(path)
+        self.assertEqual(str(cm.exception), "Duplicate name 'alpha'")
+
+
+if __name__ == "__main__":
+    runner = unittest.TextTestRunner(verbosity=2)
+    unittest.main(testRunner=runner)
@@ -989,6 +989,121 @@ class TestSFF(unittest.TestCase):
                 self.assertRaises(ValueError, SeqIO.write, record, h, "sff")
 
 
+class TestFastqBatch(unittest.TestCase):
+    def check_batches(self, filename, fmt, batch_size):
+        records = list(SeqIO.parse(filename, fmt))
+        batches = list(
+            QualityIO.FastqBatchIterator(filename, batch_size=batch_size, fmt=fmt)
+        )
+        self.assertEqual(len(batches), max(1, -(-len(records) // batch_size)))
+        reads = [read for batch in batches for read in batch]
+        self.assertEqual(len(reads), len(records))
+        for record, (title, seq, qual) in zip(records, reads):
+            self.assertEqual(record.description, title)
+            self.assertEqual(record.seq, seq)
+            self.assertEqual(record.letter_annotations["phred_quality"], list(qual))
+
+    def test_sanger(self):
+        for filename in (
+            "Quality/example.fastq",
+            "Quality/sanger_full_range_original_sanger.fastq",
+            "Quality/wrapping_original_sanger.fastq",
+            "Quality/zero_length.fastq",
+            "Quality/tricky.fastq",
+        ):
+            for batch_size in (1, 2, 3, 1000):
+                self.check_batches(filename, "fastq", batch_size)
+
+    def test_illumina(self):
+        for batch_size in (1, 5):
+            self.check_batches(
+                "Quality/illumina_full_range_as_illumina.fastq",
+                "fastq-illumina",
+                batch_size,
+            )
+
+    def test_errors(self):
+        with self.assertRaises(ValueError):
+            next(
+                QualityIO.FastqBatchIterator(
+                    "Quality/example.fastq", fmt="fastq-solexa"
+                )
+            )
+        with self.assertRaises(ValueError):
+            next(
+                QualityIO.FastqBatchIterator(
+                    "Quality/solexa_faked.fastq", fmt="fastq-illumina"
+                )
+            )
+        with self.assertRaises(ValueError):
+            list(QualityIO.FastqBatchIterator("Quality/error_qual_del.fastq"))
+
+    def test_trim_and_filter(self):
+        filename = "Quality/zero_length.fastq"
+        records = list(SeqIO.parse(filename, "fastq"))
+        for min_quality in (0, 10, 20, 30, 50):
+            expected = []
+            for record in records:
+                qual = record.letter_annotations["phred_quality"]
+                length = 0
+                for i, q in enumerate(qual):
+                    if q >= min_quality:
+                        length = i + 1
+                expected.append(record[:length])
+            batch = next(QualityIO.FastqBatchIterator(filename))
+            trimmed = batch.trim(min_quality)
+            self.assertEqual(len(trimmed), len(expected))
+            for record, (title, seq, qual) in zip(expected, trimmed):
+                self.assertEqual(record.seq, seq)
+                self.assertEqual(record.letter_annotations["phred_quality"], list(qual))
+            for min_length in (0, 1, 10):
+                filtered = list(
+                    QualityIO.FastqBatchIterator(
+                        filename,
+                        batch_size=2,
+                        trim_quality=min_quality,
+                        min_mean_quality=20,
+                        min_length=min_length,
+                    )
+                )
+                ids = [
+                    record.id
+                    for record in expected
+                    if len(record) >= min_length
+                    and len(record)
+                    and sum(record.letter_annotations["phred_quality"])
+                    >= 20 * len(record)
+                ]
+                self.assertEqual(ids, [i for batch in filtered for i in batch.ids])
+
+    def test_trailing_empty_reads(self):
+        import numpy
+
+        qualities = numpy.array([10, 20, 30], numpy.uint8)
+        for lengths in ([3, 0], [3, 0, 0], [0, 3, 0]):
+            offsets = numpy.zeros(len(lengths) + 1, numpy.int64)
+            numpy.cumsum(lengths, out=offsets[1:])
+            batch = QualityIO.FastqBatch(
+                ["r%i" % i for i in range(len(lengths))],
+                numpy.frombuffer(b"ACG", numpy.uint8),
+                qualities,
+                offsets,
+            )
+            expected = [20.0 if length else 0.0 for length in lengths]
+            self.assertEqual(batch.mean_qualities().tolist(), expected)
+            self.assertEqual(batch.trim(25).lengths.tolist(), lengths)
+            self.assertEqual(batch.trim(31).lengths.tolist(), [0] * len(lengths))
+
+    def test_select(self):
+        batch = next(QualityIO.FastqBatchIterator("Quality/tricky.fastq"))
+        subset = batch.select([3, 1])
+        self.assertEqual(subset.titles, [batch.titles[3], batch.titles[1]])
+        self.assertEqual(subset[0][1], batch[3][1])
+        self.assertEqual(list(subset[1][2]), list(batch[1][2]))
+        self.assertEqual(len(batch.select(batch.lengths < 0)), 0)
+        self.assertEqual(batch[-1][0], batch.titles[-1])
+
+
 class NonFastqTests(unittest.TestCase):
     def check_wrong_format(self, filename):
         for f in ("fastq", "fastq-sanger", "fastq-solexa", "fastq-illumina"):
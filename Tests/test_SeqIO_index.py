@@ -22,6 +22,7 @@ from io import StringIO
 
 from Bio.SeqRecord import SeqRecord
 from Bio import SeqIO
+from Bio.File import _SQLiteManySeqFilesDict
 from Bio.SeqIO._index import _FormatToRandomAccess
 
 from Bio import BiopythonParserWarning
@@ -450,8 +451,16 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
 
             rec_dict = SeqIO.index(filename, fmt)
             self.check_dict_methods(rec_dict, id_list, id_list, msg=msg)
+            keys = list(rec_dict)
             rec_dict.close()
 
+            # With a binary index file, first built then reused
+            for i in range(2):
+                rec_dict = SeqIO.index(filename, fmt, index_filename=self.index_tmp)
+                self.check_dict_methods(rec_dict, id_list, id_list, msg=msg)
+                self.assertEqual(list(rec_dict), keys, msg=msg)
+                rec_dict.close()
+
             if not sqlite3:
                 return
 
@@ -527,6 +536,17 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
             self.check_dict_methods(rec_dict, key_list, id_list, msg=msg)
             rec_dict.close()
 
+            # With a binary index file, first built then reused
+            for i in range(2):
+                rec_dict = SeqIO.index(
+                    filename,
+                    fmt,
+                    key_function=self.add_prefix,
+                    index_filename=self.index_tmp,
+                )
+                self.check_dict_methods(rec_dict, key_list, id_list, msg=msg)
+                rec_dict.close()
+
             if not sqlite3:
                 return
 
@@ -589,12 +609,18 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
             with warnings.catch_warnings():
                 warnings.simplefilter("ignore", BiopythonParserWarning)
                 rec_dict = SeqIO.index(filename, fmt, key_function=str.lower)
+                rec_dict_file = SeqIO.index(
+                    filename, fmt, key_function=str.lower, index_filename=self.index_tmp
+                )
                 if sqlite3:
                     rec_dict_db = SeqIO.index_db(
                         ":memory:", filename, fmt, key_function=str.lower,
                     )
         else:
             rec_dict = SeqIO.index(filename, fmt, key_function=str.lower)
+            rec_dict_file = SeqIO.index(
+                filename, fmt, key_function=str.lower, index_filename=self.index_tmp
+            )
             if sqlite3:
                 rec_dict_db = SeqIO.index_db(
                     ":memory:", filename, fmt, key_function=str.lower,
@@ -611,6 +637,8 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
             self.assertIsInstance(raw, bytes, msg=msg)
             self.assertTrue(raw.strip(), msg=msg)
             self.assertIn(raw, raw_file, msg=msg)
+            # Via the index file using the raw length found when indexing
+            self.assertEqual(raw, rec_dict_file.get_raw(key), msg=msg)
 
             if sqlite3:
                 raw_db = rec_dict_db.get_raw(key)
@@ -666,6 +694,7 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
                 rec2 = SeqIO.read(handle, fmt)
             self.compare_record(rec1, rec2)
         rec_dict.close()
+        rec_dict_file.close()
         del rec_dict
 
     if sqlite3:
@@ -701,6 +730,79 @@ class IndexDictTests(SeqRecordTestBaseClass, SeqIOTestBaseClass):
         """Index file with duplicate identifiers with Bio.SeqIO.index()."""
         self.assertRaises(ValueError, SeqIO.index, "Fasta/dups.fasta", "fasta")
 
+    def test_duplicates_index_file(self):
+        """Index file with duplicate identifiers using an index file."""
+        self.assertRaises(
+            ValueError,
+            SeqIO.index,
+            "Fasta/dups.fasta",
+            "fasta",
+            index_filename=self.index_tmp,
+        )
+        self.assertFalse(os.path.isfile(self.index_tmp + ".tmp"))
+
+    def test_index_file_reuse(self):
+        """Check an index file is only reused if still valid."""
+        filename = "Quality/example.fastq"
+        index_tmp = self.index_tmp
+        ids = [record.id for record in SeqIO.parse(filename, "fastq")]
+        rec_dict = SeqIO.index(filename, "fastq", index_filename=index_tmp)
+        self.assertIn("index_filename=", repr(rec_dict))
+        rec_dict.close()
+        with open(index_tmp, "rb") as handle:
+            original = handle.read()
+
+        # Tamper with the stored offsets, which should then be used as is
+        # (confirming the file was not scanned again), and detected when the
+        # parsed record does not match the key
+        tampered = bytearray(original)
+        # (the offsets start after the format name, aligned to 8 bytes)
+        offsets = tampered.index(b"fastq") + 5
+        offsets += -offsets % 8
+        tampered[offsets : offsets + 8] = tampered[offsets + 8 : offsets + 16]
+        with open(index_tmp, "wb") as handle:
+            handle.write(tampered)
+        rec_dict = SeqIO.index(filename, "fastq", index_filename=index_tmp)
+        with self.assertRaises(ValueError):
+            rec_dict["EAS54_6_R1_2_1_413_324"]
+        rec_dict.close()
+
+        # A different format or key function means the index is rebuilt
+        rec_dict = SeqIO.index(filename, "fastq-sanger", index_filename=index_tmp)
+        self.assertEqual(
+            rec_dict["EAS54_6_R1_2_1_413_324"].id, "EAS54_6_R1_2_1_413_324"
+        )
+        rec_dict.close()
+        rec_dict = SeqIO.index(
+            filename, "fastq-sanger", key_function=str.lower, index_filename=index_tmp
+        )
+        self.assertIn("eas54_6_r1_2_1_413_324", rec_dict)
+        self.assertNotIn("EAS54_6_R1_2_1_413_324", rec_dict)
+        rec_dict.close()
+        # Including a different function with the same name
+        for key_function in (lambda name: name[4:], lambda name: name[6:]):
+            rec_dict = SeqIO.index(
+                filename,
+                "fastq-sanger",
+                key_function=key_function,
+                index_filename=index_tmp,
+            )
+            self.assertEqual(sorted(rec_dict), sorted(key_function(key) for key in ids))
+            rec_dict.close()
+
+        # As does a modified sequence file, or a corrupt index file
+        with open(index_tmp, "wb") as handle:
+            handle.write(original[:-1])
+        rec_dict = SeqIO.index(filename, "fastq", index_filename=index_tmp)
+        self.assertEqual(len(rec_dict), 3)
+        rec_dict.close()
+        with open(index_tmp, "rb") as handle:
+            self.assertEqual(handle.read(), original)
+
+        # Keys must be strings
+        with self.assertRaises(TypeError):
+            SeqIO.index(filename, "fastq", key_function=len, index_filename=index_tmp)
+
     def test_duplicates_to_dict(self):
         """Index file with duplicate identifiers with Bio.SeqIO.to_dict()."""
         with open("Fasta/dups.fasta") as handle:
@@ -769,6 +871,85 @@ if sqlite3:
             d = SeqIO.index_db(":memory:", files, "fasta")
             self.assertEqual(ids, list(d))
 
+    class IndexParallel(unittest.TestCase):
+        """Check index_db gives the same index when using worker processes."""
+
+        def setUp(self):
+            # Use tiny pieces to test splitting files at record boundaries
+            self.chunk_size = _SQLiteManySeqFilesDict._chunk_size
+            _SQLiteManySeqFilesDict._chunk_size = 500
+
+        def tearDown(self):
+            _SQLiteManySeqFilesDict._chunk_size = self.chunk_size
+
+        def check(self, filenames, fmt, key_function=None):
+            tables = []
+            for processes in (1, 3):
+                d = SeqIO.index_db(
+                    ":memory:",
+                    filenames,
+                    fmt,
+                    key_function=key_function,
+                    processes=processes,
+                )
+                tables.append(
+                    d._con.execute(
+                        "SELECT key, file_number, offset, length FROM offset_data "
+                        "ORDER BY file_number, offset;"
+                    ).fetchall()
+                )
+                self.assertEqual(len(d), len(tables[-1]))
+                for key in list(d)[::7]:
+                    if key_function:
+                        self.assertEqual(key, key_function(d[key].id))
+                    else:
+                        self.assertEqual(key, d[key].id)
+                d.close()
+            self.assertEqual(tables[0], tables[1])
+
+        def test_fasta(self):
+            """Check parallel indexing of FASTA files, split into pieces."""
+            self.check(
+                [
+                    "GenBank/NC_000932.faa",
+                    "GenBank/NC_005816.faa",
+                    "GenBank/NC_005816.fna",
+                ],
+                "fasta",
+                key_function=str.upper,
+            )
+
+        def test_fastq(self):
+            """Check parallel indexing of FASTQ files, split into pieces."""
+            self.check(
+                [
+                    "Quality/tricky.fastq",
+                    "Quality/sanger_full_range_original_sanger.fastq",
+                    "Quality/zero_length.fastq",
+                ],
+                "fastq",
+            )
+            # These are line wrapped, so the pieces must be checked
+            self.check(["Quality/wrapping_original_sanger.fastq"], "fastq")
+
+        def test_genbank(self):
+            """Check parallel indexing of GenBank files (without splitting)."""
+            self.check(
+                [
+                    "GenBank/NC_005816.gb",
+                    "GenBank/cor6_6.gb",
+                    "GenBank/NC_000932.gb.bgz",
+                ],
+                "gb",
+            )
+
+        def test_duplicates(self):
+            """Check parallel indexing still catches duplicate keys."""
+            with self.assertRaises(ValueError):
+                SeqIO.index_db(
+                    ":memory:", ["Fasta/dups.fasta"] * 2, "fasta", processes=2
+                )
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
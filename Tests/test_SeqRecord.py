@@ -8,6 +8,9 @@
 Initially this takes matched tests of GenBank and FASTA files from the NCBI
 and confirms they are consistent using our different parsers.
 """
+import copy
+import pickle
+import random
 import unittest
 
 from Bio import SeqIO
@@ -358,6 +361,108 @@ Seq('ABCDEFGHIJKLMNOPQRSTUVWZYX')"""
             self.assertLessEqual(len(rec.features), len(self.record.features))
 
 
+class SeqRecordFeatureIndex(unittest.TestCase):
+    """Test finding features with the interval index."""
+
+    def setUp(self):
+        random.seed(0)
+        features = []
+        for i in range(500):
+            start = random.randint(0, 9900)
+            end = start + random.choice([0, 1, 5, 20, 300, 4000])
+            end = min(end, 10000)
+            features.append(SeqFeature(FeatureLocation(start, end), type="misc"))
+        self.record = SeqRecord(Seq("A" * 10000), features=features)
+
+    def scan(self, start, end, contained=False):
+        """Find the features by checking each of them."""
+        if contained:
+            return [
+                f
+                for f in self.record.features
+                if start <= f.location.nofuzzy_start and f.location.nofuzzy_end <= end
+            ]
+        return [
+            f
+            for f in self.record.features
+            if f.location.nofuzzy_start < end and f.location.nofuzzy_end > start
+        ]
+
+    def check(self):
+        for i in range(200):
+            start = random.randint(0, 10000)
+            end = start + random.choice([1, 10, 100, 1000, 20000])
+            for contained in (False, True):
+                self.assertEqual(
+                    self.record.find_features(start, end, contained),
+                    self.scan(start, end, contained),
+                )
+            self.assertEqual(
+                self.record.find_features(start), self.scan(start, start + 1)
+            )
+            # Slicing is limited to the length of the sequence:
+            shifted = [f.location for f in self.scan(start, min(end, 10000), True)]
+            shifted = [location._shift(-start) for location in shifted]
+            rec = self.record[start:end]
+            self.assertEqual([f.location for f in rec.features], shifted)
+
+    def test_find_features(self):
+        """Compare find_features and slicing to checking all features."""
+        self.check()
+
+    def test_modified_features(self):
+        """Check the index is rebuilt after modifying the features."""
+        self.check()
+        self.record.features.append(SeqFeature(FeatureLocation(5000, 5010), type="new"))
+        del self.record.features[:10]
+        self.record.features.reverse()
+        self.check()
+        for feature in self.record.features[::3]:
+            feature.location = feature.location._shift(random.randint(-50, 50))
+        self.check()
+        self.record.features = self.record.features[:100]
+        self.check()
+
+    def test_modified_feature_list(self):
+        """Check changes to the default features list are detected."""
+        record = SeqRecord(self.record.seq)
+        record.features.extend(self.record.features)
+        self.record = record
+        self.test_modified_features()
+
+    def test_other_records(self):
+        """Check changes to the features of other records are ignored."""
+        feature_index = self.record._get_feature_index()
+        other = SeqRecord(Seq("ACGT"))
+        other.features.append(SeqFeature(FeatureLocation(0, 2)))
+        other.features[0].location = FeatureLocation(1, 3)
+        SeqIO.read("GenBank/NC_005816.gb", "gb")
+        self.assertIs(self.record._get_feature_index(), feature_index)
+
+    def test_copies(self):
+        """Check copies of the record and features have a working index."""
+        self.check()
+        self.record = pickle.loads(pickle.dumps(self.record))
+        self.record.features[0].location = FeatureLocation(5, 9000)
+        self.check()
+        self.record = copy.deepcopy(self.record)
+        self.record.features[1].location = FeatureLocation(0, 10)
+        self.check()
+        # SeqFeature pickled before location was a property:
+        feature = SeqFeature.__new__(SeqFeature)
+        feature.__setstate__({"location": FeatureLocation(1, 5), "type": "misc"})
+        self.assertEqual(feature.location, FeatureLocation(1, 5))
+
+    def test_references(self):
+        """Check features referencing other sequences are ignored."""
+        feature = SeqFeature(FeatureLocation(10, 20, ref="ABC"), type="misc")
+        self.record.features.insert(0, feature)
+        self.assertNotIn(feature, self.record.find_features(0, 100))
+        with self.assertWarns(UserWarning):
+            rec = self.record[:100]
+        self.assertEqual(len(rec.features), len(self.scan(0, 100, True)) - 1)
+
+
 class SeqRecordMethodsMore(unittest.TestCase):
     """Test SeqRecord methods cont."""
 
@@ -13,8 +13,10 @@ import unittest
 from Bio import SeqIO
 from Bio.Seq import Seq, MutableSeq
 from Bio.SeqRecord import SeqRecord
-from Bio.SeqUtils import GC, seq1, seq3, GC_skew
+from Bio.SeqUtils import GC, seq1, seq3, GC_skew, nt_search
 from Bio.SeqUtils.lcc import lcc_simp, lcc_mult
+from Bio.SeqUtils.patterns import NucleotideSearch
+from Bio.SeqUtils.windows import window_statistics
 from Bio.SeqUtils.CheckSum import crc32, crc64, gcg, seguid
 from Bio.SeqUtils.CodonUsage import CodonAdaptationIndex
 
@@ -210,6 +212,97 @@ class SeqUtilsTests(unittest.TestCase):
     def test_GC_skew(self):
         seq = "A" * 50
         self.assertEqual(GC_skew(seq)[0], 0)
+        seq = "GGGCAATGCCcgatTTGGGC"
+        self.assertEqual(GC_skew(seq, 8), [0.6, -0.5, 0.5])
+
+    def test_nt_search(self):
+        seq = "ACGTRTAGAGTTATatTT"
+        self.assertEqual(nt_search(seq, "RT"), ["[AG]T", 2, 9, 12])
+        self.assertEqual(nt_search(Seq(seq), "TT"), ["TT", 10, 16])
+        self.assertEqual(nt_search(seq, "NNNNN")[1:], list(range(5, 10)))
+        self.assertEqual(nt_search(seq, "GGG"), ["GGG"])
+
+    def test_nucleotide_search(self):
+        seq = "AAAGATCCAGGAAATTCCTGGaattcNNgaattc"
+        searcher = NucleotideSearch(["GATC", "TTY", "gaattc", "NNNNNNNNNNNNNNNN"])
+        for s in [seq, Seq(seq), MutableSeq(seq), SeqRecord(Seq(seq))]:
+            for chunk_size in [1, 5, 1048576]:
+                matches = searcher.search(s, chunk_size)
+                self.assertEqual(len(matches), 4)
+                positions, strands = matches["GATC"]
+                self.assertEqual(positions.tolist(), [3, 3])
+                self.assertEqual(strands.tolist(), [1, -1])
+                positions, strands = matches["TTY"]
+                self.assertEqual(positions.tolist(), [0, 10, 11, 14, 20, 23, 28, 31])
+                self.assertEqual(strands.tolist(), [-1, -1, -1, 1, -1, 1, -1, 1])
+                positions, strands = matches["gaattc"]
+                self.assertEqual(positions.tolist(), [20, 20, 28, 28])
+                positions, strands = matches["NNNNNNNNNNNNNNNN"]
+                self.assertEqual(positions.tolist(), [i // 2 for i in range(22)])
+                self.assertEqual(strands.tolist(), [1, -1] * 11)
+        searcher = NucleotideSearch("TTY", both=False, ignore_case=False)
+        positions, strands = searcher.search(seq)["TTY"]
+        self.assertEqual(positions.tolist(), [14])
+        self.assertEqual(strands.tolist(), [1])
+        self.assertRaises(ValueError, NucleotideSearch, ["ACGT", ""])
+        self.assertRaises(ValueError, NucleotideSearch, ["ACGU"])
+
+    def test_nucleotide_search_many(self):
+        # More patterns than fit in a single lookup table
+        patterns = [bin(i)[2:].replace("0", "A").replace("1", "C") for i in range(100)]
+        seq = "AACACCAAACAACACACCCAACCACCCCAAAACAAACCAACACAACACCCACCAACCCCCA" * 2
+        searcher = NucleotideSearch(patterns)
+        matches = searcher.search(seq, 16)
+        for pattern in patterns:
+            positions, strands = matches[pattern]
+            expected = [i for i in range(len(seq)) if seq.startswith(pattern, i)]
+            self.assertEqual(positions[strands == 1].tolist(), expected)
+            rc = pattern.replace("A", "t").replace("C", "g")[::-1].upper()
+            expected = [i for i in range(len(seq)) if seq.startswith(rc, i)]
+            self.assertEqual(positions[strands == -1].tolist(), expected)
+
+    def test_window_statistics(self):
+        seq = "ACGGGCTACCGTATAGGCAAGAGATGATGCCCnnATsaTTtctagacgGCCGATTA" * 3
+        statistics = ["gc", "gc_skew", "at_skew", "lcc"]
+        for window, step in [(1, 1), (8, 8), (10, 3), (20, 50)]:
+            starts = range(0, len(seq) - window + 1, step)
+            for s in [seq, Seq(seq), MutableSeq(seq), SeqRecord(Seq(seq))]:
+                for chunk_size in [1, 25, 1048576]:
+                    values = window_statistics(
+                        s, window, step, statistics, chunk_size=chunk_size
+                    )
+                    self.assertEqual(len(values["gc"]), len(starts))
+                    for i, start in enumerate(starts):
+                        subseq = seq[start : start + window]
+                        upper = subseq.upper()
+                        self.assertAlmostEqual(values["gc"][i], GC(subseq))
+                        self.assertEqual(
+                            values["gc_skew"][i], GC_skew(upper, window)[0]
+                        )
+                        a = upper.count("A")
+                        t = upper.count("T")
+                        at_skew = (a - t) / (a + t) if a + t else 0.0
+                        self.assertAlmostEqual(values["at_skew"][i], at_skew)
+                        if upper.strip("NS"):
+                            self.assertAlmostEqual(values["lcc"][i], lcc_simp(upper))
+        values = window_statistics(seq, len(seq) + 1, 1, statistics)
+        self.assertEqual([len(v) for v in values.values()], [0, 0, 0, 0])
+
+    def test_window_statistics_scales(self):
+        seq = "acgtACGTNNAGCT"
+        scale = {"A": 1.0, "C": 2.0, "G": 3.0, "T": 4.0, "n": -1.0}
+        values = window_statistics(seq, 3, 2, [], {"test": scale})
+        self.assertEqual(list(values), ["test"])
+        # Lower case letters use the upper case values, but not vice versa:
+        expected = [6 / 3, 8 / 3, 6 / 3, 7 / 3, 1 / 3, 6 / 3]
+        for value1, value2 in zip(values["test"], expected):
+            self.assertAlmostEqual(value1, value2)
+        self.assertRaises(ValueError, window_statistics, seq, 0)
+        self.assertRaises(ValueError, window_statistics, seq, 3, 0)
+        self.assertRaises(ValueError, window_statistics, seq, 3, 1, ["at"])
+        self.assertRaises(
+            ValueError, window_statistics, seq, 3, 1, ["gc"], {"gc": scale}
+        )
 
     def test_seq1_seq3(self):
         s3 = "MetAlaTyrtrpcysthrLYSLEUILEGlYPrOGlNaSnaLapRoTyRLySSeRHisTrpLysThr"
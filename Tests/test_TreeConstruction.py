@@ -5,10 +5,13 @@
 
 """Unit tests for the Bio.Phylo.TreeConstruction module."""
 
+import copy
 import os
 import unittest
 import tempfile
 
+import numpy
+
 from io import StringIO
 from Bio import AlignIO
 from Bio import Phylo
@@ -46,6 +49,44 @@ class DistanceMatrixTest(unittest.TestCase):
             "matrix=[[0], [1, 0], [2, 3, 0], [4, 5, 6, 0]])",
         )
 
+    def test_matrix_attribute_assignment(self):
+        dm = DistanceMatrix(self.names, self.matrix)
+        dm.matrix[1][0] = 99
+        self.assertEqual(dm["Alpha", "Beta"], 99)
+        matrix = dm.matrix
+        matrix[3] = [7, 8, 9, 0]
+        self.assertEqual(dm["Delta"], [7, 8, 9, 0])
+        self.assertRaises(TypeError, dm.matrix[1].append, 1)
+        self.assertRaises(TypeError, dm.matrix.append, [1, 2, 3, 4, 0])
+        self.assertRaises(ValueError, matrix.__setitem__, 2, [1, 2])
+        self.assertEqual(len(dm.matrix), 4)
+        # The rows are kept until the matrix is changed
+        self.assertIs(dm.matrix, dm.matrix)
+        self.assertIsNot(copy.deepcopy(dm).matrix[0], dm.matrix[0])
+        row = dm.matrix[2]
+        del dm["Alpha"]
+        self.assertEqual(dm.matrix, [[0], [3, 0], [8, 9, 0]])
+        self.assertRaises(ValueError, row.__setitem__, 0, 42)
+        row = dm.matrix[2]
+        dm.insert("Alpha", [0, 1, 2, 3], 0)
+        self.assertRaises(ValueError, row.__setitem__, 2, 42)
+        row = dm.matrix[3]
+        dm["Beta", "Delta"] = 5
+        self.assertRaises(ValueError, row.__setitem__, 0, 42)
+        self.assertEqual(dm.matrix[3], [3, 5, 9, 0])
+
+    def test_numpy_construction(self):
+        array = numpy.array(
+            [[9, 1, 2, 4], [1, 9, 3, 5], [2, 3, 9, 6], [4, 5, 6, 9]], float
+        )
+        dm = DistanceMatrix(self.names, array)
+        self.assertEqual(dm.matrix, self.matrix)
+        self.assertEqual(dm["Beta", "Delta"], 5.0)
+        array[numpy.diag_indices(4)] = 0
+        self.assertTrue(numpy.array_equal(dm.to_numpy(), array))
+        self.assertRaises(ValueError, DistanceMatrix, self.names, numpy.zeros((3, 3)))
+        self.assertRaises(ValueError, DistanceMatrix, self.names, numpy.zeros((4, 3)))
+
     def test_bad_construction(self):
         self.assertRaises(
             TypeError,
@@ -104,6 +145,9 @@ class DistanceMatrixTest(unittest.TestCase):
         dm.insert("Alpha", [1, 2, 4, 0])
         self.assertEqual(dm.names, ["Beta", "Gamma", "Delta", "Alpha"])
         self.assertEqual(dm.matrix, [[0], [3, 0], [5, 6, 0], [1, 2, 4, 0]])
+        # setting a float value in an integer matrix
+        dm["Beta", "Gamma"] = 2.5
+        self.assertEqual(dm["Gamma", "Beta"], 2.5)
 
     def test_bad_manipulation(self):
         dm = DistanceMatrix(self.names, self.matrix)
@@ -170,6 +214,43 @@ class DistanceCalculatorTest(unittest.TestCase):
         self.assertEqual(dmat["Alpha", "Alpha"], 0.0)
         self.assertAlmostEqual(dmat["Alpha", "Gamma"], 4.0 / 5.0)
 
+    def test_blocks_and_threads(self):
+        aln = AlignIO.read("TreeConstruction/msa.phy", "phylip")
+        for model in ("identity", "blastn", "trans", "blosum62"):
+            calculator = DistanceCalculator(model)
+            # Force tiny blocks to cover the blocked calculation
+            calculator._block_cells = 10
+            dm = calculator.get_distance(aln, threads=2)
+            for i in range(len(aln)):
+                for j in range(i + 1, len(aln)):
+                    self.assertEqual(
+                        dm[i, j], calculator._pairwise(aln[i], aln[j]), model
+                    )
+
+    def test_bad_letter(self):
+        aln = AlignIO.read(StringIO(">Alpha\nACGT\n>Beta\nACGJ"), "fasta")
+        with self.assertRaisesRegex(ValueError, "Bad letter 'J' in sequence 'Beta'"):
+            DistanceCalculator("blastn").get_distance(aln)
+        # Letters missing from the model are fine if only opposite gaps
+        aln = AlignIO.read(
+            StringIO(">Alpha\nAC-TA\n>Beta\nACJ-A\n>Gamma\nA--TC"), "fasta"
+        )
+        calculator = DistanceCalculator("blastn")
+        dm = calculator.get_distance(aln)
+        for i in range(len(aln)):
+            for j in range(i + 1, len(aln)):
+                self.assertEqual(dm[i, j], calculator._pairwise(aln[i], aln[j]))
+        aln = AlignIO.read(StringIO(">Alpha\nAC-TA\n>Beta\nACTJA"), "fasta")
+        with self.assertRaisesRegex(ValueError, "'J' in sequence 'Beta'"):
+            calculator._pairwise(aln[0], aln[1])
+        aln = AlignIO.read(
+            StringIO(">Alpha\nAC-TA\n>Beta\nACJTA\n>Gamma\nAGCTA"), "fasta"
+        )
+        with self.assertRaisesRegex(
+            ValueError, "Bad letter 'J' in sequence 'Beta' at position '2'"
+        ):
+            calculator.get_distance(aln)
+
 
 class DistanceTreeConstructorTest(unittest.TestCase):
     """Test DistanceTreeConstructor."""
@@ -219,6 +300,23 @@ class DistanceTreeConstructorTest(unittest.TestCase):
         self.assertTrue(Consensus._equal_topology(tree, ref_tree))
         # ref_tree.close()
 
+    def test_nj_additive(self):
+        # Distances between the leaves of an additive tree are recovered
+        tree = Phylo.read(
+            StringIO("((A:1,B:2):1,(C:3,(D:1,E:1):2):1,(F:2,G:3):4);"), "newick"
+        )
+        names = [clade.name for clade in tree.get_terminals()]
+        matrix = [
+            [tree.distance(a, b) for b in names[: i + 1]] for i, a in enumerate(names)
+        ]
+        dm = DistanceMatrix(names, matrix)
+        for block_cells in (1, 10, DistanceTreeConstructor._block_cells):
+            self.constructor._block_cells = block_cells
+            nj_tree = self.constructor.nj(dm)
+            for a in names:
+                for b in names:
+                    self.assertAlmostEqual(nj_tree.distance(a, b), dm[a, b])
+
 
 class ParsimonyScorerTest(unittest.TestCase):
     """Test ParsimonyScorer."""
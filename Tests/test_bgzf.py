@@ -12,6 +12,7 @@ import unittest
 import gzip
 import os
 import tempfile
+from concurrent.futures import Future
 from random import shuffle
 
 from Bio import bgzf
@@ -85,7 +86,7 @@ class BgzfTests(unittest.TestCase):
         self.assertEqual(len(old), len(new))
         self.assertEqual(old, new)
 
-    def check_by_line(self, old_file, new_file, old_gzip=False):
+    def check_by_line(self, old_file, new_file, old_gzip=False, threads=1):
         if old_gzip:
             with gzip.open(old_file) as handle:
                 old = handle.read()
@@ -101,7 +102,9 @@ class BgzfTests(unittest.TestCase):
                 old = old.decode("latin1")
 
             for cache in [1, 10]:
-                with bgzf.BgzfReader(new_file, mode, max_cache=cache) as h:
+                with bgzf.BgzfReader(
+                    new_file, mode, max_cache=cache, threads=threads
+                ) as h:
                     if "b" in mode:
                         new = b"".join(line for line in h)
                     else:
@@ -150,7 +153,7 @@ class BgzfTests(unittest.TestCase):
                 )
                 self.assertEqual(old, new)
 
-    def check_random(self, filename):
+    def check_random(self, filename, threads=1):
         """Check BGZF random access by reading blocks in forward & reverse order."""
         with gzip.open(filename, "rb") as h:
             old = h.read()
@@ -160,7 +163,7 @@ class BgzfTests(unittest.TestCase):
 
         # Forward, using explicit open/close
         new = b""
-        h = bgzf.BgzfReader(filename, "rb")
+        h = bgzf.BgzfReader(filename, "rb", threads=threads)
         self.assertTrue(h.seekable())
         self.assertFalse(h.isatty())
         self.assertEqual(h.fileno(), h._handle.fileno())
@@ -177,7 +180,7 @@ class BgzfTests(unittest.TestCase):
 
         # Reverse, using with statement
         new = b""
-        with bgzf.BgzfReader(filename, "rb") as h:
+        with bgzf.BgzfReader(filename, "rb", threads=threads) as h:
             for start, raw_len, data_start, data_len in blocks[::-1]:
                 h.seek(bgzf.make_virtual_offset(start, 0))
                 data = h.read(data_len)
@@ -189,7 +192,7 @@ class BgzfTests(unittest.TestCase):
 
         # Jump back - non-sequential seeking
         if len(blocks) >= 3:
-            h = bgzf.BgzfReader(filename, "rb", max_cache=1)
+            h = bgzf.BgzfReader(filename, "rb", max_cache=1, threads=threads)
             # Seek to a late block in the file,
             # half way into the third last block
             start, raw_len, data_start, data_len = blocks[-3]
@@ -222,7 +225,7 @@ class BgzfTests(unittest.TestCase):
                 real_offset = data_start + within_offset
                 v_offsets.append((voffset, real_offset))
         shuffle(v_offsets)
-        h = bgzf.BgzfReader(filename, "rb", max_cache=1)
+        h = bgzf.BgzfReader(filename, "rb", max_cache=1, threads=threads)
         for voffset, real_offset in v_offsets:
             h.seek(0)
             self.assertTrue(voffset >= 0 and real_offset >= 0)
@@ -261,6 +264,23 @@ class BgzfTests(unittest.TestCase):
         """Check random access to GenBank/cor6_6.gb.bgz."""
         self.check_random("GenBank/cor6_6.gb.bgz")
 
+    def test_random_threads(self):
+        """Check random access with blocks decompressed on threads."""
+        self.check_random("SamBam/ex1.bam", threads=3)
+        self.check_random("GenBank/cor6_6.gb.bgz", threads=2)
+
+    def test_random_threads_cancel(self):
+        """Check blocks read ahead are cancelled on random access."""
+        with bgzf.BgzfReader("SamBam/ex1.bam", "rb", max_cache=1, threads=2) as h:
+            h.read(10)
+            offset = h.tell()
+            h.read(100000)
+            future = Future()
+            h._pending[-1] = future
+            h.seek(offset)
+            self.assertTrue(future.cancelled())
+            self.assertNotIn(-1, h._pending)
+
     def test_text_wnts_xml(self):
         """Check text mode access to Blast/wnts.xml.bgz."""
         self.check_text("Blast/wnts.xml", "Blast/wnts.xml.bgz")
@@ -291,6 +311,13 @@ class BgzfTests(unittest.TestCase):
         self.check_by_line("GenBank/NC_000932.gb", "GenBank/NC_000932.gb.bgz")
         self.check_by_char("GenBank/NC_000932.gb", "GenBank/NC_000932.gb.bgz")
 
+    def test_iter_threads(self):
+        """Check iteration with blocks decompressed on threads."""
+        self.check_by_line("SamBam/ex1.bam", "SamBam/ex1.bam", True, threads=2)
+        self.check_by_line(
+            "GenBank/NC_000932.gb", "GenBank/NC_000932.gb.bgz", threads=4
+        )
+
     def test_bam_ex1(self):
         """Reproduce BGZF compression for BAM file."""
         temp_file = self.temp_file
@@ -383,6 +410,71 @@ class BgzfTests(unittest.TestCase):
             self.assertEqual(offset1, h.tell())
             self.assertEqual(h.read(5), "Magic")
 
+    def test_write_threads(self):
+        """Check BGZF writing with blocks compressed on threads."""
+        with open("GenBank/NC_000932.gb", "rb") as h:
+            lines = h.readlines()
+        outputs = []
+        offsets = []
+        for threads in (1, 3):
+            offsets.append([])
+            with bgzf.BgzfWriter(self.temp_file, "wb", threads=threads) as h:
+                for i, line in enumerate(lines):
+                    if i % 500 == 0:
+                        offsets[-1].append(h.tell())
+                    h.write(line)
+            with open(self.temp_file, "rb") as h:
+                outputs.append(h.read())
+        self.assertEqual(outputs[0], outputs[1])
+        self.assertEqual(offsets[0], offsets[1])
+        with bgzf.BgzfReader(self.temp_file, "rb", threads=2) as h:
+            for i, offset in zip(range(0, len(lines), 500), offsets[1]):
+                h.seek(offset)
+                self.assertEqual(h.readline(), lines[i])
+
+    def test_block_cache(self):
+        """Check the LRU block cache, including sharing between readers."""
+        cache = bgzf.BgzfBlockCache(max_bytes=10)
+        cache.put("a", (b"12345", 1))
+        cache.put("b", (b"1234", 1))
+        self.assertEqual(cache.get("a"), (b"12345", 1))
+        cache.put("c", (b"123", 1))  # Should evict b, not a
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), (b"12345", 1))
+        self.assertEqual(cache.get("c"), (b"123", 1))
+        cache.put("d", (b"12345678901", 1))  # Too big to cache
+        self.assertIsNone(cache.get("d"))
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.size, 8)
+        self.assertEqual((cache.hits, cache.misses), (3, 2))
+        cache.clear()
+        self.assertEqual((len(cache), cache.size, cache.hits, cache.misses), (0,) * 4)
+
+        filename = "SamBam/ex1.bam"
+        with open(filename, "rb") as h:
+            blocks = list(bgzf.BgzfBlocks(h))
+        with gzip.open(filename) as h:
+            old = h.read()
+        # Room for three full blocks
+        cache = bgzf.BgzfBlockCache(max_bytes=3 * 65536)
+        with bgzf.BgzfReader(filename, "rb", cache=cache) as h:
+            data = h.read(len(old))
+        self.assertEqual(data, old)
+        self.assertEqual(cache.hits, 0)
+        self.assertEqual(len(cache), 3)
+        # The last three data blocks should be cached, even for a new reader
+        # (which will load the first block on opening, evicting one of them)
+        with bgzf.BgzfReader(filename, "rb", cache=cache) as h:
+            for start, raw_len, data_start, data_len in blocks[-3:-1]:
+                h.seek(bgzf.make_virtual_offset(start, 0))
+                self.assertEqual(h.read(data_len), old[data_start:][:data_len])
+        self.assertEqual(cache.hits, 2)
+        # But not for a different file
+        self.check_random("SamBam/ex1_refresh.bam")
+        with bgzf.BgzfReader("SamBam/ex1_refresh.bam", "rb", cache=cache) as h:
+            h.read(10)
+        self.assertEqual(cache.hits, 2)
+
     def test_append_mode(self):
         with self.assertRaises(NotImplementedError):
             bgzf.open(self.temp_file, "ab")
@@ -8,11 +8,16 @@
 
 """Tests for motifs module."""
 
+import itertools
+import math
 import os
+import tempfile
 import unittest
-import math
+
+import numpy
 
 from Bio import motifs
+from Bio import SeqIO
 from Bio.Seq import Seq
 
 
@@ -2262,6 +2267,137 @@ class MotifTestPWM(unittest.TestCase):
         self.assertAlmostEqual(result[5], -25.18009186, places=5)
         self.assertTrue(math.isnan(result[6]), "Expected nan, not %r" % result[6])
 
+    def test_search(self):
+        """Test searching both strands with a PSSM."""
+        pssm = self.m.counts.normalize(pseudocounts=0.25).log_odds()
+        sequence = Seq("ACGTGTGCGTAGTGCGTTCCATATAAGGACCCTTATGGCAATTCC")
+        for chunksize in (5, 10 ** 6):
+            hits = list(pssm.search(sequence, chunksize=chunksize))
+            self.assertEqual(len(hits), 2)
+            self.assertEqual(hits[0][0], 16)
+            self.assertAlmostEqual(hits[0][1], 13.312946, places=5)
+            self.assertEqual(hits[1][0], -27)
+            self.assertAlmostEqual(hits[1][1], 16.224924, places=5)
+            hits = list(pssm.search(sequence, both=False, chunksize=chunksize))
+            self.assertEqual(len(hits), 1)
+            self.assertEqual(hits[0][0], 16)
+
+    def test_batch_search(self):
+        """Test searching with many PSSMs at once."""
+        from Bio.motifs.matrix import batch_search
+
+        pssm = self.m.counts.normalize(pseudocounts=0.25).log_odds()
+        other = motifs.create(["GTTA", "GTTC"]).pssm
+        sequence = Seq("ACGTGTGCGTAGTGCGTTCCATATAAGGACCCTTATGGCAATTCC")
+        for threads in (1, 3):
+            hits = batch_search(
+                [pssm, other], sequence, [0.0, 2.0], chunksize=7, threads=threads
+            )
+            self.assertEqual(list(hits["motif"]), [0, 0, 1])
+            self.assertEqual(list(hits["position"]), [16, 18, 15])
+            self.assertEqual(list(hits["strand"]), [1, -1, 1])
+            self.assertAlmostEqual(hits["score"][0], 13.312946, places=5)
+            self.assertAlmostEqual(hits["score"][1], 16.224924, places=5)
+            self.assertAlmostEqual(hits["score"][2], 7.0, places=5)
+        hits = batch_search([pssm, other], sequence, 0.0, both=False)
+        self.assertEqual(list(hits["motif"]), [0, 1])
+        self.assertEqual(list(hits["position"]), [16, 15])
+        self.assertRaises(ValueError, batch_search, [pssm, other], sequence, [1, 2, 3])
+
+    def test_batch_search_records(self):
+        """Test searching many sequences with many PSSMs."""
+        from Bio.motifs.matrix import batch_search, batch_search_records
+
+        pssms = [
+            self.m.counts.normalize(pseudocounts=0.25).log_odds(),
+            motifs.create(["GTTA", "GTTC"]).pssm,
+        ]
+        records = list(SeqIO.parse("Fasta/f002", "fasta"))
+        sequences = [records[0], records[1].seq, str(records[2].seq)]
+        for threads in (1, 3):
+            results = list(
+                batch_search_records(
+                    pssms, iter(sequences), 2.0, chunksize=100, threads=threads
+                )
+            )
+            self.assertEqual([record for record, hits in results], sequences)
+            for record, hits in results:
+                expected = batch_search(pssms, getattr(record, "seq", record), 2.0)
+                self.assertTrue(numpy.array_equal(hits, expected))
+
+    def test_pvalue(self):
+        """Test calculating p-values from the score distribution."""
+        pssm = motifs.create(["GTTA", "GTTC", "GATC"]).counts.normalize(0.5).log_odds()
+        background = {"A": 0.3, "C": 0.2, "G": 0.2, "T": 0.3}
+        distribution = pssm.distribution(background, precision=10 ** 3)
+        # compare to the exact p-values found by enumerating all words
+        words = ["".join(word) for word in itertools.product("ACGT", repeat=4)]
+        scores = [pssm.calculate(word) for word in words]
+        for threshold in (-5.0, 0.0, 2.0, 4.0):
+            expected = sum(
+                numpy.prod([background[letter] for letter in word])
+                for word, score in zip(words, scores)
+                if score >= threshold
+            )
+            self.assertAlmostEqual(distribution.pvalue(threshold), expected, places=3)
+        pvalues = distribution.pvalue(numpy.array([-100.0, math.nan, 100.0]))
+        self.assertAlmostEqual(pvalues[0], 1.0)
+        self.assertTrue(math.isnan(pvalues[1]))
+        self.assertEqual(pvalues[2], 0.0)
+        # the distribution is cached
+        other = pssm.distribution(background, precision=10 ** 3)
+        self.assertIsNot(other, distribution)
+        self.assertTrue(numpy.array_equal(other.bg_density, distribution.bg_density))
+        # modifying the copy does not affect the cache
+        distribution.bg_density[:] = 0
+        other = pssm.distribution(background, precision=10 ** 3)
+        self.assertAlmostEqual(other.bg_density.sum(), 1.0)
+        sequence = "GTTAGATCAAAAGATCGGGGTAAC"
+        hits = list(pssm.search(sequence, pvalue=0.02, background=background))
+        self.assertEqual([hit[0] for hit in hits], [0, 4, -20, 12, -12, -4])
+        for position, score, pvalue in hits:
+            self.assertAlmostEqual(pvalue, 0.0126)
+        from Bio.motifs.matrix import batch_search
+
+        hits = batch_search([pssm], sequence, pvalue=0.02, background=background)
+        self.assertEqual(list(hits["position"]), [0, 4, 4, 12, 12, 20])
+        self.assertEqual(list(hits["strand"]), [1, 1, -1, 1, -1, -1])
+        self.assertTrue(numpy.allclose(hits["pvalue"], 0.0126))
+
+    def test_distribution_cache_dir(self):
+        """Test storing score distributions in a directory."""
+        from Bio.motifs import thresholds
+
+        pssm = motifs.create(["GTTA", "GTTC", "GCTC"]).counts.normalize(0.5).log_odds()
+        with tempfile.TemporaryDirectory() as directory:
+            thresholds.cache_dir = directory
+            try:
+                distribution = pssm.distribution(precision=100)
+                self.assertEqual(len(os.listdir(directory)), 1)
+                thresholds._cache.clear()
+                other = pssm.distribution(precision=100)
+                # a truncated file is recalculated
+                (filename,) = os.listdir(directory)
+                path = os.path.join(directory, filename)
+                with open(path, "r+b") as handle:
+                    handle.truncate(100)
+                thresholds._cache.clear()
+                recalculated = pssm.distribution(precision=100)
+                self.assertTrue(
+                    numpy.array_equal(recalculated.mo_density, distribution.mo_density)
+                )
+                # the distribution is still returned if it can't be stored
+                thresholds.cache_dir = os.path.join(directory, "missing")
+                thresholds._cache.clear()
+                unstored = pssm.distribution(precision=100)
+                self.assertEqual(os.listdir(directory), [filename])
+            finally:
+                thresholds.cache_dir = None
+        self.assertTrue(numpy.array_equal(unstored.bg_density, distribution.bg_density))
+        self.assertEqual(other.n_points, distribution.n_points)
+        self.assertTrue(numpy.array_equal(other.bg_density, distribution.bg_density))
+        self.assertEqual(other.threshold_fpr(0.1), distribution.threshold_fpr(0.1))
+
     def test_calculate_pseudocounts(self):
         pseudocounts = motifs.jaspar.calculate_pseudocounts(self.m)
         self.assertAlmostEqual(pseudocounts["A"], 1.695582495781317, places=5)
@@ -19,6 +19,7 @@ from Bio import pairwise2
 # Explicitly using pure Python fallback functions:
 pairwise2._make_score_matrix_fast = pairwise2._python_make_score_matrix_fast
 pairwise2.rint = pairwise2._python_rint
+pairwise2._PairwiseAligner = None
 
 
 if __name__ == "__main__":
@@ -6,10 +6,16 @@
 """Tests for pairwise aligner module."""
 
 import array
+import itertools
 import os
+import random
 import unittest
 
+import numpy
+
 from Bio import Align, SeqIO
+from Bio.Align import substitution_matrices
+from Bio.Seq import Seq
 
 
 class TestAlignerProperties(unittest.TestCase):
@@ -2520,6 +2526,514 @@ class TestUnicodeStrings(unittest.TestCase):
         self.assertEqual(alignment.aligned, (((0, 1), (2, 3)), ((1, 2), (2, 3))))
 
 
+class TestScoreMany(unittest.TestCase):
+    def setUp(self):
+        random.seed(0)
+        self.seqsA = [
+            "".join(random.choice("ACGT") for j in range(random.randint(1, 60)))
+            for i in range(40)
+        ]
+        self.seqsB = [
+            "".join(random.choice("ACGT") for j in range(random.randint(1, 60)))
+            for i in range(40)
+        ]
+
+    def check_aligner(self, aligner):
+        expected = [aligner.score(a, b) for a, b in zip(self.seqsA, self.seqsB)]
+        for threads in (1, 3):
+            scores = aligner.score_many(self.seqsA, self.seqsB, threads=threads)
+            self.assertIsInstance(scores, numpy.ndarray)
+            self.assertEqual(scores.tolist(), expected)
+            results = aligner.align_many(self.seqsA, self.seqsB, threads=threads)
+            self.assertEqual(len(results), len(expected))
+            for alignments, seqA, seqB, score in zip(
+                results, self.seqsA, self.seqsB, expected
+            ):
+                self.assertEqual(alignments.score, score)
+                alignment = alignments[0]
+                self.assertEqual(alignment.target, seqA)
+                self.assertEqual(alignment.query, seqB)
+                self.assertEqual(alignment.score, score)
+
+    def test_needlemanwunsch(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1)
+        self.assertEqual(aligner.algorithm, "Needleman-Wunsch")
+        self.check_aligner(aligner)
+
+    def test_smithwaterman(self):
+        aligner = Align.PairwiseAligner(mode="local", mismatch_score=-1)
+        self.assertEqual(aligner.algorithm, "Smith-Waterman")
+        self.check_aligner(aligner)
+
+    def test_gotoh(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, open_gap_score=-2)
+        aligner.extend_gap_score = -0.5
+        self.assertEqual(aligner.algorithm, "Gotoh global alignment algorithm")
+        self.check_aligner(aligner)
+        aligner.mode = "local"
+        self.assertEqual(aligner.algorithm, "Gotoh local alignment algorithm")
+        self.check_aligner(aligner)
+
+    def test_substitution_matrix(self):
+        aligner = Align.PairwiseAligner()
+        aligner.substitution_matrix = substitution_matrices.load("NUC.4.4")
+        aligner.open_gap_score = -5
+        aligner.extend_gap_score = -1
+        self.check_aligner(aligner)
+
+    def test_one_against_many(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, mode="local")
+        query = Seq(self.seqsA[0])
+        expected = [aligner.score(query, b) for b in self.seqsB]
+        scores = aligner.score_many(query, self.seqsB, threads=2)
+        self.assertEqual(scores.tolist(), expected)
+        expected = [aligner.score(b, query) for b in self.seqsB]
+        scores = aligner.score_many(self.seqsB, query, threads=2)
+        self.assertEqual(scores.tolist(), expected)
+
+    def test_arrays(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1)
+        seqsA = numpy.array([list(b"ACGTAC"), list(b"TTGACA")], numpy.uint8)
+        seqsB = numpy.array([list(b"ACTAC"), list(b"TTGCA")], numpy.uint8)
+        scores = aligner.score_many(seqsA, seqsB)
+        self.assertEqual(scores.tolist(), [5.0, 5.0])
+        # indices into the substitution matrix
+        aligner.substitution_matrix = substitution_matrices.load("NUC.4.4")
+        alphabet = aligner.substitution_matrix.alphabet
+        seqs = ["".join(random.choice("ACGTN") for j in range(20)) for i in range(10)]
+        indices = numpy.array(
+            [[alphabet.index(c) for c in seq] for seq in seqs], numpy.int32
+        )
+        query = indices[0, :7]
+        expected = [aligner.score(seqs[0][:7], seq) for seq in seqs]
+        scores = aligner.score_many(query, indices, threads=2)
+        self.assertEqual(scores.tolist(), expected)
+
+    def test_errors(self):
+        aligner = Align.PairwiseAligner()
+        with self.assertRaises(ValueError) as cm:
+            aligner.score_many(["ACGT", "AC"], ["AC"])
+        self.assertEqual(
+            str(cm.exception), "seqsA and seqsB have different lengths (2 and 1)"
+        )
+        with self.assertRaises(ValueError):
+            aligner.score_many("ACGT", "ACGT")
+        with self.assertRaises(ValueError):
+            aligner.score_many(["ACGT", ""], ["AC", "AC"], threads=2)
+        self.assertEqual(aligner.score_many([], []).tolist(), [])
+
+
+class TestAlignLinear(unittest.TestCase):
+    def path_score(self, aligner, alignment):
+        # Only for aligners with the same gap scores everywhere
+        target = alignment.target
+        query = alignment.query
+        path = alignment.path
+        score = 0
+        for (i1, j1), (i2, j2) in zip(path[:-1], path[1:]):
+            if i1 == i2 or j1 == j2:
+                n = max(i2 - i1, j2 - j1)
+                score += aligner.open_gap_score + (n - 1) * aligner.extend_gap_score
+            else:
+                for a, b in zip(target[i1:i2], query[j1:j2]):
+                    if a == b:
+                        score += aligner.match_score
+                    else:
+                        score += aligner.mismatch_score
+        return score
+
+    def check_aligner(self, aligner):
+        random.seed(0)
+        for n, m in ((1, 1), (1, 5), (7, 0), (20, 31), (70, 65), (300, 250)):
+            for trial in range(5):
+                seqA = "".join(random.choice("ACGT") for i in range(n))
+                seqB = "".join(random.choice("ACGT") for i in range(m))
+                if not seqA or not seqB:
+                    continue
+                alignments = aligner.align(seqA, seqB)
+                alignment = aligner.align_linear(seqA, seqB)
+                self.assertEqual(alignment.target, seqA)
+                self.assertEqual(alignment.query, seqB)
+                self.assertAlmostEqual(alignment.score, alignments.score)
+                self.assertEqual(alignment.path[0], (0, 0))
+                self.assertEqual(alignment.path[-1], (n, m))
+                self.assertAlmostEqual(
+                    self.path_score(aligner, alignment), alignments.score
+                )
+                if len(alignments) < 100:
+                    paths = [alignment.path for alignment in alignments]
+                    self.assertIn(alignment.path, paths)
+
+    def test_needlemanwunsch(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-2)
+        self.assertEqual(aligner.algorithm, "Needleman-Wunsch")
+        self.check_aligner(aligner)
+
+    def test_gotoh(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, open_gap_score=-3)
+        aligner.extend_gap_score = -0.5
+        self.assertEqual(aligner.algorithm, "Gotoh global alignment algorithm")
+        self.check_aligner(aligner)
+        # gap extension penalized more than gap opening
+        aligner.open_gap_score = -1
+        aligner.extend_gap_score = -2
+        self.check_aligner(aligner)
+
+    def test_end_gaps(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-2, open_gap_score=-3)
+        aligner.extend_gap_score = -1
+        aligner.end_gap_score = 0
+        seqA = "AAAAAAAAAAAAAAAAAAAACCCCGGGGTTTTACGTTTTTTTTTTTTTTTTTTTT" * 20
+        seqB = "CCCCGGGGTTTTACGT" * 5
+        alignments = aligner.align(seqA, seqB)
+        alignment = aligner.align_linear(seqA, seqB)
+        self.assertEqual(alignment.score, alignments.score)
+        self.assertEqual(alignment.path[-1], (len(seqA), len(seqB)))
+
+    def test_seq(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-1)
+        alignment = aligner.align_linear(Seq("GAACT"), Seq("GAT"))
+        self.assertEqual(alignment.score, 1.0)
+        self.assertEqual(
+            str(alignment),
+            """\
+GAACT
+|-|-|
+G-A-T
+""",
+        )
+
+    def test_errors(self):
+        aligner = Align.PairwiseAligner(mode="local")
+        with self.assertRaises(ValueError) as cm:
+            aligner.align_linear("ACGT", "ACT")
+        self.assertEqual(
+            str(cm.exception), "linear memory alignment requires global mode"
+        )
+        aligner.mode = "global"
+        aligner.target_gap_score = lambda i, n: -2 * n
+        with self.assertRaises(ValueError):
+            aligner.align_linear("ACGT", "ACT")
+
+
+class TestBanded(unittest.TestCase):
+    def mutate(self, seqA):
+        seqB = list(seqA)
+        for k in range(random.randint(0, 5)):
+            i = random.randrange(len(seqB) + 1)
+            if random.random() < 0.5:
+                del seqB[i : i + random.randint(1, 3)]
+            else:
+                seqB[i:i] = random.choice("ACGT") * random.randint(1, 3)
+        return "".join(seqB) or "A"
+
+    def check_aligner(self, aligner):
+        random.seed(0)
+        for trial in range(40):
+            n = random.randint(1, 60)
+            seqA = "".join(random.choice("ACGT") for i in range(n))
+            seqB = self.mutate(seqA)
+            nA = len(seqA)
+            nB = len(seqB)
+            aligner.band_width = None
+            score = aligner.score(seqA, seqB)
+            alignments = aligner.align(seqA, seqB)
+            # a band covering the whole matrix gives the same alignments
+            aligner.band_width = nA + nB
+            self.assertAlmostEqual(aligner.score(seqA, seqB), score)
+            banded = aligner.align(seqA, seqB)
+            self.assertAlmostEqual(banded.score, score)
+            if len(alignments) < 100:
+                self.assertEqual(
+                    sorted(alignment.path for alignment in banded),
+                    sorted(alignment.path for alignment in alignments),
+                )
+            # a narrow band can only lower the score
+            width = random.choice([0, 1, 2, 5])
+            aligner.band_width = width
+            banded = aligner.align(seqA, seqB)
+            self.assertAlmostEqual(aligner.score(seqA, seqB), banded.score)
+            self.assertLessEqual(banded.score, score + 1e-9)
+            lower = min(0, nB - nA) - width
+            upper = max(0, nB - nA) + width
+            for alignment in itertools.islice(banded, 100):
+                for i, j in alignment.path:
+                    self.assertGreaterEqual(j - i, lower)
+                    self.assertLessEqual(j - i, upper)
+
+    def test_needlemanwunsch(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-2)
+        self.check_aligner(aligner)
+
+    def test_gotoh(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-2, open_gap_score=-3)
+        aligner.extend_gap_score = -1
+        self.check_aligner(aligner)
+        aligner.end_gap_score = 0
+        self.check_aligner(aligner)
+
+    def test_smithwaterman(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-2)
+        aligner.mode = "local"
+        self.check_aligner(aligner)
+
+    def test_local_gotoh(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-2, open_gap_score=-3)
+        aligner.extend_gap_score = -1
+        aligner.mode = "local"
+        self.check_aligner(aligner)
+
+    def test_narrow_band(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-2)
+        aligner.band_width = 2
+        alignments = aligner.align("GAACTTGACGATT", "GAACTGACGATT")
+        self.assertAlmostEqual(alignments.score, 10.0)
+        self.assertEqual(
+            str(alignments[0]),
+            """\
+GAACTTGACGATT
+||||-||||||||
+GAAC-TGACGATT
+""",
+        )
+        # the moved block needs a band of width three
+        aligner.gap_score = -1
+        seqA = "ACGTACGTACTTTGATCGATCGA"
+        seqB = "ACGTACGTACGATCGATCGATTT"
+        aligner.band_width = None
+        self.assertAlmostEqual(aligner.score(seqA, seqB), 14.0)
+        aligner.band_width = 3
+        self.assertAlmostEqual(aligner.score(seqA, seqB), 14.0)
+        aligner.band_width = 2
+        self.assertAlmostEqual(aligner.score(seqA, seqB), 12.0)
+
+    def test_xdrop(self):
+        aligner = Align.PairwiseAligner(mismatch_score=-1, gap_score=-2)
+        aligner.mode = "local"
+        random.seed(1)
+        for trial in range(40):
+            n = random.randint(1, 60)
+            seqA = "".join(random.choice("ACGT") for i in range(n))
+            seqB = self.mutate(seqA)
+            aligner.xdrop = None
+            score = aligner.score(seqA, seqB)
+            aligner.xdrop = 1000
+            self.assertAlmostEqual(aligner.score(seqA, seqB), score)
+            self.assertAlmostEqual(aligner.align(seqA, seqB).score, score)
+            aligner.xdrop = 2
+            alignments = aligner.align(seqA, seqB)
+            self.assertAlmostEqual(aligner.score(seqA, seqB), alignments.score)
+            self.assertLessEqual(alignments.score, score + 1e-9)
+        seqA = "GGGGGGGGGGAACCGGTTAA"
+        seqB = "AACCGGTTAAGGGGG"
+        aligner.xdrop = None
+        self.assertAlmostEqual(aligner.score(seqA, seqB), 10.0)
+        aligner.xdrop = 3
+        self.assertAlmostEqual(aligner.score(seqA, seqB), 5.0)
+
+    def test_attributes(self):
+        aligner = Align.PairwiseAligner()
+        self.assertIsNone(aligner.band_width)
+        self.assertIsNone(aligner.xdrop)
+        self.assertNotIn("band_width", str(aligner))
+        aligner.band_width = 5
+        aligner.mode = "local"
+        aligner.xdrop = 2.5
+        self.assertEqual(aligner.band_width, 5)
+        self.assertAlmostEqual(aligner.xdrop, 2.5)
+        self.assertIn("band_width: 5", str(aligner))
+        self.assertIn("xdrop: 2.5", str(aligner))
+        aligner.band_width = None
+        aligner.xdrop = None
+        self.assertIsNone(aligner.band_width)
+        self.assertIsNone(aligner.xdrop)
+
+    def test_errors(self):
+        aligner = Align.PairwiseAligner()
+        with self.assertRaises(ValueError):
+            aligner.band_width = -1
+        with self.assertRaises(TypeError):
+            aligner.band_width = 2.5
+        with self.assertRaises(ValueError):
+            aligner.xdrop = -1
+        aligner.xdrop = 5
+        with self.assertRaises(ValueError) as cm:
+            aligner.score("ACGT", "ACT")
+        self.assertEqual(str(cm.exception), "X-drop termination requires local mode")
+        aligner.xdrop = None
+        aligner.band_width = 3
+        aligner.target_gap_score = lambda i, n: -2 * n
+        with self.assertRaises(ValueError):
+            aligner.align("ACGT", "ACT")
+
+
+class TestStriped(unittest.TestCase):
+    letters = "ARNDCQEGHILKMFPSTWYV"
+
+    def random_sequence(self, n):
+        return "".join(random.choice(self.letters) for i in range(n))
+
+    def check_aligner(self, aligner):
+        random.seed(0)
+        for trial in range(50):
+            seqA = self.random_sequence(random.randint(1, 80))
+            if trial % 2:
+                seqB = self.random_sequence(random.randint(1, 80))
+            else:
+                seqB = seqA[random.randint(0, len(seqA) - 1) :]
+            score = aligner.align(seqA, seqB).score
+            self.assertEqual(aligner.score(seqA, seqB), score)
+            # profiles are reused for repeated sequences
+            self.assertEqual(aligner.score(seqA, seqB), score)
+            self.assertEqual(aligner.score(seqB, seqA), aligner.align(seqB, seqA).score)
+
+    def test_blosum62(self):
+        substitution_matrix = substitution_matrices.load("BLOSUM62")
+        aligner = Align.PairwiseAligner(mode="local")
+        aligner.substitution_matrix = substitution_matrix
+        aligner.open_gap_score = -11
+        aligner.extend_gap_score = -1
+        self.check_aligner(aligner)
+        aligner.gap_score = -4
+        self.check_aligner(aligner)
+        aligner.target_open_gap_score = -3
+        aligner.query_extend_gap_score = -2
+        self.check_aligner(aligner)
+
+    def test_asymmetric(self):
+        random.seed(1)
+        alphabet = self.letters
+        substitution_matrix = substitution_matrices.Array(alphabet, dims=2)
+        for c1 in alphabet:
+            for c2 in alphabet:
+                substitution_matrix[c1, c2] = random.randint(-4, 5)
+        aligner = Align.PairwiseAligner(mode="local")
+        aligner.substitution_matrix = substitution_matrix
+        aligner.open_gap_score = -5
+        aligner.extend_gap_score = -2
+        self.check_aligner(aligner)
+
+    def test_score_many(self):
+        random.seed(2)
+        aligner = Align.PairwiseAligner(mode="local")
+        aligner.substitution_matrix = substitution_matrices.load("BLOSUM62")
+        aligner.open_gap_score = -10
+        aligner.extend_gap_score = -1
+        query = self.random_sequence(100)
+        targets = [self.random_sequence(random.randint(50, 150)) for i in range(20)]
+        targets.append(query[20:80])
+        expected = [aligner.align(query, target).score for target in targets]
+        self.assertEqual(aligner.score_many(query, targets).tolist(), expected)
+        expected = [aligner.align(target, query).score for target in targets]
+        self.assertEqual(aligner.score_many(targets, query).tolist(), expected)
+        # modifying the substitution matrix invalidates the profiles
+        aligner.substitution_matrix["W", "W"] = 20
+        expected = [aligner.align(query, target).score for target in targets]
+        self.assertEqual(aligner.score_many(query, targets).tolist(), expected)
+
+    def test_fallback(self):
+        aligner = Align.PairwiseAligner(mode="local")
+        aligner.substitution_matrix = substitution_matrices.load("BLOSUM62")
+        aligner.open_gap_score = -10
+        aligner.extend_gap_score = -1
+        # too high for 16-bit integers
+        seq = "W" * 4000
+        self.assertAlmostEqual(aligner.score(seq, seq), 44000)
+        # scores that are not integers
+        aligner.extend_gap_score = -0.5
+        self.check_aligner(aligner)
+        # extending a gap scores less than opening one
+        aligner.open_gap_score = -1
+        aligner.extend_gap_score = -3
+        self.check_aligner(aligner)
+
+
+class TestAlignmentsIndexing(unittest.TestCase):
+    def check_indexing(self, aligner, seqA, seqB):
+        expected = [alignment.path for alignment in aligner.align(seqA, seqB)]
+        alignments = aligner.align(seqA, seqB)
+        self.assertEqual(len(alignments), len(expected))
+        alignments.checkpoint_interval = 7
+        random.seed(0)
+        for i in range(200):
+            index = random.randrange(-len(expected), len(expected))
+            self.assertEqual(alignments[index].path, expected[index])
+        # checkpoints were saved before every seventh alignment only
+        self.assertEqual(len(alignments._checkpoints), (len(expected) - 1) // 7 + 1)
+        self.assertEqual([alignment.path for alignment in alignments], expected)
+        with self.assertRaises(IndexError):
+            alignments[len(expected)]
+        with self.assertRaises(IndexError):
+            alignments[-len(expected) - 1]
+
+    def test_needlemanwunsch(self):
+        aligner = Align.PairwiseAligner()
+        self.check_indexing(aligner, "AACAACAA", "ACACA")
+
+    def test_smithwaterman(self):
+        aligner = Align.PairwiseAligner(mode="local")
+        self.check_indexing(aligner, "AACAACAAC", "ACACAC")
+
+    def test_gotoh(self):
+        aligner = Align.PairwiseAligner()
+        aligner.open_gap_score = -1
+        aligner.extend_gap_score = -0.5
+        self.check_indexing(aligner, "AACAACAAAC", "ACACA")
+        aligner.mode = "local"
+        self.check_indexing(aligner, "AACAACAAAC", "ACACA")
+
+    def test_waterman_smith_beyer(self):
+        aligner = Align.PairwiseAligner()
+        aligner.gap_score = lambda i, n: -1 - 0.5 * n
+        self.check_indexing(aligner, "AACAACAAAC", "ACACA")
+        aligner.mode = "local"
+        self.check_indexing(aligner, "AACAACAAAC", "ACACA")
+
+    def test_max_alignments(self):
+        aligner = Align.PairwiseAligner()
+        alignments = aligner.align("AAAAAAAAAA", "AAAAA")
+        self.assertEqual(len(alignments), 252)
+        expected = [alignment.path for alignment in alignments]
+        alignments = aligner.align("AAAAAAAAAA", "AAAAA", max_alignments=10)
+        self.assertEqual(len(alignments), 10)
+        paths = [alignment.path for alignment in alignments]
+        self.assertEqual(paths, expected[:10])
+        self.assertEqual(alignments[-1].path, expected[9])
+        self.assertEqual(alignments[3].path, expected[3])
+        with self.assertRaises(IndexError):
+            alignments[10]
+        alignments = aligner.align("AAAAAAAAAA", "AAAAA", max_alignments=1000)
+        self.assertEqual(len(alignments), 252)
+        alignments = aligner.align("AAAAAAAAAA", "AAAAA", max_alignments=0)
+        self.assertEqual(len(alignments), 0)
+        self.assertEqual(list(alignments), [])
+        with self.assertRaises(ValueError):
+            aligner.align("AAAAAAAAAA", "AAAAA", max_alignments=-1)
+
+    def test_restore_errors(self):
+        aligner = Align.PairwiseAligner()
+        alignments = aligner.align("AAAA", "AA")
+        paths = alignments.paths
+        state = paths.checkpoint()
+        self.assertEqual(state, (0, 0, b""))
+        next(paths)
+        state = paths.checkpoint()
+        self.assertEqual(len(state[2]), 4)
+        with self.assertRaises(ValueError):
+            paths.restore((0, 0, b"\x04\x04\x04"))
+        with self.assertRaises(ValueError):
+            paths.restore((0, 0, b"\x09"))
+        with self.assertRaises(ValueError):
+            paths.restore((1, 0, b""))
+        with self.assertRaises(TypeError):
+            paths.restore("state")
+        paths.restore(state)
+        self.assertEqual(len(list(paths)), 5)
+        paths.restore(None)
+        self.assertEqual(list(paths), [])
+        self.assertIsNone(paths.checkpoint())
+
+
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)
     unittest.main(testRunner=runner)
@@ -87,6 +87,73 @@ class TestTranscriptionTranslation(unittest.TestCase):
         stop_protein = dna.translate("SGC1", to_stop=True)
         self.assertEqual(stop_protein, "BD")
 
+    def test_long_sequence(self):
+        codons = ["ATG", "TGG", "TAA", "NNN", "TAN", "RAT", "GCN", "aaa", "---"]
+        protein = ["M", "W", "*", "X", "X", "B", "A", "K", "-"]
+        s = "".join(codons * 50)
+        self.assertEqual(Seq.translate(s, gap="-"), "".join(protein * 50))
+        self.assertEqual(
+            Seq.translate(s, stop_symbol="@", gap="-"),
+            "".join(protein * 50).replace("*", "@"),
+        )
+        self.assertEqual(Seq.translate(s, to_stop=True), "MW")
+        self.assertEqual(Seq.translate(s[6:], table=2, to_stop=True, gap="-"), "")
+        with self.assertRaisesRegex(Exception, "Codon '---' is invalid"):
+            Seq.translate(s)
+        s = "ATG" + "GCC" * 200 + "TAA"
+        self.assertEqual(Seq.translate(s, cds=True), "M" + "A" * 200)
+        s = "ATG" + "GCC" * 200 + "TAA" + "GCC" + "TAA"
+        with self.assertRaisesRegex(Exception, "Extra in frame stop codon found"):
+            Seq.translate(s, cds=True)
+        s = "ATG" + "GCC" * 200 + "G?C" + "TAA" + "TAA"
+        with self.assertRaisesRegex(Exception, "Codon 'G\\?C' is invalid"):
+            Seq.translate(s, cds=True)
+
+    def test_non_latin1(self):
+        for n in (1, 200):
+            s = "ATG" * n + "\u20acCA"
+            with self.assertRaisesRegex(Exception, "Codon '\u20acCA' is invalid"):
+                Seq.translate(s)
+            with self.assertRaisesRegex(Exception, "Codon '\u20acCA' is invalid"):
+                Seq.translate_many([s])
+            s = "ATG" * n + "\u20ac" * 3
+            with self.assertRaisesRegex(Exception, "is invalid"):
+                Seq.translate(s, gap="?")
+            self.assertEqual(Seq.translate("ATG" * n + "???", gap="?"), "M" * n + "?")
+
+    def test_without_numpy(self):
+        table = Seq.CodonTable.ambiguous_generic_by_id[1]
+        translator = Seq._CodonTranslator(table)
+        translator._make_table = lambda: False
+        codons = ["ATG", "TGG", "TAA", "NNN", "TAN", "RAT", "GCN", "AAA", "---"]
+        s = "".join(codons * 50)
+        self.assertEqual(
+            translator.translate(s, gap="-"), Seq.translate(s, table=1, gap="-")
+        )
+        self.assertIsNone(translator.table)
+
+    def test_translate_many(self):
+        sequences = [
+            "ATGGCCATTGTAATGGGCCGCTGAAAGGGTGCCCGATAG",
+            Seq.Seq("ATGGCC"),
+            "",
+            Seq.MutableSeq("TTTNNNTAAGGG"),
+            "gcc-----",
+        ]
+        proteins = Seq.translate_many(sequences, gap="-", stop_symbol="@")
+        for sequence, protein in zip(sequences[:4], proteins):
+            expected = Seq.translate(sequence, stop_symbol="@")
+            self.assertEqual(protein, expected)
+            self.assertIsInstance(protein, type(expected))
+        self.assertEqual(proteins[4], "A-")
+        proteins = Seq.translate_many(sequences[:4], table=11, to_stop=True)
+        self.assertEqual(proteins, ["MAIVMGR", "MA", "", "FX"])
+        proteins = Seq.translate_many([Seq.Seq(None, 9), "CCC"])
+        self.assertEqual(len(proteins[0]), 3)
+        self.assertEqual(proteins[1], "P")
+        with self.assertRaisesRegex(Exception, "Codon '---' is invalid"):
+            Seq.translate_many(sequences)
+
 
 if __name__ == "__main__":
     runner = unittest.TextTestRunner(verbosity=2)